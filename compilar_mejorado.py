@@ -799,6 +799,12 @@ def main():
             print("❌ Error en BaseDatos.json")
             return False
         
+        # 1b. Compilar interfaces .ui (arranque sin parsear el XML; si falla se usa loadUi)
+        print("\n🧩 Compilando interfaces .ui...")
+        from compilar_ui import compilar_interfaces
+        if not compilar_interfaces():
+            print("⚠️ Interfaces sin compilar, el EXE usará uic.loadUi")
+        
         # 2. Preservar archivos críticos  
         backups = preservar_archivos_criticos()
         
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compila los archivos .ui de la interfaz a módulos Python con pyuic5
+- ui/actas.ui -> ui/actas_ui.py (con el hash del .ui en la primera línea)
+- Al arrancar se usa el módulo compilado si está al día; si no, uic.loadUi
+- --comparar mide el arranque en frío con loadUi y con el módulo compilado
+
+Uso:
+    python compilar_ui.py              Compila las interfaces que no estén al día
+    python compilar_ui.py --forzar     Compila todas
+    python compilar_ui.py --comparar   Compara tiempos de carga (procesos nuevos)
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from helpers_py import get_ui_file_path, ui_compilada_vigente, compilar_ui, get_ruta_ui_compilada
+
+# Interfaces que carga la aplicación
+INTERFACES = [get_ui_file_path()]
+
+REPETICIONES_COMPARACION = 5
+
+# Proceso nuevo: crea la ventana y mide solo la carga de la interfaz (imports incluidos)
+_SCRIPT_MEDICION = r"""
+import sys, time
+sys.path.insert(0, {directorio!r})
+from PyQt5.QtWidgets import QApplication, QMainWindow
+from helpers_py import _aplicar_ui_compilada, _cargar_ui_compilada
+app = QApplication(sys.argv)
+ventana = QMainWindow()
+inicio = time.perf_counter()
+if {compilada!r}:
+    _aplicar_ui_compilada(ventana, _cargar_ui_compilada({ruta_compilada!r}))
+else:
+    from PyQt5 import uic
+    uic.loadUi({ui_path!r}, ventana)
+print((time.perf_counter() - inicio) * 1000)
+"""
+
+
+def compilar_interfaces(forzar: bool = False) -> bool:
+    """Compilar las interfaces desactualizadas (paso previo a PyInstaller)"""
+    correcto = True
+    for ui_path in INTERFACES:
+        if not ui_path:
+            print("❌ No se encontró ui/actas.ui")
+            correcto = False
+            continue
+        if not forzar and ui_compilada_vigente(ui_path):
+            print(f"✅ Al día: {get_ruta_ui_compilada(ui_path)}")
+            continue
+        try:
+            inicio = time.perf_counter()
+            ruta = compilar_ui(ui_path)
+            print(f"✅ Compilada: {ruta} ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"❌ Error compilando {ui_path}: {e}")
+            correcto = False
+    return correcto
+
+
+def _medir(ui_path: str, compilada: bool) -> float:
+    script = _SCRIPT_MEDICION.format(directorio=current_dir, compilada=compilada,
+                                     ui_path=ui_path, ruta_compilada=get_ruta_ui_compilada(ui_path))
+    resultado = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+
+def comparar_arranque(repeticiones: int = REPETICIONES_COMPARACION):
+    """Tiempo de carga de la interfaz en procesos nuevos: loadUi frente a módulo compilado"""
+    compilar_interfaces()
+    for ui_path in INTERFACES:
+        tiempos = {}
+        for compilada in (False, True):
+            tiempos[compilada] = [_medir(ui_path, compilada) for _ in range(repeticiones)]
+        mediana_ui = statistics.median(tiempos[False])
+        mediana_compilada = statistics.median(tiempos[True])
+        print(f"{os.path.basename(ui_path)} ({repeticiones} arranques en frío, mediana):")
+        print(f"   uic.loadUi:       {mediana_ui:8.1f} ms")
+        print(f"   módulo compilado: {mediana_compilada:8.1f} ms ({mediana_ui / mediana_compilada:.1f}x)")
+
+
+if __name__ == "__main__":
+    if "--comparar" in sys.argv:
+        comparar_arranque()
+    else:
+        sys.exit(0 if compilar_interfaces(forzar="--forzar" in sys.argv) else 1)
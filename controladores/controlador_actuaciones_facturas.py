@@ -14,8 +14,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, 
                            QLineEdit, QComboBox, QPushButton, QFileDialog, 
-                           QMessageBox, QListWidget, QLabel, QTableWidget,
-                           QTableWidgetItem, QHeaderView, QAbstractItemView,
+                           QMessageBox, QListWidget, QLabel, QTableView,
+                           QHeaderView, QAbstractItemView,
                            QWidget,QSizePolicy, QTextEdit)
 from PyQt5.QtCore import QMargins
 from PyQt5.QtCore import Qt
@@ -375,13 +375,17 @@ class ControladorActuacionesFacturas:
         self.contract_manager = getattr(main_window, 'contract_manager', None)
 
 
-        # Datos
+        # Datos (las listas son las del almacén del contrato abierto)
         self.actuaciones = []
         self.facturas = []
+        self.repositorio = None
         
         # Referencias a elementos UI - CORREGIR NOMBRES
         self.table_actuaciones = getattr(main_window, 'tableActuaciones', None)
         self.table_facturas = getattr(main_window, 'tableFactura', None)
+        # Modelos de las tablas (se crean al configurarlas)
+        self.modelo_actuaciones = None
+        self.modelo_facturas = None
         
         # Guardar referencia a main_window para re-búsquedas posteriores
         self.main_window = main_window
@@ -394,7 +398,7 @@ class ControladorActuacionesFacturas:
         if not self.table_actuaciones:
 
             # Buscar en todos los widgets hijos
-            for child in main_window.findChildren(QTableWidget):
+            for child in main_window.findChildren(QTableView):
                 if child.objectName() == 'tableActuaciones':
                     self.table_actuaciones = child
 
@@ -403,7 +407,7 @@ class ControladorActuacionesFacturas:
         if not self.table_facturas:
 
             # Buscar en todos los widgets hijos
-            for child in main_window.findChildren(QTableWidget):
+            for child in main_window.findChildren(QTableView):
                 if child.objectName() == 'tableFactura':
                     self.table_facturas = child
 
@@ -454,43 +458,62 @@ class ControladorActuacionesFacturas:
             pass
     
     def setup_tables(self):
-        """Configurar tablas"""
+        """Configurar tablas: modelo + proxy por tabla y botones de acciones pintados por un delegado"""
+        from .controlador_modelos_tabla import ColumnaTabla, DelegadoBotones, ModeloTablaDiccionarios, ProxySeleccion, fila_origen
 
         logging.debug(f"[ActuacionesFacturas] table_actuaciones: {self.table_actuaciones is not None}")
         logging.debug(f"[ActuacionesFacturas] table_facturas: {self.table_facturas is not None}")
         
-        # Configurar tabla actuaciones
-        if self.table_actuaciones:
-            headers_actuaciones = ["Actuación", "Localidad", "GPED", "Facturas Asociadas", "Acciones"]
-            self.table_actuaciones.setColumnCount(len(headers_actuaciones))
-            self.table_actuaciones.setHorizontalHeaderLabels(headers_actuaciones)
-
+        def configurar_tabla(tabla, columnas, botones, al_doble_clic):
+            modelo = ModeloTablaDiccionarios(columnas, parent=tabla)
+            proxy = ProxySeleccion(tabla)
+            proxy.setSourceModel(modelo)
+            tabla.setModel(proxy)
+            tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+            tabla.verticalHeader().setDefaultSectionSize(100)
+            columna_acciones = len(columnas) - 1
+            tabla.setItemDelegateForColumn(columna_acciones, DelegadoBotones(botones, tabla))
+            tabla.doubleClicked.connect(lambda index: al_doble_clic(fila_origen(index), index.column()))
             
             # Configurar anchos de columna
-            header = self.table_actuaciones.horizontalHeader()
-            header.setSectionResizeMode(0, QHeaderView.Stretch)  # Actuación
-            header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Localidad
-            header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # GPED
-            header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Facturas
-            header.setSectionResizeMode(4, QHeaderView.Interactive)
-            
-            self.table_actuaciones.cellDoubleClicked.connect(self.editar_actuacion_doble_clic)
+            header = tabla.horizontalHeader()
+            header.setSectionResizeMode(0, QHeaderView.Stretch)
+            for columna in range(1, columna_acciones):
+                header.setSectionResizeMode(columna, QHeaderView.ResizeToContents)
+            header.setSectionResizeMode(columna_acciones, QHeaderView.Interactive)
+            tabla.setColumnWidth(columna_acciones, 200)
+            return modelo
+        
+        # Configurar tabla actuaciones
+        if self.table_actuaciones and self.modelo_actuaciones is None:
+            self.modelo_actuaciones = configurar_tabla(self.table_actuaciones, [
+                ColumnaTabla("Actuación", lambda a: a.get('actuacion', '')),
+                ColumnaTabla("Localidad", lambda a: a.get('localidad', '')),
+                ColumnaTabla("GPED", lambda a: str(a.get('gped', ''))),
+                ColumnaTabla("Facturas Asociadas", lambda a: str(len(a.get('facturas_asociadas', [])))),
+                ColumnaTabla("Acciones", lambda a: ''),
+            ], [
+                ("📄 Ver PDF", "#47cf73", "#209150", self.ver_pdfs_actuacion),
+                ("🔄 Cambiar PDF", "#5dade2", "#2471a3", self.cambiar_pdfs_actuacion),
+            ], self.editar_actuacion_doble_clic)
         
         # Configurar tabla facturas
-        if self.table_facturas:
-            headers_facturas = ["Nombre", "Importe (€)", "Actuaciones Asociadas", "Acciones"]
-            self.table_facturas.setColumnCount(len(headers_facturas))
-            self.table_facturas.setHorizontalHeaderLabels(headers_facturas)
-
-            
-            # Configurar anchos de columna
-            header = self.table_facturas.horizontalHeader()
-            header.setSectionResizeMode(0, QHeaderView.Stretch)  # Nombre
-            header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Importe
-            header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Actuaciones
-            header.setSectionResizeMode(3, QHeaderView.Interactive)  # Acciones
-
-            self.table_facturas.cellDoubleClicked.connect(self.editar_factura_doble_clic)
+        if self.table_facturas and self.modelo_facturas is None:
+            self.modelo_facturas = configurar_tabla(self.table_facturas, [
+                ColumnaTabla("Nombre", lambda f: f.get('nombre', '')),
+                ColumnaTabla("Importe (€)", lambda f: f"{f.get('importe', 0.0):.2f} €"),
+                ColumnaTabla("Actuaciones Asociadas", lambda f: str(len(f.get('actuaciones_asociadas', [])))),
+                ColumnaTabla("Acciones", lambda f: ''),
+            ], [
+                ("📄 Ver", "#47cf73", "#209150", self.ver_pdfs_factura),
+                ("🔄 Cambiar", "#5dade2", "#2471a3", self.cambiar_pdfs_factura),
+            ], self.editar_factura_doble_clic)
+    
+    def _fila_seleccionada(self, tabla) -> int:
+        """Fila (en la lista de datos) de la fila actual de la tabla, -1 si no hay"""
+        from .controlador_modelos_tabla import fila_origen
+        index = tabla.currentIndex()
+        return fila_origen(index) if index.isValid() else -1
     
     def set_proyecto_actual(self, nombre_proyecto, contract_data=None):
         """Establecer el proyecto actual"""
@@ -539,16 +562,26 @@ class ControladorActuacionesFacturas:
     def _cargar_datos_desde_json(self):
         """Cargar datos desde el JSON del contrato"""
         try:
-            if not self.contract_data:
-                return
+            # Almacén propio del contrato; la primera vez se siembra con lo que había en BaseDatos.json
+            from .controlador_repositorio_actuaciones import RepositorioActuacionesFacturas
+            from .controlador_routes import rutas
+            if self.repositorio is not None:
+                self.repositorio.cerrar()
+            self.repositorio = RepositorioActuacionesFacturas(
+                rutas.get_ruta_actuaciones_facturas(), self.proyecto_actual, self.contract_data,
+                al_compactar=self._copiar_en_base_datos)
             
             # Cargar actuaciones
-            self.actuaciones = self.contract_data.get('actuaciones', [])
+            self.actuaciones = self.repositorio.filas('actuaciones')
 
             
             # Cargar facturas
-            self.facturas = self.contract_data.get('facturas', [])
+            self.facturas = self.repositorio.filas('facturas')
 
+            # Los demás lectores del contrato en memoria (resumen, diálogos) ven las mismas listas
+            if self.contract_data:
+                self.contract_data['actuaciones'] = self.actuaciones
+                self.contract_data['facturas'] = self.facturas
             
             # Debug: Mostrar primer elemento si existe
 
@@ -572,7 +605,7 @@ class ControladorActuacionesFacturas:
 
             # Intentar re-encontrar la tabla
             if hasattr(self, 'main_window') and self.main_window:
-                for child in self.main_window.findChildren(QTableWidget):
+                for child in self.main_window.findChildren(QTableView):
                     if child.objectName() == 'tableActuaciones':
                         self.table_actuaciones = child
 
@@ -580,15 +613,7 @@ class ControladorActuacionesFacturas:
             if not self.table_actuaciones:
                 return
         
-        self.table_actuaciones.setRowCount(len(self.actuaciones))
-
-        
-        for i, actuacion in enumerate(self.actuaciones):
-            # Usar el campo 'actuacion' en lugar de 'nombre' para coincidir con el JSON
-            self.table_actuaciones.setItem(i, 0, QTableWidgetItem(actuacion.get('actuacion', '')))
-            self.table_actuaciones.setItem(i, 1, QTableWidgetItem(actuacion.get('localidad', '')))
-            self.table_actuaciones.setItem(i, 2, QTableWidgetItem(str(actuacion.get('gped', ''))))
-            self.table_actuaciones.setItem(i, 3, QTableWidgetItem(str(len(actuacion.get('facturas_asociadas', [])))))
+        self.actualizar_tabla_actuaciones()
     
     def _actualizar_tabla_facturas(self):
         """Actualizar tabla de facturas"""
@@ -600,7 +625,7 @@ class ControladorActuacionesFacturas:
 
             # Intentar re-encontrar la tabla
             if hasattr(self, 'main_window') and self.main_window:
-                for child in self.main_window.findChildren(QTableWidget):
+                for child in self.main_window.findChildren(QTableView):
                     if child.objectName() == 'tableFactura':
                         self.table_facturas = child
 
@@ -608,12 +633,7 @@ class ControladorActuacionesFacturas:
             if not self.table_facturas:
                 return
         
-        self.table_facturas.setRowCount(len(self.facturas))
-        
-        for i, factura in enumerate(self.facturas):
-            self.table_facturas.setItem(i, 0, QTableWidgetItem(factura.get('nombre', '')))
-            self.table_facturas.setItem(i, 1, QTableWidgetItem(f"{factura.get('importe', 0):.2f}"))
-            self.table_facturas.setItem(i, 2, QTableWidgetItem(str(len(factura.get('actuaciones_asociadas', [])))))
+        self.actualizar_tabla_facturas()
     
     def _actualizar_labels_presupuesto(self):
         """Actualizar labels de presupuesto"""
@@ -1188,7 +1208,7 @@ class ControladorActuacionesFacturas:
             if not self.table_actuaciones:
                 return
             
-            fila_actual = self.table_actuaciones.currentRow()
+            fila_actual = self._fila_seleccionada(self.table_actuaciones)
             if fila_actual < 0 or fila_actual >= len(self.actuaciones):
                 QMessageBox.warning(self.main_window, "Advertencia", "Selecciona una actuación para borrar")
                 return
@@ -1202,12 +1222,11 @@ class ControladorActuacionesFacturas:
             )
             
             if respuesta == QMessageBox.Yes:
-                # Borrar de la lista
-                self.actuaciones.pop(fila_actual)
+                # Borrar de la lista y del almacén del proyecto
+                if not self._guardar_fila('borrar', 'actuaciones', actuacion):
+                    return
                 # Actualizar tabla
                 self.actualizar_tabla_actuaciones()
-                # Guardar cambios
-                self.guardar_en_json()
                 QMessageBox.information(self.main_window, "Éxito", "Actuación borrada correctamente")
                 
         except Exception as e:
@@ -1220,7 +1239,7 @@ class ControladorActuacionesFacturas:
             if not self.table_facturas:
                 return
             
-            fila_actual = self.table_facturas.currentRow()
+            fila_actual = self._fila_seleccionada(self.table_facturas)
             if fila_actual < 0 or fila_actual >= len(self.facturas):
                 QMessageBox.warning(self.main_window, "Advertencia", "Selecciona una factura para borrar")
                 return
@@ -1234,12 +1253,11 @@ class ControladorActuacionesFacturas:
             )
             
             if respuesta == QMessageBox.Yes:
-                # Borrar de la lista
-                self.facturas.pop(fila_actual)
+                # Borrar de la lista y del almacén del proyecto
+                if not self._guardar_fila('borrar', 'facturas', factura):
+                    return
                 # Actualizar tabla
                 self.actualizar_tabla_facturas()
-                # Guardar cambios
-                self.guardar_en_json()
                 QMessageBox.information(self.main_window, "Éxito", "Factura borrada correctamente")
                 self.actualizar_labels_presupuesto()
                 
@@ -1250,14 +1268,17 @@ class ControladorActuacionesFacturas:
         """Limpiar proyecto actual y deshabilitar botones"""
         self.proyecto_actual = None
         self.ruta_carpeta_obra = None
+        if self.repositorio is not None and self.repositorio.pendiente:
+            self.repositorio.compactar()
+        self.repositorio = None
         self.actuaciones = []
         self.facturas = []
         
         # Limpiar tablas
-        if self.table_actuaciones:
-            self.table_actuaciones.setRowCount(0)
-        if self.table_facturas:
-            self.table_facturas.setRowCount(0)
+        if self.modelo_actuaciones:
+            self.modelo_actuaciones.establecer_filas([])
+        if self.modelo_facturas:
+            self.modelo_facturas.establecer_filas([])
         
         # Deshabilitar botones
         self._limpiar_labels_presupuesto()
@@ -1362,41 +1383,25 @@ class ControladorActuacionesFacturas:
             else:
                 carpeta_destino = os.path.join(carpeta_proyecto, "10-otros")
             
-            # Crear carpeta destino si no existe
-            os.makedirs(carpeta_destino, exist_ok=True)
+            # Almacén por contenido del proyecto: un PDF ya adjuntado a la misma carpeta no se
+            # vuelve a copiar y las copias son enlaces duros a un único objeto. Las copias van
+            # en segundo plano con progreso; los PDFs cancelados no se adjuntan
+            from .controlador_almacen_pdf import AlmacenPDF
+            from .controlador_transferencias_pdf import TareaTransferencia, transferir_con_progreso
+            almacen = AlmacenPDF(carpeta_proyecto)
+            tareas = [TareaTransferencia(almacen, archivo_original, carpeta_destino)
+                      for archivo_original in archivos_originales if os.path.exists(archivo_original)]
+            with almacen.lote():  # el manifiesto se escribe una vez, al terminar la cola
+                transferir_con_progreso(self.main_window, tareas)
             
             archivos_copiados = []
-            
-            for archivo_original in archivos_originales:
-                if not os.path.exists(archivo_original):
-    
-                    continue
-                
-                # Generar nombre único para evitar conflictos
-                nombre_archivo = os.path.basename(archivo_original)
-                nombre_base, extension = os.path.splitext(nombre_archivo)
-                
-                # Si el archivo ya existe, agregar timestamp
-                archivo_destino = os.path.join(carpeta_destino, nombre_archivo)
-                contador = 1
-                
-                while os.path.exists(archivo_destino):
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    nuevo_nombre = f"{nombre_base}_{timestamp}_{contador}{extension}"
-                    archivo_destino = os.path.join(carpeta_destino, nuevo_nombre)
-                    contador += 1
-                
-                # Copiar archivo
-                try:
-                    import shutil
-                    shutil.copy2(archivo_original, archivo_destino)
-                    archivos_copiados.append(archivo_destino)
-                    
-                except Exception as e:
-                    logging.error(f"[ActuacionesFacturas] Error copiando {nombre_archivo}: {e}")
+            for tarea in tareas:
+                if tarea.destino:
+                    if tarea.destino not in archivos_copiados:
+                        archivos_copiados.append(tarea.destino)
+                elif tarea.error:
                     # Si no se puede copiar, usar el original
-                    archivos_copiados.append(archivo_original)
+                    archivos_copiados.append(tarea.origen)
             
             return archivos_copiados
             
@@ -1605,11 +1610,9 @@ class ControladorActuacionesFacturas:
             # Copiar archivos PDF
             datos['archivos_pdf'] = self.copiar_archivos_pdf(datos['archivos_pdf'], 'actuaciones')
             
-            # Agregar a la lista
-            self.actuaciones.append(datos)
-            
-            # Guardar en JSON
-            self.guardar_en_json()
+            # Agregar a la lista y al almacén del proyecto
+            if not self._guardar_fila('insertar', 'actuaciones', datos):
+                return
             
             # Actualizar tabla
             self.actualizar_tabla_actuaciones()
@@ -1630,11 +1633,9 @@ class ControladorActuacionesFacturas:
             # Copiar archivos PDF
             datos['archivos_pdf'] = self.copiar_archivos_pdf(datos['archivos_pdf'], 'actuaciones')
             
-            # Agregar a la lista
-            self.actuaciones.append(datos)
-            
-            # Guardar en JSON
-            self.guardar_en_json()
+            # Agregar a la lista y al almacén del proyecto
+            if not self._guardar_fila('insertar', 'actuaciones', datos):
+                return
             
             # Actualizar tabla
             self.actualizar_tabla_actuaciones()
@@ -1692,15 +1693,13 @@ Sistema ADIF
             # Copiar archivos PDF
             datos['archivos_pdf'] = self.copiar_archivos_pdf(datos['archivos_pdf'], 'facturas')
             
-            # Agregar a la lista
-            self.facturas.append(datos)
+            # Agregar a la lista y al almacén del proyecto
+            if not self._guardar_fila('insertar', 'facturas', datos):
+                return
             
             # Actualizar facturas asociadas en actuaciones
             self.actualizar_asociaciones_actuaciones(datos)
             
-            # Guardar en JSON
-            self.guardar_en_json()
-            
             # Actualizar tablas
             self.actualizar_tabla_facturas()
             self.actualizar_tabla_actuaciones()
@@ -1719,36 +1718,7 @@ Sistema ADIF
                 
                 if factura_id not in actuacion['facturas_asociadas']:
                     actuacion['facturas_asociadas'].append(factura_id)
-    
-    def actualizar_tabla_actuaciones(self):
-        """Actualizar tabla de actuaciones"""
-
-
-
-        
-        if not self.table_actuaciones:
-
-            return
-        
-        self.table_actuaciones.setRowCount(len(self.actuaciones))
-        
-        for row, actuacion in enumerate(self.actuaciones):
-            # Actuación
-            self.table_actuaciones.setItem(row, 0, QTableWidgetItem(actuacion.get('actuacion', '')))
-            
-            # Localidad
-            self.table_actuaciones.setItem(row, 1, QTableWidgetItem(actuacion.get('localidad', '')))
-            
-            # GPED
-            self.table_actuaciones.setItem(row, 2, QTableWidgetItem(actuacion.get('gped', '')))
-            
-            # Facturas asociadas (contar)
-            num_facturas = len(actuacion.get('facturas_asociadas', []))
-            self.table_actuaciones.setItem(row, 3, QTableWidgetItem(str(num_facturas)))
-            
-            # Acciones (botones)
-            btn_acciones = QPushButton("⚙️ Acciones")
-            self.table_actuaciones.setCellWidget(row, 4, btn_acciones)
+                    self._guardar_fila('actualizar', 'actuaciones', actuacion)
     
     def cambiar_pdfs_factura(self, fila: int):
         """Cambiar PDFs de una factura"""
@@ -1769,7 +1739,8 @@ Sistema ADIF
                 # Actualizar datos
                 factura['archivos_pdf'] = nuevos_pdfs
                 # Guardar cambios
-                self.guardar_en_json()
+                if not self._guardar_fila('actualizar', 'facturas', factura):
+                    return
                 QMessageBox.information(self.main_window, "Éxito", f"PDFs actualizados: {len(nuevos_pdfs)} archivos")
                 
         except Exception as e:
@@ -1806,212 +1777,61 @@ Sistema ADIF
             QMessageBox.critical(self.main_window, "Error", f"Error abriendo PDF: {e}")
     
     def guardar_en_json(self):
-        """Guardar datos en JSON del proyecto"""
+        """Guardar todas las actuaciones y facturas del proyecto (instantánea completa de su almacén)"""
         try:
-            if not self.proyecto_actual:
+            if not self.proyecto_actual or self.repositorio is None:
 
                 return
             
-            # Acceder al controlador JSON principal
-            if hasattr(self.main_window, 'controlador_json') and self.main_window.controlador_json:
-                gestor = self.main_window.controlador_json.gestor
-                
-                if gestor:
-                    
-                    # Obtener datos actuales del proyecto
-                    datos_proyecto = gestor.cargar_datos_obra(self.proyecto_actual)
-                    
-                    if not datos_proyecto:
-                        logging.error(f"[ActuacionesFacturas] No se pudieron cargar datos del proyecto: {self.proyecto_actual}")
-                        return
-                    
-                    # Actualizar con nuevos datos
-                    datos_proyecto['actuaciones'] = self.actuaciones
-                    datos_proyecto['facturas'] = self.facturas
-                    
-                    # CRÍTICO: Actualizar los datos en el gestor
-                    gestor.datos['obras'][self.proyecto_actual] = datos_proyecto
-                    
-                    # Guardar en el gestor
-                    if gestor.guardar_datos():
-                        pass  # JSON guardado exitosamente
-                    else:
-                        logging.error(f"[ActuacionesFacturas] Error guardando archivo JSON")
-                else:
-                    logging.error("[ActuacionesFacturas] Gestor no disponible")
-            else:
-                logging.error("[ActuacionesFacturas] Controlador JSON no disponible")
+            if not self.repositorio.compactar():
+                logging.error(f"[ActuacionesFacturas] Error guardando actuaciones y facturas")
             
         except Exception as e:
             logging.error(f"[ActuacionesFacturas] Error guardando en JSON: {e}")
-            import traceback
-            logger.exception("Error completo:")
+    
+    # =================== PERSISTENCIA POR FILAS ===================
+    
+    def _copiar_en_base_datos(self, clave: str, tablas: Dict[str, List[Dict[str, Any]]]):
+        """Al compactar el almacén, copiar sus listas en BaseDatos.json (otros las leen de ahí)"""
+        controlador_json = getattr(self.main_window, 'controlador_json', None)
+        if controlador_json:
+            controlador_json.actualizar_contrato(clave, {'actuaciones': tablas['actuaciones'],
+                                                         'facturas': tablas['facturas']})
+    
+    def _guardar_fila(self, operacion: str, tabla: str, fila: Dict[str, Any]) -> bool:
+        """
+        Persistir un cambio de una fila en el almacén del proyecto (una línea en su diario)
+        
+        operacion: 'insertar', 'actualizar' o 'borrar'; la lista en memoria cambia con ella
+        """
+        if self.repositorio is None:
+            logging.error(f"[ActuacionesFacturas] No hay proyecto abierto para guardar {tabla}")
+            return False
+        if operacion == 'insertar':
+            correcto = bool(self.repositorio.insertar(tabla, fila))
+        elif operacion == 'actualizar':
+            correcto = self.repositorio.actualizar(tabla, fila)
+        else:
+            correcto = self.repositorio.borrar(tabla, fila.get('id'))
+        if not correcto:
+            QMessageBox.critical(self.main_window, "Error", f"No se pudieron guardar los cambios en {tabla}")
+        return correcto
+    
     def actualizar_tabla_actuaciones(self):
-        """Actualizar tabla de actuaciones con botones modernos."""
+        """Actualizar tabla de actuaciones (el modelo se reinicia; la vista solo pinta las filas visibles)"""
         if not self.table_actuaciones:
             return
-
-        self.table_actuaciones.setRowCount(len(self.actuaciones))
-        self.table_actuaciones.setColumnWidth(4, 200)
-        estilo_boton = """
-        QPushButton {
-            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #47cf73, stop:1 #209150);
-            color: white;
-            border: none;
-            border-radius: 14px;
-            font-size: 15px;
-            font-weight: bold;
-            padding: 10px 0px;
-            margin-left: 8px;
-            margin-right: 8px;
-        }
-        QPushButton:hover {
-            background-color: #58d68d;
-            color: #117a65;
-        }
-        QPushButton:pressed {
-            background-color: #138d75;
-            color: #d5f5e3;
-        }
-        """
-
-        estilo_boton_azul = """
-        QPushButton {
-            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #5dade2, stop:1 #2471a3);
-            color: white;
-            border: none;
-            border-radius: 14px;
-            font-size: 15px;
-            font-weight: bold;
-            padding: 10px 0px;
-            margin-left: 8px;
-            margin-right: 8px;
-        }
-        QPushButton:hover {
-            background-color: #85c1e9;
-            color: #154360;
-        }
-        QPushButton:pressed {
-            background-color: #21618c;
-            color: #d6eaf8;
-        }
-        """
-
-        for row, actuacion in enumerate(self.actuaciones):
-            self.table_actuaciones.setItem(row, 0, QTableWidgetItem(actuacion.get('actuacion', '')))
-            self.table_actuaciones.setItem(row, 1, QTableWidgetItem(actuacion.get('localidad', '')))
-            self.table_actuaciones.setItem(row, 2, QTableWidgetItem(actuacion.get('gped', '')))
-            num_facturas = len(actuacion.get('facturas_asociadas', []))
-            self.table_actuaciones.setItem(row, 3, QTableWidgetItem(str(num_facturas)))
-            self.table_actuaciones.setRowHeight(row, 100)
-
-            # -- Acciones: botones modernos --
-            widget_acciones = QWidget()
-            layout_acciones = QVBoxLayout(widget_acciones)
-            layout_acciones.setContentsMargins(0, 6, 0, 6)
-            layout_acciones.setSpacing(8)
-
-            # Botón Ver PDFs (verde)
-            btn_ver_pdf = QPushButton("📄 Ver PDF")
-            btn_ver_pdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            btn_ver_pdf.setStyleSheet(estilo_boton)
-            btn_ver_pdf.clicked.connect(lambda checked, r=row: self.ver_pdfs_actuacion(r))
-            layout_acciones.addWidget(btn_ver_pdf)
-
-            # Botón Cambiar PDFs (azul)
-            btn_cambiar_pdf = QPushButton("🔄 Cambiar PDF")
-            btn_cambiar_pdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            btn_cambiar_pdf.setStyleSheet(estilo_boton_azul)
-            btn_cambiar_pdf.clicked.connect(lambda checked, r=row: self.cambiar_pdfs_actuacion(r))
-            layout_acciones.addWidget(btn_cambiar_pdf)
-
-            self.table_actuaciones.setCellWidget(row, 4, widget_acciones)
+        if self.modelo_actuaciones is None:
+            self.setup_tables()
+        self.modelo_actuaciones.establecer_filas(self.actuaciones)
 
     def actualizar_tabla_facturas(self):
-        """Actualizar tabla de facturas con botones modernos (mismos textos que antes)."""
+        """Actualizar tabla de facturas (el modelo se reinicia; la vista solo pinta las filas visibles)"""
         if not self.table_facturas:
             return
-
-        self.table_facturas.setRowCount(len(self.facturas))
-        self.table_facturas.setColumnWidth(3, 200)  # Ajusta el ancho de la columna de botones
-
-        estilo_boton_ver = """
-        QPushButton {
-            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #47cf73, stop:1 #209150);
-            color: white;
-            border: none;
-            border-radius: 14px;
-            font-size: 15px;
-            font-weight: bold;
-            padding: 10px 0px;
-            margin-left: 8px;
-            margin-right: 8px;
-        }
-        QPushButton:hover {
-            background-color: #58d68d;
-            color: #117a65;
-        }
-        QPushButton:pressed {
-            background-color: #138d75;
-            color: #d5f5e3;
-        }
-        """
-
-        estilo_boton_cambiar = """
-        QPushButton {
-            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #5dade2, stop:1 #2471a3);
-            color: white;
-            border: none;
-            border-radius: 14px;
-            font-size: 15px;
-            font-weight: bold;
-            padding: 10px 0px;
-            margin-left: 8px;
-            margin-right: 8px;
-        }
-        QPushButton:hover {
-            background-color: #85c1e9;
-            color: #154360;
-        }
-        QPushButton:pressed {
-            background-color: #21618c;
-            color: #d6eaf8;
-        }
-        """
-
-        for row, factura in enumerate(self.facturas):
-            self.table_facturas.setItem(row, 0, QTableWidgetItem(factura.get('nombre', '')))
-            importe = factura.get('importe', 0.0)
-            self.table_facturas.setItem(row, 1, QTableWidgetItem(f"{importe:.2f} €"))
-            num_actuaciones = len(factura.get('actuaciones_asociadas', []))
-            self.table_facturas.setItem(row, 2, QTableWidgetItem(str(num_actuaciones)))
-            self.table_facturas.setRowHeight(row, 100)
-
-            # -- Acciones: botones modernos (mismos textos) --
-            widget_acciones = QWidget()
-            layout_acciones = QVBoxLayout(widget_acciones)
-            layout_acciones.setContentsMargins(0, 6, 0, 6)
-            layout_acciones.setSpacing(8)
-
-            # Botón Ver PDFs (verde, mismo texto)
-            btn_ver_pdf = QPushButton("📄 Ver")
-            btn_ver_pdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            btn_ver_pdf.setStyleSheet(estilo_boton_ver)
-            btn_ver_pdf.clicked.connect(lambda checked, r=row: self.ver_pdfs_factura(r))
-            layout_acciones.addWidget(btn_ver_pdf)
-
-            # Botón Cambiar PDFs (azul, mismo texto)
-            btn_cambiar_pdf = QPushButton("🔄 Cambiar")
-            btn_cambiar_pdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            btn_cambiar_pdf.setStyleSheet(estilo_boton_cambiar)
-            btn_cambiar_pdf.clicked.connect(lambda checked, r=row: self.cambiar_pdfs_factura(r))
-            layout_acciones.addWidget(btn_cambiar_pdf)
-
-            self.table_facturas.setCellWidget(row, 3, widget_acciones)
+        if self.modelo_facturas is None:
+            self.setup_tables()
+        self.modelo_facturas.establecer_filas(self.facturas)
 
     def ver_pdfs_actuacion(self, fila: int):
         """Ver PDFs de una actuación"""
@@ -2118,7 +1938,8 @@ Sistema ADIF
                 # Actualizar datos
                 actuacion['archivos_pdf'] = nuevos_pdfs
                 # Guardar cambios
-                self.guardar_en_json()
+                if not self._guardar_fila('actualizar', 'actuaciones', actuacion):
+                    return
                 QMessageBox.information(self.main_window, "Éxito", f"PDFs actualizados: {len(nuevos_pdfs)} archivos")
                 
         except Exception as e:
@@ -2172,11 +1993,9 @@ Sistema ADIF
                         datos_actualizados['archivos_pdf'], 'actuaciones'
                     )
                 
-                # Actualizar en la lista
-                self.actuaciones[row] = datos_actualizados
-                
-                # Guardar cambios
-                self.guardar_en_json()
+                # Actualizar en la lista y en el almacén del proyecto
+                if not self._guardar_fila('actualizar', 'actuaciones', datos_actualizados):
+                    return
                 
                 # Actualizar tabla
                 self.actualizar_tabla_actuaciones()
@@ -2228,6 +2047,10 @@ Sistema ADIF
                         datos_actualizados['archivos_pdf'], 'facturas'
                     )
                 
+                # Actualizar en la lista y en el almacén del proyecto
+                if not self._guardar_fila('actualizar', 'facturas', datos_actualizados):
+                    return
+                
                 # Obtener asociaciones anteriores para limpiar referencias
                 asociaciones_anteriores = set(factura_data.get('actuaciones_asociadas', []))
                 asociaciones_nuevas = set(datos_actualizados['actuaciones_asociadas'])
@@ -2239,17 +2062,12 @@ Sistema ADIF
                             facturas_asociadas = actuacion.get('facturas_asociadas', [])
                             if factura_data['id'] in facturas_asociadas:
                                 facturas_asociadas.remove(factura_data['id'])
+                                self._guardar_fila('actualizar', 'actuaciones', actuacion)
                             break
                 
-                # Actualizar en la lista
-                self.facturas[row] = datos_actualizados
-                
                 # Actualizar asociaciones en actuaciones
                 self.actualizar_asociaciones_actuaciones(datos_actualizados)
                 
-                # Guardar cambios
-                self.guardar_en_json()
-                
                 # Actualizar tablas
                 self.actualizar_tabla_facturas()
                 self.actualizar_tabla_actuaciones()
@@ -2274,6 +2092,7 @@ Sistema ADIF
                         facturas_asociadas = actuacion.get('facturas_asociadas', [])
                         if factura_id in facturas_asociadas:
                             facturas_asociadas.remove(factura_id)
+                            self._guardar_fila('actualizar', 'actuaciones', actuacion)
 
                         break
         except Exception as e:
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+controlador_almacen_pdf.py - Almacén de PDFs direccionado por contenido
+- Cada contenido distinto se guarda una sola vez como objeto (<raíz>/.almacen_pdf/objetos/ab/<sha256>.pdf)
+- Los archivos visibles en las carpetas (08-actuaciones, pdfactura directa...) son enlaces
+  duros al objeto cuando el sistema de archivos lo permite
+- Sin enlaces duros (FAT, algunas unidades de red) no hay objeto aparte: el primer archivo
+  visible con ese contenido hace de objeto y el manifiesto apunta a él
+- Un manifiesto (manifiesto.json) relaciona cada nombre lógico con su objeto
+- Adjuntar un PDF que ya está en la carpeta de destino devuelve el existente en lugar de
+  copiarlo otra vez (también los anteriores al almacén, que se comparan por tamaño y hash)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CARPETA_ALMACEN = ".almacen_pdf"
+TAMANO_BLOQUE = 1024 * 1024
+
+# (ruta absoluta, tamaño, mtime_ns) -> sha256: un mismo archivo no se vuelve a leer
+_hashes_calculados: Dict[tuple, str] = {}
+
+
+class TransferenciaCancelada(Exception):
+    """Copia interrumpida a petición del usuario"""
+
+
+def _calcular_hash(ruta: str, progreso: Callable[[int], None] = None,
+                   cancelado: Callable[[], bool] = None) -> str:
+    resumen = hashlib.sha256()
+    leidos = 0
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b''):
+            if cancelado and cancelado():
+                raise TransferenciaCancelada(ruta)
+            resumen.update(bloque)
+            leidos += len(bloque)
+            if progreso:
+                progreso(leidos)
+    return resumen.hexdigest()
+
+
+def _clave_hash(ruta: str, stat: os.stat_result) -> tuple:
+    return (os.path.abspath(ruta), stat.st_size, stat.st_mtime_ns)
+
+
+def hash_conocido(ruta: str) -> Optional[str]:
+    """SHA-256 ya calculado del archivo tal como está ahora, sin leerlo; None si no se conoce"""
+    try:
+        return _hashes_calculados.get(_clave_hash(ruta, os.stat(ruta)))
+    except OSError:
+        return None
+
+
+def hash_archivo(ruta: str, progreso: Callable[[int], None] = None,
+                 cancelado: Callable[[], bool] = None) -> str:
+    """
+    SHA-256 del contenido (se recuerda mientras el archivo no cambie de tamaño ni de fecha);
+    si hay que leerlo, progreso recibe los bytes leídos y cancelado lo interrumpe
+    """
+    clave = _clave_hash(ruta, os.stat(ruta))
+    if clave not in _hashes_calculados:
+        _hashes_calculados[clave] = _calcular_hash(ruta, progreso, cancelado)
+    return _hashes_calculados[clave]
+
+
+def _recordar_hash(ruta: str, hash_contenido: str, stat: os.stat_result = None):
+    try:
+        _hashes_calculados[_clave_hash(ruta, stat or os.stat(ruta))] = hash_contenido
+    except OSError:
+        pass
+
+
+def _escalar_progreso(progreso: Optional[Callable[[int], None]], inicio: int, factor: float):
+    if progreso is None:
+        return None
+    return lambda hechos: progreso(inicio + int(hechos * factor))
+
+
+def copiar_por_bloques(origen: str, destino: str, hash_esperado: str = None,
+                       progreso: Callable[[int], None] = None, cancelado: Callable[[], bool] = None) -> str:
+    """
+    Copiar origen en bloques de TAMANO_BLOQUE (progreso recibe los bytes copiados) y devolver
+    el SHA-256 de lo copiado, calculado al leer; con hash_esperado se comprueba con él. Si se
+    cancela o falla no queda destino
+    """
+    try:
+        stat_origen = os.stat(origen)
+        resumen = hashlib.sha256()
+        copiados = 0
+        with open(origen, 'rb') as f_origen, open(destino, 'wb') as f_destino:
+            for bloque in iter(lambda: f_origen.read(TAMANO_BLOQUE), b''):
+                if cancelado and cancelado():
+                    raise TransferenciaCancelada(origen)
+                f_destino.write(bloque)
+                resumen.update(bloque)
+                copiados += len(bloque)
+                if progreso:
+                    progreso(copiados)
+        shutil.copystat(origen, destino)
+        hash_contenido = resumen.hexdigest()
+        if hash_esperado and hash_contenido != hash_esperado:
+            raise IOError(f"La copia de {os.path.basename(origen)} no coincide con el original")
+        if copiados != os.path.getsize(destino):
+            raise IOError(f"La copia de {os.path.basename(origen)} está incompleta")
+    except BaseException:
+        if os.path.exists(destino):
+            os.remove(destino)
+        raise
+    if _clave_hash(origen, os.stat(origen)) == _clave_hash(origen, stat_origen):
+        _recordar_hash(origen, hash_contenido, stat_origen)
+    return hash_contenido
+
+
+class AlmacenPDF:
+    """Almacén de una carpeta raíz (proyecto o carpeta de facturas directas)"""
+
+    def __init__(self, raiz: str):
+        self.raiz = os.path.abspath(raiz)
+        self.carpeta = os.path.join(self.raiz, CARPETA_ALMACEN)
+        self.archivo_manifiesto = os.path.join(self.carpeta, "manifiesto.json")
+        # Ruta relativa a la raíz (con '/') -> {"hash", "tamano"}
+        self.nombres: Dict[str, Dict] = {}
+        # Hash -> {"tamano", "mtime_ns"} del objeto al guardarlo (detecta objetos modificados)
+        self.objetos: Dict[str, Dict] = {}
+        self._profundidad_lote = 0
+        self._modificado = False
+        self._cargar()
+
+    # =================== MANIFIESTO ===================
+
+    def _cargar(self):
+        try:
+            with open(self.archivo_manifiesto, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            self.nombres = datos.get("nombres", {})
+            self.objetos = datos.get("objetos", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error leyendo manifiesto de PDFs {self.archivo_manifiesto}: {e}")
+
+    def _guardar_manifiesto(self):
+        self._modificado = True
+        if self._profundidad_lote:
+            return
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            ruta_temporal = self.archivo_manifiesto + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "nombres": self.nombres, "objetos": self.objetos},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(ruta_temporal, self.archivo_manifiesto)
+            self._modificado = False
+        except Exception as e:
+            logger.error(f"Error guardando manifiesto de PDFs: {e}")
+
+    @contextmanager
+    def lote(self):
+        """Varias operaciones con una sola escritura del manifiesto"""
+        self._profundidad_lote += 1
+        try:
+            yield self
+        finally:
+            self._profundidad_lote -= 1
+            if not self._profundidad_lote and self._modificado:
+                self._guardar_manifiesto()
+
+    # =================== RUTAS ===================
+
+    def _relativa(self, ruta: str) -> str:
+        relativa = os.path.relpath(os.path.abspath(ruta), self.raiz)
+        if relativa.startswith(os.pardir):
+            raise ValueError(f"{ruta} está fuera del almacén {self.raiz}")
+        return relativa.replace(os.sep, '/')
+
+    def ruta_objeto(self, hash_contenido: str) -> str:
+        return os.path.join(self.carpeta, "objetos", hash_contenido[:2], hash_contenido + ".pdf")
+
+    def hash_de(self, ruta: str) -> Optional[str]:
+        """Hash registrado para un archivo de la carpeta (None si no está o ha cambiado de tamaño)"""
+        registro = self.nombres.get(self._relativa(ruta))
+        try:
+            if registro and os.path.getsize(ruta) == registro["tamano"]:
+                return registro["hash"]
+        except OSError:
+            pass
+        return None
+
+    # =================== OPERACIONES ===================
+
+    def guardar(self, origen: str, carpeta_destino: str, nombre: str = None, reemplazar: bool = False,
+                progreso: Callable[[int], None] = None, cancelado: Callable[[], bool] = None) -> str:
+        """
+        Guardar origen en carpeta_destino (dentro de la raíz) y devolver la ruta del archivo
+
+        Sin nombre, si la carpeta ya tiene un archivo con ese contenido se devuelve ese; con
+        nombre y reemplazar, el archivo de ese nombre pasa a tener el contenido de origen.
+        progreso recibe los bytes del archivo ya tratados y cancelado interrumpe la operación
+        (TransferenciaCancelada)
+
+        El hash de origen se calcula al copiarlo; solo se lee antes si hay un archivo o un
+        objeto del mismo tamaño con el que compararlo (entonces la lectura cuenta como la
+        primera mitad del progreso y la copia, si hace falta, como la segunda)
+        """
+        if not os.path.isfile(origen):
+            raise FileNotFoundError(f"Archivo origen no existe: {origen}")
+        os.makedirs(carpeta_destino, exist_ok=True)
+        if nombre is None and os.path.dirname(os.path.abspath(origen)) == os.path.abspath(carpeta_destino):
+            # Ya está en su carpeta (p. ej. PDFs existentes al editar una actuación)
+            return origen
+
+        tamano = os.path.getsize(origen)
+        hash_contenido, leido = None, False
+        if nombre is None:
+            if self._hay_mismo_tamano(carpeta_destino, tamano):
+                hash_contenido, leido = self._hash_origen(origen, progreso, cancelado)
+                existente = self._buscar_contenido(carpeta_destino, hash_contenido, tamano, cancelado)
+                if existente:
+                    if self._modificado:
+                        self._guardar_manifiesto()  # archivos anteriores registrados al buscar
+                    return existente
+            ruta = self._nombre_libre(carpeta_destino, os.path.basename(origen))
+        else:
+            ruta = os.path.join(carpeta_destino, nombre)
+            if os.path.exists(ruta):
+                if self.hash_de(ruta) and os.path.getsize(ruta) == tamano:
+                    hash_contenido, leido = self._hash_origen(origen, progreso, cancelado)
+                    if self.hash_de(ruta) == hash_contenido:
+                        return ruta
+                if not reemplazar:
+                    ruta = self._nombre_libre(carpeta_destino, nombre)
+        if hash_contenido is None and any(o["tamano"] == tamano for o in self.objetos.values()):
+            hash_contenido, leido = self._hash_origen(origen, progreso, cancelado)
+
+        # El archivo anterior se sustituye después de copiar: si se cancela sigue en su sitio
+        ruta_temporal = ruta + ".tmp"
+        existente = self._archivo_objeto(hash_contenido) if hash_contenido else None
+        if existente:
+            try:
+                self._enlazar(existente, ruta_temporal)
+            except BaseException:
+                if os.path.exists(ruta_temporal):
+                    os.remove(ruta_temporal)
+                raise
+        else:
+            progreso_copia = _escalar_progreso(progreso, tamano // 2, 0.5) if leido else progreso
+            hash_contenido = copiar_por_bloques(origen, ruta_temporal, hash_contenido,
+                                                progreso_copia, cancelado)
+        if os.path.exists(ruta):
+            self._quitar(ruta)
+        os.replace(ruta_temporal, ruta)
+        _recordar_hash(ruta, hash_contenido)
+        self.nombres[self._relativa(ruta)] = {"hash": hash_contenido, "tamano": tamano}
+        if hash_contenido not in self.objetos:
+            self._registrar_objeto(hash_contenido, ruta)
+        self._guardar_manifiesto()
+        return ruta
+
+    def eliminar(self, ruta: str) -> bool:
+        """Borrar el archivo (y su objeto si ningún otro nombre lo usa); False si no existía"""
+        existia = os.path.exists(ruta)
+        self._quitar(ruta)
+        self._guardar_manifiesto()
+        return existia
+
+    def _quitar(self, ruta: str):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        relativa = self._relativa(ruta)
+        registro = self.nombres.pop(relativa, None)
+        if not registro:
+            return
+        hash_contenido = registro["hash"]
+        otros = [r for r, datos in self.nombres.items() if datos["hash"] == hash_contenido]
+        objeto = self.objetos.get(hash_contenido)
+        if not otros:
+            ruta_objeto = self.ruta_objeto(hash_contenido)
+            if os.path.exists(ruta_objeto):
+                os.remove(ruta_objeto)
+                try:
+                    os.rmdir(os.path.dirname(ruta_objeto))  # solo si ha quedado vacía
+                except OSError:
+                    pass
+            self.objetos.pop(hash_contenido, None)
+        elif objeto and objeto.get("ruta") == relativa:
+            # Hacía de objeto (sin enlaces duros): pasa a hacerlo otra copia con ese contenido
+            del self.objetos[hash_contenido]
+            try:
+                self._registrar_objeto(hash_contenido, os.path.join(self.raiz, otros[0]), enlazar=False)
+            except OSError as e:
+                logger.warning(f"No se pudo usar {otros[0]} como objeto PDF: {e}")
+
+    def _archivo_objeto(self, hash_contenido: str) -> Optional[str]:
+        """Archivo con ese contenido del que enlazar o copiar (objeto o archivo visible), o None"""
+        registro = self.objetos.get(hash_contenido)
+        if not registro:
+            return None
+        if registro.get("ruta"):
+            archivo = os.path.join(self.raiz, registro["ruta"])
+        else:
+            archivo = self.ruta_objeto(hash_contenido)
+        try:
+            stat = os.stat(archivo)
+            if (stat.st_size, stat.st_mtime_ns) == (registro["tamano"], registro["mtime_ns"]):
+                return archivo
+            # Un nombre enlazado se editó en el sitio y con él el objeto: esos nombres ya no
+            # tienen este contenido (se volverán a calcular) y el objeto se repone desde origen
+            logger.warning(f"Objeto PDF modificado fuera del almacén: {hash_contenido[:12]}")
+            for relativa in [r for r, datos in self.nombres.items() if datos["hash"] == hash_contenido]:
+                del self.nombres[relativa]
+        except FileNotFoundError:
+            pass
+        del self.objetos[hash_contenido]
+        self._modificado = True
+        return None
+
+    def _registrar_objeto(self, hash_contenido: str, ruta: str, enlazar: bool = True):
+        """Crear el objeto como enlace duro de ruta o, si no se puede, usar ruta como objeto"""
+        objeto = self.ruta_objeto(hash_contenido)
+        archivo = ruta
+        if enlazar:
+            try:
+                os.makedirs(os.path.dirname(objeto), exist_ok=True)
+                if os.path.exists(objeto):
+                    os.remove(objeto)  # objeto modificado fuera del almacén
+                os.link(ruta, objeto)
+                archivo = objeto
+            except OSError:
+                try:
+                    os.rmdir(os.path.dirname(objeto))
+                except OSError:
+                    pass
+        stat = os.stat(archivo)
+        self.objetos[hash_contenido] = {"tamano": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if archivo == ruta:
+            self.objetos[hash_contenido]["ruta"] = self._relativa(ruta)
+
+    def _hash_origen(self, origen: str, progreso, cancelado) -> Tuple[str, bool]:
+        """Hash de origen y si hubo que leerlo (su lectura es la primera mitad del progreso)"""
+        conocido = hash_conocido(origen)
+        if conocido:
+            return conocido, False
+        return hash_archivo(origen, _escalar_progreso(progreso, 0, 0.5), cancelado), True
+
+    @staticmethod
+    def _hay_mismo_tamano(carpeta: str, tamano: int) -> bool:
+        with os.scandir(carpeta) as entradas:
+            return any(entrada.is_file() and not entrada.name.endswith(".tmp")
+                       and entrada.stat().st_size == tamano for entrada in entradas)
+
+    def _buscar_contenido(self, carpeta: str, hash_contenido: str, tamano: int,
+                          cancelado: Callable[[], bool] = None) -> Optional[str]:
+        """Archivo de la carpeta con ese contenido (solo se leen los que tienen el mismo tamaño)"""
+        with os.scandir(carpeta) as entradas:
+            for entrada in entradas:
+                if not entrada.is_file() or entrada.name.endswith(".tmp") or entrada.stat().st_size != tamano:
+                    continue
+                relativa = self._relativa(entrada.path)
+                registro = self.nombres.get(relativa)
+                if registro is None or registro["tamano"] != tamano:
+                    # Archivo anterior al almacén (o sustituido a mano): se registra con su hash
+                    registro = {"hash": hash_archivo(entrada.path, cancelado=cancelado), "tamano": tamano}
+                    self.nombres[relativa] = registro
+                    self._modificado = True
+                if registro["hash"] == hash_contenido:
+                    return entrada.path
+        return None
+
+    def _nombre_libre(self, carpeta: str, nombre: str) -> str:
+        base, extension = os.path.splitext(nombre)
+        ruta = os.path.join(carpeta, nombre)
+        contador = 1
+        while os.path.exists(ruta):
+            ruta = os.path.join(carpeta, f"{base}_{contador}{extension}")
+            contador += 1
+        return ruta
+
+    def _enlazar(self, objeto: str, ruta: str):
+        try:
+            os.link(objeto, ruta)
+        except OSError:
+            # Sin enlaces duros: copia local desde el archivo que hace de objeto
+            shutil.copy2(objeto, ruta)
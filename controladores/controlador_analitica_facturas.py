@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+controlador_analitica_facturas.py - Acumulados de facturación por periodo
+- Número de facturas e importe por mes, trimestre y año (y en total), desglosados
+  por categoría, localidad, empresa y estado
+- Se construyen una vez y después se actualizan factura a factura (sumar/restar),
+  de modo que los informes leen los acumulados sin recorrer todas las facturas
+- El periodo de una factura es el de su fecha de validación; las que no tienen una
+  válida se acumulan en "Sin fecha"
+"""
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Periodos acumulados ('total' es todo el histórico, con clave '')
+PERIODOS = ('total', 'mes', 'trimestre', 'anio')
+# Columnas por las que se desglosan los acumulados
+DIMENSIONES = ('categoria', 'localidad', 'empresa', 'estado')
+# Clave de periodo de las facturas sin fecha de validación válida
+SIN_FECHA = 'Sin fecha'
+
+
+@lru_cache(maxsize=4096)
+def claves_periodo(fecha: Optional[str]) -> Tuple[str, str, str, str]:
+    """Claves (total, mes, trimestre, año) de una fecha 'YYYY-MM-DD': ('', '2024-03', '2024-T1', '2024')"""
+    try:
+        fecha_validada = datetime.strptime(fecha, "%Y-%m-%d")
+    except (ValueError, TypeError):
+        return ('', SIN_FECHA, SIN_FECHA, SIN_FECHA)
+    anio = f"{fecha_validada.year:04d}"
+    return ('', f"{anio}-{fecha_validada.month:02d}", f"{anio}-T{(fecha_validada.month - 1) // 3 + 1}", anio)
+
+
+def _a_float(valor) -> float:
+    try:
+        return float(valor or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class AnaliticaFacturas:
+    """Acumulados (número, importe) de las facturas activas por periodo y dimensión"""
+
+    def __init__(self, facturas: Iterable[Dict] = ()):
+        # periodo -> clave de periodo -> [número, importe]
+        self._series: Dict[str, Dict[str, list]] = {periodo: {} for periodo in PERIODOS}
+        # periodo -> dimensión -> clave de periodo -> valor -> [número, importe]
+        self._acumulados: Dict[str, Dict[str, Dict[str, Dict[str, list]]]] = {
+            periodo: {dimension: {} for dimension in DIMENSIONES} for periodo in PERIODOS
+        }
+        # Carga inicial: se agrupa por fecha (y por fecha y valor de cada dimensión) y
+        # cada grupo se reparte después entre sus periodos
+        por_fecha: Dict[Optional[str], list] = {}
+        por_valor: Dict[str, Dict[tuple, list]] = {dimension: {} for dimension in DIMENSIONES}
+        for factura in facturas:
+            if not factura.get('activa', True):
+                continue
+            fecha = self._fecha(factura)
+            importe = _a_float(factura.get('importe'))
+            self._sumar_celda(por_fecha, fecha, 1, importe)
+            for dimension in DIMENSIONES:
+                self._sumar_celda(por_valor[dimension], (fecha, str(factura.get(dimension) or '')), 1, importe)
+        for fecha, (numero, importe) in por_fecha.items():
+            self._acumular_serie(fecha, numero, importe)
+        for dimension, grupos in por_valor.items():
+            for (fecha, valor), (numero, importe) in grupos.items():
+                self._acumular_valor(fecha, dimension, valor, numero, importe)
+
+    # =================== ACTUALIZACIÓN ===================
+
+    @staticmethod
+    def _fecha(factura: Dict) -> Optional[str]:
+        fecha = factura.get('fecha_validacion')
+        return fecha if isinstance(fecha, str) else None
+
+    def _acumular_serie(self, fecha: Optional[str], numero: int, importe: float):
+        for periodo, clave in zip(PERIODOS, claves_periodo(fecha)):
+            self._sumar_celda(self._series[periodo], clave, numero, importe)
+
+    def _acumular_valor(self, fecha: Optional[str], dimension: str, valor: str, numero: int, importe: float):
+        for periodo, clave in zip(PERIODOS, claves_periodo(fecha)):
+            acumulados = self._acumulados[periodo][dimension]
+            self._sumar_celda(acumulados.setdefault(clave, {}), valor, numero, importe)
+            if not acumulados[clave]:
+                del acumulados[clave]
+
+    def _acumular_factura(self, factura: Optional[Dict], signo: int):
+        """Sumar (signo 1) o restar (signo -1) una factura en todas sus celdas"""
+        if not factura or not factura.get('activa', True):
+            return
+        fecha = self._fecha(factura)
+        importe = signo * _a_float(factura.get('importe'))
+        self._acumular_serie(fecha, signo, importe)
+        for dimension in DIMENSIONES:
+            self._acumular_valor(fecha, dimension, str(factura.get(dimension) or ''), signo, importe)
+
+    @staticmethod
+    def _sumar_celda(celdas: Dict, clave, numero: int, importe: float):
+        celda = celdas.get(clave)
+        if celda is None:
+            celda = celdas[clave] = [0, 0.0]
+        celda[0] += numero
+        celda[1] += importe
+        if celda[0] <= 0:
+            # Sin facturas no queda importe (evita arrastrar restos de redondeo)
+            del celdas[clave]
+
+    def sumar(self, factura: Dict):
+        """Añadir una factura a los acumulados (las inactivas no cuentan)"""
+        self._acumular_factura(factura, 1)
+
+    def restar(self, factura: Dict):
+        """Quitar de los acumulados una factura sumada antes"""
+        self._acumular_factura(factura, -1)
+
+    def reemplazar(self, anterior: Optional[Dict], nueva: Optional[Dict]):
+        """La factura ha cambiado (alta: anterior None; baja: nueva inactiva o None)"""
+        self.restar(anterior)
+        self.sumar(nueva)
+
+    # =================== CONSULTAS ===================
+
+    def total(self) -> Tuple[int, float]:
+        """(número de facturas, importe total) de todas las facturas activas"""
+        numero, importe = self._series['total'].get('', (0, 0.0))
+        return numero, importe
+
+    def serie(self, periodo: str, dimension: str = None, valor: str = None) -> Dict[str, Tuple[int, float]]:
+        """
+        Número e importe por clave de periodo, en orden cronológico ("Sin fecha" al final)
+
+        Con dimension y valor, solo las facturas con ese valor (p. ej. serie('mes', 'estado', 'Pagada'))
+        """
+        if dimension is None:
+            celdas = self._series[periodo].items()
+        else:
+            celdas = ((clave, valores[valor]) for clave, valores in self._acumulados[periodo][dimension].items()
+                      if valor in valores)
+        return {clave: (celda[0], celda[1])
+                for clave, celda in sorted(celdas, key=lambda item: (item[0] == SIN_FECHA, item[0]))}
+
+    def totales_por(self, dimension: str, periodo: str = 'total', clave: str = '') -> Dict[str, Tuple[int, float]]:
+        """Número e importe por valor de la dimensión en un periodo (por defecto, todo el histórico)"""
+        valores = self._acumulados[periodo][dimension].get(clave, {})
+        return {valor: (celda[0], celda[1]) for valor, celda in valores.items()}
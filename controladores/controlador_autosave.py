@@ -55,16 +55,15 @@ class ControladorAutoGuardado:
     def configurar_auto_guardado_campos(self):
         """Configurar auto-guardado para campos editables en pérdida de foco"""
         try:
-            tipos_soportados = (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QDateEdit, 
-                              QtWidgets.QTimeEdit, QtWidgets.QDoubleSpinBox, QtWidgets.QSpinBox, QtWidgets.QComboBox)
-            
-            widgets = self.main_window.findChildren(tipos_soportados)
-
-            for widget in widgets:
-                nombre = widget.objectName()
-                if not nombre or nombre.startswith('qt_'):
-                    continue
+            if hasattr(self.main_window, 'registro_campos'):
+                campos = [(campo.widget, campo.nombre) for campo in self.main_window.registro_campos.campos()]
+            else:
+                tipos_soportados = (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QDateEdit, 
+                                  QtWidgets.QTimeEdit, QtWidgets.QDoubleSpinBox, QtWidgets.QSpinBox, QtWidgets.QComboBox)
+                campos = [(widget, widget.objectName()) for widget in self.main_window.findChildren(tipos_soportados)
+                          if widget.objectName() and not widget.objectName().startswith('qt_')]
 
+            for widget, nombre in campos:
                 if isinstance(widget, QtWidgets.QLineEdit):
                     self._configurar_lineedit_con_focusout(widget, nombre)
                 elif isinstance(widget, QtWidgets.QTextEdit):
@@ -256,27 +255,8 @@ class ControladorAutoGuardado:
 
     def _extraer_valor_widget(self, widget) -> Optional[str]:
         """Extraer valor de un widget según su tipo"""
-        try:
-            if isinstance(widget, QtWidgets.QLineEdit):
-                return widget.text().strip()
-            elif isinstance(widget, QtWidgets.QTextEdit):
-                return widget.toPlainText().strip()
-            elif isinstance(widget, QtWidgets.QDateEdit):
-                return widget.date().toString("yyyy-MM-dd")
-            elif isinstance(widget, QtWidgets.QTimeEdit):
-                return widget.time().toString("HH:mm")
-            
-            elif isinstance(widget, QtWidgets.QSpinBox):
-                return str(int(widget.value()))  # ENTERO para QSpinBox
-            elif isinstance(widget, QtWidgets.QDoubleSpinBox):
-                return str(widget.value())  # DECIMAL para QDoubleSpinBox
-                
-            elif isinstance(widget, QtWidgets.QComboBox):
-                return widget.currentText().strip()
-            else:
-                return None
-        except Exception:
-            return None
+        from .controlador_vinculos_campos import extraer_valor
+        return extraer_valor(widget)
 
     def _extraer_datos_tabla_empresas(self) -> list:
         """NUEVA: Extraer datos unificados de ambas tablas"""
@@ -420,12 +400,18 @@ class ControladorAutoGuardado:
             return False
 
     def _actualizar_campos_desde_json(self, contract_data):
-        """Actualizar campos desde JSON"""
-        tipos_soportados = (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QDateEdit, 
-                          QtWidgets.QTimeEdit, QtWidgets.QDoubleSpinBox, QtWidgets.QSpinBox, QtWidgets.QComboBox)
-        
-        widgets = self.main_window.findChildren(tipos_soportados)
-        
+        """Actualizar campos desde JSON (las pestañas pendientes se actualizan al rellenarse)"""
+        if hasattr(self.main_window, 'widgets_campos_cargados'):
+            widgets = self.main_window.widgets_campos_cargados()
+            self.main_window.pestanas_diferidas.actualizar_datos(contract_data)
+        else:
+            tipos_soportados = (QtWidgets.QLineEdit, QtWidgets.QTextEdit, QtWidgets.QDateEdit, 
+                              QtWidgets.QTimeEdit, QtWidgets.QDoubleSpinBox, QtWidgets.QSpinBox, QtWidgets.QComboBox)
+            widgets = self.main_window.findChildren(tipos_soportados)
+        self.actualizar_campos(widgets, contract_data)
+
+    def actualizar_campos(self, widgets, contract_data):
+        """Establecer en los campos indicados los valores no vacíos del contrato"""
         for widget in widgets:
             nombre = widget.objectName()
             if not nombre or nombre.startswith('qt_'):
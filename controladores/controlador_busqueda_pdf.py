@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_busqueda_pdf.py - Búsqueda de texto en los PDFs de las obras
+- Extrae el texto de cada página con PyMuPDF en segundo plano
+- Índice invertido por carpeta de contrato, guardado en disco (.indice_texto.json)
+- Solo se vuelven a extraer los PDFs nuevos o modificados (tamaño/mtime)
+- Búsqueda en un contrato o en todas las obras indexadas
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_INDICE_TEXTO = ".indice_texto.json"
+
+# Caracteres de contexto a cada lado del texto encontrado
+CONTEXTO_FRAGMENTO = 60
+
+# Palabras o importes ("12.345,67") como términos del índice
+_PATRON_TERMINO = re.compile(r"\d+(?:[.,]\d+)*|[^\W\d_]+")
+
+# Quitar acentos sin cambiar la longitud del texto (los fragmentos usan las mismas posiciones)
+_TABLA_ACENTOS = str.maketrans("áàäâéèëêíìïîóòöôúùüûç", "aaaaeeeeiiiioooouuuuc")
+
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas y sin acentos, con la misma longitud que el original"""
+    return texto.lower().translate(_TABLA_ACENTOS)
+
+
+def tokenizar(texto: str) -> List[str]:
+    return _PATRON_TERMINO.findall(normalizar_texto(texto))
+
+
+def extraer_texto_paginas(ruta_pdf: str) -> List[str]:
+    """Texto de cada página del PDF (espacios colapsados)"""
+    import fitz  # PyMuPDF, carga diferida
+
+    with fitz.open(ruta_pdf) as documento:
+        return [" ".join(pagina.get_text().split()) for pagina in documento]
+
+
+def carpeta_contrato_de(ruta_pdf: str, ruta_obras: str) -> Optional[str]:
+    """Carpeta del contrato al que pertenece un PDF, o None si está fuera de obras"""
+    ruta_pdf = os.path.abspath(ruta_pdf)
+    ruta_obras = os.path.abspath(ruta_obras)
+    try:
+        relativa = os.path.relpath(ruta_pdf, ruta_obras)
+    except ValueError:
+        return None  # Otra unidad en Windows
+    partes = relativa.split(os.sep)
+    if partes[0] == os.pardir or len(partes) < 2:
+        return None
+    return os.path.join(ruta_obras, partes[0])
+
+
+class IndiceTextoPDF:
+    """Índice invertido del texto de los PDFs de una carpeta de contrato"""
+
+    VERSION = 1
+
+    def __init__(self, carpeta_contrato: str):
+        self.carpeta_contrato = carpeta_contrato
+        self.archivo_indice = os.path.join(carpeta_contrato, ARCHIVO_INDICE_TEXTO)
+        self.archivos: Dict[str, dict] = {}            # ruta relativa -> {tamano, mtime, paginas}
+        self.terminos: Dict[str, Dict[str, List[int]]] = {}  # término -> {ruta relativa: [páginas]}
+        self._modificado = False
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo_indice):
+                with open(self.archivo_indice, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self.archivos = data.get('archivos', {})
+                    self.terminos = data.get('terminos', {})
+                else:
+                    logger.info("Versión de índice de texto distinta, se descarta")
+        except Exception as e:
+            logger.error(f"Error cargando índice de texto de {self.carpeta_contrato}: {e}")
+            self.archivos, self.terminos = {}, {}
+        self._modificado = False
+
+    def guardar(self) -> bool:
+        """Persiste el índice si ha cambiado (escritura atómica)"""
+        if not self._modificado:
+            return True
+        try:
+            ruta_temporal = self.archivo_indice + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'archivos': self.archivos, 'terminos': self.terminos},
+                          f, ensure_ascii=False)
+            os.replace(ruta_temporal, self.archivo_indice)
+            self._modificado = False
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando índice de texto de {self.carpeta_contrato}: {e}")
+            return False
+
+    # =================== INDEXADO INCREMENTAL ===================
+
+    def pdfs_en_carpeta(self) -> List[str]:
+        """Rutas relativas de los PDFs del contrato (sin carpetas ocultas)"""
+        pdfs = []
+        for raiz, carpetas, archivos in os.walk(self.carpeta_contrato):
+            carpetas[:] = [c for c in carpetas if not c.startswith('.')]
+            for nombre in archivos:
+                if nombre.lower().endswith('.pdf') and not nombre.startswith('~$'):
+                    pdfs.append(os.path.relpath(os.path.join(raiz, nombre), self.carpeta_contrato))
+        return sorted(pdfs)
+
+    def actualizar(self, extractor: Callable[[str], List[str]] = None,
+                   cancelado: Callable[[], bool] = None) -> int:
+        """
+        Extrae el texto de los PDFs nuevos o modificados y quita los borrados
+
+        Returns:
+            Número de PDFs añadidos, reindexados o eliminados
+        """
+        extractor = extractor or extraer_texto_paginas
+        pdfs = self.pdfs_en_carpeta()
+        cambios = 0
+
+        for relativa in set(self.archivos) - set(pdfs):
+            self._quitar(relativa)
+            cambios += 1
+
+        for relativa in pdfs:
+            if cancelado and cancelado():
+                break
+            ruta = os.path.join(self.carpeta_contrato, relativa)
+            try:
+                stat = os.stat(ruta)
+            except OSError:
+                continue
+            entrada = self.archivos.get(relativa)
+            if entrada and entrada['tamano'] == stat.st_size and entrada['mtime'] == stat.st_mtime_ns:
+                continue
+            try:
+                paginas = extractor(ruta)
+            except Exception as e:
+                # Bloqueado o a medio copiar: no se registra, el siguiente recorrido lo reintenta
+                logger.warning(f"No se pudo extraer texto de {ruta}: {e}")
+                continue
+            self._quitar(relativa)
+            self._agregar(relativa, stat, paginas)
+            cambios += 1
+
+        return cambios
+
+    def _agregar(self, relativa: str, stat, paginas: List[str]):
+        self.archivos[relativa] = {'tamano': stat.st_size, 'mtime': stat.st_mtime_ns, 'paginas': paginas}
+        for numero_pagina, texto in enumerate(paginas):
+            for termino in set(tokenizar(texto)):
+                self.terminos.setdefault(termino, {}).setdefault(relativa, []).append(numero_pagina)
+        self._modificado = True
+
+    def _quitar(self, relativa: str):
+        if self.archivos.pop(relativa, None) is None:
+            return
+        for termino in list(self.terminos):
+            apariciones = self.terminos[termino]
+            if apariciones.pop(relativa, None) is not None and not apariciones:
+                del self.terminos[termino]
+        self._modificado = True
+
+    # =================== BÚSQUEDA ===================
+
+    def _paginas_con_termino(self, termino: str, prefijo: bool) -> Dict[str, set]:
+        if not prefijo:
+            return {ruta: set(paginas) for ruta, paginas in self.terminos.get(termino, {}).items()}
+        paginas_por_ruta: Dict[str, set] = {}
+        for candidato, apariciones in self.terminos.items():
+            if candidato.startswith(termino):
+                for ruta, paginas in apariciones.items():
+                    paginas_por_ruta.setdefault(ruta, set()).update(paginas)
+        return paginas_por_ruta
+
+    def buscar(self, consulta: str, ruta_pdf: str = None, limite: int = 500) -> List[dict]:
+        """
+        Páginas que contienen la consulta como frase (sin distinguir mayúsculas ni acentos).
+        La última palabra puede estar incompleta, para buscar mientras se escribe.
+
+        Args:
+            ruta_pdf: Limitar la búsqueda a un PDF del contrato
+
+        Returns:
+            Lista de {'archivo', 'ruta', 'pagina', 'fragmento'} ordenada por archivo y página
+        """
+        terminos = tokenizar(consulta)
+        frase = " ".join(normalizar_texto(consulta).split())
+        if not terminos or not frase:
+            return []
+
+        solo = os.path.relpath(os.path.abspath(ruta_pdf), self.carpeta_contrato) if ruta_pdf else None
+
+        # Candidatas: páginas con todos los términos; después se comprueba la frase
+        candidatas = None
+        for posicion, termino in enumerate(terminos):
+            encontradas = self._paginas_con_termino(termino, prefijo=posicion == len(terminos) - 1)
+            if candidatas is None:
+                candidatas = encontradas
+            else:
+                candidatas = {ruta: paginas & encontradas[ruta]
+                              for ruta, paginas in candidatas.items() if ruta in encontradas}
+            if not candidatas:
+                return []
+
+        resultados = []
+        for relativa in sorted(candidatas):
+            if solo is not None and relativa != solo:
+                continue
+            textos = self.archivos.get(relativa, {}).get('paginas', [])
+            for numero_pagina in sorted(candidatas[relativa]):
+                texto = textos[numero_pagina] if numero_pagina < len(textos) else ""
+                posicion = normalizar_texto(texto).find(frase)
+                if posicion < 0:
+                    continue
+                inicio = max(0, posicion - CONTEXTO_FRAGMENTO)
+                fin = min(len(texto), posicion + len(frase) + CONTEXTO_FRAGMENTO)
+                resultados.append({
+                    'archivo': relativa,
+                    'ruta': os.path.join(self.carpeta_contrato, relativa),
+                    'pagina': numero_pagina,
+                    'fragmento': ("…" if inicio else "") + texto[inicio:fin] + ("…" if fin < len(texto) else "")
+                })
+                if len(resultados) >= limite:
+                    return resultados
+        return resultados
+
+
+def carpetas_contrato(ruta_obras: str = None) -> List[str]:
+    """Carpetas de todas las obras"""
+    if not ruta_obras:
+        from .controlador_routes import rutas
+        ruta_obras = rutas.get_ruta_carpeta_obras()
+    if not os.path.isdir(ruta_obras):
+        return []
+    return [os.path.join(ruta_obras, nombre) for nombre in sorted(os.listdir(ruta_obras))
+            if os.path.isdir(os.path.join(ruta_obras, nombre))]
+
+
+def cargar_indices_obras(ruta_obras: str = None) -> List[IndiceTextoPDF]:
+    """Índices ya guardados de todas las obras (no indexa nada)"""
+    return [IndiceTextoPDF(carpeta) for carpeta in carpetas_contrato(ruta_obras)
+            if os.path.exists(os.path.join(carpeta, ARCHIVO_INDICE_TEXTO))]
+
+
+def buscar_en_indices(indices: List[IndiceTextoPDF], consulta: str, limite: int = 500) -> List[dict]:
+    """Búsqueda en varios contratos; cada resultado indica además su 'obra'"""
+    resultados = []
+    for indice in indices:
+        for resultado in indice.buscar(consulta, limite=limite - len(resultados)):
+            resultado['obra'] = os.path.basename(indice.carpeta_contrato)
+            resultados.append(resultado)
+        if len(resultados) >= limite:
+            break
+    return resultados
+
+
+class IndexadorTextoPDF(QThread):
+    """Actualiza en segundo plano el índice de texto de una o varias carpetas de contrato"""
+
+    carpeta_indexada = pyqtSignal(str, object)
+    finalizado = pyqtSignal()
+
+    def __init__(self, carpetas: List[str] = None, parent=None):
+        """
+        Args:
+            carpetas: Carpetas de contrato a indexar (por defecto, todas las obras)
+        """
+        super().__init__(parent)
+        self.carpetas = carpetas
+        self._cancelado = False
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def run(self):
+        try:
+            carpetas = self.carpetas if self.carpetas is not None else carpetas_contrato()
+            for carpeta in carpetas:
+                if self._cancelado:
+                    break
+                try:
+                    indice = IndiceTextoPDF(carpeta)
+                    cambios = indice.actualizar(cancelado=lambda: self._cancelado)
+                    indice.guardar()
+                    if cambios:
+                        logger.info(f"Índice de texto de {os.path.basename(carpeta)}: {cambios} PDFs actualizados")
+                    self.carpeta_indexada.emit(carpeta, indice)
+                except Exception as e:
+                    logger.error(f"Error indexando texto de {carpeta}: {e}")
+        finally:
+            self.finalizado.emit()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Cache persistente de firmas digitales extraídas de PDFs
+Evita volver a parsear con PyPDF2 los PDFs firmados que no han cambiado
+- Una sola instancia por aplicación (obtener_cache_firmas), usada solo desde el hilo de la GUI
+- Los hilos en segundo plano consultan una instantánea de las entradas y devuelven lo que
+  extraen por señales; el registro y el guardado los hace el hilo de la GUI
+"""
+import os
+import json
+import hashlib
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheFirmas:
+    """Cache en disco de firmas por PDF, indexada por (ruta, tamaño, mtime)"""
+
+    VERSION = 1
+
+    def __init__(self, archivo_cache: str = None, usar_hash: bool = False):
+        """
+        Args:
+            archivo_cache: Ruta del JSON de cache (por defecto junto al historial de documentos)
+            usar_hash: Si True, cuando cambian tamaño/mtime se compara también el SHA-256
+                       del contenido para reaprovechar PDFs copiados o tocados sin cambios
+        """
+        if archivo_cache:
+            self.archivo_cache = archivo_cache
+        else:
+            from .controlador_routes import rutas
+            self.archivo_cache = rutas.get_ruta_cache_firmas()
+        self.usar_hash = usar_hash
+        self.entradas: Dict[str, dict] = {}
+        self._modificado = False
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo_cache):
+                with open(self.archivo_cache, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self.entradas = data.get('entradas', {})
+                else:
+                    logger.info("Versión de cache de firmas distinta, se descarta")
+                    self.entradas = {}
+            else:
+                self.entradas = {}
+        except Exception as e:
+            logger.error(f"Error cargando cache de firmas: {e}")
+            self.entradas = {}
+        self._modificado = False
+
+    def guardar(self) -> bool:
+        """Persiste la cache si ha cambiado (escritura atómica)"""
+        if not self._modificado:
+            return True
+        try:
+            directorio = os.path.dirname(self.archivo_cache)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+
+            ruta_temporal = self.archivo_cache + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'entradas': self.entradas}, f, ensure_ascii=False)
+            os.replace(ruta_temporal, self.archivo_cache)
+
+            self._modificado = False
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando cache de firmas: {e}")
+            return False
+
+    def obtener_firmas(self, ruta_pdf: str, extractor: Callable[[str], List[dict]]) -> List[dict]:
+        """
+        Devuelve las firmas del PDF desde la cache, o las extrae con `extractor`
+        si el archivo es nuevo o ha cambiado
+
+        Si `extractor` lanza una excepción (PDF bloqueado o a medio escribir) se propaga
+        sin registrar nada, para que el siguiente escaneo lo vuelva a intentar
+        """
+        firmas = self.consultar(ruta_pdf)
+        if firmas is not None:
+            return firmas
+        if not os.path.exists(ruta_pdf):
+            return []
+
+        firmas = extractor(ruta_pdf) or []
+        self.registrar(ruta_pdf, firmas)
+        return [dict(firma) for firma in firmas]
+
+    def consultar(self, ruta_pdf: str) -> Optional[List[dict]]:
+        """Firmas cacheadas del PDF, o None si no hay entrada válida"""
+        clave = self._clave(ruta_pdf)
+        try:
+            stat = os.stat(ruta_pdf)
+        except OSError:
+            self.invalidar(ruta_pdf)
+            return None
+
+        entrada = self.entradas.get(clave)
+        if not entrada:
+            return None
+        if _coincide(entrada, stat):
+            return [dict(firma) for firma in entrada['firmas']]
+
+        # Tamaño/mtime distintos: con hash activado, el contenido puede seguir siendo el mismo
+        if self.usar_hash and entrada.get('hash'):
+            if self._calcular_hash(ruta_pdf) == entrada['hash']:
+                entrada['tamano'] = stat.st_size
+                entrada['mtime'] = stat.st_mtime_ns
+                self._modificado = True
+                return [dict(firma) for firma in entrada['firmas']]
+        return None
+
+    def registrar(self, ruta_pdf: str, firmas: List[dict]):
+        """Guarda en cache las firmas recién extraídas de un PDF"""
+        try:
+            stat = os.stat(ruta_pdf)
+        except OSError:
+            self.invalidar(ruta_pdf)
+            return
+
+        self.entradas[self._clave(ruta_pdf)] = {
+            'tamano': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': self._calcular_hash(ruta_pdf) if self.usar_hash else None,
+            'firmas': [dict(firma) for firma in firmas or []]
+        }
+        self._modificado = True
+
+    def instantanea(self) -> Dict[str, dict]:
+        """Copia de las entradas para consultarlas desde otro hilo (firmas_en_instantanea)"""
+        return {clave: dict(entrada) for clave, entrada in self.entradas.items()}
+
+    def invalidar(self, ruta_pdf: str = None):
+        """Elimina la entrada de un PDF, o toda la cache si no se indica ruta"""
+        if ruta_pdf is None:
+            if self.entradas:
+                self.entradas = {}
+                self._modificado = True
+            return
+        if self.entradas.pop(self._clave(ruta_pdf), None) is not None:
+            self._modificado = True
+
+    def purgar_inexistentes(self) -> int:
+        """Elimina entradas de PDFs que ya no existen en disco"""
+        eliminadas = [clave for clave in self.entradas if not os.path.exists(clave)]
+        for clave in eliminadas:
+            del self.entradas[clave]
+        if eliminadas:
+            self._modificado = True
+        return len(eliminadas)
+
+    def _clave(self, ruta_pdf: str) -> str:
+        return _clave(ruta_pdf)
+
+    def _calcular_hash(self, ruta_pdf: str) -> Optional[str]:
+        try:
+            sha = hashlib.sha256()
+            with open(ruta_pdf, 'rb') as f:
+                for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(bloque)
+            return sha.hexdigest()
+        except OSError as e:
+            logger.warning(f"No se pudo calcular hash de {ruta_pdf}: {e}")
+            return None
+
+
+def _clave(ruta_pdf: str) -> str:
+    return os.path.normcase(os.path.abspath(ruta_pdf))
+
+
+def _coincide(entrada: dict, stat: os.stat_result) -> bool:
+    return entrada['tamano'] == stat.st_size and entrada['mtime'] == stat.st_mtime_ns
+
+
+def firmas_en_instantanea(entradas: Dict[str, dict], ruta_pdf: str) -> Optional[List[dict]]:
+    """Firmas del PDF según una instantánea de la cache (sin hash), o None si no vale"""
+    entrada = entradas.get(_clave(ruta_pdf))
+    try:
+        if entrada and _coincide(entrada, os.stat(ruta_pdf)):
+            return [dict(firma) for firma in entrada['firmas']]
+    except OSError:
+        pass
+    return None
+
+
+_cache_firmas = None  # CacheFirmas compartida (se crea al pedirla)
+
+
+def obtener_cache_firmas() -> CacheFirmas:
+    """Cache de firmas compartida por toda la aplicación (solo desde el hilo de la GUI)"""
+    global _cache_firmas
+    if _cache_firmas is None:
+        _cache_firmas = CacheFirmas()
+    return _cache_firmas
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+controlador_columnas_facturas.py - Facturas en columnas para filtrar y totalizar sin recorrerlas
+- Se construye una vez por lista de facturas: fechas de validación ya parseadas,
+  textos en minúsculas y cada columna codificada por sus valores distintos
+- Una selección de filas es una máscara: un entero con un byte por fila (0/1),
+  de modo que combinar filtros es un & entre enteros (en C, sin bucles Python)
+- Las filas mantienen el orden de la lista; un índice aparte ordenado por fecha de
+  validación resuelve un rango de fechas con búsqueda binaria
+"""
+
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import date, datetime
+from itertools import compress, repeat
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Columnas que se filtran por valor exacto y se pueden totalizar
+COLUMNAS_CATEGORICAS = ('estado', 'categoria', 'localidad')
+# Columnas que se filtran por texto contenido (sin distinguir mayúsculas)
+COLUMNAS_TEXTO = ('empresa', 'cif')
+
+
+def _ordinal_fecha(valor) -> Optional[int]:
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d").toordinal() if valor else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _a_float(valor) -> float:
+    try:
+        return float(valor or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class _Columna:
+    """Valores distintos de una columna y código de cada fila"""
+
+    __slots__ = ('valores', 'codigo_de', 'codigos', 'mascaras')
+
+    def __init__(self, valores_filas: Iterable[str]):
+        self.codigo_de: Dict[str, int] = {}
+        codigos = [self.codigo_de.setdefault(valor, len(self.codigo_de)) for valor in valores_filas]
+        self.valores: List[str] = list(self.codigo_de)
+        # Con hasta 256 valores distintos los códigos caben en bytes y una máscara es un translate
+        self.codigos = bytearray(codigos) if len(self.valores) <= 256 else array('I', codigos)
+        # Máscaras por código, creadas al usarlas por primera vez
+        self.mascaras: Dict[int, int] = {}
+
+    def mascara(self, codigos: Iterable[int]) -> int:
+        """Filas cuyo código está entre los indicados"""
+        compactos = isinstance(self.codigos, bytearray)
+        tabla = bytearray(256 if compactos else len(self.valores))
+        for codigo in codigos:
+            tabla[codigo] = 1
+        marcas = self.codigos.translate(tabla) if compactos else bytes(map(tabla.__getitem__, self.codigos))
+        return int.from_bytes(marcas, 'little')
+
+    def codigo_para(self, valor: str) -> int:
+        """Código del valor, dándolo de alta si es nuevo"""
+        codigo = self.codigo_de.get(valor)
+        if codigo is None:
+            codigo = self.codigo_de[valor] = len(self.valores)
+            self.valores.append(valor)
+            if len(self.valores) > 256 and isinstance(self.codigos, bytearray):
+                self.codigos = array('I', self.codigos)
+        return codigo
+
+
+class ColumnasFacturas:
+    """Índice columnar de una lista de facturas (cambiar_valor actualiza también la factura)"""
+
+    def __init__(self, facturas: Iterable[Dict]):
+        self.lista = list(facturas)
+        self.n = len(self.lista)
+        # Cada fecha distinta se parsea una sola vez
+        ordinales = {}
+        fechas = []
+        for factura in self.lista:
+            texto = factura.get('fecha_validacion')
+            clave = texto if isinstance(texto, str) else None
+            if clave not in ordinales:
+                ordinales[clave] = _ordinal_fecha(texto)
+            fechas.append(ordinales[clave])
+
+        # Filas con fecha válida ordenadas por fecha (las que no la tienen pasan siempre el filtro)
+        self.orden_fechas = array('I', sorted((i for i in range(self.n) if fechas[i] is not None),
+                                              key=fechas.__getitem__))
+        self.fechas = array('l', (fechas[i] for i in self.orden_fechas))
+
+        # Lista (no array): compress no tiene que crear un float por fila al sumar
+        self.importes = [_a_float(f.get('importe')) for f in self.lista]
+        self.posicion_id = {f.get('id'): posicion for posicion, f in enumerate(self.lista)}
+        self.columnas: Dict[str, _Columna] = {}
+        for columna in COLUMNAS_CATEGORICAS:
+            self.columnas[columna] = _Columna(str(f.get(columna) or '') for f in self.lista)
+        for columna in COLUMNAS_TEXTO:
+            self.columnas[columna] = _Columna(str(f.get(columna) or '').lower() for f in self.lista)
+
+        self.todas = int.from_bytes(b'\x01' * self.n, 'little')
+        self.sin_fecha = self._mascara_posiciones([array('I', (i for i in range(self.n) if fechas[i] is None))])
+
+    # =================== MÁSCARAS ===================
+
+    def _mascara_posiciones(self, grupos: Iterable[array]) -> int:
+        marcas = bytearray(self.n)
+        for posiciones in grupos:
+            # Asignación en C, sin bucle Python por fila
+            deque(map(marcas.__setitem__, posiciones, repeat(1)), maxlen=0)
+        return int.from_bytes(marcas, 'little')
+
+    def _mascara_valor(self, columna: str, valor: str) -> int:
+        datos = self.columnas[columna]
+        codigo = datos.codigo_de.get(valor)
+        if codigo is None:
+            return 0
+        if codigo not in datos.mascaras:
+            datos.mascaras[codigo] = datos.mascara([codigo])
+        return datos.mascaras[codigo]
+
+    def _mascara_texto(self, columna: str, texto: str) -> int:
+        datos = self.columnas[columna]
+        codigos = [codigo for codigo, valor in enumerate(datos.valores) if texto in valor]
+        if len(codigos) == 1:
+            return self._mascara_valor(columna, datos.valores[codigos[0]])
+        return datos.mascara(codigos)
+
+    def filtrar(self, empresa: str = '', cif: str = '', estado: str = None, categoria: str = None,
+                localidad: str = None, desde: date = None, hasta: date = None) -> int:
+        """
+        Máscara de las facturas que cumplen todos los filtros (los vacíos o None no filtran)
+
+        empresa/cif buscan el texto contenido sin distinguir mayúsculas; estado, categoría
+        y localidad, el valor exacto; desde/hasta acotan la fecha de validación (inclusive)
+        """
+        mascara = self.todas
+        for columna, texto in (('empresa', empresa), ('cif', cif)):
+            texto = (texto or '').lower().strip()
+            if texto:
+                mascara &= self._mascara_texto(columna, texto)
+        for columna, valor in (('estado', estado), ('categoria', categoria), ('localidad', localidad)):
+            if valor is not None:
+                mascara &= self._mascara_valor(columna, valor)
+        if desde is not None or hasta is not None:
+            inicio = bisect_left(self.fechas, desde.toordinal()) if desde else 0
+            fin = max(inicio, bisect_right(self.fechas, hasta.toordinal()) if hasta else len(self.fechas))
+            mascara &= self._mascara_fechas(inicio, fin)
+        return mascara
+
+    def _mascara_fechas(self, inicio: int, fin: int) -> int:
+        """Filas con fecha en el tramo [inicio, fin) del índice por fecha, más las que no tienen fecha"""
+        # Se marcan las filas del tramo más corto: las de dentro del rango o las de fuera (e invertir)
+        if fin - inicio <= len(self.fechas) // 2:
+            return self._mascara_posiciones([self.orden_fechas[inicio:fin]]) | self.sin_fecha
+        return self.todas ^ self._mascara_posiciones([self.orden_fechas[:inicio], self.orden_fechas[fin:]])
+
+    def seleccion(self, mascara: int) -> bytes:
+        """Un byte por factura, en el orden de la lista: 1 si está en la máscara"""
+        return mascara.to_bytes(self.n, 'little')
+
+    def facturas(self, mascara: int) -> List[Dict]:
+        """Facturas de la máscara en el orden de la lista"""
+        return list(compress(self.lista, self.seleccion(mascara)))
+
+    # =================== TOTALES ===================
+
+    def totales(self, mascara: int) -> Tuple[int, float]:
+        """(número de facturas, importe total) de la máscara"""
+        seleccion = self.seleccion(mascara)
+        return seleccion.count(1), sum(compress(self.importes, seleccion))
+
+    def totales_por(self, columna: str, mascara: int) -> Dict[str, Tuple[int, float]]:
+        """Número e importe de la máscara agrupados por los valores de una columna categórica"""
+        datos = self.columnas[columna]
+        numeros = [0] * len(datos.valores)
+        importes = [0.0] * len(datos.valores)
+        for codigo, importe in compress(zip(datos.codigos, self.importes), self.seleccion(mascara)):
+            numeros[codigo] += 1
+            importes[codigo] += importe
+        return {datos.valores[codigo]: (numeros[codigo], importes[codigo])
+                for codigo in range(len(datos.valores)) if numeros[codigo]}
+
+    # =================== CAMBIOS ===================
+
+    def cambiar_valor(self, factura_id, columna: str, valor: str) -> bool:
+        """Cambiar el valor categórico de una factura sin reconstruir el índice"""
+        posicion = self.posicion_id.get(factura_id)
+        if posicion is None or columna not in COLUMNAS_CATEGORICAS:
+            return False
+        datos = self.columnas[columna]
+        anterior = datos.codigos[posicion]
+        nuevo = datos.codigo_para(valor)
+        if nuevo == anterior:
+            return True
+
+        bit = 1 << (8 * posicion)
+        datos.codigos[posicion] = nuevo
+        if anterior in datos.mascaras:
+            datos.mascaras[anterior] &= ~bit
+        if nuevo in datos.mascaras:
+            datos.mascaras[nuevo] |= bit
+        self.lista[posicion][columna] = valor
+        return True
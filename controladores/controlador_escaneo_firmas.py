@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Servicio de extracción de firmas en paralelo
+Reparte el parseo de PDFs firmados (PyPDF2 + certificados PKCS#7) entre varios
+procesos y devuelve los resultados a la interfaz a medida que van terminando
+"""
+import os
+import sys
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+# Carpetas de cada obra donde se buscan PDFs firmados
+CARPETA_DOCUMENTACION_FINALES = "02-documentacion-finales"
+CARPETA_PROYECTO = "01-proyecto"
+
+MAX_PROCESOS_POR_DEFECTO = 4
+
+
+def _extraer_firmas_proceso(ruta_pdf: str):
+    """Punto de entrada en el proceso hijo (debe ser importable a nivel de módulo)"""
+    directorio_raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if directorio_raiz not in sys.path:
+        sys.path.insert(0, directorio_raiz)
+
+    from firmas import obtener_firmas_pdf
+    # Los errores de lectura se propagan: un PDF bloqueado no debe quedar como "sin firmas"
+    return ruta_pdf, obtener_firmas_pdf(ruta_pdf, lanzar_errores=True)
+
+
+def calcular_numero_procesos(num_archivos: int, max_procesos: int = None) -> int:
+    """Número de procesos a usar: nunca más que archivos ni que núcleos disponibles"""
+    limite = max_procesos or min(MAX_PROCESOS_POR_DEFECTO, max(1, (os.cpu_count() or 2) - 1))
+    return max(1, min(num_archivos, limite))
+
+
+def listar_pdfs_obra(carpeta_obra: str) -> List[str]:
+    """PDFs con posibles firmas de una obra: 02-documentacion-finales y proyecto en 01-proyecto"""
+    rutas_pdf = []
+
+    carpeta_documentos = os.path.join(carpeta_obra, CARPETA_DOCUMENTACION_FINALES)
+    if os.path.isdir(carpeta_documentos):
+        for archivo in sorted(os.listdir(carpeta_documentos)):
+            if archivo.lower().endswith('.pdf'):
+                rutas_pdf.append(os.path.join(carpeta_documentos, archivo))
+
+    carpeta_proyecto = os.path.join(carpeta_obra, CARPETA_PROYECTO)
+    if os.path.isdir(carpeta_proyecto):
+        for archivo in sorted(os.listdir(carpeta_proyecto)):
+            if archivo.lower().endswith('.pdf') and 'proyecto' in archivo.lower():
+                rutas_pdf.append(os.path.join(carpeta_proyecto, archivo))
+
+    return rutas_pdf
+
+
+def listar_pdfs_obras(ruta_obras: str) -> List[str]:
+    """PDFs con posibles firmas de todas las obras"""
+    rutas_pdf = []
+    if not os.path.isdir(ruta_obras):
+        return rutas_pdf
+    for nombre in sorted(os.listdir(ruta_obras)):
+        carpeta_obra = os.path.join(ruta_obras, nombre)
+        if os.path.isdir(carpeta_obra):
+            rutas_pdf.extend(listar_pdfs_obra(carpeta_obra))
+    return rutas_pdf
+
+
+def crear_pool_procesos(max_procesos: int = None) -> Optional[ProcessPoolExecutor]:
+    """Pool de procesos para extraer firmas, o None si el sistema no permite crearlo"""
+    try:
+        return ProcessPoolExecutor(max_workers=calcular_numero_procesos(MAX_PROCESOS_POR_DEFECTO, max_procesos))
+    except (OSError, NotImplementedError) as e:
+        logger.warning(f"No se pudo crear el pool de procesos, extracción secuencial: {e}")
+        return None
+
+
+def extraer_firmas_en_paralelo(rutas_pdf: List[str], max_procesos: int = None,
+                               al_completar: Callable[[str, list], None] = None,
+                               cancelado: Callable[[], bool] = None,
+                               executor: ProcessPoolExecutor = None) -> Dict[str, list]:
+    """
+    Extrae las firmas de varios PDFs repartiéndolos entre procesos
+
+    Args:
+        rutas_pdf: PDFs a analizar
+        max_procesos: Límite de procesos (por defecto núcleos - 1, máximo 4)
+        al_completar: Callback (ruta, firmas) llamado según termina cada PDF
+        cancelado: Función que devuelve True para dejar de procesar
+        executor: Pool ya creado que se reutiliza sin cerrarlo (p. ej. uno para todas las
+                  obras); por defecto se crea uno solo para esta llamada
+
+    Returns:
+        dict: ruta -> lista de firmas, solo de los PDFs procesados; los que no se pudieron
+              leer no aparecen (ni se notifican), para no cachear un error como "sin firmas"
+    """
+    resultados = {}
+
+    def _entregar(ruta_pdf, firmas):
+        resultados[ruta_pdf] = firmas or []
+        if al_completar:
+            al_completar(ruta_pdf, resultados[ruta_pdf])
+
+    def _repartir(pool):
+        futuros = {pool.submit(_extraer_firmas_proceso, ruta_pdf): ruta_pdf for ruta_pdf in rutas_pdf}
+        for futuro in as_completed(futuros):
+            if cancelado and cancelado():
+                for pendiente in futuros:
+                    pendiente.cancel()
+                break
+            ruta_pdf = futuros[futuro]
+            try:
+                _entregar(*futuro.result())
+            except Exception as e:
+                logger.error(f"Error extrayendo firmas de {ruta_pdf}: {e}")
+
+    if executor is not None:
+        _repartir(executor)
+        return resultados
+
+    if calcular_numero_procesos(len(rutas_pdf), max_procesos) == 1:
+        # Arrancar un proceso no compensa para un único PDF
+        for ruta_pdf in rutas_pdf:
+            if cancelado and cancelado():
+                break
+            try:
+                _entregar(*_extraer_firmas_proceso(ruta_pdf))
+            except Exception as e:
+                logger.error(f"Error extrayendo firmas de {ruta_pdf}: {e}")
+        return resultados
+
+    executor = crear_pool_procesos(calcular_numero_procesos(len(rutas_pdf), max_procesos))
+    if executor is None:
+        return extraer_firmas_en_paralelo(rutas_pdf, 1, al_completar, cancelado)
+
+    with executor:
+        _repartir(executor)
+
+    return resultados
+
+
+class ServicioEscaneoFirmas(QThread):
+    """Extrae firmas de una lista de PDFs fuera del hilo de la interfaz"""
+
+    firmas_extraidas = pyqtSignal(str, list)
+    progreso = pyqtSignal(int, int)
+    finalizado = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, rutas_pdf: List[str], max_procesos: int = None, parent=None):
+        super().__init__(parent)
+        self.rutas_pdf = list(rutas_pdf)
+        self.max_procesos = max_procesos
+        self._cancelado = False
+        self._completados = 0
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def esta_cancelado(self) -> bool:
+        return self._cancelado
+
+    def run(self):
+        try:
+            total = len(self.rutas_pdf)
+            self._completados = 0
+            self.progreso.emit(0, total)
+
+            def _al_completar(ruta_pdf, firmas):
+                self._completados += 1
+                self.firmas_extraidas.emit(ruta_pdf, firmas)
+                self.progreso.emit(self._completados, total)
+
+            extraer_firmas_en_paralelo(
+                self.rutas_pdf, self.max_procesos,
+                al_completar=_al_completar, cancelado=self.esta_cancelado
+            )
+        except Exception as e:
+            logger.error(f"Error en servicio de escaneo de firmas: {e}")
+            self.error.emit(str(e))
+        finally:
+            self.finalizado.emit()
@@ -737,6 +737,7 @@ class ControladorEventosUI:
         
         try:
             # Ejecutar cálculos
+            self._asegurar_pestanas_cargadas()
             self.controlador_calculos.calcular_iva_adjudicacion(self.main_window)
             self.controlador_calculos.calcular_anualidades(self.main_window)
             
@@ -750,6 +751,37 @@ class ControladorEventosUI:
         except Exception as e:
             logger.info(f"[ControladorEventosUI] ERROR Error en precio_adjudicacion_changed: {e}")
 
+    def recalcular_campos_cargados(self, widgets, contract_data) -> bool:
+        """
+        Cálculos que dependen de los campos recién cargados de una pestaña (la carga no dispara
+        sus eventos) y guardado de los resultados que difieren del contrato. Los cálculos que
+        combinan campos de varias pestañas se hacen al editar, con todas ellas cargadas
+        """
+        if not self.controlador_calculos:
+            return False
+        
+        nombres = {widget.objectName() for widget in widgets}
+        if nombres & {'certBase', 'precioEjecucionContrata', 'presupuestoVigente'}:
+            self.controlador_calculos.calcular_liquidacion(self.main_window)
+        if 'anoactual' in nombres:
+            self._on_ano_actual_changed(self.main_window.anoactual.date())
+        
+        for nombre, valor in list(self._cambios_pendientes.items()):
+            if self._mismo_valor(contract_data.get(nombre, ''), valor):
+                del self._cambios_pendientes[nombre]
+        if not self._cambios_pendientes:
+            return False
+        self._guardar_cambios_pendientes()
+        return True
+
+    @staticmethod
+    def _mismo_valor(guardado, calculado: str) -> bool:
+        """Compara como importes si ambos lo son (el JSON puede tener 0, 0.0 o "0.00")"""
+        try:
+            return round(float(guardado), 2) == round(float(calculado), 2)
+        except (TypeError, ValueError):
+            return str(guardado) == calculado
+
     def _on_ano_actual_changed(self, fecha):
         """Evento: anoactual cambió - actualizar anosiguinte"""
         try:
@@ -836,8 +868,9 @@ class ControladorEventosUI:
         try:
             # Tabs
             if hasattr(self.main_window, 'tabWidget'):
+                # Solo el slot propio: la ventana principal también escucha los cambios de pestaña
                 try:
-                    self.main_window.tabWidget.currentChanged.disconnect()
+                    self.main_window.tabWidget.currentChanged.disconnect(self._on_tab_changed)
                 except:
                     pass
                 self.main_window.tabWidget.currentChanged.connect(self._on_tab_changed)
@@ -850,51 +883,45 @@ class ControladorEventosUI:
             logger.error(f"[ControladorEventosUI] Error en eventos generales: {e}")
 
     def _setup_widgets_generales(self):
-        """Configurar widgets con eventos de foco"""
+        """Configurar widgets con eventos de foco (los de pestañas sin abrir se conectan al abrirlas)"""
         try:
-            # QLineEdit generales
-            line_edits = self.main_window.findChildren(QLineEdit)
-            campos_especiales = ['basePresupuesto', 'certBase', 'fechaContrato']
-            
-            for widget in line_edits:
-                nombre = widget.objectName()
-                if nombre and not nombre.startswith('qt_') and nombre not in campos_especiales:
-                    # Solo editingFinished (pérdida de foco)
-                    try:
-                        widget.editingFinished.disconnect()
-                    except:
-                        pass
-                    widget.editingFinished.connect(lambda w=widget, n=nombre: self._on_focus_lost(n, w))
-            
-            # QDoubleSpinBox generales
-            spinboxes = self.main_window.findChildren(QDoubleSpinBox)
-            for widget in spinboxes:
-                nombre = widget.objectName()
-                if nombre and not nombre.startswith('qt_') and nombre not in campos_especiales:
-                    # Solo editingFinished (pérdida de foco)
-                    try:
-                        widget.editingFinished.disconnect()
-                    except:
-                        pass
-                    widget.editingFinished.connect(lambda w=widget, n=nombre: self._on_focus_lost(n, w))
-            
-            # QSpinBox generales
-            from PyQt5.QtWidgets import QSpinBox
-            spinboxes_int = self.main_window.findChildren(QSpinBox)
-            for widget in spinboxes_int:
-                nombre = widget.objectName()
-                if nombre and not nombre.startswith('qt_'):
-                    try:
-                        widget.editingFinished.disconnect()
-                    except:
-                        pass
-                    widget.editingFinished.connect(lambda w=widget, n=nombre: self._on_focus_lost(n, w))
-            
+            if hasattr(self.main_window, 'widgets_campos_conectados'):
+                widgets = self.main_window.widgets_campos_conectados()
+            else:
+                from PyQt5.QtWidgets import QSpinBox
+                widgets = self.main_window.findChildren((QLineEdit, QDoubleSpinBox, QSpinBox))
+            self.conectar_widgets_generales(widgets)
         except Exception as e:
             logger.info(f"[ControladorEventosUI] ERROR Error en widgets generales: {e}")
 
+    def conectar_widgets_generales(self, widgets):
+        """Guardar al perder el foco (editingFinished) los QLineEdit, QDoubleSpinBox y QSpinBox indicados"""
+        from PyQt5.QtWidgets import QSpinBox
+        campos_especiales = ['basePresupuesto', 'certBase', 'fechaContrato']
+        
+        for widget in widgets:
+            nombre = widget.objectName()
+            if not nombre or nombre.startswith('qt_'):
+                continue
+            if isinstance(widget, (QLineEdit, QDoubleSpinBox)):
+                if nombre in campos_especiales:
+                    continue
+            elif not isinstance(widget, QSpinBox):
+                continue
+            # Solo editingFinished (pérdida de foco)
+            try:
+                widget.editingFinished.disconnect()
+            except:
+                pass
+            widget.editingFinished.connect(lambda w=widget, n=nombre: self._on_focus_lost(n, w))
+
     # =================== CALLBACKS ESPECÍFICOS ===================
     
+    def _asegurar_pestanas_cargadas(self):
+        """Los cálculos leen campos de otras pestañas: cargar antes las que siguen con el contrato anterior"""
+        if hasattr(self.main_window, 'asegurar_pestanas_cargadas'):
+            self.main_window.asegurar_pestanas_cargadas()
+    
     def _on_base_presupuesto_changed(self):
         """Evento: basePresupuesto cambió - CON CÁLCULOS Y AUTO-GUARDADO"""
         if self.cargando_datos or not self.controlador_calculos:
@@ -902,6 +929,7 @@ class ControladorEventosUI:
         
         try:
             # Ejecutar cálculos
+            self._asegurar_pestanas_cargadas()
             self.controlador_calculos.calcular_iva_base_presupuesto(self.main_window)
             self.controlador_calculos.actualizar_justificacion_limites(self.main_window)
             
@@ -922,6 +950,7 @@ class ControladorEventosUI:
         
         try:
             # Ejecutar cálculos
+            self._asegurar_pestanas_cargadas()
             self.controlador_calculos.calcular_certificacion_completa(self.main_window)
             
             # AUTO-GUARDADO: Guardar el valor modificado
@@ -1051,6 +1080,7 @@ class ControladorEventosUI:
             logger.info(f"[ControladorEventosUI] TwOfertas[{fila},{columna}] = '{valor}'")
 
             if columna == 1:
+                self._asegurar_pestanas_cargadas()
                 resultado = self.controlador_calculos.calcular_ofertas_completo(self.main_window)
                 
                 if hasattr(self.main_window, 'controlador_autosave'):
@@ -1111,6 +1141,7 @@ class ControladorEventosUI:
             return
         
         try:
+            self._asegurar_pestanas_cargadas()
             self.controlador_calculos.actualizar_justificacion_limites(self.main_window)
         except Exception as e:
             logger.info(f"[ControladorEventosUI] Error en _on_radiobutton_changed: {e}")
@@ -1123,6 +1154,7 @@ class ControladorEventosUI:
             return
         
         try:
+            self._asegurar_pestanas_cargadas()
             self.controlador_calculos.calcular_anualidades(self.main_window)
             
             # AUTO-GUARDADO: Guardar la fecha modificada
@@ -1298,15 +1330,22 @@ class ControladorEventosUI:
         """Verificar si está pausado"""
         return self.cargando_datos
     
-    def configurar_eventos_perdida_foco(self):
-        """Configurar eventos de pérdida de foco"""
+    def configurar_eventos_perdida_foco(self, widgets=None):
+        """
+        Configurar eventos de pérdida de foco
+
+        Args:
+            widgets: Campos a configurar (por defecto, los ya conectados de la ventana principal)
+        """
         try:
-            widgets_con_foco = []
-            
-            if hasattr(self.main_window, 'findChildren'):
-                widgets_con_foco.extend(self.main_window.findChildren(QLineEdit))
-                widgets_con_foco.extend(self.main_window.findChildren(QTextEdit))
-                widgets_con_foco.extend(self.main_window.findChildren(QDoubleSpinBox))
+            if widgets is None:
+                if hasattr(self.main_window, 'widgets_campos_conectados'):
+                    widgets = self.main_window.widgets_campos_conectados()
+                elif hasattr(self.main_window, 'findChildren'):
+                    widgets = self.main_window.findChildren((QLineEdit, QTextEdit, QDoubleSpinBox))
+                else:
+                    widgets = []
+            widgets_con_foco = [w for w in widgets if isinstance(w, (QLineEdit, QTextEdit, QDoubleSpinBox))]
             
             for widget in widgets_con_foco:
                 if widget.objectName() and not widget.objectName().startswith('qt_'):
@@ -7,7 +7,6 @@ Gestiona facturas directas con interfaz estilo verde corporativo ADIF
 import sys
 import os
 import json
-import shutil
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
@@ -17,13 +16,9 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
-# Importaciones para generar documentos Word
+# python-docx genera el informe Word (controlador_informe_facturas)
 try:
-    from docx import Document
-    from docx.shared import Inches, Pt, RGBColor
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
-    from docx.oxml.shared import OxmlElement, qn
+    import docx
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
@@ -40,6 +35,12 @@ class ControladorFacturasDirectas:
         self.archivo_json = rutas.get_ruta_facturas_directas()
         self.carpeta_pdfs = os.path.join(self.directorio_base, "pdfactura directa")
         self._inicializar_archivos()
+        from .controlador_repositorio_facturas import RepositorioFacturasDirectas
+        self.repositorio = RepositorioFacturasDirectas(self.archivo_json)
+        # Acumulados por periodo: se construyen al pedirlos y se actualizan con cada cambio
+        self._analitica = None
+        self._generacion_analitica = None
+        self._almacen_pdfs = None
     
     def _obtener_directorio_base(self):
         """Obtener directorio base donde está BaseDatos.json - Compatible con exe"""
@@ -69,18 +70,9 @@ class ControladorFacturasDirectas:
         try:
             # Crear archivo JSON si no existe
             if not os.path.exists(self.archivo_json):
-                datos_iniciales = {
-                    "version": "1.1",
-                    "fecha_creacion": datetime.now().isoformat(),
-                    "facturas": [],
-                    "configuracion": {
-                        "categorias": ["Agua", "Vegetal", "Limpieza", "Actuaciones mantenimiento", "Otras"],
-                        "estados": ["Emitida", "Tramitada", "Pagada", "Con deficiencias"],
-                        "ultimo_id": 0
-                    }
-                }
+                from .controlador_repositorio_facturas import datos_iniciales
                 with open(self.archivo_json, 'w', encoding='utf-8') as f:
-                    json.dump(datos_iniciales, f, ensure_ascii=False, indent=4)
+                    json.dump(datos_iniciales(), f, ensure_ascii=False, indent=4)
                 logger.info(f"Archivo JSON creado: {self.archivo_json}")
             
             # Crear carpeta de PDFs si no existe
@@ -101,36 +93,44 @@ class ControladorFacturasDirectas:
             return False
     
     def leer_datos_json(self) -> Dict:
-        """Leer datos del archivo JSON"""
-        try:
-            with open(self.archivo_json, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error leyendo JSON: {e}")
-            return {"facturas": [], "configuracion": {"categorias": [], "ultimo_id": 0}}
+        """Leer datos del archivo JSON (copia del contenido en memoria)"""
+        return self.repositorio.datos()
     
     def guardar_datos_json(self, datos: Dict) -> bool:
         """Guardar datos en el archivo JSON"""
-        try:
-            with open(self.archivo_json, 'w', encoding='utf-8') as f:
-                json.dump(datos, f, ensure_ascii=False, indent=4)
-            return True
-        except Exception as e:
-            logger.error(f"Error guardando JSON: {e}")
-            return False
+        return self.repositorio.reemplazar(datos)
+    
+    def lote(self):
+        """Agrupar varias operaciones en una sola escritura del JSON (with controlador.lote(): ...)"""
+        return self.repositorio.lote()
+    
+    def siguiente_id(self) -> int:
+        """ID que recibirá la próxima factura"""
+        return self.repositorio.ultimo_id() + 1
+    
+    def analitica(self):
+        """Acumulados de facturación (AnaliticaFacturas) de las facturas activas"""
+        from .controlador_analitica_facturas import AnaliticaFacturas
+        generacion = self.repositorio.generacion()
+        if self._analitica is None or self._generacion_analitica != generacion:
+            self._analitica = AnaliticaFacturas(self.repositorio.facturas_activas())
+            self._generacion_analitica = generacion
+        return self._analitica
+    
+    def _actualizar_analitica(self, anterior: Optional[Dict], nueva: Optional[Dict]):
+        """Aplicar a los acumulados el cambio de una factura (o descartarlos si el JSON se ha recargado)"""
+        if self._analitica is None:
+            return
+        if self._generacion_analitica != self.repositorio.generacion():
+            self._analitica = None
+            return
+        self._analitica.reemplazar(anterior, nueva)
     
     def agregar_factura(self, datos_factura: Dict) -> bool:
         """Agregar nueva factura"""
         try:
-            datos = self.leer_datos_json()
-            
-            # Generar ID único
-            datos["configuracion"]["ultimo_id"] += 1
-            nuevo_id = datos["configuracion"]["ultimo_id"]
-            
-            # Crear factura con timestamp y todos los campos
+            # Crear factura con timestamp y todos los campos (el ID lo asigna el repositorio)
             nueva_factura = {
-                "id": nuevo_id,
                 "fecha_creacion": datetime.now().isoformat(),
                 "importe": datos_factura.get("importe", 0.0),
                 "categoria": datos_factura.get("categoria", ""),
@@ -147,9 +147,9 @@ class ControladorFacturasDirectas:
                 "activa": True
             }
             
-            datos["facturas"].append(nueva_factura)
-            
-            if self.guardar_datos_json(datos):
+            nuevo_id = self.repositorio.agregar(nueva_factura)
+            if nuevo_id:
+                self._actualizar_analitica(None, self.repositorio.obtener(nuevo_id))
                 logger.info(f"Factura agregada con ID: {nuevo_id}")
                 return True
             return False
@@ -161,26 +161,64 @@ class ControladorFacturasDirectas:
     def obtener_facturas(self) -> List[Dict]:
         """Obtener lista de facturas activas"""
         try:
-            datos = self.leer_datos_json()
-            return [f for f in datos.get("facturas", []) if f.get("activa", True)]
+            return self.repositorio.facturas_activas()
         except Exception as e:
             logger.error(f"Error obteniendo facturas: {e}")
             return []
     
+    def exportar_facturas(self, ruta: str, facturas: List[Dict] = None) -> int:
+        """Exportar a CSV o Excel (según la extensión) las facturas indicadas o todas las activas; -1 si falla"""
+        try:
+            from .controlador_intercambio_facturas import exportar_facturas
+            if facturas is None:
+                facturas = self.obtener_facturas()
+            return exportar_facturas(facturas, ruta)
+        except Exception as e:
+            logger.error(f"Error exportando facturas: {e}")
+            return -1
+    
+    def importar_facturas(self, ruta: str):
+        """
+        Importar facturas desde CSV o Excel (ResultadoImportacion)
+        
+        Las filas se validan y se descartan las duplicadas; las válidas se dan de alta juntas
+        con ids consecutivos y una sola escritura
+        """
+        from .controlador_intercambio_facturas import ResultadoImportacion, leer_filas, preparar_importacion
+        try:
+            campos, filas = leer_filas(ruta)
+            configuracion = self.repositorio.datos_configuracion()
+            resultado = preparar_importacion(campos, filas, self.repositorio.todas(),
+                                             configuracion.get("estados", []), configuracion.get("categorias", []))
+            if resultado.facturas:
+                resultado.ids = self.repositorio.agregar_lote(resultado.facturas)
+                if not resultado.ids:
+                    resultado.errores.insert(0, (0, "no se pudo guardar el archivo de facturas"))
+                    resultado.facturas = []
+                for factura_id in resultado.ids:
+                    self._actualizar_analitica(None, self.repositorio.obtener(factura_id))
+            logger.info(f"Importación de {os.path.basename(ruta)}: {len(resultado.ids)} facturas, "
+                        f"{len(resultado.duplicadas)} duplicadas, {len(resultado.errores)} con errores")
+            return resultado
+        except Exception as e:
+            logger.error(f"Error importando facturas: {e}")
+            resultado = ResultadoImportacion()
+            resultado.errores.append((0, str(e)))
+            return resultado
+    
+    def obtener_factura(self, factura_id: int) -> Optional[Dict]:
+        """Obtener una factura por su ID (None si no existe)"""
+        return self.repositorio.obtener(factura_id)
+    
     def eliminar_factura(self, factura_id: int) -> bool:
         """Eliminar factura (marcar como inactiva)"""
         try:
-            datos = self.leer_datos_json()
-            
-            for factura in datos.get("facturas", []):
-                if factura.get("id") == factura_id:
-                    factura["activa"] = False
-                    factura["fecha_eliminacion"] = datetime.now().isoformat()
-                    
-                    if self.guardar_datos_json(datos):
-                        logger.info(f"Factura {factura_id} eliminada")
-                        return True
-                    break
+            cambios = {"activa": False, "fecha_eliminacion": datetime.now().isoformat()}
+            anterior = self.repositorio.obtener(factura_id)
+            if self.repositorio.modificar(factura_id, cambios):
+                self._actualizar_analitica(anterior, self.repositorio.obtener(factura_id))
+                logger.info(f"Factura {factura_id} eliminada")
+                return True
             return False
             
         except Exception as e:
@@ -190,17 +228,12 @@ class ControladorFacturasDirectas:
     def actualizar_estado_factura(self, factura_id: int, nuevo_estado: str) -> bool:
         """Actualizar estado de una factura específica"""
         try:
-            datos = self.leer_datos_json()
-            
-            for factura in datos.get("facturas", []):
-                if factura.get("id") == factura_id and factura.get("activa", True):
-                    factura["estado"] = nuevo_estado
-                    factura["fecha_modificacion_estado"] = datetime.now().isoformat()
-                    
-                    if self.guardar_datos_json(datos):
-                        logger.info(f"Estado de factura {factura_id} actualizado a: {nuevo_estado}")
-                        return True
-                    break
+            cambios = {"estado": nuevo_estado, "fecha_modificacion_estado": datetime.now().isoformat()}
+            anterior = self.repositorio.obtener(factura_id)
+            if self.repositorio.modificar(factura_id, cambios, solo_activas=True):
+                self._actualizar_analitica(anterior, self.repositorio.obtener(factura_id))
+                logger.info(f"Estado de factura {factura_id} actualizado a: {nuevo_estado}")
+                return True
             return False
             
         except Exception as e:
@@ -228,26 +261,33 @@ class ControladorFacturasDirectas:
             logger.error(f"Error generando nombre PDF: {e}")
             return f"{id_factura}_factura.pdf"
     
+    def almacen_pdfs(self):
+        """Almacén por contenido de la carpeta de PDFs (se crea al usarlo por primera vez)"""
+        if self._almacen_pdfs is None:
+            from .controlador_almacen_pdf import AlmacenPDF
+            self._almacen_pdfs = AlmacenPDF(self.carpeta_pdfs)
+        return self._almacen_pdfs
+    
+    def tarea_pdf(self, archivo_origen: str, datos_factura: Dict):
+        """TareaTransferencia que copia el PDF con el nombre id_empresa_importe.pdf (reemplazando el anterior)"""
+        from .controlador_transferencias_pdf import TareaTransferencia
+        nombre_pdf = self.generar_nombre_pdf(datos_factura.get("id", 0),
+                                             datos_factura.get("empresa", "SinEmpresa"),
+                                             datos_factura.get("importe", 0.0))
+        return TareaTransferencia(self.almacen_pdfs(), archivo_origen, self.carpeta_pdfs,
+                                  nombre_pdf, reemplazar=True)
+    
     def gestionar_pdf(self, archivo_origen: str, datos_factura: Dict) -> str:
         """Copiar PDF a la carpeta de facturas directas con nombre formato id_empresa_importe.pdf"""
         try:
             if not os.path.exists(archivo_origen):
                 raise FileNotFoundError(f"Archivo origen no existe: {archivo_origen}")
             
-            # Generar nombre con formato específico
-            id_factura = datos_factura.get("id", 0)
-            empresa = datos_factura.get("empresa", "SinEmpresa")
-            importe = datos_factura.get("importe", 0.0)
-            
-            nombre_pdf = self.generar_nombre_pdf(id_factura, empresa, importe)
-            archivo_destino = os.path.join(self.carpeta_pdfs, nombre_pdf)
-            
-            # Si el archivo ya existe, eliminarlo (reemplazar)
-            if os.path.exists(archivo_destino):
-                os.remove(archivo_destino)
-            
-            # Copiar archivo
-            shutil.copy2(archivo_origen, archivo_destino)
+            # Si el archivo ya existe se reemplaza (sin copiar nada si tiene el mismo contenido)
+            tarea = self.tarea_pdf(archivo_origen, datos_factura)
+            if not tarea.ejecutar():
+                return ""
+            nombre_pdf = os.path.basename(tarea.destino)
             logger.info(f"PDF copiado con formato: {nombre_pdf}")
             
             return nombre_pdf
@@ -256,193 +296,37 @@ class ControladorFacturasDirectas:
             logger.error(f"Error gestionando PDF: {e}")
             return ""
     
-    def generar_informe_word(self, facturas: List[Dict]) -> str:
-        """Generar informe de facturas en formato Word (.docx)"""
+    def crear_generador_informe(self, facturas: List[Dict], analitica=None):
+        """
+        Generador del informe Word (GeneradorInformeFacturas) de esas facturas
+        
+        analitica: acumulados de esas mismas facturas (p. ej. self.analitica() si son todas
+        las activas); si no se indica, se calculan a partir de la lista
+        """
+        from .controlador_informe_facturas import GeneradorInformeFacturas
+        if analitica is None:
+            from .controlador_analitica_facturas import AnaliticaFacturas
+            analitica = AnaliticaFacturas(facturas)
+        return GeneradorInformeFacturas(facturas, analitica, self.directorio_base)
+    
+    def generar_informe_word(self, facturas: List[Dict], analitica=None) -> str:
+        """Generar informe de facturas en formato Word (.docx); devuelve la ruta del (primer) archivo"""
         try:
             if not DOCX_AVAILABLE:
                 raise ImportError("python-docx no está disponible")
             
-            # Crear documento
-            doc = Document()
-            
-            # === PÁGINA INICIAL ===
-            # Título principal
-            titulo = doc.add_heading('', 0)
-            titulo_run = titulo.runs[0] if titulo.runs else titulo.add_run()
-            titulo.text = "INFORME DE FACTURAS DIRECTAS"
-            titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            titulo_run.font.size = Pt(20)
-            titulo_run.font.color.rgb = RGBColor(46, 125, 50)  # Verde ADIF
-            titulo_run.bold = True
-            
-            # Subtítulo
-            subtitulo = doc.add_heading('Sistema de Administración ADIF', 2)
-            subtitulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            subtitulo.runs[0].font.color.rgb = RGBColor(27, 94, 32)  # Verde oscuro ADIF
-            
-            # Espaciado
-            doc.add_paragraph()
-            doc.add_paragraph()
-            
-            # Información general
-            fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M")
-            total_facturas = len(facturas)
-            total_importe = sum(f.get('importe', 0) for f in facturas)
-            
-            info_para = doc.add_paragraph()
-            info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            info_run = info_para.add_run(f"""
-📅 Fecha de generación: {fecha_actual}
-📊 Total de facturas: {total_facturas}
-💰 Importe total: {total_importe:.2f} €
-            """.strip())
-            info_run.font.size = Pt(12)
-            info_run.font.color.rgb = RGBColor(56, 142, 60)  # Verde info ADIF
-            
-            # Resumen por estado
-            estados_resumen = {}
-            for factura in facturas:
-                estado = factura.get('estado', 'Sin estado')
-                estados_resumen[estado] = estados_resumen.get(estado, 0) + 1
-            
-            doc.add_paragraph()
-            resumen_para = doc.add_heading('📈 Resumen por Estado', 3)
-            resumen_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            for estado, cantidad in estados_resumen.items():
-                estado_para = doc.add_paragraph(f"• {estado}: {cantidad} facturas")
-                estado_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                estado_para.runs[0].font.size = Pt(11)
-            
-            # Salto de página
-            doc.add_page_break()
-            
-            # === PÁGINA DE TABLA ===
-            # Título de la tabla
-            tabla_titulo = doc.add_heading('📋 Detalle de Facturas', 1)
-            tabla_titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            tabla_titulo.runs[0].font.color.rgb = RGBColor(46, 125, 50)
-            
-            if not facturas:
-                doc.add_paragraph("No hay facturas para mostrar.")
-                return self._guardar_documento(doc)
-            
-            # Crear tabla
-            columnas = ['ID', 'Empresa', 'CIF', 'Importe', 'Estado', 'Categoría', 'Localidad', 'Fecha Valid.']
-            tabla = doc.add_table(rows=1, cols=len(columnas))
-            tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
-            tabla.style = 'Light Grid Accent 1'
-            
-            # Configurar encabezados
-            header_cells = tabla.rows[0].cells
-            for i, columna in enumerate(columnas):
-                header_cells[i].text = columna
-                # Formatear encabezados
-                para = header_cells[i].paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = para.runs[0]
-                run.font.bold = True
-                run.font.size = Pt(10)
-                run.font.color.rgb = RGBColor(255, 255, 255)
-                # Color de fondo verde ADIF para encabezados
-                shading_elm = self._crear_sombreado(header_cells[i], RGBColor(46, 125, 50))
-            
-            # Añadir filas de datos
-            for factura in facturas:
-                row_cells = tabla.add_row().cells
-                
-                # Preparar datos
-                datos_fila = [
-                    str(factura.get('id', '')),
-                    factura.get('empresa', ''),
-                    factura.get('cif', ''),
-                    f"{factura.get('importe', 0):.2f} €",
-                    factura.get('estado', ''),
-                    factura.get('categoria', ''),
-                    factura.get('localidad', ''),
-                    factura.get('fecha_validacion', '')
-                ]
-                
-                # Llenar celdas
-                for i, dato in enumerate(datos_fila):
-                    row_cells[i].text = dato
-                    # Formatear celdas
-                    para = row_cells[i].paragraphs[0]
-                    para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i in [0, 3, 4] else WD_ALIGN_PARAGRAPH.LEFT
-                    run = para.runs[0]
-                    run.font.size = Pt(9)
-                    
-                    # Colorear según estado (columna 4)
-                    if i == 4:  # Columna Estado
-                        estado = factura.get('estado', '')
-                        if estado == 'Pagada':
-                            run.font.color.rgb = RGBColor(76, 175, 80)  # Verde
-                        elif estado == 'Con deficiencias':
-                            run.font.color.rgb = RGBColor(244, 67, 54)  # Rojo
-                        elif estado == 'Tramitada':
-                            run.font.color.rgb = RGBColor(255, 152, 0)  # Naranja
-            
-            # Ajustar ancho de columnas
-            for i, column in enumerate(tabla.columns):
-                if i == 0:  # ID
-                    column.width = Inches(0.5)
-                elif i == 1:  # Empresa
-                    column.width = Inches(1.5)
-                elif i == 2:  # CIF
-                    column.width = Inches(1.0)
-                elif i == 3:  # Importe
-                    column.width = Inches(0.8)
-                else:
-                    column.width = Inches(1.0)
-            
-            # Footer con información adicional
-            doc.add_paragraph()
-            footer_para = doc.add_paragraph()
-            footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            footer_run = footer_para.add_run(f"\nInforme generado por Sistema ADIF - {fecha_actual}")
-            footer_run.font.size = Pt(8)
-            footer_run.font.color.rgb = RGBColor(117, 117, 117)
-            footer_run.italic = True
-            
-            return self._guardar_documento(doc)
+            rutas = self.crear_generador_informe(facturas, analitica).generar()
+            return rutas[0] if rutas else ""
             
         except Exception as e:
             logger.error(f"Error generando informe Word: {e}")
             return ""
     
-    def _crear_sombreado(self, cell, color: RGBColor):
-        """Crear sombreado para celda de tabla"""
-        try:
-            shading_elm = OxmlElement(qn('w:shd'))
-            shading_elm.set(qn('w:fill'), f"{color.r:02x}{color.g:02x}{color.b:02x}")
-            cell._tc.get_or_add_tcPr().append(shading_elm)
-            return shading_elm
-        except:
-            return None
-    
-    def _guardar_documento(self, doc) -> str:
-        """Guardar documento y devolver ruta"""
-        try:
-            # Generar nombre de archivo único
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nombre_archivo = f"Informe_Facturas_ADIF_{timestamp}.docx"
-            ruta_archivo = os.path.join(self.directorio_base, nombre_archivo)
-            
-            # Guardar documento
-            doc.save(ruta_archivo)
-            logger.info(f"Informe guardado: {ruta_archivo}")
-            return ruta_archivo
-            
-        except Exception as e:
-            logger.error(f"Error guardando documento: {e}")
-            return ""
-    
     def eliminar_pdf(self, nombre_archivo: str) -> bool:
         """Eliminar PDF de la carpeta de facturas directas"""
         try:
             archivo_path = os.path.join(self.carpeta_pdfs, nombre_archivo)
-            if os.path.exists(archivo_path):
-                os.remove(archivo_path)
+            if self.almacen_pdfs().eliminar(archivo_path):
                 logger.info(f"PDF eliminado: {nombre_archivo}")
                 return True
             return False
@@ -457,8 +341,11 @@ class DialogoFacturasDirectas(QDialog):
     def __init__(self, parent=None, controlador=None):
         super().__init__(parent)
         self.controlador = controlador
+        self.hilo_informe = None
+        self.progreso_informe = None
+        self.error_informe = ""
         self.setWindowTitle("Facturas Directas - ADIF")
-        self.setFixedSize(650, 450)
+        self.setFixedSize(650, 540)
         self.setWindowFlags(Qt.Dialog | Qt.WindowCloseButtonHint)
         self.setup_ui()
         self.apply_adif_style()
@@ -478,9 +365,8 @@ class DialogoFacturasDirectas(QDialog):
         # Información de estado
         if self.controlador:
             try:
-                facturas = self.controlador.obtener_facturas()
-                total = sum(f.get('importe', 0) for f in facturas)
-                info_text = f"{len(facturas)} facturas • Total: {total:.2f} €"
+                numero, total = self.controlador.analitica().total()
+                info_text = f"{numero} facturas • Total: {total:.2f} €"
             except:
                 info_text = "Sistema listo"
         else:
@@ -499,7 +385,9 @@ class DialogoFacturasDirectas(QDialog):
             ("✏️ Editar factura", self.editar_factura),
             ("🗑️ Borrar factura", self.borrar_factura),
             ("📊 Resumen facturación", self.resumen_facturacion),
-            ("📄 Informe facturación", self.informe_facturacion)
+            ("📄 Informe facturación", self.informe_facturacion),
+            ("📥 Importar facturas (CSV/Excel)", self.importar_facturas),
+            ("📤 Exportar facturas (CSV/Excel)", self.exportar_facturas)
         ]
         
         for text, callback in buttons_data:
@@ -642,7 +530,9 @@ class DialogoFacturasDirectas(QDialog):
         
         # Crear diálogo con tabla
         dialogo_tabla = DialogoTablaResumen(self, facturas)
-        dialogo_tabla.exec_()
+        # Los cambios de estado de la tabla se agrupan en pocas escrituras (como tarde, al cerrarla)
+        with self.controlador.lote():
+            dialogo_tabla.exec_()
     
     def informe_facturacion(self):
         """Generar informe de facturación en Word"""
@@ -665,47 +555,148 @@ class DialogoFacturasDirectas(QDialog):
                                    "Después reinicia la aplicación.")
                 return
             
-            # Mostrar diálogo de progreso
-            progress = QProgressDialog("Generando informe Word...", "Cancelar", 0, 100, self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setWindowTitle("Generando Informe")
-            progress.setValue(10)
-            
-            # Generar informe
-            progress.setValue(50)
-            ruta_archivo = self.controlador.generar_informe_word(facturas)
-            progress.setValue(90)
+            if self.hilo_informe is not None and self.hilo_informe.isRunning():
+                return
             
-            if ruta_archivo and os.path.exists(ruta_archivo):
-                progress.setValue(100)
-                progress.close()
-                
-                # Preguntar si abrir el archivo
-                reply = QMessageBox.question(self, "Informe generado", 
-                                           f"📄 Informe generado exitosamente:\n\n{os.path.basename(ruta_archivo)}\n\n"
-                                           f"📁 Ubicación: {os.path.dirname(ruta_archivo)}\n\n"
-                                           "¿Desea abrir el archivo?",
-                                           QMessageBox.Yes | QMessageBox.No,
-                                           QMessageBox.Yes)
-                
-                if reply == QMessageBox.Yes:
-                    try:
-                        # Abrir archivo con aplicación predeterminada
-                        if sys.platform.startswith('win'):
-                            os.startfile(ruta_archivo)
-                        elif sys.platform.startswith('darwin'):  # macOS
-                            os.system(f'open "{ruta_archivo}"')
-                        else:  # Linux
-                            os.system(f'xdg-open "{ruta_archivo}"')
-                    except Exception as e:
-                        QMessageBox.information(self, "Archivo generado", 
-                                              f"Informe guardado en:\n{ruta_archivo}")
-            else:
-                progress.close()
-                QMessageBox.critical(self, "Error", "No se pudo generar el informe Word")
+            # El informe se genera en un hilo; el diálogo muestra el progreso real (filas y archivos)
+            generador = self.controlador.crear_generador_informe(facturas, self.controlador.analitica())
+            self.progreso_informe = QProgressDialog("Generando informe Word...", "Cancelar", 0, 0, self)
+            self.progreso_informe.setWindowModality(Qt.WindowModal)
+            self.progreso_informe.setWindowTitle("Generando Informe")
+            self.progreso_informe.setMinimumDuration(0)
+            self.progreso_informe.setAutoClose(False)
+            self.progreso_informe.setAutoReset(False)
+            
+            from .controlador_informe_facturas import HiloInformeFacturas
+            self.hilo_informe = HiloInformeFacturas(generador, self)
+            self.hilo_informe.progreso.connect(self._progreso_informe)
+            self.error_informe = ""
+            self.hilo_informe.error.connect(self._informe_error)
+            self.hilo_informe.finalizado.connect(self._informe_finalizado)
+            self.hilo_informe.finished.connect(self.hilo_informe.deleteLater)
+            self.progreso_informe.canceled.connect(self.hilo_informe.cancelar)
+            self.hilo_informe.start()
+            self.progreso_informe.show()
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error generando informe: {str(e)}")
+    
+    def importar_facturas(self):
+        """Importar facturas desde un CSV o Excel"""
+        if not self.controlador:
+            QMessageBox.critical(self, "Error", "Controlador no disponible")
+            return
+        ruta, _ = QFileDialog.getOpenFileName(self, "Importar facturas", self.controlador.directorio_base,
+                                              "Facturas (*.csv *.xlsx)")
+        if not ruta:
+            return
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            resultado = self.controlador.importar_facturas(ruta)
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        if resultado.ids:
+            QMessageBox.information(self, "Importación completada", resultado.resumen())
+        else:
+            QMessageBox.warning(self, "Ninguna factura importada", resultado.resumen())
+    
+    def exportar_facturas(self):
+        """Exportar todas las facturas activas a CSV o Excel"""
+        if not self.controlador:
+            QMessageBox.critical(self, "Error", "Controlador no disponible")
+            return
+        exportar_facturas_a_archivo(self, self.controlador, None)
+    
+    def _progreso_informe(self, hechas, total, mensaje):
+        if self.progreso_informe is not None:
+            self.progreso_informe.setMaximum(total)
+            self.progreso_informe.setValue(hechas)
+            self.progreso_informe.setLabelText(mensaje)
+    
+    def _informe_error(self, mensaje):
+        """El hilo falló: el mensaje se muestra al terminar, en un solo aviso"""
+        self.error_informe = mensaje
+    
+    def _informe_finalizado(self, rutas):
+        """Fin del hilo del informe: ofrecer abrir el archivo (o la carpeta, si son varias partes)"""
+        cancelado = self.hilo_informe.cancelado if self.hilo_informe else False
+        if self.progreso_informe is not None:
+            self.progreso_informe.close()
+            self.progreso_informe = None
+        self.hilo_informe = None
+        
+        # Cancelado o con error no queda ninguna parte: el generador borra las ya guardadas
+        rutas = [ruta for ruta in rutas if os.path.exists(ruta)]
+        if not rutas:
+            if self.error_informe:
+                QMessageBox.critical(self, "Error", f"No se pudo generar el informe Word:\n{self.error_informe}")
+            elif not cancelado:
+                QMessageBox.critical(self, "Error", "No se pudo generar el informe Word")
+            return
+        
+        if len(rutas) == 1:
+            ruta_abrir = rutas[0]
+            texto = (f"📄 Informe generado exitosamente:\n\n{os.path.basename(rutas[0])}\n\n"
+                     f"📁 Ubicación: {os.path.dirname(rutas[0])}\n\n"
+                     "¿Desea abrir el archivo?")
+        else:
+            ruta_abrir = os.path.dirname(rutas[0])
+            texto = (f"📄 Informe generado en {len(rutas)} archivos:\n\n"
+                     + "\n".join(os.path.basename(ruta) for ruta in rutas[:10])
+                     + ("\n..." if len(rutas) > 10 else "")
+                     + f"\n\n📁 Ubicación: {ruta_abrir}\n\n"
+                     "¿Desea abrir la carpeta?")
+        reply = QMessageBox.question(self, "Informe generado", texto,
+                                   QMessageBox.Yes | QMessageBox.No,
+                                   QMessageBox.Yes)
+        
+        if reply == QMessageBox.Yes:
+            try:
+                # Abrir con aplicación predeterminada
+                if sys.platform.startswith('win'):
+                    os.startfile(ruta_abrir)
+                elif sys.platform.startswith('darwin'):  # macOS
+                    os.system(f'open "{ruta_abrir}"')
+                else:  # Linux
+                    os.system(f'xdg-open "{ruta_abrir}"')
+            except Exception as e:
+                QMessageBox.information(self, "Archivo generado", 
+                                      f"Informe guardado en:\n{ruta_abrir}")
+    
+    def done(self, resultado):
+        """No cerrar con el informe a medias: cancelarlo y esperar al hilo"""
+        if self.hilo_informe is not None and self.hilo_informe.isRunning():
+            self.hilo_informe.finalizado.disconnect()
+            self.hilo_informe.cancelar()
+            self.hilo_informe.wait()
+            self.hilo_informe = None
+        super().done(resultado)
+
+
+def exportar_facturas_a_archivo(parent, controlador, facturas):
+    """Pedir la ruta y exportar (facturas None: todas las activas)"""
+    nombre = f"Facturas_ADIF_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    ruta, filtro = QFileDialog.getSaveFileName(parent, "Exportar facturas",
+                                               os.path.join(controlador.directorio_base, nombre),
+                                               "Excel (*.xlsx);;CSV (*.csv)")
+    if not ruta:
+        return
+    if not os.path.splitext(ruta)[1]:
+        ruta += ".csv" if "csv" in filtro.lower() else ".xlsx"
+    
+    QApplication.setOverrideCursor(Qt.WaitCursor)
+    try:
+        numero = controlador.exportar_facturas(ruta, facturas)
+    finally:
+        QApplication.restoreOverrideCursor()
+    
+    if numero >= 0:
+        QMessageBox.information(parent, "Exportación completada",
+                                f"📤 {numero} facturas exportadas a:\n{ruta}")
+    else:
+        QMessageBox.critical(parent, "Error", "No se pudieron exportar las facturas")
 
 
 class DialogoCrearFactura(QDialog):
@@ -1052,8 +1043,7 @@ class DialogoCrearFactura(QDialog):
             else:
                 # Para nueva factura, obtener próximo ID
                 if self.controlador:
-                    datos_json = self.controlador.leer_datos_json()
-                    id_temp = datos_json.get("configuracion", {}).get("ultimo_id", 0) + 1
+                    id_temp = self.controlador.siguiente_id()
                 else:
                     id_temp = 1
                     
@@ -1063,15 +1053,18 @@ class DialogoCrearFactura(QDialog):
                 "importe": self.importe_spinbox.value()
             }
             
-            # Copiar archivo a la carpeta de facturas directas
+            # Copiar archivo a la carpeta de facturas directas (en segundo plano, con progreso)
             if self.controlador:
-                nuevo_nombre = self.controlador.gestionar_pdf(archivo, datos_temp)
-                if nuevo_nombre:
+                from .controlador_transferencias_pdf import transferir_con_progreso
+                tarea = self.controlador.tarea_pdf(archivo, datos_temp)
+                transferir_con_progreso(self, [tarea], "Copiando PDF")
+                if tarea.destino:
+                    nuevo_nombre = os.path.basename(tarea.destino)
                     self.archivo_pdf_seleccionado = nuevo_nombre
                     self.archivo_label.setText(f"Archivo: {nuevo_nombre}")
                     self.btn_quitar_pdf.setEnabled(True)
                     logger.info(f"PDF seleccionado con nombre: {nuevo_nombre}")
-                else:
+                elif not tarea.cancelada:
                     QMessageBox.critical(self, "Error", "No se pudo copiar el archivo PDF")
             else:
                 QMessageBox.critical(self, "Error", "Controlador no disponible")
@@ -1150,6 +1143,9 @@ class DialogoCrearFactura(QDialog):
 class DialogoTablaResumen(QDialog):
     """Diálogo para mostrar resumen de facturas en tabla"""
     
+    RETRASO_GUARDADO_MS = 2000
+    FILAS_MUESTRA_ANCHO = 200
+    
     def __init__(self, parent=None, facturas=None):
         super().__init__(parent)
         self.facturas = facturas or []
@@ -1159,6 +1155,18 @@ class DialogoTablaResumen(QDialog):
         self.setup_ui()
         self.apply_adif_style()
         self.cargar_datos_tabla()
+        
+        # Guardado agrupado de los cambios de estado: se escribe tras una pausa en la edición
+        self.temporizador_guardado = QTimer(self)
+        self.temporizador_guardado.setSingleShot(True)
+        self.temporizador_guardado.setInterval(self.RETRASO_GUARDADO_MS)
+        self.temporizador_guardado.timeout.connect(self.guardar_cambios_pendientes)
+    
+    def guardar_cambios_pendientes(self):
+        """Escribir en el JSON los cambios de estado acumulados"""
+        controlador = getattr(self.parent(), 'controlador', None)
+        if controlador and not controlador.repositorio.guardar():
+            QMessageBox.critical(self, "Error", "No se pudieron guardar los cambios de estado")
     
     def setup_ui(self):
         """Configurar interfaz del diálogo de tabla"""
@@ -1172,12 +1180,16 @@ class DialogoTablaResumen(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
         
+        # Índice columnar de las facturas: los filtros y totales no las recorren una a una
+        from .controlador_columnas_facturas import ColumnasFacturas
+        self.columnas = ColumnasFacturas(self.facturas)
+        
         # Información general
-        total = sum(f.get('importe', 0) for f in self.facturas)
-        info_label = QLabel(f"Total facturas: {len(self.facturas)} | Importe total: {total:.2f} €")
-        info_label.setObjectName("info_label")
-        info_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(info_label)
+        self.info_label = QLabel()
+        self.info_label.setObjectName("info_label")
+        self.info_label.setAlignment(Qt.AlignCenter)
+        self.actualizar_info(self.columnas.todas)
+        layout.addWidget(self.info_label)
         
         # Sistema de filtros
         filtros_group = QGroupBox("🔍 Filtros de Búsqueda")
@@ -1235,7 +1247,13 @@ class DialogoTablaResumen(QDialog):
         btn_limpiar = QPushButton("🗑️ Limpiar Filtros")
         btn_limpiar.setObjectName("clear_filters_button")
         btn_limpiar.clicked.connect(self.limpiar_filtros)
-        filtros_layout.addWidget(btn_limpiar, 3, 0, 1, 4)
+        filtros_layout.addWidget(btn_limpiar, 3, 0, 1, 2)
+        
+        # Botón exportar (las facturas que muestra la tabla)
+        btn_exportar = QPushButton("📤 Exportar mostradas")
+        btn_exportar.setObjectName("clear_filters_button")
+        btn_exportar.clicked.connect(self.exportar_mostradas)
+        filtros_layout.addWidget(btn_exportar, 3, 2, 1, 2)
         
         layout.addWidget(filtros_group)
         
@@ -1243,21 +1261,26 @@ class DialogoTablaResumen(QDialog):
         self.todas_facturas = self.facturas.copy()
         
         # Tabla
-        self.tabla = QTableWidget()
+        # Tabla: modelo sobre las facturas y proxy con la selección de los filtros
+        # (la vista solo pide las celdas visibles)
+        from .controlador_modelos_tabla import ModeloTablaDiccionarios, ProxySeleccion
+        self.modelo = ModeloTablaDiccionarios(self._columnas_tabla(), parent=self)
+        self.proxy = ProxySeleccion(self)
+        self.proxy.setSourceModel(self.modelo)
+        
+        self.tabla = QTableView()
         self.tabla.setObjectName("tabla_facturas")
-        
-        # Definir columnas con todos los campos incluyendo nuevos
-        columnas = ["ID", "Fecha", "Empresa", "CIF", "Importe", "Estado", "Categoría", "Localidad", "GPED", "ID Especial", "ID AdmYCont", "Fecha Valid.", "Comentarios", "PDF"]
-        self.tabla.setColumnCount(len(columnas))
-        self.tabla.setHorizontalHeaderLabels(columnas)
+        self.tabla.setModel(self.proxy)
         
         # Configurar tabla
         self.tabla.setAlternatingRowColors(True)
         self.tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tabla.horizontalHeader().setStretchLastSection(True)
+        # Al ajustar columnas, medir solo una muestra de filas
+        self.tabla.horizontalHeader().setResizeContentsPrecision(self.FILAS_MUESTRA_ANCHO)
         
         # Conectar evento de doble clic para editar estado
-        self.tabla.cellDoubleClicked.connect(self.editar_estado_celda)
+        self.tabla.doubleClicked.connect(lambda index: self.editar_estado_celda(index.row(), index.column()))
         
         layout.addWidget(self.tabla)
         
@@ -1268,102 +1291,74 @@ class DialogoTablaResumen(QDialog):
         btn_cerrar.clicked.connect(self.close)
         layout.addWidget(btn_cerrar)
     
-    def cargar_datos_tabla(self):
-        """Cargar datos de facturas en la tabla con todas las columnas"""
-        self.tabla.setRowCount(len(self.facturas))
+    def _columnas_tabla(self):
+        """Columnas de la tabla con todos los campos incluyendo nuevos"""
+        from .controlador_modelos_tabla import ColumnaTabla
+        
+        colores_estado = {
+            "Pagada": QColor(200, 255, 200),  # Verde claro
+            "Con deficiencias": QColor(255, 200, 200),  # Rojo claro
+            "Tramitada": QColor(255, 255, 200),  # Amarillo claro
+        }
         
-        for row, factura in enumerate(self.facturas):
-            col = 0
-            
-            # ID
-            self.tabla.setItem(row, col, QTableWidgetItem(str(factura.get('id', ''))))
-            col += 1
-            
-            # Fecha (solo fecha, sin hora)
+        def fecha_corta(factura):
+            # Solo fecha, sin hora
             fecha_completa = factura.get('fecha_creacion', '')
-            fecha_corta = fecha_completa.split('T')[0] if 'T' in fecha_completa else fecha_completa
-            self.tabla.setItem(row, col, QTableWidgetItem(fecha_corta))
-            col += 1
-            
-            # Empresa
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('empresa', '')))
-            col += 1
-            
-            # CIF
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('cif', '')))
-            col += 1
-            
-            # Importe
-            importe = factura.get('importe', 0)
-            self.tabla.setItem(row, col, QTableWidgetItem(f"{importe:.2f} €"))
-            col += 1
-            
-            # Estado
-            estado = factura.get('estado', 'Emitida')
-            item_estado = QTableWidgetItem(estado)
-            # Colorear según estado
-            if estado == "Pagada":
-                item_estado.setBackground(QColor(200, 255, 200))  # Verde claro
-            elif estado == "Con deficiencias":
-                item_estado.setBackground(QColor(255, 200, 200))  # Rojo claro
-            elif estado == "Tramitada":
-                item_estado.setBackground(QColor(255, 255, 200))  # Amarillo claro
-            self.tabla.setItem(row, col, item_estado)
-            col += 1
-            
-            # Categoría
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('categoria', '')))
-            col += 1
-            
-            # Localidad
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('localidad', '')))
-            col += 1
-            
-            # GPED
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('gped', '')))
-            col += 1
-            
-            # Identificador Especial
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('identificador_especial', '')))
-            col += 1
-            
-            # ID AdmYCont (nuevo campo)
-            self.tabla.setItem(row, col, QTableWidgetItem(factura.get('identificacion_admycont', '')))
-            col += 1
-            
-            # Fecha Validación (nuevo campo)
-            fecha_validacion = factura.get('fecha_validacion', '')
-            self.tabla.setItem(row, col, QTableWidgetItem(fecha_validacion))
-            col += 1
-            
-            # Comentarios (truncar si es muy largo)
+            return fecha_completa.split('T')[0] if 'T' in fecha_completa else fecha_completa
+        
+        def comentarios_cortos(factura):
+            # Truncar si es muy largo
             comentarios = factura.get('comentarios', '')
-            comentarios_cortos = comentarios[:25] + "..." if len(comentarios) > 25 else comentarios
-            self.tabla.setItem(row, col, QTableWidgetItem(comentarios_cortos))
-            col += 1
-            
-            # PDF
-            pdf = factura.get('archivo_pdf', '')
-            pdf_nombre = "✅" if pdf else "❌"
-            self.tabla.setItem(row, col, QTableWidgetItem(pdf_nombre))
+            return comentarios[:25] + "..." if len(comentarios) > 25 else comentarios
+        
+        def campo(nombre):
+            return lambda factura: str(factura.get(nombre, ''))
+        
+        return [
+            ColumnaTabla("ID", campo('id')),
+            ColumnaTabla("Fecha", fecha_corta),
+            ColumnaTabla("Empresa", campo('empresa')),
+            ColumnaTabla("CIF", campo('cif')),
+            ColumnaTabla("Importe", lambda factura: f"{factura.get('importe', 0):.2f} €"),
+            ColumnaTabla("Estado", lambda factura: factura.get('estado', 'Emitida'),
+                         lambda factura: colores_estado.get(factura.get('estado', 'Emitida'))),
+            ColumnaTabla("Categoría", campo('categoria')),
+            ColumnaTabla("Localidad", campo('localidad')),
+            ColumnaTabla("GPED", campo('gped')),
+            ColumnaTabla("ID Especial", campo('identificador_especial')),
+            ColumnaTabla("ID AdmYCont", campo('identificacion_admycont')),
+            ColumnaTabla("Fecha Valid.", campo('fecha_validacion')),
+            ColumnaTabla("Comentarios", comentarios_cortos),
+            ColumnaTabla("PDF", lambda factura: "✅" if factura.get('archivo_pdf', '') else "❌"),
+        ]
+    
+    def cargar_datos_tabla(self):
+        """Cargar las facturas en el modelo de la tabla (sin filtros)"""
+        self.modelo.establecer_filas(self.todas_facturas)
+        self.proxy.establecer_seleccion(None)
         
-        # Ajustar tamaño de columnas
+        # Ajustar tamaño de columnas (Qt solo mide una muestra de filas)
         self.tabla.resizeColumnsToContents()
     
     def editar_estado_celda(self, row, col):
-        """Editar estado de factura con doble clic en columna Estado"""
+        """Editar estado de factura con doble clic en columna Estado (row: fila de la vista)"""
         try:
+            fila = self.proxy.mapToSource(self.proxy.index(row, col)).row()
+            factura = self.modelo.fila(fila)
+            if factura is None:
+                return
+            
             # La columna Estado es la número 5 (índice basado en 0)
             if col == 5:  # Columna Estado
-                factura_id = int(self.tabla.item(row, 0).text())  # ID en columna 0
-                estado_actual = self.tabla.item(row, col).text()
+                factura_id = factura.get('id')
+                estado_actual = factura.get('estado', 'Emitida')
                 
                 # Mostrar diálogo de selección de estado
                 estados = ["Emitida", "Tramitada", "Pagada", "Con deficiencias"]
                 nuevo_estado, ok = QInputDialog.getItem(
                     self, f"Editar Estado - Factura {factura_id}", 
                     "Seleccione el nuevo estado:", 
-                    estados, estados.index(estado_actual), False
+                    estados, estados.index(estado_actual) if estado_actual in estados else 0, False
                 )
                 
                 if ok and nuevo_estado != estado_actual:
@@ -1371,18 +1366,15 @@ class DialogoTablaResumen(QDialog):
                     if hasattr(self.parent(), 'controlador') and self.parent().controlador:
                         controlador = self.parent().controlador
                         if controlador.actualizar_estado_factura(factura_id, nuevo_estado):
-                            # Actualizar visualmente en la tabla
-                            item_estado = QTableWidgetItem(nuevo_estado)
-                            
-                            # Colorear según estado
-                            if nuevo_estado == "Pagada":
-                                item_estado.setBackground(QColor(200, 255, 200))
-                            elif nuevo_estado == "Con deficiencias":
-                                item_estado.setBackground(QColor(255, 200, 200))
-                            elif nuevo_estado == "Tramitada":
-                                item_estado.setBackground(QColor(255, 255, 200))
-                            
-                            self.tabla.setItem(row, col, item_estado)
+                            self.temporizador_guardado.start()
+                            # La factura cambia en el índice de los filtros; con filtros aplicados se
+                            # recalcula la selección (puede dejar de cumplir el filtro de estado)
+                            self.columnas.cambiar_valor(factura_id, "estado", nuevo_estado)
+                            if self.proxy.seleccion is not None:
+                                self.aplicar_filtros()
+                            else:
+                                self.modelo.actualizar_fila(fila)
+                                self.actualizar_info(self.columnas.todas)
                             QMessageBox.information(self, "Estado actualizado", 
                                                   f"Estado de factura {factura_id} cambiado a: {nuevo_estado}")
                         else:
@@ -1391,100 +1383,84 @@ class DialogoTablaResumen(QDialog):
                         QMessageBox.critical(self, "Error", "Controlador no disponible")
             else:
                 # Mostrar información de la celda para otras columnas
-                item = self.tabla.item(row, col)
-                if item and item.text():
+                valor = self.modelo.columnas[col].texto(factura)
+                if valor:
                     QMessageBox.information(self, "Información", 
-                                          f"Columna: {self.tabla.horizontalHeaderItem(col).text()}\n"
-                                          f"Valor: {item.text()}")
+                                          f"Columna: {self.modelo.columnas[col].titulo}\n"
+                                          f"Valor: {valor}")
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error editando estado: {str(e)}")
     
+    def actualizar_info(self, mascara, filtrado=False):
+        """Totales de las facturas mostradas (desglose por estado, categoría y localidad en el tooltip)"""
+        numero, total = self.columnas.totales(mascara)
+        if filtrado:
+            texto = f"Total facturas mostradas: {numero} de {self.columnas.n} | Importe total: {total:.2f} €"
+        else:
+            texto = f"Total facturas: {numero} | Importe total: {total:.2f} €"
+        self.info_label.setText(texto)
+        
+        lineas = []
+        for columna, titulo in (("estado", "Por estado"), ("categoria", "Por categoría"), ("localidad", "Por localidad")):
+            lineas.append(f"{titulo}:")
+            for valor, (numero_valor, total_valor) in sorted(self.columnas.totales_por(columna, mascara).items()):
+                lineas.append(f"   {valor or '(sin valor)'}: {numero_valor} | {total_valor:.2f} €")
+        self.info_label.setToolTip("\n".join(lineas))
+    
     def aplicar_filtros(self):
         """Aplicar filtros a la tabla de facturas"""
         try:
-            # Obtener valores de los filtros
-            empresa_filtro = self.filtro_empresa.text().lower().strip()
-            cif_filtro = self.filtro_cif.text().lower().strip()
             estado_filtro = self.filtro_estado.currentText()
             categoria_filtro = self.filtro_categoria.currentText()
-            fecha_desde = self.filtro_fecha_desde.date().toPyDate()
-            fecha_hasta = self.filtro_fecha_hasta.date().toPyDate()
-            
-            # Filtrar facturas
-            facturas_filtradas = []
-            
-            for factura in self.todas_facturas:
-                # Filtro por empresa
-                if empresa_filtro and empresa_filtro not in factura.get('empresa', '').lower():
-                    continue
-                    
-                # Filtro por CIF
-                if cif_filtro and cif_filtro not in factura.get('cif', '').lower():
-                    continue
-                    
-                # Filtro por estado
-                if estado_filtro != "Todos" and factura.get('estado', '') != estado_filtro:
-                    continue
-                    
-                # Filtro por categoría
-                if categoria_filtro != "Todas" and factura.get('categoria', '') != categoria_filtro:
-                    continue
-                    
-                # Filtro por fecha de validación
-                fecha_validacion_str = factura.get('fecha_validacion', '')
-                if fecha_validacion_str:
-                    try:
-                        fecha_validacion = datetime.strptime(fecha_validacion_str, "%Y-%m-%d").date()
-                        if fecha_validacion < fecha_desde or fecha_validacion > fecha_hasta:
-                            continue
-                    except:
-                        # Si no se puede parsear la fecha, incluir la factura
-                        pass
-                
-                # Si llegamos aquí, la factura pasa todos los filtros
-                facturas_filtradas.append(factura)
-            
-            # Actualizar tabla con facturas filtradas
-            self.facturas = facturas_filtradas
-            self.cargar_datos_tabla()
-            
-            # Actualizar información general
-            total = sum(f.get('importe', 0) for f in facturas_filtradas)
-            info_text = f"Total facturas mostradas: {len(facturas_filtradas)} de {len(self.todas_facturas)} | Importe total: {total:.2f} €"
-            
-            # Buscar el label de información y actualizarlo
-            for child in self.children():
-                if isinstance(child, QLabel) and hasattr(child, 'objectName') and child.objectName() == "info_label":
-                    child.setText(info_text)
-                    break
+            mascara = self.columnas.filtrar(
+                empresa=self.filtro_empresa.text(),
+                cif=self.filtro_cif.text(),
+                estado=None if estado_filtro == "Todos" else estado_filtro,
+                categoria=None if categoria_filtro == "Todas" else categoria_filtro,
+                desde=self.filtro_fecha_desde.date().toPyDate(),
+                hasta=self.filtro_fecha_hasta.date().toPyDate(),
+            )
+            
+            # El proxy muestra solo las facturas filtradas (el modelo no se reconstruye)
+            self.facturas = self.columnas.facturas(mascara)
+            self.proxy.establecer_seleccion(self.columnas.seleccion(mascara))
+            self.actualizar_info(mascara, filtrado=True)
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error aplicando filtros: {str(e)}")
     
+    def exportar_mostradas(self):
+        """Exportar a CSV o Excel las facturas que cumplen los filtros"""
+        controlador = getattr(self.parent(), 'controlador', None)
+        if not controlador:
+            QMessageBox.critical(self, "Error", "Controlador no disponible")
+            return
+        exportar_facturas_a_archivo(self, controlador, self.facturas)
+    
     def limpiar_filtros(self):
         """Limpiar todos los filtros y mostrar todas las facturas"""
         try:
-            self.filtro_empresa.clear()
-            self.filtro_cif.clear()
-            self.filtro_estado.setCurrentText("Todos")
-            self.filtro_categoria.setCurrentText("Todas")
-            self.filtro_fecha_desde.setDate(QDate.currentDate().addDays(-365))
-            self.filtro_fecha_hasta.setDate(QDate.currentDate().addDays(365))
+            # Sin señales: cada cambio volvería a filtrar y recargar la tabla
+            filtros = (self.filtro_empresa, self.filtro_cif, self.filtro_estado, self.filtro_categoria,
+                       self.filtro_fecha_desde, self.filtro_fecha_hasta)
+            for filtro in filtros:
+                filtro.blockSignals(True)
+            try:
+                self.filtro_empresa.clear()
+                self.filtro_cif.clear()
+                self.filtro_estado.setCurrentText("Todos")
+                self.filtro_categoria.setCurrentText("Todas")
+                self.filtro_fecha_desde.setDate(QDate.currentDate().addDays(-365))
+                self.filtro_fecha_hasta.setDate(QDate.currentDate().addDays(365))
+            finally:
+                for filtro in filtros:
+                    filtro.blockSignals(False)
             
             # Restaurar todas las facturas
             self.facturas = self.todas_facturas.copy()
-            self.cargar_datos_tabla()
-            
-            # Actualizar información general
-            total = sum(f.get('importe', 0) for f in self.facturas)
-            info_text = f"Total facturas: {len(self.facturas)} | Importe total: {total:.2f} €"
-            
-            # Buscar el label de información y actualizarlo
-            for child in self.children():
-                if isinstance(child, QLabel) and hasattr(child, 'objectName') and child.objectName() == "info_label":
-                    child.setText(info_text)
-                    break
+            self.proxy.establecer_seleccion(None)
+            self.actualizar_info(self.columnas.todas)
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error limpiando filtros: {str(e)}")
@@ -1520,7 +1496,7 @@ class DialogoTablaResumen(QDialog):
             border-radius: 4px;
         }
         
-        QTableWidget#tabla_facturas {
+        QTableView#tabla_facturas {
             font-size: 7pt;
             gridline-color: #4CAF50;
             background-color: white;
@@ -1530,12 +1506,12 @@ class DialogoTablaResumen(QDialog):
             border-radius: 4px;
         }
         
-        QTableWidget#tabla_facturas::item {
+        QTableView#tabla_facturas::item {
             padding: 4px;
             border: none;
         }
         
-        QTableWidget#tabla_facturas::item:selected {
+        QTableView#tabla_facturas::item:selected {
             background-color: #4CAF50;
             color: white;
         }
@@ -6,9 +6,10 @@ from PyQt5.QtCore import *
 from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import QSpinBox, QWidget  # Import específico para QSpinBox y QWidget
-from PyQt5 import uic
+from PyQt5.QtWidgets import QLineEdit, QTextEdit, QDateEdit, QTimeEdit, QDoubleSpinBox, QComboBox
 from modelos_py import Proyecto, DatosContrato, TipoContrato, Constantes
-from helpers_py import setup_ui_with_new_structure, abrir_archivo
+from helpers_py import setup_ui_with_new_structure, abrir_archivo, cargar_ui
+from perfil_arranque import perfil
 
 
 # PRECARGAR PARA EXE - CRÍTICO PARA PYINSTALLER
@@ -32,6 +33,9 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+# Campos de datos del contrato (los que se cargan, guardan y conectan por pestaña)
+TIPOS_CAMPOS_EDITABLES = (QLineEdit, QTextEdit, QDateEdit, QTimeEdit, QDoubleSpinBox, QSpinBox, QComboBox)
+
 # PRECARGAR OTROS IMPORTS CRÍTICOS
 try:
     from helpers_py import get_ui_file_path, crear_copia_respaldo_proyecto
@@ -68,19 +72,22 @@ class ControladorGrafica(QMainWindow):
         
         if archivo_proyecto:
             self.proyecto_actual = archivo_proyecto
-        self._setup_ui_fast()
+        with perfil.etapa('_setup_ui_fast'):
+            self._setup_ui_fast()
         
         # Para EXE: Inicializar controladores optimizados
-        self._init_controllers_for_exe()
+        with perfil.etapa('_init_controllers_for_exe'):
+            self._init_controllers_for_exe()
         
         # Threading: Ejecutar operaciones pesadas en segundo plano
-        self._init_background_operations()
+        with perfil.etapa('_init_background_operations'):
+            self._init_background_operations()
         
     def _setup_ui_fast(self):
         try:
             ui_file = get_ui_file_path()
             if ui_file:
-                uic.loadUi(ui_file, self)
+                cargar_ui(self, ui_file)
                 self._setup_connections()
                 self._configure_tables()
                 # Configurar icono de ventana inmediatamente
@@ -312,6 +319,8 @@ class ControladorGrafica(QMainWindow):
                 QTimer.singleShot(base_delay + 40, lambda: self._safe_background_call(self.arreglar_botones_ahora))
                 QTimer.singleShot(base_delay + 60, lambda: self._safe_background_call(self._setup_resumen_integrado))
                 QTimer.singleShot(base_delay + 80, lambda: self._safe_background_call(self._load_data))
+                QTimer.singleShot(base_delay + 280, lambda: self._safe_background_call(self._iniciar_precarga_modulos))
+                QTimer.singleShot(base_delay + 2000, lambda: self._safe_background_call(self._iniciar_indexador_firmas))
             else:
                 # Desarrollo: timing conservador para debugging
                 QTimer.singleShot(10, lambda: self._safe_background_call(self._setup_componentes_ui))
@@ -320,14 +329,45 @@ class ControladorGrafica(QMainWindow):
                 QTimer.singleShot(base_delay + 100, lambda: self._safe_background_call(self.arreglar_botones_ahora))
                 QTimer.singleShot(base_delay + 150, lambda: self._safe_background_call(self._setup_resumen_integrado))
                 QTimer.singleShot(base_delay + 200, lambda: self._safe_background_call(self._load_data))
+                QTimer.singleShot(base_delay + 400, lambda: self._safe_background_call(self._iniciar_precarga_modulos))
+                QTimer.singleShot(base_delay + 2000, lambda: self._safe_background_call(self._iniciar_indexador_firmas))
             logger.debug(f"Background operations scheduled (EXE mode: {es_exe})")
         except Exception as e:
             logger.error(f"Error scheduling background operations: {e}")
     
+    def _iniciar_precarga_modulos(self):
+        """Importar en segundo plano los módulos pesados (PDF, Word, Excel, firmas)"""
+        from .controlador_precarga import obtener_precargador
+        precargador = obtener_precargador()
+        precargador.precarga_finalizada.connect(self._guardar_perfil_arranque)
+        precargador.iniciar()
+        if not precargador.en_marcha():
+            # El visor de PDF ya había lanzado y terminado la precarga
+            self._guardar_perfil_arranque()
+        return precargador
+
+    def _guardar_perfil_arranque(self):
+        """Guardar el informe de tiempos de este arranque (una vez, al terminar la precarga)"""
+        from .controlador_precarga import obtener_precargador
+        from .controlador_routes import rutas
+        perfil.guardar(rutas.get_ruta_perfiles_arranque(),
+                       extra={'precarga': obtener_precargador().resumen()})
+
+    def _iniciar_indexador_firmas(self):
+        """Actualizar en segundo plano el índice de firmas de todas las obras"""
+        indexador = getattr(self, '_indexador_firmas', None)
+        if indexador is not None and indexador.isRunning():
+            return indexador
+        from .controlador_indice_firmas import IndexadorFirmas
+        self._indexador_firmas = IndexadorFirmas(parent=self)
+        self._indexador_firmas.start()
+        return self._indexador_firmas
+
     def _safe_background_call(self, func):
         """Ejecutar función de forma segura en segundo plano"""
         try:
-            func()
+            with perfil.etapa(func.__name__):
+                func()
         except Exception as e:
             logger.warning(f"Error in background operation {func.__name__}: {e}")
     
@@ -389,7 +429,7 @@ class ControladorGrafica(QMainWindow):
         try:
             ui_file = get_ui_file_path()
             if ui_file:
-                uic.loadUi(ui_file, self)
+                cargar_ui(self, ui_file)
                 # Animaciones eliminadas - innecesarias para la funcionalidad
             else:
                 self.create_emergency_ui()
@@ -516,22 +556,6 @@ class ControladorGrafica(QMainWindow):
             # logger.error(f"[ControladorGrafica] Error verificando estructura: {e}")
             pass
 
-    def _limpiar_todos_los_widgets(self):
-        self.blockSignals(True)
-        try:
-            for widget in self.findChildren(QLineEdit):
-                widget.clear()
-            for widget in self.findChildren(QTextEdit):
-                widget.clear()
-            for widget in self.findChildren(QDoubleSpinBox):
-                widget.setValue(0.0)
-            for widget in self.findChildren(QDateEdit):
-                widget.setDate(QDate.currentDate())
-        except:
-            pass
-        finally:
-            self.blockSignals(False)
-
     def _inicializar_widgets_vacios(self):
         try:
             self._cargar_todos_los_widgets({})
@@ -539,55 +563,128 @@ class ControladorGrafica(QMainWindow):
             pass
 
     def _cargar_todos_los_widgets(self, contract_data):
+        """Cargar los campos del contrato; de las pestañas solo la visible (las demás al abrirlas)"""
         if hasattr(self, '_cargando_widgets') and self._cargando_widgets:
             return
         self._cargando_widgets = True
         
         try:
-            # LIMPIAR PRIMERO
-            self._limpiar_todos_los_widgets()
-            self.blockSignals(True)
-            
             # LOG DE CAMBIO DE CONTRATO
             nombre_contrato = contract_data.get('nombreObra', 'Sin nombre')
             logger.info(f"[CAMBIO_CONTRATO] 🔄 Cargando widgets para: {nombre_contrato}")
             
-            widgets_tipos = [
-                (QLineEdit, self._cargar_lineedit),
-                (QTextEdit, self._cargar_textedit), 
-                (QDoubleSpinBox, self._cargar_doublespinbox),
-                (QSpinBox, self._cargar_spinbox),
-                (QDateEdit, self._cargar_dateedit)
-            ]
-            
-            # CARGAR TODOS LOS WIDGETS CON LOG
-            for widget_type, metodo_carga in widgets_tipos:
-                for widget in self.findChildren(widget_type):
-                    if widget.objectName() and not widget.objectName().startswith('qt_'):
-                        metodo_carga(widget, contract_data)
-            
-            # VERIFICAR CAMPOS CRÍTICOS DESPUÉS DE LA CARGA
-            self._verificar_campos_criticos_post_carga(contract_data)
+            pestanas = self.pestanas_diferidas
+            self._cargar_campos([None], contract_data)
+            pestanas.nuevo_contrato(contract_data)
+            pestanas.activar(self.tabWidget.currentWidget().objectName())
             
             # FORZAR ACTUALIZACIÓN VISUAL
             self.update()
                         
-        except:
-            pass
+        except Exception as e:
+            logger.error(f"[CAMBIO_CONTRATO] Error cargando widgets: {e}")
         finally:
-            self.blockSignals(False)
             self._cargando_widgets = False
     
-    def _verificar_campos_criticos_post_carga(self, contract_data):
+    def _cargar_campos(self, pestanas, contract_data):
+        """Mostrar el contrato en los campos de las pestañas indicadas (solo cambian los distintos)"""
+        self.blockSignals(True)
+        try:
+            cambiados = self.registro_campos.cargar(contract_data, pestanas)
+            logger.debug(f"[CAMBIO_CONTRATO] {len(cambiados)} campos cambiados en {pestanas}")
+            
+            # VERIFICAR CAMPOS CRÍTICOS DESPUÉS DE LA CARGA
+            self._verificar_campos_criticos_post_carga(contract_data, self.registro_campos.widgets(pestanas))
+        finally:
+            self.blockSignals(False)
+    
+    def _cargar_campos_sin_senales(self, pestanas, contract_data):
+        """Cargar los campos sin disparar sus eventos (ni cálculos ni guardados)"""
+        widgets = self.registro_campos.widgets(pestanas)
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            self._cargar_campos(pestanas, contract_data)
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+    
+    # =================== REGISTRO DE CAMPOS Y CARGA DIFERIDA DE PESTAÑAS ===================
+    
+    @property
+    def registro_campos(self):
+        """Campos del contrato vinculados a sus widgets (se construye una vez, al configurar la UI)"""
+        if getattr(self, '_registro_campos', None) is None:
+            from .controlador_vinculos_campos import RegistroCampos, adaptador_qt
+            
+            paginas = {self.tabWidget.widget(i): self.tabWidget.widget(i).objectName()
+                       for i in range(self.tabWidget.count())}
+            self._registro_campos = RegistroCampos.construir(
+                self.findChildren(TIPOS_CAMPOS_EDITABLES), paginas, lambda w: w.parent(), adaptador_qt
+            )
+            logger.info(f"[ControladorGrafica] {len(self._registro_campos)} campos vinculados")
+        return self._registro_campos
+    
+    @property
+    def pestanas_diferidas(self):
+        """Estado de carga de las pestañas (se crea al cargar el primer contrato)"""
+        if getattr(self, '_pestanas_diferidas', None) is None:
+            from .controlador_pestanas import CargaDiferidaPestanas
+            
+            self._pestanas_diferidas = CargaDiferidaPestanas(
+                self.registro_campos.claves_pestanas, conectar=self._conectar_pestana, poblar=self._poblar_pestana
+            )
+        return self._pestanas_diferidas
+    
+    def _conectar_pestana(self, clave):
+        """Primera apertura de una pestaña: conectar los eventos de sus campos"""
+        if hasattr(self, 'controlador_eventos_ui') and self.controlador_eventos_ui:
+            widgets = self.registro_campos.widgets([clave])
+            self.controlador_eventos_ui.conectar_widgets_generales(widgets)
+            self.controlador_eventos_ui.configurar_eventos_perdida_foco(widgets)
+    
+    def _poblar_pestana(self, clave, contract_data):
+        """Primera apertura de una pestaña tras cambiar de contrato: cargar sus campos sin eventos"""
+        autosave = getattr(self, 'controlador_autosave', None)
+        if autosave:
+            autosave.iniciar_carga_datos()
+        try:
+            self._cargar_campos_sin_senales([clave], contract_data)
+            
+            # Sin eventos en la carga, los cálculos que dependen de la pestaña se hacen aquí
+            if hasattr(self, 'controlador_eventos_ui') and self.controlador_eventos_ui:
+                self.controlador_eventos_ui.recalcular_campos_cargados(
+                    self.registro_campos.widgets([clave]), contract_data
+                )
+        except Exception as e:
+            logger.error(f"[CAMBIO_CONTRATO] Error cargando pestaña {clave}: {e}")
+        finally:
+            if autosave:
+                autosave.finalizar_carga_datos()
+    
+    def asegurar_pestanas_cargadas(self):
+        """Rellenar ya las pestañas pendientes (antes de un cálculo que lee campos de otras)"""
+        if getattr(self, '_pestanas_diferidas', None) is not None:
+            self._pestanas_diferidas.poblar_todas()
+    
+    def widgets_campos_cargados(self):
+        """Campos que ya muestran el contrato actual (fuera de pestañas y pestañas rellenadas)"""
+        return self.registro_campos.widgets([None, *self.pestanas_diferidas.pobladas])
+    
+    def widgets_campos_conectados(self):
+        """Campos cuyos eventos deben estar conectados (fuera de pestañas y pestañas ya abiertas)"""
+        return self.registro_campos.widgets([None, *self.pestanas_diferidas.conectadas])
+    
+    def _verificar_campos_criticos_post_carga(self, contract_data, widgets):
         """Verificar y mostrar estado de campos críticos después de la carga"""
         try:
             logger.debug(f"[CAMBIO_CONTRATO] 🔍 VERIFICANDO CAMPOS CRÍTICOS TRAS CARGA:")
             
             campos_criticos = ['plazoEjecucion', 'numEmpresasPresentadas', 'numEmpresasSolicitadas', 'basePresupuesto', 'precioAdjudicacion']
             
-            for campo in campos_criticos:
-                widget = self.findChild(QWidget, campo)
-                if widget:
+            for widget in widgets:
+                campo = widget.objectName()
+                if campo in campos_criticos:
                     tipo_widget = type(widget).__name__
                     valor_json = contract_data.get(campo, '')
                     
@@ -654,85 +751,6 @@ class ControladorGrafica(QMainWindow):
             logger.error(f"[CAMBIO_CONTRATO] Error calculando empresas presentadas: {e}")
             return 0
 
-    def _cargar_lineedit(self, widget, contract_data):
-        try:
-            valor = str(contract_data.get(widget.objectName(), ''))
-            widget.setText(valor)
-            # LOGGING ESPECIAL para campos críticos que son QLineEdit
-            if widget.objectName() in ['numEmpresasPresentadas', 'numEmpresasSolicitadas']:
-                logger.info(f"[CAMBIO_CONTRATO] QLineEdit {widget.objectName()}: '{valor}' (CRÍTICO)")
-                # Si está vacío, intentar cargar desde tabla de empresas
-                if not valor and widget.objectName() == 'numEmpresasPresentadas':
-                    valor_calculado = self._calcular_num_empresas_presentadas()
-                    if valor_calculado:
-                        widget.setText(str(valor_calculado))
-                        logger.info(f"[CAMBIO_CONTRATO] AUTO-CALCULADO numEmpresasPresentadas: '{valor_calculado}'")
-            elif valor:  # Solo mostrar si tiene valor
-                logger.info(f"[CAMBIO_CONTRATO] QLineEdit {widget.objectName()}: '{valor}'")
-        except:
-            pass
-            
-    def _cargar_textedit(self, widget, contract_data):
-        try:
-            valor = str(contract_data.get(widget.objectName(), ''))
-            widget.setPlainText(valor)
-            if valor:  # Solo mostrar si tiene valor
-                logger.info(f"[CAMBIO_CONTRATO] QTextEdit {widget.objectName()}: '{valor[:50]}{'...' if len(valor) > 50 else ''}'")
-        except:
-            pass
-            
-    def _cargar_doublespinbox(self, widget, contract_data):
-        try:
-            nombre_widget = widget.objectName()
-            valor_json = contract_data.get(nombre_widget, 0)
-            
-            # Convertir a float de forma segura
-            try:
-                valor = float(str(valor_json)) if valor_json else 0.0
-            except (ValueError, TypeError):
-                valor = 0.0
-            
-            widget.setValue(valor)
-            
-            # Mostrar log para todos los QDoubleSpinBox
-            logger.info(f"[CAMBIO_CONTRATO] QDoubleSpinBox {nombre_widget}: '{valor}'")
-            
-        except Exception as e:
-            logger.error(f"[CAMBIO_CONTRATO] Error cargando QDoubleSpinBox {widget.objectName()}: {e}")
-            widget.setValue(0.0)
-            
-    def _cargar_spinbox(self, widget, contract_data):
-        try:
-            nombre_widget = widget.objectName()
-            valor_json = contract_data.get(nombre_widget, 0)
-            
-            # Convertir a entero de forma segura
-            try:
-                valor = int(float(str(valor_json))) if valor_json else 0
-            except (ValueError, TypeError):
-                valor = 0
-            
-            widget.setValue(valor)
-            
-            # LOGGING ESPECIAL para campos críticos
-            if nombre_widget in ['numEmpresasPresentadas', 'numEmpresasSolicitadas', 'plazoEjecucion']:
-                logger.info(f"[CAMBIO_CONTRATO] QSpinBox {nombre_widget}: '{valor}' (CRÍTICO)")
-            elif valor != 0:  # Solo mostrar si tiene valor
-                logger.info(f"[CAMBIO_CONTRATO] QSpinBox {nombre_widget}: '{valor}'")
-                
-        except Exception as e:
-            logger.error(f"[CAMBIO_CONTRATO] Error cargando QSpinBox {widget.objectName()}: {e}")
-            widget.setValue(0)
-            
-    def _cargar_dateedit(self, widget, contract_data):
-        try:
-            valor = contract_data.get(widget.objectName(), '')
-            if valor:
-                fecha = datetime.strptime(valor, "%Y-%m-%d").date()
-                widget.setDate(QDate(fecha.year, fecha.month, fecha.day))
-        except:
-            pass
-        
     def _cargar_timeedit(self, widget, contract_data):
         """Cargar QTimeEdit optimizado"""
         try:
@@ -1214,7 +1232,8 @@ class ControladorGrafica(QMainWindow):
             # 7. Inicializar UI
             self._initialize_ui()
             
-            # 8. Configurar auto-guardado
+            # 8. Vincular los campos del contrato (una vez) y configurar auto-guardado
+            self.registro_campos
             self._configurar_auto_guardado()
             
             # 9. Configurar cambios de pestañas
@@ -1352,7 +1371,15 @@ class ControladorGrafica(QMainWindow):
     def on_tab_changed(self, index):
         """Manejar cambio de pestañas"""
         try:
-            if not hasattr(self, 'tabWidget') or not self.contract_manager:
+            if not hasattr(self, 'tabWidget'):
+                return
+            
+            # Primera vez que se abre la pestaña: conectar y rellenar sus campos
+            pagina = self.tabWidget.widget(index)
+            if pagina is not None:
+                self.pestanas_diferidas.activar(pagina.objectName())
+            
+            if not self.contract_manager:
                 return
                 
             contrato_actual = self.contract_manager.get_current_contract()
@@ -2269,6 +2296,26 @@ class ControladorGrafica(QMainWindow):
             pass
             QMessageBox.critical(self, "Error", f"Error inesperado al borrar contrato: {str(e)}")
 
+    def mostrar_pendientes_firma(self):
+        """Mostrar documentos pendientes de firma de todas las obras"""
+        try:
+            from .dialogo_pendientes_firma import DialogoPendientesFirma
+            dialogo = DialogoPendientesFirma(self)
+            dialogo.exec_()
+        except Exception as e:
+            logger.error(f"Error mostrando pendientes de firma: {e}")
+            QMessageBox.critical(self, "Error", f"Error mostrando pendientes de firma:\n{str(e)}")
+
+    def mostrar_busqueda_texto(self):
+        """Buscar texto en los PDFs de todas las obras"""
+        try:
+            from .dialogo_busqueda_texto import DialogoBusquedaTexto
+            dialogo = DialogoBusquedaTexto(self, getattr(self, 'pdf_viewer', None))
+            dialogo.exec_()
+        except Exception as e:
+            logger.error(f"Error mostrando búsqueda de texto: {e}")
+            QMessageBox.critical(self, "Error", f"Error mostrando búsqueda de texto:\n{str(e)}")
+
     def abrir_editor_firmantes(self):
         """Abrir popup editor de firmantes"""
         try:
@@ -2487,6 +2534,17 @@ class ControladorGrafica(QMainWindow):
             if hasattr(self, 'controlador_autosave') and self.controlador_autosave:
                 self.controlador_autosave.forzar_guardado_completo()
             
+            indexador = getattr(self, '_indexador_firmas', None)
+            if indexador is not None and indexador.isRunning():
+                indexador.detener()
+
+            pdf_viewer = getattr(self, 'pdf_viewer', None)
+            if pdf_viewer is not None:
+                pdf_viewer.detener_tareas()
+
+            from .controlador_precarga import obtener_precargador
+            obtener_precargador().detener()
+
             if self.proyecto_actual:
                 self._crear_copia_respaldo()
             event.accept()
@@ -2543,6 +2601,8 @@ class ControladorGrafica(QMainWindow):
                 'actionClonar_Proyecto': self.mostrar_dialogo_clonar_contrato,
                 'actionCambiar_tipo': self._cambiar_tipo_contrato,
                 'actionEditar_firmantes': self.abrir_editor_firmantes,
+                'actionPendientes_firma': self.mostrar_pendientes_firma,
+                'actionBuscar_texto_pdf': self.mostrar_busqueda_texto,
                 'actioninformacion_general': self.mostrar_informacion_general,
                 'actioncuadroi_general': self.mostrar_cuadro_general,
                 'actionSobre_auttor': self.mostrar_sobre_autor,
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Índice de seguimiento de firmas de todas las obras
+Un indexador en segundo plano recorre la carpeta de obras y mantiene en disco el
+estado de firma de cada fase, para que el cuadro de pendientes abra al instante
+"""
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QCoreApplication, QThread, pyqtSignal, pyqtSlot
+
+from .controlador_escaneo_firmas import (
+    CARPETA_DOCUMENTACION_FINALES, CARPETA_PROYECTO, crear_pool_procesos, extraer_firmas_en_paralelo
+)
+from .controlador_resumen import MAPEO_ARCHIVOS_PDF_FASES
+
+logger = logging.getLogger(__name__)
+
+CARPETA_DOCUMENTOS_SIN_FIRMAR = "04-documentos-sin-firmar"
+
+# Estados de una fase en el índice
+ESTADO_FIRMADO = "firmado"          # PDF final con al menos una firma digital
+ESTADO_SIN_FIRMAS = "sin_firmas"    # PDF final sin firmas detectadas
+ESTADO_SIN_FIRMAR = "sin_firmar"    # Solo existe el borrador generado
+
+SIN_FIRMANTES = "Sin firmantes registrados"
+
+
+def determinar_fase_archivo(nombre_archivo: str, mapeo_fases: dict = None) -> Optional[str]:
+    """Fase a la que pertenece un archivo según su nombre, o None si no encaja"""
+    nombre_lower = nombre_archivo.lower()
+    for fase, palabras_clave in (mapeo_fases or MAPEO_ARCHIVOS_PDF_FASES).items():
+        for palabra in palabras_clave:
+            if palabra in nombre_lower:
+                return fase
+    return None
+
+
+class IndiceFirmas:
+    """Estado de firma por obra y fase, persistido en JSON"""
+
+    VERSION = 1
+
+    def __init__(self, archivo_indice: str = None):
+        if archivo_indice:
+            self.archivo_indice = archivo_indice
+        else:
+            from .controlador_routes import rutas
+            self.archivo_indice = rutas.get_ruta_indice_firmas()
+        self.obras: Dict[str, dict] = {}
+        self.actualizado: Optional[str] = None
+        self._modificado = False
+        self.cargar()
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo_indice):
+                with open(self.archivo_indice, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self.obras = data.get('obras', {})
+                    self.actualizado = data.get('actualizado')
+                else:
+                    logger.info("Versión de índice de firmas distinta, se descarta")
+                    self.obras = {}
+            else:
+                self.obras = {}
+        except Exception as e:
+            logger.error(f"Error cargando índice de firmas: {e}")
+            self.obras = {}
+        self._modificado = False
+
+    def guardar(self) -> bool:
+        """Persiste el índice si ha cambiado (escritura atómica)"""
+        if not self._modificado:
+            return True
+        try:
+            directorio = os.path.dirname(self.archivo_indice)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+
+            self.actualizado = datetime.now().isoformat(timespec='seconds')
+            ruta_temporal = self.archivo_indice + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': self.VERSION,
+                    'actualizado': self.actualizado,
+                    'obras': self.obras
+                }, f, ensure_ascii=False, indent=1)
+            os.replace(ruta_temporal, self.archivo_indice)
+
+            self._modificado = False
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando índice de firmas: {e}")
+            return False
+
+    # =================== INDEXADO ===================
+
+    def indexar_obra(self, carpeta_obra: str,
+                     extraer: Callable[[List[str]], Dict[str, list]] = extraer_firmas_en_paralelo) -> bool:
+        """
+        Actualiza la entrada de una obra. Solo se parsean los PDFs nuevos o modificados
+
+        Los PDFs que `extraer` no devuelve (no se pudieron leer o se canceló) quedan sin
+        firmas y sin registrar, y la obra se vuelve a revisar en el siguiente recorrido
+
+        Returns:
+            bool: True si la entrada de la obra ha cambiado
+        """
+        nombre_obra = os.path.basename(os.path.normpath(carpeta_obra))
+        archivos = self._listar_archivos(carpeta_obra)
+        huella = sorted([rel, datos['tamano'], datos['mtime']] for rel, datos in archivos.items())
+
+        anterior = self.obras.get(nombre_obra, {})
+        if anterior.get('huella') == huella:
+            return False
+
+        # Reaprovechar firmas de PDFs sin cambios
+        archivos_previos = anterior.get('archivos', {})
+        pendientes = {}
+        for rel, datos in archivos.items():
+            if not datos['pdf_final']:
+                continue
+            previo = archivos_previos.get(rel)
+            if previo and previo['tamano'] == datos['tamano'] and previo['mtime'] == datos['mtime']:
+                datos['firmas'] = previo.get('firmas', [])
+            else:
+                pendientes[os.path.join(carpeta_obra, rel)] = datos
+
+        sin_leer = False
+        if pendientes:
+            extraidas = extraer(list(pendientes)) or {}
+            for ruta_pdf, datos in pendientes.items():
+                if ruta_pdf in extraidas:
+                    datos['firmas'] = extraidas[ruta_pdf]
+                else:
+                    datos['sin_leer'] = True
+                    sin_leer = True
+
+        self.obras[nombre_obra] = self._construir_entrada(archivos, None if sin_leer else huella)
+        self._modificado = True
+        return True
+
+    def eliminar_obras_inexistentes(self, nombres_obra: List[str]) -> int:
+        """Quita del índice las obras que ya no están en la carpeta de obras"""
+        existentes = set(nombres_obra)
+        eliminadas = [nombre for nombre in self.obras if nombre not in existentes]
+        for nombre in eliminadas:
+            del self.obras[nombre]
+        if eliminadas:
+            self._modificado = True
+        return len(eliminadas)
+
+    def _listar_archivos(self, carpeta_obra: str) -> Dict[str, dict]:
+        """Archivos relevantes de la obra: ruta relativa -> stat y fase"""
+        archivos = {}
+        fuentes = [
+            (CARPETA_DOCUMENTACION_FINALES, True),
+            (CARPETA_PROYECTO, True),
+            (CARPETA_DOCUMENTOS_SIN_FIRMAR, False),
+        ]
+        for subcarpeta, pdf_final in fuentes:
+            ruta_subcarpeta = os.path.join(carpeta_obra, subcarpeta)
+            if not os.path.isdir(ruta_subcarpeta):
+                continue
+            for archivo in sorted(os.listdir(ruta_subcarpeta)):
+                nombre_lower = archivo.lower()
+                if archivo.startswith('~$'):
+                    continue
+                if pdf_final:
+                    if not nombre_lower.endswith('.pdf'):
+                        continue
+                    if subcarpeta == CARPETA_PROYECTO and 'proyecto' not in nombre_lower:
+                        continue
+                elif not nombre_lower.endswith(('.pdf', '.docx')):
+                    continue
+
+                fase = 'CREACION' if subcarpeta == CARPETA_PROYECTO else determinar_fase_archivo(archivo)
+                if not fase:
+                    continue
+                try:
+                    stat = os.stat(os.path.join(ruta_subcarpeta, archivo))
+                except OSError:
+                    continue
+                archivos[f"{subcarpeta}/{archivo}"] = {
+                    'tamano': stat.st_size,
+                    'mtime': stat.st_mtime_ns,
+                    'fase': fase,
+                    'pdf_final': pdf_final,
+                    'firmas': []
+                }
+        return archivos
+
+    def _construir_entrada(self, archivos: Dict[str, dict], huella: list) -> dict:
+        """Resume los archivos de una obra en estado por fase"""
+        firmantes = []
+        for datos in archivos.values():
+            for firma in datos['firmas']:
+                firmante = firma.get('firmante')
+                if firmante and firmante not in firmantes:
+                    firmantes.append(firmante)
+
+        fases = {}
+        for rel, datos in archivos.items():
+            if datos['pdf_final']:
+                estado = ESTADO_FIRMADO if datos['firmas'] else ESTADO_SIN_FIRMAS
+            else:
+                estado = ESTADO_SIN_FIRMAR
+            actual = fases.get(datos['fase'])
+            # Prioridad: firmado > PDF final sin firmas > borrador
+            if actual and self._prioridad(actual['estado']) >= self._prioridad(estado):
+                continue
+            firmado_por = [f.get('firmante') for f in datos['firmas'] if f.get('firmante')]
+            fases[datos['fase']] = {
+                'archivo': rel,
+                'estado': estado,
+                'firmas': datos['firmas'],
+                'faltan': [f for f in firmantes if f not in firmado_por] if estado == ESTADO_FIRMADO else list(firmantes)
+            }
+
+        return {
+            'actualizado': datetime.now().isoformat(timespec='seconds'),
+            'huella': huella,
+            'archivos': {
+                rel: {'tamano': d['tamano'], 'mtime': d['mtime'], 'firmas': d['firmas']}
+                for rel, d in archivos.items() if d['pdf_final'] and not d.get('sin_leer')
+            },
+            'firmantes': firmantes,
+            'fases': fases
+        }
+
+    @staticmethod
+    def _prioridad(estado: str) -> int:
+        return {ESTADO_SIN_FIRMAR: 0, ESTADO_SIN_FIRMAS: 1, ESTADO_FIRMADO: 2}.get(estado, 0)
+
+    # =================== CONSULTAS ===================
+
+    def pendientes_de_firma(self) -> List[dict]:
+        """Fases de todas las obras que aún no tienen firma, ordenadas por obra y fase"""
+        orden_fases = list(MAPEO_ARCHIVOS_PDF_FASES)
+        pendientes = []
+        for nombre_obra in sorted(self.obras):
+            entrada = self.obras[nombre_obra]
+            for fase, datos in entrada.get('fases', {}).items():
+                if datos.get('estado') == ESTADO_FIRMADO:
+                    continue
+                pendientes.append({
+                    'obra': nombre_obra,
+                    'fase': fase,
+                    'archivo': os.path.basename(datos.get('archivo', '')),
+                    'estado': datos.get('estado'),
+                    'faltan': datos.get('faltan') or [SIN_FIRMANTES]
+                })
+        pendientes.sort(key=lambda p: (
+            p['obra'], orden_fases.index(p['fase']) if p['fase'] in orden_fases else len(orden_fases)
+        ))
+        return pendientes
+
+    def pendientes_por_firmante(self) -> Dict[str, List[dict]]:
+        """Agrupa los pendientes por la persona cuya firma se espera"""
+        agrupados: Dict[str, List[dict]] = {}
+        for pendiente in self.pendientes_de_firma():
+            for firmante in pendiente['faltan']:
+                agrupados.setdefault(firmante, []).append(pendiente)
+        return agrupados
+
+
+class IndexadorFirmas(QThread):
+    """
+    Recorre todas las obras en segundo plano y actualiza el índice de firmas
+
+    Las firmas ya conocidas se consultan en una instantánea de la cache compartida tomada al
+    crearlo; las que extrae el recorrido llegan por firmas_extraidas y se registran y guardan
+    en la cache desde el hilo de la GUI (el hilo del recorrido nunca la toca)
+    """
+
+    obra_indexada = pyqtSignal(str)
+    firmas_extraidas = pyqtSignal(str, object)  # ruta del PDF, lista de firmas
+    finalizado = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, ruta_obras: str = None, archivo_indice: str = None,
+                 cache=None, parent=None):
+        super().__init__(parent)
+        self.ruta_obras = ruta_obras
+        self.archivo_indice = archivo_indice
+        self._cancelado = False
+        self._pool = None
+        if cache is None:
+            from .controlador_cache_firmas import obtener_cache_firmas
+            cache = obtener_cache_firmas()
+        self._cache = cache
+        self._firmas_conocidas = cache.instantanea()
+        # El QThread vive en el hilo de la GUI: estos slots se ejecutan allí, en orden de emisión
+        self.firmas_extraidas.connect(self._registrar_en_cache)
+        self.finalizado.connect(self._guardar_cache)
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def detener(self):
+        """Cancelar, esperar al hilo y registrar en la cache las firmas que aún estaban en cola"""
+        self.cancelar()
+        self.wait()  # sin límite: no se destruye el hilo en marcha
+        QCoreApplication.sendPostedEvents(self, 0)
+
+    @pyqtSlot(str, object)
+    def _registrar_en_cache(self, ruta_pdf: str, firmas: list):
+        self._cache.registrar(ruta_pdf, firmas)
+
+    @pyqtSlot(object)
+    def _guardar_cache(self, _indice=None):
+        self._cache.guardar()
+
+    def _extraer(self, rutas_pdf: List[str]) -> Dict[str, list]:
+        """Firmas desde la instantánea de la cache; el resto se reparte en el pool del recorrido"""
+        from .controlador_cache_firmas import firmas_en_instantanea
+        firmas_por_ruta = {}
+        pendientes = []
+        for ruta_pdf in rutas_pdf:
+            firmas = firmas_en_instantanea(self._firmas_conocidas, ruta_pdf)
+            if firmas is None:
+                pendientes.append(ruta_pdf)
+            else:
+                firmas_por_ruta[ruta_pdf] = firmas
+
+        if pendientes:
+            extraidas = extraer_firmas_en_paralelo(
+                pendientes, 1 if self._pool is None else None,
+                cancelado=lambda: self._cancelado, executor=self._pool
+            )
+            for ruta_pdf, firmas in extraidas.items():
+                self.firmas_extraidas.emit(ruta_pdf, firmas)
+                firmas_por_ruta[ruta_pdf] = firmas
+        return firmas_por_ruta
+
+    def run(self):
+        indice = None
+        try:
+            if not self.ruta_obras:
+                from .controlador_routes import rutas
+                self.ruta_obras = rutas.get_ruta_carpeta_obras()
+
+            indice = IndiceFirmas(self.archivo_indice)
+            nombres_obra = sorted(
+                nombre for nombre in os.listdir(self.ruta_obras)
+                if os.path.isdir(os.path.join(self.ruta_obras, nombre))
+            ) if os.path.isdir(self.ruta_obras) else []
+
+            # Un solo pool para todas las obras (sus procesos arrancan con el primer PDF pendiente)
+            self._pool = crear_pool_procesos()
+            try:
+                for nombre_obra in nombres_obra:
+                    if self._cancelado:
+                        break
+                    try:
+                        if indice.indexar_obra(os.path.join(self.ruta_obras, nombre_obra), self._extraer):
+                            self.obra_indexada.emit(nombre_obra)
+                    except Exception as e:
+                        logger.error(f"Error indexando firmas de {nombre_obra}: {e}")
+            finally:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=True, cancel_futures=True)
+                    self._pool = None
+
+            if not self._cancelado:
+                indice.eliminar_obras_inexistentes(nombres_obra)
+            indice.guardar()
+            logger.info(f"Índice de firmas actualizado: {len(indice.obras)} obras")
+        except Exception as e:
+            logger.error(f"Error en indexador de firmas: {e}")
+            self.error.emit(str(e))
+        finally:
+            self.finalizado.emit(indice)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+controlador_informe_facturas.py - Informe Word de facturas directas
+- La portada y la cabecera de la tabla se crean con python-docx; las filas de datos
+  se generan como XML a partir de plantillas de fila ya formateadas (una por color
+  de estado) y se insertan por bloques, sin crear celdas/runs uno a uno
+- Con muchas facturas el informe se divide en varios archivos (partes); si se cancela o
+  falla se borran las ya guardadas
+- HiloInformeFacturas lo genera fuera del hilo de la interfaz informando del progreso real
+"""
+
+import os
+import re
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+try:
+    from docx import Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.table import WD_TABLE_ALIGNMENT
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls, qn
+    from docx.oxml.shared import OxmlElement
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Columnas de la tabla: (cabecera, ancho, centrada)
+COLUMNAS_INFORME = [
+    ('ID', 0.5, True),
+    ('Empresa', 1.5, False),
+    ('CIF', 1.0, False),
+    ('Importe', 0.8, True),
+    ('Estado', 1.0, True),
+    ('Categoría', 1.0, False),
+    ('Localidad', 1.0, False),
+    ('Fecha Valid.', 1.0, False),
+]
+# Color del texto de la columna Estado
+COLORES_ESTADO = {
+    'Pagada': '4CAF50',
+    'Con deficiencias': 'F44336',
+    'Tramitada': 'FF9800',
+}
+# Facturas por archivo (por encima se divide el informe en partes)
+FACTURAS_POR_ARCHIVO = 5000
+# Filas que se convierten a XML e insertan de una vez
+FILAS_POR_BLOQUE = 500
+
+# Caracteres de control que no admite XML 1.0
+_CARACTERES_NO_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _texto_xml(valor) -> str:
+    return escape(_CARACTERES_NO_XML.sub('', str(valor)))
+
+
+def _celda_xml(ancho: float, centrada: bool, color: Optional[str], texto: str) -> str:
+    """Celda con el mismo formato que se le daba con python-docx (9 pt, alineación y color)"""
+    alineacion = 'center' if centrada else 'left'
+    color_xml = f'<w:color w:val="{color}"/>' if color else ''
+    return (f'<w:tc><w:tcPr><w:tcW w:w="{int(ancho * 1440)}" w:type="dxa"/></w:tcPr>'
+            f'<w:p><w:pPr><w:jc w:val="{alineacion}"/></w:pPr>'
+            f'<w:r><w:rPr>{color_xml}<w:sz w:val="18"/></w:rPr>'
+            f'<w:t xml:space="preserve">{texto}</w:t></w:r></w:p></w:tc>')
+
+
+def plantilla_fila(estado: str) -> str:
+    """Plantilla XML de una fila (str.format con c0..c7) para facturas de ese estado"""
+    celdas = []
+    for i, (_, ancho, centrada) in enumerate(COLUMNAS_INFORME):
+        color = COLORES_ESTADO.get(estado) if i == 4 else None
+        # Las llaves del XML no se usan; solo las de los huecos
+        celdas.append(_celda_xml(ancho, centrada, color, f'{{c{i}}}'))
+    return '<w:tr>' + ''.join(celdas) + '</w:tr>'
+
+
+def _importe(valor) -> str:
+    try:
+        return f"{float(valor or 0):.2f} €"
+    except (ValueError, TypeError):
+        return f"{valor} €"
+
+
+class GeneradorInformeFacturas:
+    """
+    Genera el informe Word de una lista de facturas (en uno o varios archivos)
+
+    Args:
+        facturas: facturas a listar, en orden
+        analitica: AnaliticaFacturas de esas mismas facturas (portada)
+        directorio: carpeta donde se guardan los .docx
+        facturas_por_archivo: máximo de filas por archivo (0: sin dividir)
+    """
+
+    def __init__(self, facturas: List[Dict], analitica, directorio: str,
+                 facturas_por_archivo: int = FACTURAS_POR_ARCHIVO):
+        self.facturas = list(facturas)
+        self.directorio = directorio
+        self.facturas_por_archivo = facturas_por_archivo
+        # Los acumulados se copian aquí (hilo de la interfaz): después pueden seguir cambiando
+        self.total = analitica.total()
+        self.por_estado = analitica.totales_por('estado')
+        self.por_anio = analitica.serie('anio')
+        self._plantillas: Dict[str, str] = {}
+        self.fecha_actual = ""
+
+    # =================== PARTES ===================
+
+    def partes(self) -> List[List[Dict]]:
+        """Facturas de cada archivo"""
+        if not self.facturas_por_archivo or len(self.facturas) <= self.facturas_por_archivo:
+            return [self.facturas]
+        return [self.facturas[i:i + self.facturas_por_archivo]
+                for i in range(0, len(self.facturas), self.facturas_por_archivo)]
+
+    def generar(self, progreso: Callable[[int, int, str], None] = None,
+                cancelado: Callable[[], bool] = None) -> List[str]:
+        """
+        Generar y guardar el informe; devuelve las rutas de los archivos
+
+        progreso(hechas, total, mensaje) se llama por cada bloque de filas y cada archivo
+        guardado; si cancelado() devuelve True o hay un error se borran las partes ya
+        guardadas (un informe incompleto no queda en disco)
+        """
+        if not DOCX_AVAILABLE:
+            raise ImportError("python-docx no está disponible")
+
+        rutas = []
+        try:
+            completo = self._generar_partes(rutas, progreso, cancelado)
+        except BaseException:
+            self._borrar_partes(rutas)
+            raise
+        if not completo:
+            self._borrar_partes(rutas)
+        return rutas
+
+    def _generar_partes(self, rutas: List[str], progreso=None, cancelado=None) -> bool:
+        """Guardar las partes (añadiendo cada ruta a rutas); False si se canceló antes de terminar"""
+        partes = self.partes()
+        total = len(self.facturas) + len(partes)
+        hechas = 0
+        marca_tiempo = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M")
+        for numero_parte, facturas_parte in enumerate(partes, 1):
+            doc = Document()
+            self._portada(doc, numero_parte, len(partes))
+            tabla = self._tabla(doc) if facturas_parte else None
+            for inicio in range(0, len(facturas_parte), FILAS_POR_BLOQUE):
+                if cancelado and cancelado():
+                    return False
+                bloque = facturas_parte[inicio:inicio + FILAS_POR_BLOQUE]
+                self._agregar_filas(tabla, bloque)
+                hechas += len(bloque)
+                if progreso:
+                    progreso(hechas, total, f"Generando parte {numero_parte} de {len(partes)}...")
+            self._pie(doc)
+
+            if cancelado and cancelado():
+                return False
+            if progreso:
+                progreso(hechas, total, f"Guardando parte {numero_parte} de {len(partes)}...")
+            sufijo = f"_parte{numero_parte}de{len(partes)}" if len(partes) > 1 else ""
+            ruta = os.path.join(self.directorio, f"Informe_Facturas_ADIF_{marca_tiempo}{sufijo}.docx")
+            doc.save(ruta)
+            logger.info(f"Informe guardado: {ruta}")
+            rutas.append(ruta)
+            hechas += 1
+            if progreso:
+                progreso(hechas, total, f"Parte {numero_parte} de {len(partes)} guardada")
+        return True
+
+    @staticmethod
+    def _borrar_partes(rutas: List[str]):
+        for ruta in rutas:
+            try:
+                os.remove(ruta)
+                logger.info(f"Parte de informe incompleto borrada: {ruta}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"No se pudo borrar {ruta}: {e}")
+        rutas.clear()
+
+    # =================== DOCUMENTO ===================
+
+    def _portada(self, doc, numero_parte: int, total_partes: int):
+        """Título, totales y resúmenes por estado y año (de todas las facturas, en cada parte)"""
+        titulo = doc.add_heading('', 0)
+        titulo_run = titulo.runs[0] if titulo.runs else titulo.add_run()
+        titulo.text = "INFORME DE FACTURAS DIRECTAS"
+        titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        titulo_run.font.size = Pt(20)
+        titulo_run.font.color.rgb = RGBColor(46, 125, 50)  # Verde ADIF
+        titulo_run.bold = True
+
+        subtitulo = doc.add_heading('Sistema de Administración ADIF', 2)
+        subtitulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        subtitulo.runs[0].font.color.rgb = RGBColor(27, 94, 32)  # Verde oscuro ADIF
+
+        doc.add_paragraph()
+        doc.add_paragraph()
+
+        total_facturas, total_importe = self.total
+        lineas = [
+            f"📅 Fecha de generación: {self.fecha_actual}",
+            f"📊 Total de facturas: {total_facturas}",
+            f"💰 Importe total: {total_importe:.2f} €",
+        ]
+        if total_partes > 1:
+            lineas.append(f"📑 Parte {numero_parte} de {total_partes}")
+        info_para = doc.add_paragraph()
+        info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        info_run = info_para.add_run("\n".join(lineas))
+        info_run.font.size = Pt(12)
+        info_run.font.color.rgb = RGBColor(56, 142, 60)  # Verde info ADIF
+
+        doc.add_paragraph()
+        resumen_para = doc.add_heading('📈 Resumen por Estado', 3)
+        resumen_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        for estado, (cantidad, _) in self.por_estado.items():
+            estado_para = doc.add_paragraph(f"• {estado or 'Sin estado'}: {cantidad} facturas")
+            estado_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            estado_para.runs[0].font.size = Pt(11)
+
+        doc.add_paragraph()
+        anual_para = doc.add_heading('📅 Resumen por Año', 3)
+        anual_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        for anio, (cantidad, importe) in self.por_anio.items():
+            anio_para = doc.add_paragraph(f"• {anio}: {cantidad} facturas - {importe:.2f} €")
+            anio_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            anio_para.runs[0].font.size = Pt(11)
+
+        doc.add_page_break()
+
+        tabla_titulo = doc.add_heading('📋 Detalle de Facturas', 1)
+        tabla_titulo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        tabla_titulo.runs[0].font.color.rgb = RGBColor(46, 125, 50)
+
+        if not self.facturas:
+            doc.add_paragraph("No hay facturas para mostrar.")
+
+    def _tabla(self, doc):
+        """Tabla con la fila de cabecera (verde ADIF); las filas de datos se añaden por bloques"""
+        tabla = doc.add_table(rows=1, cols=len(COLUMNAS_INFORME))
+        tabla.alignment = WD_TABLE_ALIGNMENT.CENTER
+        tabla.style = 'Light Grid Accent 1'
+
+        for celda, (titulo, ancho, _) in zip(tabla.rows[0].cells, COLUMNAS_INFORME):
+            celda.text = titulo
+            celda.width = Inches(ancho)
+            para = celda.paragraphs[0]
+            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = para.runs[0]
+            run.font.bold = True
+            run.font.size = Pt(10)
+            run.font.color.rgb = RGBColor(255, 255, 255)
+            sombreado = OxmlElement('w:shd')
+            sombreado.set(qn('w:fill'), "2e7d32")
+            celda._tc.get_or_add_tcPr().append(sombreado)
+
+        for columna, (_, ancho, _) in zip(tabla.columns, COLUMNAS_INFORME):
+            columna.width = Inches(ancho)
+        return tabla
+
+    def _plantilla(self, estado: str) -> str:
+        clave = estado if estado in COLORES_ESTADO else ''
+        if clave not in self._plantillas:
+            self._plantillas[clave] = plantilla_fila(clave)
+        return self._plantillas[clave]
+
+    def _agregar_filas(self, tabla, facturas: List[Dict]):
+        """Añadir las filas de un bloque: un único parseo de XML para todo el bloque"""
+        filas = []
+        for factura in facturas:
+            estado = factura.get('estado', '')
+            filas.append(self._plantilla(estado).format(
+                c0=_texto_xml(factura.get('id', '')),
+                c1=_texto_xml(factura.get('empresa', '')),
+                c2=_texto_xml(factura.get('cif', '')),
+                c3=_texto_xml(_importe(factura.get('importe', 0))),
+                c4=_texto_xml(estado),
+                c5=_texto_xml(factura.get('categoria', '')),
+                c6=_texto_xml(factura.get('localidad', '')),
+                c7=_texto_xml(factura.get('fecha_validacion', '')),
+            ))
+        bloque = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(filas)}</w:tbl>')
+        tbl = tabla._tbl
+        for fila in list(bloque):
+            tbl.append(fila)
+
+    def _pie(self, doc):
+        doc.add_paragraph()
+        pie_para = doc.add_paragraph()
+        pie_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        pie_run = pie_para.add_run(f"\nInforme generado por Sistema ADIF - {self.fecha_actual}")
+        pie_run.font.size = Pt(8)
+        pie_run.font.color.rgb = RGBColor(117, 117, 117)
+        pie_run.italic = True
+
+
+class HiloInformeFacturas(QThread):
+    """Genera el informe en segundo plano"""
+
+    progreso = pyqtSignal(int, int, str)  # hechas, total, mensaje
+    finalizado = pyqtSignal(object)  # lista de rutas (vacía si se canceló o falló)
+    error = pyqtSignal(str)  # se emite antes de finalizado
+
+    def __init__(self, generador: GeneradorInformeFacturas, parent=None):
+        super().__init__(parent)
+        self.generador = generador
+        self._cancelado = False
+
+    def cancelar(self):
+        self._cancelado = True
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado
+
+    def run(self):
+        rutas = []
+        try:
+            rutas = self.generador.generar(self.progreso.emit, lambda: self._cancelado)
+        except Exception as e:
+            logger.error(f"Error generando informe Word: {e}")
+            self.error.emit(str(e))
+        finally:
+            self.finalizado.emit(rutas)
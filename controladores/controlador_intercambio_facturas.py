@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+controlador_intercambio_facturas.py - Exportar/importar facturas directas en CSV y Excel
+- Exportación: todas las facturas o un subconjunto (p. ej. las filtradas en el resumen);
+  CSV con csv.writer.writerows (bucle en C) y Excel con openpyxl en modo write_only
+- Importación: las filas se validan y se comparan con las existentes en una sola pasada
+  (conjuntos de ids y de claves de factura) y las válidas se dan de alta juntas, con ids
+  consecutivos a partir de configuracion.ultimo_id y una única escritura del JSON
+- Una fila es la misma factura que otra si coincide su id, o su CIF y su identificador
+  especial (o, sin identificador, su CIF, fecha de validación e importe)
+"""
+
+import csv
+import os
+import logging
+import unicodedata
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (campo, cabecera) en el orden de las columnas exportadas
+COLUMNAS_INTERCAMBIO = [
+    ("id", "ID"),
+    ("empresa", "Empresa"),
+    ("cif", "CIF"),
+    ("importe", "Importe"),
+    ("estado", "Estado"),
+    ("categoria", "Categoría"),
+    ("localidad", "Localidad"),
+    ("fecha_validacion", "Fecha Validación"),
+    ("identificador_especial", "ID Especial"),
+    ("identificacion_admycont", "ID AdmYCont"),
+    ("gped", "GPED"),
+    ("comentarios", "Comentarios"),
+    ("archivo_pdf", "PDF"),
+]
+# Campos obligatorios al importar
+CAMPOS_OBLIGATORIOS = ("empresa", "localidad")
+# Separador de los CSV exportados (el de Excel en configuración regional española)
+SEPARADOR_CSV = ";"
+FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+
+def _normalizar_cabecera(texto) -> str:
+    sin_tildes = unicodedata.normalize("NFKD", str(texto or "")).encode("ascii", "ignore").decode()
+    return "".join(c for c in sin_tildes.lower() if c.isalnum())
+
+
+# Cabecera normalizada (o nombre del campo) -> campo
+_CAMPO_DE_CABECERA = {}
+for _campo, _cabecera in COLUMNAS_INTERCAMBIO:
+    _CAMPO_DE_CABECERA[_normalizar_cabecera(_cabecera)] = _campo
+    _CAMPO_DE_CABECERA[_normalizar_cabecera(_campo)] = _campo
+
+
+def formato_archivo(ruta: str) -> str:
+    """'csv' o 'xlsx' según la extensión (ValueError si no es ninguna de las dos)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".xlsx", ".xlsm"):
+        return "xlsx"
+    raise ValueError(f"Formato no soportado: {extension or ruta} (use .csv o .xlsx)")
+
+
+# =================== EXPORTACIÓN ===================
+
+def exportar_facturas(facturas: Iterable[Dict], ruta: str) -> int:
+    """Escribir las facturas en CSV o Excel (según la extensión); devuelve cuántas se escribieron"""
+    campos = [campo for campo, _ in COLUMNAS_INTERCAMBIO]
+    cabeceras = [cabecera for _, cabecera in COLUMNAS_INTERCAMBIO]
+    filas = [[factura.get(campo, "") for campo in campos] for factura in facturas]
+
+    if formato_archivo(ruta) == "csv":
+        # utf-8-sig: Excel reconoce la codificación y muestra bien las tildes
+        with open(ruta, "w", encoding="utf-8-sig", newline="") as f:
+            escritor = csv.writer(f, delimiter=SEPARADOR_CSV)
+            escritor.writerow(cabeceras)
+            escritor.writerows(filas)
+    else:
+        from openpyxl import Workbook
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet("Facturas")
+        hoja.append(cabeceras)
+        for fila in filas:
+            hoja.append(fila)
+        libro.save(ruta)
+
+    logger.info(f"Exportadas {len(filas)} facturas a {os.path.basename(ruta)}")
+    return len(filas)
+
+
+# =================== LECTURA ===================
+
+def leer_filas(ruta: str) -> Tuple[List[Optional[str]], Iterator[Sequence]]:
+    """(campo de cada columna o None si no se reconoce, filas de datos) de un CSV o Excel"""
+    if formato_archivo(ruta) == "csv":
+        filas = _leer_csv(ruta)
+    else:
+        filas = _leer_xlsx(ruta)
+    cabecera = next(filas, [])
+    return [_CAMPO_DE_CABECERA.get(_normalizar_cabecera(c)) for c in cabecera], filas
+
+
+def _leer_csv(ruta: str) -> Iterator[Sequence]:
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        muestra = f.read(8192)
+        f.seek(0)
+        try:
+            separador = csv.Sniffer().sniff(muestra, delimiters=";,\t").delimiter
+        except csv.Error:
+            separador = SEPARADOR_CSV
+        yield from csv.reader(f, delimiter=separador)
+
+
+def _leer_xlsx(ruta: str) -> Iterator[Sequence]:
+    from openpyxl import load_workbook
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+# =================== VALIDACIÓN ===================
+
+def convertir_importe(valor) -> float:
+    """Número o texto ('1.234,56 €', '1234.56') a float (ValueError si no lo es)"""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    texto = str(valor or "").replace("€", "").replace(" ", "").strip()
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
+
+
+def convertir_fecha(valor) -> str:
+    """Fecha (date/datetime de Excel o texto en los formatos admitidos) a 'YYYY-MM-DD'"""
+    if isinstance(valor, datetime):
+        return valor.date().isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    texto = str(valor or "").strip()
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"fecha no válida: '{texto}'")
+
+
+def clave_factura(factura: Dict) -> Optional[tuple]:
+    """Clave que identifica una factura para detectar duplicados (None si no tiene CIF)"""
+    cif = "".join(str(factura.get("cif") or "").upper().split())
+    if not cif:
+        return None
+    identificador = str(factura.get("identificador_especial") or "").strip().upper()
+    if identificador:
+        return (cif, identificador)
+    try:
+        importe = round(convertir_importe(factura.get("importe")), 2)
+    except ValueError:
+        importe = None
+    return (cif, str(factura.get("fecha_validacion") or ""), importe)
+
+
+class ResultadoImportacion:
+    """Resultado de preparar una importación (las líneas cuentan desde la cabecera, que es la 1)"""
+
+    def __init__(self):
+        self.facturas: List[Dict] = []
+        self.errores: List[Tuple[int, str]] = []
+        self.duplicadas: List[Tuple[int, str]] = []
+        self.ids: List[int] = []
+
+    def resumen(self) -> str:
+        lineas = [f"Facturas importadas: {len(self.ids) if self.ids else len(self.facturas)}",
+                  f"Duplicadas (omitidas): {len(self.duplicadas)}",
+                  f"Con errores (omitidas): {len(self.errores)}"]
+        for linea, motivo in (self.errores + self.duplicadas)[:15]:
+            lineas.append(f"   Línea {linea}: {motivo}")
+        if len(self.errores) + len(self.duplicadas) > 15:
+            lineas.append("   ...")
+        return "\n".join(lineas)
+
+
+def preparar_importacion(campos: Sequence[Optional[str]], filas: Iterable[Sequence],
+                         existentes: Iterable[Dict], estados: Sequence[str] = (),
+                         categorias: Sequence[str] = ()) -> ResultadoImportacion:
+    """
+    Validar las filas y descartar las duplicadas (contra las facturas existentes y entre sí)
+
+    Las facturas válidas no llevan id: se lo asigna el repositorio al darlas de alta
+    """
+    resultado = ResultadoImportacion()
+    faltan = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in campos]
+    if faltan:
+        resultado.errores.append((1, f"faltan columnas obligatorias: {', '.join(faltan)}"))
+        return resultado
+
+    ids_existentes = set()
+    claves_existentes = set()
+    for factura in existentes:
+        ids_existentes.add(factura.get("id"))
+        clave = clave_factura(factura)
+        if clave and factura.get("activa", True):
+            claves_existentes.add(clave)
+
+    for linea, fila in enumerate(filas, 2):
+        valores = {campo: valor for campo, valor in zip(campos, fila) if campo}
+        if not any(str(v).strip() for v in valores.values() if v is not None):
+            continue  # fila vacía
+        try:
+            factura = _validar_fila(valores, estados, categorias)
+        except ValueError as e:
+            resultado.errores.append((linea, str(e)))
+            continue
+
+        id_fila = valores.get("id")
+        if id_fila not in (None, ""):
+            try:
+                if int(float(id_fila)) in ids_existentes:
+                    resultado.duplicadas.append((linea, f"ya existe una factura con ID {int(float(id_fila))}"))
+                    continue
+            except ValueError:
+                pass
+        clave = clave_factura(factura)
+        if clave in claves_existentes:
+            resultado.duplicadas.append((linea, f"factura ya registrada ({factura['cif']})"))
+            continue
+        if clave:
+            claves_existentes.add(clave)
+        resultado.facturas.append(factura)
+    return resultado
+
+
+def _validar_fila(valores: Dict, estados: Sequence[str], categorias: Sequence[str]) -> Dict:
+    """Factura con los mismos campos que agregar_factura (ValueError con el motivo si no es válida)"""
+    texto = {campo: ("" if valor is None else str(valor).strip()) for campo, valor in valores.items()}
+    for campo in CAMPOS_OBLIGATORIOS:
+        if not texto.get(campo):
+            raise ValueError(f"falta {campo}")
+
+    try:
+        importe = convertir_importe(valores.get("importe"))
+    except ValueError:
+        raise ValueError(f"importe no válido: '{texto.get('importe', '')}'")
+    if importe <= 0:
+        raise ValueError("el importe debe ser mayor que 0")
+
+    fecha = valores.get("fecha_validacion")
+    fecha_validacion = convertir_fecha(fecha) if texto.get("fecha_validacion") else datetime.now().date().isoformat()
+
+    estado = texto.get("estado") or "Emitida"
+    if estados and estado not in estados:
+        raise ValueError(f"estado desconocido: '{estado}'")
+    categoria = texto.get("categoria", "")
+    if categoria and categorias and categoria not in categorias:
+        raise ValueError(f"categoría desconocida: '{categoria}'")
+
+    return {
+        "fecha_creacion": datetime.now().isoformat(),
+        "importe": importe,
+        "categoria": categoria,
+        "localidad": texto["localidad"],
+        "empresa": texto["empresa"],
+        "cif": texto.get("cif", ""),
+        "identificador_especial": texto.get("identificador_especial", ""),
+        "identificacion_admycont": texto.get("identificacion_admycont", ""),
+        "fecha_validacion": fecha_validacion,
+        "estado": estado,
+        "comentarios": texto.get("comentarios", ""),
+        "gped": texto.get("gped", ""),
+        "archivo_pdf": "",
+        "activa": True,
+    }
@@ -366,7 +366,13 @@ class GestorJsonUnificado:
             if len(obras_filtradas) < len(obras):
                 self.datos["obras"] = obras_filtradas
                 logger.info(f"Contrato eliminado: {nombre_contrato}")
-                return self.guardar_datos()
+                if not self.guardar_datos():
+                    return False
+                # Sus actuaciones y facturas (almacén por nombre) no deben pasar a otro contrato
+                # que se cree con el mismo nombre
+                from .controlador_repositorio_actuaciones import eliminar_almacen_contrato
+                eliminar_almacen_contrato(rutas.get_ruta_actuaciones_facturas(), nombre_contrato)
+                return True
             else:
                 logger.error(f"Contrato no encontrado para eliminar: {nombre_contrato}")
                 return False
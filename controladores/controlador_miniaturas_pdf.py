@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_miniaturas_pdf.py - Miniaturas de páginas para la barra lateral del visor PDF
+- Se generan en segundo plano, primero las que están a la vista en la barra
+- Se guardan junto al PDF (carpeta .miniaturas del contrato) en una subcarpeta por hash
+  del contenido, así al reabrir el proyecto se muestran sin volver a renderizar
+- Los PDFs de fuera de las obras (descargas, carpetas compartidas) o de carpetas sin
+  permiso de escritura usan la carpeta de miniaturas del usuario (rutas.get_ruta_miniaturas)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, Iterable, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from .controlador_pdf_render import renderizar_qimage
+
+logger = logging.getLogger(__name__)
+
+# Carpeta de miniaturas, junto al PDF dentro de la carpeta del contrato
+CARPETA_MINIATURAS = ".miniaturas"
+
+# Ancho en píxeles de cada miniatura
+ANCHO_MINIATURA = 120
+
+
+def calcular_hash_archivo(ruta: str) -> Optional[str]:
+    """SHA-256 del contenido de un archivo, o None si no se puede leer"""
+    try:
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+    except OSError as e:
+        logger.warning(f"No se pudo calcular hash de {ruta}: {e}")
+        return None
+
+
+def carpeta_miniaturas_de(ruta_pdf: str, ruta_obras: str = None, carpeta_usuario: str = None) -> str:
+    """.miniaturas junto al PDF si está en una obra y se puede escribir; si no, la del usuario"""
+    from .controlador_busqueda_pdf import carpeta_contrato_de
+    from .controlador_routes import rutas
+    carpeta_pdf = os.path.dirname(os.path.abspath(ruta_pdf))
+    if carpeta_contrato_de(ruta_pdf, ruta_obras or rutas.get_ruta_carpeta_obras()) and \
+            os.access(carpeta_pdf, os.W_OK):
+        return os.path.join(carpeta_pdf, CARPETA_MINIATURAS)
+    return carpeta_usuario or rutas.get_ruta_miniaturas()
+
+
+class CacheMiniaturasPDF:
+    """Miniaturas persistidas de un PDF, en una carpeta por hash del contenido"""
+
+    VERSION = 1
+
+    def __init__(self, ruta_pdf: str, carpeta_cache: str = None):
+        """
+        Args:
+            ruta_pdf: PDF cuyas miniaturas se guardan
+            carpeta_cache: Carpeta de miniaturas (por defecto carpeta_miniaturas_de)
+        """
+        self.ruta_pdf = ruta_pdf
+        self.carpeta_cache = carpeta_cache or carpeta_miniaturas_de(ruta_pdf)
+        # En .miniaturas junto al PDF basta el nombre; en otra carpeta, la ruta completa
+        ruta_absoluta = os.path.abspath(ruta_pdf)
+        if os.path.dirname(os.path.abspath(self.carpeta_cache)) == os.path.dirname(ruta_absoluta):
+            self.clave_indice = os.path.basename(ruta_absoluta)
+        else:
+            self.clave_indice = os.path.normcase(ruta_absoluta)
+        self.archivo_indice = os.path.join(self.carpeta_cache, "indice.json")
+        self.hash = self._resolver_hash()
+        self.carpeta = os.path.join(self.carpeta_cache, self.hash) if self.hash else None
+
+    def ruta_miniatura(self, pagina: int) -> Optional[str]:
+        """Ruta del PNG de la miniatura de una página (exista o no)"""
+        if not self.carpeta:
+            return None
+        return os.path.join(self.carpeta, f"pagina_{pagina + 1:04d}_{ANCHO_MINIATURA}.png")
+
+    def tiene(self, pagina: int) -> bool:
+        ruta = self.ruta_miniatura(pagina)
+        return bool(ruta) and os.path.exists(ruta)
+
+    def preparar(self) -> bool:
+        """Crea la carpeta de miniaturas de este PDF"""
+        if not self.carpeta:
+            return False
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            return True
+        except OSError as e:
+            logger.warning(f"No se pudo crear carpeta de miniaturas {self.carpeta}: {e}")
+            return False
+
+    # =================== ÍNDICE NOMBRE -> HASH ===================
+
+    def _leer_indice(self) -> Dict[str, dict]:
+        try:
+            if os.path.exists(self.archivo_indice):
+                with open(self.archivo_indice, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    return data.get('archivos', {})
+        except Exception as e:
+            logger.error(f"Error leyendo índice de miniaturas: {e}")
+        return {}
+
+    def _guardar_indice(self, archivos: Dict[str, dict]):
+        try:
+            os.makedirs(self.carpeta_cache, exist_ok=True)
+            ruta_temporal = self.archivo_indice + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'archivos': archivos}, f, ensure_ascii=False)
+            os.replace(ruta_temporal, self.archivo_indice)
+        except Exception as e:
+            logger.error(f"Error guardando índice de miniaturas: {e}")
+
+    def _resolver_hash(self) -> Optional[str]:
+        """
+        Hash del PDF. Solo se recalcula si cambian tamaño o mtime; si el contenido
+        cambió, se borran las miniaturas del hash anterior que ya nadie usa
+        """
+        try:
+            stat = os.stat(self.ruta_pdf)
+        except OSError:
+            return None
+
+        nombre = self.clave_indice
+        archivos = self._leer_indice()
+        entrada = archivos.get(nombre)
+        if entrada and entrada['tamano'] == stat.st_size and entrada['mtime'] == stat.st_mtime_ns:
+            return entrada['hash']
+
+        hash_pdf = calcular_hash_archivo(self.ruta_pdf)
+        if not hash_pdf:
+            return None
+
+        hash_anterior = entrada.get('hash') if entrada else None
+        archivos[nombre] = {'tamano': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': hash_pdf}
+        if hash_anterior and hash_anterior != hash_pdf and \
+                not any(e.get('hash') == hash_anterior for e in archivos.values()):
+            shutil.rmtree(os.path.join(self.carpeta_cache, hash_anterior), ignore_errors=True)
+        self._guardar_indice(archivos)
+        return hash_pdf
+
+
+class ColaPaginas:
+    """Páginas pendientes de miniatura; las visibles en la barra pasan delante"""
+
+    def __init__(self, total_paginas: int):
+        self._pendientes = list(range(total_paginas))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pendientes)
+
+    def priorizar(self, paginas: Iterable[int]):
+        with self._lock:
+            delante = [p for p in paginas if p in self._pendientes]
+            if delante:
+                self._pendientes = delante + [p for p in self._pendientes if p not in delante]
+
+    def siguiente(self) -> Optional[int]:
+        with self._lock:
+            return self._pendientes.pop(0) if self._pendientes else None
+
+
+class GeneradorMiniaturas(QThread):
+    """Carga del disco o renderiza las miniaturas de un PDF en segundo plano"""
+
+    miniatura_lista = pyqtSignal(int, QImage)
+
+    def __init__(self, fitz, ruta_pdf: str, total_paginas: int, parent=None):
+        super().__init__(parent)
+        self.fitz = fitz
+        self.ruta_pdf = ruta_pdf
+        self.cola = ColaPaginas(total_paginas)
+        self._cancelado = False
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def priorizar(self, paginas: Iterable[int]):
+        """Adelantar las páginas que el usuario tiene a la vista"""
+        self.cola.priorizar(paginas)
+
+    def run(self):
+        documento = None
+        try:
+            cache = CacheMiniaturasPDF(self.ruta_pdf)
+            persistir = cache.preparar()
+            renderizadas = 0
+
+            while not self._cancelado:
+                pagina = self.cola.siguiente()
+                if pagina is None:
+                    break
+
+                ruta = cache.ruta_miniatura(pagina)
+                imagen = QImage(ruta) if ruta and os.path.exists(ruta) else None
+                if imagen is None or imagen.isNull():
+                    if documento is None:
+                        documento = self.fitz.open(self.ruta_pdf)
+                    imagen = self._renderizar(documento, pagina)
+                    renderizadas += 1
+                    if persistir:
+                        self._guardar(imagen, ruta)
+
+                if not self._cancelado:
+                    self.miniatura_lista.emit(pagina, imagen)
+
+            if renderizadas:
+                logger.info(f"[PDF] {renderizadas} miniaturas nuevas de {os.path.basename(self.ruta_pdf)}")
+        except Exception as e:
+            logger.error(f"[PDF] Error generando miniaturas: {e}")
+        finally:
+            if documento is not None:
+                documento.close()
+
+    def _renderizar(self, documento, pagina: int) -> QImage:
+        ancho_pagina = documento[pagina].rect.width or ANCHO_MINIATURA
+        return renderizar_qimage(self.fitz, documento, pagina, ANCHO_MINIATURA / ancho_pagina)
+
+    def _guardar(self, imagen: QImage, ruta: str):
+        """Escritura atómica del PNG (una miniatura a medias no debe quedar en cache)"""
+        try:
+            ruta_temporal = ruta + ".tmp"
+            if imagen.save(ruta_temporal, "PNG"):
+                os.replace(ruta_temporal, ruta)
+        except OSError as e:
+            logger.warning(f"[PDF] No se pudo guardar miniatura {ruta}: {e}")
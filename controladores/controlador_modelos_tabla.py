@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_modelos_tabla.py - Modelos Qt para tablas de listas de diccionarios
+- ModeloTablaDiccionarios: cada fila es un diccionario y cada columna una función;
+  la vista solo pide (y formatea) las celdas visibles
+- ProxySeleccion: filtra con una selección ya calculada (un byte por fila)
+- DelegadoBotones: botones de acción pintados en la celda, sin un widget por fila
+"""
+
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QModelIndex, QRectF, QSortFilterProxyModel, Qt
+from PyQt5.QtGui import QColor, QFont, QLinearGradient, QPainter, QPainterPath
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+logger = logging.getLogger(__name__)
+
+# Rol con el diccionario completo de la fila
+ROL_FILA = Qt.UserRole + 1
+
+
+class ColumnaTabla:
+    """
+    Columna de un ModeloTablaDiccionarios
+
+    Args:
+        titulo: cabecera
+        texto: fila -> texto de la celda
+        fondo: fila -> QColor de fondo (None si no tiene)
+    """
+
+    __slots__ = ('titulo', 'texto', 'fondo')
+
+    def __init__(self, titulo: str, texto: Callable[[dict], str],
+                 fondo: Optional[Callable[[dict], Optional[QColor]]] = None):
+        self.titulo = titulo
+        self.texto = texto
+        self.fondo = fondo
+
+
+class ModeloTablaDiccionarios(QAbstractTableModel):
+    """Tabla de solo lectura sobre una lista de diccionarios (no se copian)"""
+
+    def __init__(self, columnas: Sequence[ColumnaTabla], filas: Sequence[dict] = (), parent=None):
+        super().__init__(parent)
+        self.columnas = list(columnas)
+        self.filas = list(filas)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columnas)
+
+    def data(self, index, role=Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        fila = self.filas[index.row()]
+        columna = self.columnas[index.column()]
+        try:
+            if role == Qt.DisplayRole:
+                return columna.texto(fila)
+            if role == Qt.BackgroundRole and columna.fondo:
+                return columna.fondo(fila)
+            if role == ROL_FILA:
+                return fila
+        except Exception as e:
+            logger.error(f"Error formateando celda ({index.row()}, {columna.titulo}): {e}")
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientacion == Qt.Horizontal:
+            return self.columnas[seccion].titulo if 0 <= seccion < len(self.columnas) else None
+        return str(seccion + 1)
+
+    def establecer_filas(self, filas: Sequence[dict]):
+        """Sustituir todas las filas (la vista vuelve a pedir solo lo visible)"""
+        self.beginResetModel()
+        self.filas = list(filas)
+        self.endResetModel()
+
+    def fila(self, row: int) -> Optional[dict]:
+        return self.filas[row] if 0 <= row < len(self.filas) else None
+
+    def actualizar_fila(self, row: int):
+        """La fila ha cambiado en su diccionario: repintar solo sus celdas"""
+        if 0 <= row < len(self.filas) and self.columnas:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columnas) - 1))
+
+
+class ProxySeleccion(QSortFilterProxyModel):
+    """Proxy que muestra las filas marcadas en una selección precalculada"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._seleccion: Optional[bytes] = None
+
+    def establecer_seleccion(self, seleccion: Optional[bytes]):
+        """Un byte por fila del modelo de origen (1: visible); None muestra todas"""
+        if seleccion is None and self._seleccion is None:
+            return
+        # Reinicio en lugar de invalidateFilter: este notifica cada tramo de filas
+        # eliminado o insertado y la vista se recalcula una vez por tramo
+        self.beginResetModel()
+        self._seleccion = seleccion
+        self.endResetModel()
+
+    @property
+    def seleccion(self) -> Optional[bytes]:
+        """Selección aplicada (None: sin filtrar)"""
+        return self._seleccion
+
+    def filterAcceptsRow(self, fila, padre) -> bool:
+        return self._seleccion is None or (fila < len(self._seleccion) and self._seleccion[fila] == 1)
+
+
+def fila_origen(index) -> int:
+    """Fila del modelo de origen para un índice de la vista (con o sin proxy)"""
+    modelo = index.model()
+    if isinstance(modelo, QSortFilterProxyModel):
+        index = modelo.mapToSource(index)
+    return index.row()
+
+
+class DelegadoBotones(QStyledItemDelegate):
+    """
+    Botones apilados pintados en una celda; al pulsar uno se llama a su acción
+    con la fila del modelo de origen
+
+    Args:
+        botones: (texto, color superior, color inferior, acción(fila))
+    """
+
+    MARGEN_HORIZONTAL = 8
+    MARGEN_VERTICAL = 6
+    SEPARACION = 8
+
+    def __init__(self, botones: List[Tuple[str, str, str, Callable[[int], None]]], parent=None):
+        super().__init__(parent)
+        self.botones = botones
+
+    def _rectangulos(self, rect) -> List[QRectF]:
+        n = len(self.botones)
+        alto = (rect.height() - 2 * self.MARGEN_VERTICAL - (n - 1) * self.SEPARACION) / max(n, 1)
+        return [QRectF(rect.x() + self.MARGEN_HORIZONTAL,
+                       rect.y() + self.MARGEN_VERTICAL + i * (alto + self.SEPARACION),
+                       rect.width() - 2 * self.MARGEN_HORIZONTAL, alto)
+                for i in range(n)]
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        fuente = QFont(option.font)
+        fuente.setBold(True)
+        painter.setFont(fuente)
+        for (texto, color_superior, color_inferior, _), rect in zip(self.botones, self._rectangulos(option.rect)):
+            degradado = QLinearGradient(rect.topLeft(), rect.bottomLeft())
+            degradado.setColorAt(0, QColor(color_superior))
+            degradado.setColorAt(1, QColor(color_inferior))
+            contorno = QPainterPath()
+            contorno.addRoundedRect(rect, 14, 14)
+            painter.fillPath(contorno, degradado)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignCenter, texto)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        for (_, _, _, accion), rect in zip(self.botones, self._rectangulos(option.rect)):
+            if rect.contains(event.localPos()):
+                accion(fila_origen(index))
+                return True
+        return False
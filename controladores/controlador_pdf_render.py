@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_pdf_render.py - Renderizado de páginas para el visor PDF
+- Cache LRU de páginas renderizadas (documento, página, zoom) con presupuesto de memoria
+- Rasterizado en hilos de QThreadPool, cada hilo con su propio documento PyMuPDF
+- Previsualización a baja resolución antes de la página completa
+- Las peticiones que el usuario ya ha dejado atrás se descartan sin renderizar
+- A zoom alto, renderizado por teselas (clip de PyMuPDF) solo de la zona visible
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import Qt, QObject, QRect, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QLabel
+
+logger = logging.getLogger(__name__)
+
+# Memoria máxima para páginas renderizadas (bytes)
+MEMORIA_CACHE_PAGINAS = 256 * 1024 * 1024
+
+# Hilos dedicados a rasterizar (PyMuPDF libera el GIL mientras renderiza)
+MAX_HILOS_RENDER = 2
+
+# Documentos PyMuPDF abiertos por hilo de render
+_MAX_DOCUMENTOS_POR_HILO = 2
+
+# Zoom de la previsualización rápida (por debajo no compensa previsualizar)
+ZOOM_PREVISUALIZACION = 0.3
+
+# Teselado: páginas cuyo render completo superaría este número de píxeles se
+# rasterizan en teselas cuadradas de TAMANO_TESELA píxeles
+UMBRAL_TESELADO_PIXELES = 3000 * 3000
+TAMANO_TESELA = 512
+
+# Prioridades en el pool: primero la previsualización, luego la página visible
+PRIORIDAD_PREVISUALIZACION = 3
+PRIORIDAD_VISIBLE = 2
+PRIORIDAD_PRECARGA = 0
+
+
+def clave_pagina(id_documento, pagina: int, zoom: float) -> tuple:
+    """Clave de cache de una página renderizada"""
+    return (id_documento, pagina, round(zoom, 3))
+
+
+def clave_tesela(id_documento, pagina: int, zoom: float, columna: int, fila: int) -> tuple:
+    """Clave de cache de una tesela de página"""
+    return clave_pagina(id_documento, pagina, zoom) + (columna, fila)
+
+
+def es_clave_tesela(clave: tuple) -> bool:
+    return len(clave) == 5
+
+
+def requiere_teselado(ancho: int, alto: int) -> bool:
+    """True si la página a este tamaño debe renderizarse por teselas"""
+    return ancho * alto > UMBRAL_TESELADO_PIXELES
+
+
+def teselas_en_rect(x: int, y: int, ancho: int, alto: int, ancho_pagina: int, alto_pagina: int) -> list:
+    """(columna, fila) de las teselas que cortan un rectángulo en píxeles de la página"""
+    if ancho <= 0 or alto <= 0:
+        return []
+    col_ini = max(0, x // TAMANO_TESELA)
+    fila_ini = max(0, y // TAMANO_TESELA)
+    col_fin = min((ancho_pagina - 1) // TAMANO_TESELA, (x + ancho - 1) // TAMANO_TESELA)
+    fila_fin = min((alto_pagina - 1) // TAMANO_TESELA, (y + alto - 1) // TAMANO_TESELA)
+    return [(col, fila) for fila in range(fila_ini, fila_fin + 1) for col in range(col_ini, col_fin + 1)]
+
+
+def clave_previsualizacion(clave: tuple) -> Optional[tuple]:
+    """Clave de la versión a baja resolución de una página (o de la página de una tesela)"""
+    id_documento, pagina, zoom = clave[:3]
+    if zoom <= ZOOM_PREVISUALIZACION:
+        return None
+    return clave_pagina(id_documento, pagina, ZOOM_PREVISUALIZACION)
+
+
+def identificador_documento(ruta: str) -> tuple:
+    """Identificador de un PDF que cambia si el archivo se modifica"""
+    try:
+        stat = os.stat(ruta)
+        return (os.path.normcase(os.path.abspath(ruta)), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return (os.path.normcase(os.path.abspath(ruta)), 0, 0)
+
+
+def coste_imagen(imagen) -> int:
+    """Bytes aproximados que ocupa un QImage/QPixmap (32 bits por píxel)"""
+    try:
+        return int(imagen.width()) * int(imagen.height()) * 4
+    except Exception:
+        return 0
+
+
+class CachePaginasPDF:
+    """Cache LRU de páginas renderizadas limitada por memoria"""
+
+    def __init__(self, presupuesto_bytes: int = MEMORIA_CACHE_PAGINAS):
+        self.presupuesto_bytes = presupuesto_bytes
+        self._entradas: Dict[tuple, tuple] = OrderedDict()  # clave -> (página, coste)
+        self.memoria_usada = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._entradas
+
+    def obtener(self, clave):
+        """Devuelve la página cacheada (y la marca como reciente) o None"""
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            return None
+        self._entradas.move_to_end(clave)
+        return entrada[0]
+
+    def guardar(self, clave, valor, coste: int = None):
+        """Añade una página y expulsa las menos recientes si se supera el presupuesto"""
+        if coste is None:
+            coste = coste_imagen(valor)
+        if coste > self.presupuesto_bytes:
+            return  # Una sola página mayor que todo el presupuesto no se cachea
+
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.memoria_usada -= anterior[1]
+
+        self._entradas[clave] = (valor, coste)
+        self.memoria_usada += coste
+
+        while self.memoria_usada > self.presupuesto_bytes and self._entradas:
+            _, (_, coste_expulsado) = self._entradas.popitem(last=False)
+            self.memoria_usada -= coste_expulsado
+
+    def invalidar_documento(self, id_documento=None):
+        """Elimina las páginas de un documento, o todas si no se indica"""
+        if id_documento is None:
+            self._entradas.clear()
+            self.memoria_usada = 0
+            return
+        for clave in [c for c in self._entradas if c[0] == id_documento]:
+            self.memoria_usada -= self._entradas.pop(clave)[1]
+
+
+# =================== RENDER EN HILOS ===================
+
+_estado_hilo = threading.local()
+
+
+def _documento_del_hilo(fitz, ruta: str, id_documento: tuple = None):
+    """
+    Documento PyMuPDF propio del hilo actual (PyMuPDF no comparte documentos entre hilos)
+
+    Se indexa por el mismo identificador que la cache de páginas: si el PDF se ha
+    sustituido en disco se cierra el documento abierto de la versión anterior
+    """
+    if id_documento is None:
+        id_documento = identificador_documento(ruta)
+    documentos = getattr(_estado_hilo, 'documentos', None)
+    if documentos is None:
+        documentos = _estado_hilo.documentos = OrderedDict()
+
+    documento = documentos.get(id_documento)
+    if documento is not None:
+        documentos.move_to_end(id_documento)
+        return documento
+
+    obsoletos = [clave for clave in documentos if clave[0] == id_documento[0]]
+    documento = fitz.open(ruta)
+    documentos[id_documento] = documento
+    while len(documentos) > _MAX_DOCUMENTOS_POR_HILO or obsoletos:
+        clave = obsoletos.pop() if obsoletos else next(iter(documentos))
+        try:
+            documentos.pop(clave).close()
+        except Exception:
+            pass
+    return documento
+
+
+def renderizar_qimage(fitz, documento, pagina: int, zoom: float, tesela: tuple = None) -> QImage:
+    """
+    Rasteriza una página (o solo una tesela) con PyMuPDF
+    
+    Returns:
+        QImage independiente del buffer de PyMuPDF
+    """
+    clip = None
+    if tesela is not None:
+        columna, fila = tesela
+        lado = TAMANO_TESELA / zoom
+        clip = fitz.Rect(columna * lado, fila * lado, (columna + 1) * lado, (fila + 1) * lado)
+    pix = documento[pagina].get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+    fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+    # copy(): el QImage no puede apuntar a memoria de un Pixmap que se va a liberar
+    return QImage(pix.samples, pix.width, pix.height, pix.stride, fmt).copy()
+
+
+class SenalesRenderizado(QObject):
+    """Señales de las tareas de render (QRunnable no es QObject)"""
+
+    pagina_renderizada = pyqtSignal(object, object)  # clave, QImage
+
+
+class TareaRenderizado(QRunnable):
+    """Rasteriza una página en un hilo del pool"""
+
+    def __init__(self, fitz, ruta: str, clave: tuple, senales: SenalesRenderizado,
+                 vigente: Callable[[], bool] = None):
+        super().__init__()
+        self.fitz = fitz
+        self.ruta = ruta
+        self.clave = clave
+        self.senales = senales
+        self.vigente = vigente
+
+    def run(self):
+        try:
+            if self.vigente and not self.vigente():
+                # Petición superada (el usuario ya ha pasado de página): liberar sin renderizar
+                self.senales.pagina_renderizada.emit(self.clave, None)
+                return
+            _, pagina, zoom = self.clave[:3]
+            documento = _documento_del_hilo(self.fitz, self.ruta, self.clave[0])
+            imagen = renderizar_qimage(self.fitz, documento, pagina, zoom, self.clave[3:] or None)
+            self.senales.pagina_renderizada.emit(self.clave, imagen)
+        except Exception as e:
+            logger.warning(f"[PDF] Error renderizando página {self.clave[1] + 1} en segundo plano: {e}")
+            self.senales.pagina_renderizada.emit(self.clave, None)
+
+
+class RenderizadorPaginasPDF(QObject):
+    """Coordina cache y render en segundo plano de las páginas del visor"""
+
+    pagina_lista = pyqtSignal(object)  # clave ya disponible en cache
+
+    def __init__(self, parent=None, presupuesto_bytes: int = MEMORIA_CACHE_PAGINAS):
+        super().__init__(parent)
+        self.cache = CachePaginasPDF(presupuesto_bytes)
+        self._en_curso = set()
+        self._solicitadas = frozenset()
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(MAX_HILOS_RENDER)
+        self._senales = SenalesRenderizado()
+        self._senales.pagina_renderizada.connect(self._on_pagina_renderizada)
+
+    def obtener(self, clave) -> Optional[QPixmap]:
+        return self.cache.obtener(clave)
+
+    def solicitar(self, fitz, ruta: str, visibles, precarga=()):
+        """
+        Pide las páginas visibles (con previsualización) y las de precarga
+        
+        Sustituye a la petición anterior: las tareas en cola de páginas que ya no
+        se piden se descartan al llegar su turno
+        """
+        tareas = {}
+        for clave in visibles:
+            previa = clave_previsualizacion(clave)
+            if previa is not None:
+                tareas.setdefault(previa, PRIORIDAD_PREVISUALIZACION)
+            tareas.setdefault(clave, PRIORIDAD_VISIBLE)
+        for clave in precarga:
+            tareas.setdefault(clave, PRIORIDAD_PRECARGA)
+
+        # Asignación atómica: los hilos del pool leen este conjunto
+        self._solicitadas = frozenset(tareas)
+
+        for clave, prioridad in tareas.items():
+            if clave in self.cache or clave in self._en_curso:
+                continue
+            self._en_curso.add(clave)
+            tarea = TareaRenderizado(fitz, ruta, clave, self._senales,
+                                     vigente=lambda c=clave: c in self._solicitadas)
+            self._pool.start(tarea, prioridad)
+
+    def cancelar(self):
+        """Descarta todas las peticiones pendientes"""
+        self._solicitadas = frozenset()
+
+    def invalidar(self, id_documento=None):
+        self.cancelar()
+        self.cache.invalidar_documento(id_documento)
+
+    def _on_pagina_renderizada(self, clave, imagen):
+        """Ya en el hilo de la interfaz: convertir a QPixmap y cachear"""
+        self._en_curso.discard(clave)
+        if imagen is None:
+            return
+        self.cache.guardar(clave, QPixmap.fromImage(imagen))
+        self.pagina_lista.emit(clave)
+
+
+# =================== WIDGET DE PÁGINA ===================
+
+class LabelPaginaPDF(QLabel):
+    """
+    QLabel de página del visor
+    
+    Con pixmap se comporta como un QLabel normal. En modo teselado no guarda
+    ningún pixmap: pinta las teselas cacheadas que caen en la zona visible (con la
+    previsualización escalada de fondo) y pide las que faltan
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._teselado = None
+        self._proveedor = None
+        self._al_faltar = None
+        self._faltan_notificadas = None
+
+    def mostrar_teselado(self, numero_pagina: int, clave_base: tuple, ancho: int, alto: int,
+                         proveedor: Callable[[tuple], Optional[QPixmap]],
+                         al_faltar: Callable[[int, list], None]):
+        """Pasar a modo teselado para la página/zoom indicados"""
+        if self._teselado and self._teselado['clave_base'] == clave_base:
+            return
+        QLabel.clear(self)
+        self._teselado = {'pagina': numero_pagina, 'clave_base': clave_base, 'ancho': ancho, 'alto': alto}
+        self._proveedor = proveedor
+        self._al_faltar = al_faltar
+        self._faltan_notificadas = None
+        self.updateGeometry()
+        self.resize(ancho, alto)
+        self.update()
+
+    def en_teselado(self, clave_base: tuple = None) -> bool:
+        if self._teselado is None:
+            return False
+        return clave_base is None or self._teselado['clave_base'] == clave_base
+
+    def actualizar_tesela(self, columna: int, fila: int):
+        """Repintar solo la zona de una tesela recién llegada"""
+        if self._teselado:
+            x0, y0 = self._origen()
+            self.update(QRect(x0 + columna * TAMANO_TESELA, y0 + fila * TAMANO_TESELA, TAMANO_TESELA, TAMANO_TESELA))
+
+    def _salir_teselado(self):
+        if self._teselado is not None:
+            self._teselado = None
+            self._faltan_notificadas = None
+            self.updateGeometry()
+
+    def setPixmap(self, pixmap):
+        self._salir_teselado()
+        super().setPixmap(pixmap)
+
+    def setText(self, texto):
+        self._salir_teselado()
+        super().setText(texto)
+
+    def clear(self):
+        self._salir_teselado()
+        super().clear()
+
+    def sizeHint(self):
+        if self._teselado:
+            return QSize(self._teselado['ancho'], self._teselado['alto'])
+        return super().sizeHint()
+
+    def minimumSizeHint(self):
+        if self._teselado:
+            return self.sizeHint()
+        return super().minimumSizeHint()
+
+    def _origen(self) -> tuple:
+        """Esquina de la página dentro del label (centrada si el label es mayor)"""
+        return (max(0, (self.width() - self._teselado['ancho']) // 2),
+                max(0, (self.height() - self._teselado['alto']) // 2))
+
+    def paintEvent(self, event):
+        if not self._teselado:
+            super().paintEvent(event)
+            return
+
+        datos = self._teselado
+        x0, y0 = self._origen()
+        ancho, alto = datos['ancho'], datos['alto']
+        id_documento, pagina, zoom = datos['clave_base']
+        previa = self._proveedor(clave_previsualizacion(datos['clave_base']))
+
+        painter = QPainter(self)
+        zona = event.rect()
+        for columna, fila in teselas_en_rect(zona.x() - x0, zona.y() - y0, zona.width(), zona.height(), ancho, alto):
+            destino = QRect(x0 + columna * TAMANO_TESELA, y0 + fila * TAMANO_TESELA,
+                            min(TAMANO_TESELA, ancho - columna * TAMANO_TESELA),
+                            min(TAMANO_TESELA, alto - fila * TAMANO_TESELA))
+            tesela = self._proveedor(clave_tesela(id_documento, pagina, zoom, columna, fila))
+            if tesela is not None:
+                painter.drawPixmap(destino.topLeft(), tesela)
+            elif previa is not None:
+                escala_x = previa.width() / ancho
+                escala_y = previa.height() / alto
+                origen = QRect(int((destino.x() - x0) * escala_x), int((destino.y() - y0) * escala_y),
+                               max(1, int(destino.width() * escala_x)), max(1, int(destino.height() * escala_y)))
+                painter.drawPixmap(destino, previa, origen)
+            else:
+                painter.fillRect(destino, QColor(240, 240, 240))
+        painter.end()
+
+        # Pedir las teselas de toda la zona visible que aún no están en cache
+        visible = self.visibleRegion().boundingRect()
+        faltan = [clave_tesela(id_documento, pagina, zoom, columna, fila)
+                  for columna, fila in teselas_en_rect(visible.x() - x0, visible.y() - y0,
+                                                       visible.width(), visible.height(), ancho, alto)]
+        faltan = [clave for clave in faltan if self._proveedor(clave) is None]
+        if faltan != self._faltan_notificadas and self._al_faltar:
+            self._faltan_notificadas = faltan
+            self._al_faltar(pagina, faltan)
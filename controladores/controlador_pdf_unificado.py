@@ -12,20 +12,35 @@ import logging
 import os
 import platform
 import subprocess
-import threading
 
 logger = logging.getLogger(__name__)
 from datetime import datetime
 from typing import Optional
 
-from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer
-from PyQt5.QtGui import QImage, QPixmap, QFont
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer, QSize
+from PyQt5.QtGui import QImage, QPixmap, QFont, QIcon, QColor, QBrush
 from PyQt5.QtWidgets import (
     QFileDialog, QMessageBox, QPushButton, QLabel,
     QSlider, QSpinBox, QScrollArea, QWidget, QVBoxLayout, QHBoxLayout,
-    QDialog
+    QDialog, QListWidget, QListWidgetItem, QListView, QLineEdit
 )
 
+from .controlador_pdf_render import (
+    LabelPaginaPDF, RenderizadorPaginasPDF, clave_pagina, clave_previsualizacion,
+    es_clave_tesela, identificador_documento, requiere_teselado
+)
+from .controlador_miniaturas_pdf import GeneradorMiniaturas, ANCHO_MINIATURA
+from .controlador_busqueda_pdf import IndexadorTextoPDF, carpeta_contrato_de
+
+# Ancho de la barra lateral de miniaturas
+ANCHO_PANEL_MINIATURAS = ANCHO_MINIATURA + 40
+
+# Alto de la caja de búsqueda y su contador, sobre las miniaturas
+ALTO_BUSQUEDA = 48
+
+# Color de las miniaturas de páginas con resultados de búsqueda
+COLOR_RESULTADO_BUSQUEDA = "#fff59d"
+
 # ===== VARIABLES GLOBALES PARA LAZY LOADING =====
 _fitz_module = None
 _fitz_loading = False
@@ -63,13 +78,15 @@ def _load_fitz_lazy():
         _fitz_loading = False
 
 def _load_fitz_async(callback=None):
-    """Cargar PyMuPDF de forma asíncrona"""
-    def load_thread():
-        fitz = _load_fitz_lazy()
+    """Cargar PyMuPDF con el precargador de módulos (el callback llega en el hilo de la GUI)"""
+    from .controlador_precarga import obtener_precargador
+    
+    def on_precargado(correcto: bool, error: str):
+        fitz = _load_fitz_lazy()  # Ya importado: solo registra el módulo o el error
         if callback:
             callback(fitz is not None, _fitz_load_error)
     
-    threading.Thread(target=load_thread, daemon=True).start()
+    obtener_precargador().al_cargar("fitz", on_precargado)
 
 class PDFScrollArea(QScrollArea):
     """QScrollArea personalizado para manejar rueda del ratón para cambio de páginas."""
@@ -110,6 +127,26 @@ class _PDFControllerOptimized(QObject):
         self.pdf_label_left = None
         self.pdf_label_right = None
         
+        # Cache de páginas renderizadas y precarga en segundo plano
+        self._renderizador = None
+        self._id_documento = None
+        self._peticion_paginas = []
+        self._peticion_precarga = []
+        self._peticion_teselas = {}
+        self._peticion_programada = False
+        
+        # Barra lateral de miniaturas
+        self.lista_miniaturas = None
+        self._generador_miniaturas = None
+        
+        # Búsqueda de texto en el PDF
+        self.busqueda_pdf = None
+        self.busqueda_info = None
+        self._indice_texto = None
+        self._indexador_texto = None
+        self._resultados_busqueda = []
+        self._resultado_actual = -1
+        
         # Estado de carga de PyMuPDF
         self._fitz_ready = False
         self._fitz_loading = False
@@ -265,6 +302,7 @@ class _PDFControllerOptimized(QObject):
         if old_name and old_name != self._contract_name:
 
             if self.pdf_document:
+                self._detener_miniaturas()
                 self.pdf_document = None
                 self.current_pdf_path = None
                 self.total_pages = 0
@@ -339,6 +377,7 @@ class _PDFControllerOptimized(QObject):
         try:
             self.pdf_document = fitz.open(path)
             self.current_pdf_path = path
+            self._id_documento = identificador_documento(path)
             self.total_pages = len(self.pdf_document)
             self.current_page = 0
             
@@ -349,6 +388,8 @@ class _PDFControllerOptimized(QObject):
             
             self.render_page()
             self._update_controls()
+            self._iniciar_miniaturas()
+            self._iniciar_indice_texto()
             self.pdf_changed.emit(path)
             
             if path != self._pdf_pendiente:
@@ -434,6 +475,11 @@ class _PDFControllerOptimized(QObject):
                 parent = self.scroll_area.parent()
                 geometry = self.scroll_area.geometry()
                 
+                # Búsqueda y barra de miniaturas a la izquierda del visor
+                self._crear_busqueda(parent, geometry)
+                self._crear_lista_miniaturas(parent, geometry.adjusted(0, ALTO_BUSQUEDA, 0, 0))
+                geometry.adjust(ANCHO_PANEL_MINIATURAS + 10, 0, 0, 0)
+                
                 custom_scroll = PDFScrollArea(self, parent)
                 custom_scroll.setGeometry(geometry)
                 custom_scroll.setWidgetResizable(True)
@@ -445,8 +491,8 @@ class _PDFControllerOptimized(QObject):
                 layout.setSpacing(10)
                 
                 # Crear dos labels
-                self.pdf_label_left = QLabel()
-                self.pdf_label_right = QLabel()
+                self.pdf_label_left = LabelPaginaPDF()
+                self.pdf_label_right = LabelPaginaPDF()
                 self.pdf_label_left.setAlignment(Qt.AlignCenter)
                 self.pdf_label_right.setAlignment(Qt.AlignCenter)
                 
@@ -465,41 +511,348 @@ class _PDFControllerOptimized(QObject):
         except Exception as e:
             logger.error(f"[PDF] Error configurando scroll area: {e}")
 
+    # ===== MINIATURAS =====
+    
+    def _crear_lista_miniaturas(self, parent: QWidget, geometry):
+        """Barra lateral con una miniatura por página"""
+        self.lista_miniaturas = QListWidget(parent)
+        self.lista_miniaturas.setObjectName("lista_miniaturas")
+        self.lista_miniaturas.setGeometry(geometry.x(), geometry.y(), ANCHO_PANEL_MINIATURAS, geometry.height())
+        self.lista_miniaturas.setViewMode(QListView.IconMode)
+        self.lista_miniaturas.setFlow(QListView.TopToBottom)
+        self.lista_miniaturas.setWrapping(False)
+        self.lista_miniaturas.setMovement(QListView.Static)
+        self.lista_miniaturas.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.lista_miniaturas.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.lista_miniaturas.currentRowChanged.connect(self._on_miniatura_seleccionada)
+        self.lista_miniaturas.verticalScrollBar().valueChanged.connect(self._priorizar_miniaturas_visibles)
+        self.lista_miniaturas.show()
+    
+    def _iniciar_miniaturas(self):
+        """Rellenar la barra con una entrada por página y generar las miniaturas"""
+        self._detener_miniaturas()
+        if self.lista_miniaturas is None or not self.has_pdf_loaded():
+            return
+        
+        # Tamaño según la primera página, hasta que llegue cada miniatura
+        rect = self.pdf_document[0].rect
+        alto = int(ANCHO_MINIATURA * rect.height / rect.width) if rect.width else ANCHO_MINIATURA
+        self.lista_miniaturas.setIconSize(QSize(ANCHO_MINIATURA, alto))
+        self.lista_miniaturas.setGridSize(QSize(ANCHO_MINIATURA + 16, alto + 24))
+        
+        self.lista_miniaturas.blockSignals(True)
+        for numero_pagina in range(self.total_pages):
+            item = QListWidgetItem(str(numero_pagina + 1))
+            item.setTextAlignment(Qt.AlignHCenter)
+            self.lista_miniaturas.addItem(item)
+        self.lista_miniaturas.setCurrentRow(self.current_page)
+        self.lista_miniaturas.blockSignals(False)
+        
+        generador = GeneradorMiniaturas(_fitz_module, self.current_pdf_path, self.total_pages, self)
+        generador.miniatura_lista.connect(
+            lambda pagina, imagen, g=generador: self._on_miniatura_lista(g, pagina, imagen)
+        )
+        generador.finished.connect(lambda g=generador: self._on_miniaturas_finalizadas(g))
+        self._generador_miniaturas = generador
+        self._priorizar_miniaturas_visibles()
+        generador.start(GeneradorMiniaturas.LowPriority)
+    
+    def _detener_miniaturas(self, esperar_ms: int = 0):
+        """Cancelar la generación en curso y vaciar la barra"""
+        generador, self._generador_miniaturas = self._generador_miniaturas, None
+        if generador is not None:
+            generador.cancelar()
+            if esperar_ms and generador.isRunning():
+                generador.wait(esperar_ms)
+        if self.lista_miniaturas is not None:
+            self.lista_miniaturas.clear()
+    
+    def _priorizar_miniaturas_visibles(self, *_):
+        """Las miniaturas a la vista en la barra se generan primero"""
+        if self._generador_miniaturas is None or not self.lista_miniaturas.count():
+            return
+        # Una fila por celda de la rejilla, desplazamiento por píxeles
+        alto_fila = max(self.lista_miniaturas.gridSize().height(), 1)
+        desplazamiento = self.lista_miniaturas.verticalScrollBar().value()
+        primera = desplazamiento // alto_fila
+        ultima = min((desplazamiento + self.lista_miniaturas.viewport().height()) // alto_fila,
+                     self.total_pages - 1)
+        self._generador_miniaturas.priorizar(range(primera, ultima + 1))
+    
+    def _on_miniatura_lista(self, generador, numero_pagina: int, imagen: QImage):
+        if generador is not self._generador_miniaturas:
+            return  # Miniatura de un PDF que ya no está abierto
+        item = self.lista_miniaturas.item(numero_pagina)
+        if item is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(imagen)))
+    
+    def _on_miniaturas_finalizadas(self, generador):
+        if generador is self._generador_miniaturas:
+            self._generador_miniaturas = None
+        generador.deleteLater()
+    
+    def _on_miniatura_seleccionada(self, fila: int):
+        if fila >= 0 and self.has_pdf_loaded() and fila != self.current_page:
+            self.goto_page(fila + 1)
+    
+    def detener_tareas(self):
+        """Parar el trabajo en segundo plano (al cerrar la aplicación)"""
+        self._detener_miniaturas(esperar_ms=2000)
+        indexador, self._indexador_texto = self._indexador_texto, None
+        if indexador is not None and indexador.isRunning():
+            indexador.cancelar()
+            indexador.wait(2000)
+        if self._renderizador is not None:
+            self._renderizador.cancelar()
+
+    # ===== BÚSQUEDA DE TEXTO =====
+    
+    def _crear_busqueda(self, parent: QWidget, geometry):
+        """Caja de búsqueda: Enter salta al siguiente resultado"""
+        self.busqueda_pdf = QLineEdit(parent)
+        self.busqueda_pdf.setObjectName("busqueda_pdf")
+        self.busqueda_pdf.setPlaceholderText("🔍 Buscar en el PDF")
+        self.busqueda_pdf.setClearButtonEnabled(True)
+        self.busqueda_pdf.setGeometry(geometry.x(), geometry.y(), ANCHO_PANEL_MINIATURAS, 26)
+        self.busqueda_pdf.textChanged.connect(self.buscar_texto)
+        self.busqueda_pdf.returnPressed.connect(self.siguiente_resultado)
+        self.busqueda_pdf.show()
+        
+        self.busqueda_info = QLabel(parent)
+        self.busqueda_info.setGeometry(geometry.x(), geometry.y() + 28, ANCHO_PANEL_MINIATURAS, 18)
+        self.busqueda_info.setStyleSheet("color: #666; font-size: 10px;")
+        self.busqueda_info.show()
+    
+    def _iniciar_indice_texto(self):
+        """Actualizar en segundo plano el índice de texto del contrato del PDF"""
+        anterior, self._indexador_texto = self._indexador_texto, None
+        if anterior is not None:
+            anterior.cancelar()
+        try:
+            from .controlador_routes import rutas
+            carpeta = carpeta_contrato_de(self.current_pdf_path, rutas.get_ruta_carpeta_obras())
+        except Exception as e:
+            logger.error(f"[PDF] Error localizando carpeta del contrato: {e}")
+            return
+        
+        if self._indice_texto is not None and self._indice_texto.carpeta_contrato != carpeta:
+            self._indice_texto = None
+        if carpeta is None:
+            self._mostrar_info_busqueda("Búsqueda solo en PDFs de obras")
+            return
+        if self._indice_texto is None:
+            self._mostrar_info_busqueda("⏳ Indexando texto...")
+        
+        indexador = IndexadorTextoPDF([carpeta], self)
+        indexador.carpeta_indexada.connect(self._on_indice_texto_listo)
+        indexador.finished.connect(lambda i=indexador: self._on_indexador_texto_finalizado(i))
+        self._indexador_texto = indexador
+        indexador.start(IndexadorTextoPDF.LowPriority)
+    
+    def _on_indice_texto_listo(self, carpeta: str, indice):
+        if self._indexador_texto is None or self.sender() is not self._indexador_texto:
+            return
+        self._indice_texto = indice
+        self.buscar_texto(self.busqueda_pdf.text() if self.busqueda_pdf else "")
+    
+    def _on_indexador_texto_finalizado(self, indexador):
+        if indexador is self._indexador_texto:
+            self._indexador_texto = None
+        indexador.deleteLater()
+    
+    def buscar_texto(self, consulta: str):
+        """Buscar en el PDF abierto y saltar al primer resultado"""
+        self._marcar_resultados([])
+        self._resultados_busqueda = []
+        self._resultado_actual = -1
+        consulta = (consulta or "").strip()
+        
+        if not consulta or not self.has_pdf_loaded():
+            self._mostrar_info_busqueda("")
+            return
+        if self._indice_texto is None:
+            self._mostrar_info_busqueda("⏳ Indexando texto...")
+            return
+        
+        resultados = self._indice_texto.buscar(consulta, ruta_pdf=self.current_pdf_path)
+        self._resultados_busqueda = [r['pagina'] for r in resultados]
+        self._marcar_resultados(self._resultados_busqueda)
+        if not resultados:
+            self._mostrar_info_busqueda("Sin resultados")
+            return
+        self.siguiente_resultado()
+    
+    def siguiente_resultado(self):
+        """Saltar a la siguiente página con resultados (cíclico)"""
+        if not self._resultados_busqueda:
+            return
+        self._resultado_actual = (self._resultado_actual + 1) % len(self._resultados_busqueda)
+        self.goto_page(self._resultados_busqueda[self._resultado_actual] + 1)
+        self._mostrar_info_busqueda(
+            f"{self._resultado_actual + 1} de {len(self._resultados_busqueda)} páginas · Enter: siguiente"
+        )
+    
+    def _mostrar_info_busqueda(self, texto: str):
+        if self.busqueda_info is not None:
+            self.busqueda_info.setText(texto)
+    
+    def _marcar_resultados(self, paginas: list):
+        """Resaltar en la barra las miniaturas de las páginas con resultados"""
+        if self.lista_miniaturas is None:
+            return
+        marcadas = set(paginas)
+        color = QColor(COLOR_RESULTADO_BUSQUEDA)
+        for fila in range(self.lista_miniaturas.count()):
+            item = self.lista_miniaturas.item(fila)
+            item.setBackground(color if fila in marcadas else QBrush())
+
+    def mostrar_resultado(self, ruta_pdf: str, numero_pagina: int) -> bool:
+        """Ir a un resultado de búsqueda si es el PDF abierto en el visor"""
+        if not self.has_pdf_loaded() or not self.current_pdf_path:
+            return False
+        if os.path.normcase(os.path.abspath(ruta_pdf)) != os.path.normcase(os.path.abspath(self.current_pdf_path)):
+            return False
+        self.goto_page(numero_pagina + 1)
+        return True
+
+    def _obtener_renderizador(self) -> RenderizadorPaginasPDF:
+        """Renderizador con cache LRU (creado al primer uso)"""
+        if self._renderizador is None:
+            self._renderizador = RenderizadorPaginasPDF(self)
+            self._renderizador.pagina_lista.connect(self._on_pagina_lista)
+        return self._renderizador
+
+    def _paginas_visibles(self) -> list:
+        """Números de página mostrados ahora (vista dual)"""
+        return [n for n in (self.current_page, self.current_page + 1) if n < self.total_pages]
+
+    def _label_de_pagina(self, numero_pagina: int) -> Optional[QLabel]:
+        if numero_pagina == self.current_page:
+            return self.pdf_label_left
+        if numero_pagina == self.current_page + 1:
+            return self.pdf_label_right
+        return None
+
+    def _mostrar_pixmap(self, label: QLabel, qpix: QPixmap):
+        label.setPixmap(qpix)
+        label.setScaledContents(False)
+        label.resize(qpix.size())
+
+    def _mostrar_previsualizacion(self, label: QLabel, numero_pagina: int, previa: QPixmap):
+        """Previsualización escalada al tamaño final mientras llega la página completa"""
+        ancho, alto = self._tamano_pagina(numero_pagina)
+        self._mostrar_pixmap(label, previa.scaled(ancho, alto, Qt.IgnoreAspectRatio, Qt.FastTransformation))
+
+    def _tamano_pagina(self, numero_pagina: int) -> tuple:
+        """Tamaño en píxeles de la página al zoom actual (sin rasterizar)"""
+        rect = self.pdf_document[numero_pagina].rect
+        return int(round(rect.width * self.zoom_level)), int(round(rect.height * self.zoom_level))
+
     def render_page(self):
-        """Renderizar página(s) - con soporte dual"""
+        """Renderizar página(s) - con soporte dual, rasterizando en segundo plano"""
         if not self.has_pdf_loaded() or not self.pdf_label or not _fitz_module:
             return
         
         try:
-            # Página izquierda (actual)
-            page = self.pdf_document[self.current_page]
-            mat = _fitz_module.Matrix(self.zoom_level, self.zoom_level)
-            pix = page.get_pixmap(matrix=mat)
-            fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
-            image = QImage(pix.samples, pix.width, pix.height, pix.stride, fmt)
-            qpix = QPixmap.fromImage(image)
-            
-            self.pdf_label_left.setPixmap(qpix)
-            self.pdf_label_left.setScaledContents(False)
-            self.pdf_label_left.resize(qpix.size())
+            renderizador = self._obtener_renderizador()
+            pendientes = []
+            hay_teselado = False
+            self._peticion_teselas = {}
             
-            # Página derecha (si existe)
-            if (self.current_page + 1) < self.total_pages:
-                page_right = self.pdf_document[self.current_page + 1]
-                pix_right = page_right.get_pixmap(matrix=mat)
-                image_right = QImage(pix_right.samples, pix_right.width, pix_right.height, pix_right.stride, fmt)
-                qpix_right = QPixmap.fromImage(image_right)
+            for numero_pagina in self._paginas_visibles():
+                label = self._label_de_pagina(numero_pagina)
+                clave = clave_pagina(self._id_documento, numero_pagina, self.zoom_level)
                 
-                self.pdf_label_right.setPixmap(qpix_right)
-                self.pdf_label_right.setScaledContents(False)
-                self.pdf_label_right.resize(qpix_right.size())
-            else:
+                # Zoom alto en página grande: solo se rasteriza la zona visible
+                ancho, alto = self._tamano_pagina(numero_pagina)
+                if requiere_teselado(ancho, alto):
+                    hay_teselado = True
+                    label.mostrar_teselado(numero_pagina, clave, ancho, alto,
+                                           renderizador.obtener, self._on_teselas_faltan)
+                    continue
+                
+                qpix = renderizador.obtener(clave)
+                if qpix is not None:
+                    self._mostrar_pixmap(label, qpix)
+                    continue
+                
+                pendientes.append(clave)
+                previa_clave = clave_previsualizacion(clave)
+                previa = renderizador.obtener(previa_clave) if previa_clave else None
+                if previa is not None:
+                    self._mostrar_previsualizacion(label, numero_pagina, previa)
+                else:
+                    label.clear()
+                    label.setText(f"⏳ Renderizando página {numero_pagina + 1}...")
+            
+            # Página derecha (si no existe)
+            if (self.current_page + 1) >= self.total_pages:
                 self.pdf_label_right.clear()
                 self.pdf_label_right.setText("Fin del documento")
+            
+            # Dobles páginas anterior y siguiente como precarga (no con páginas teseladas)
+            precarga = []
+            if not hay_teselado:
+                vecinas = [self.current_page + 2, self.current_page + 3,
+                           self.current_page - 2, self.current_page - 1]
+                precarga = [clave_pagina(self._id_documento, n, self.zoom_level)
+                            for n in vecinas if 0 <= n < self.total_pages]
+            
+            self._peticion_paginas = pendientes
+            self._peticion_precarga = precarga
+            self._enviar_peticion_render()
                 
         except Exception as e:
             logger.error(f"[PDF] Error renderizando: {e}")
 
+    def _on_teselas_faltan(self, numero_pagina: int, claves: list):
+        """Un label teselado necesita teselas de su zona visible"""
+        if numero_pagina not in self._paginas_visibles():
+            return
+        self._peticion_teselas[numero_pagina] = claves
+        if not self._peticion_programada:
+            # Agrupar las peticiones de ambos labels en un solo envío
+            self._peticion_programada = True
+            QTimer.singleShot(0, self._enviar_peticion_render)
+
+    def _enviar_peticion_render(self):
+        """Enviar al renderizador todo lo que se necesita ahora (sustituye lo anterior)"""
+        self._peticion_programada = False
+        if not self.has_pdf_loaded() or not _fitz_module:
+            return
+        visibles = list(self._peticion_paginas)
+        for claves in self._peticion_teselas.values():
+            visibles.extend(claves)
+        self._obtener_renderizador().solicitar(
+            _fitz_module, self.current_pdf_path, visibles, self._peticion_precarga
+        )
+
+    def _on_pagina_lista(self, clave):
+        """Una página (o tesela) terminó de renderizarse en segundo plano"""
+        try:
+            id_documento, numero_pagina, zoom = clave[:3]
+            if id_documento != self._id_documento or not self.has_pdf_loaded():
+                return
+            label = self._label_de_pagina(numero_pagina)
+            if label is None:
+                return
+            
+            clave_actual = clave_pagina(self._id_documento, numero_pagina, self.zoom_level)
+            if label.en_teselado(clave_actual):
+                if es_clave_tesela(clave) and clave[:3] == clave_actual:
+                    label.actualizar_tesela(*clave[3:])
+                elif clave == clave_previsualizacion(clave_actual):
+                    label.update()
+                return
+            
+            renderizador = self._obtener_renderizador()
+            if clave == clave_actual:
+                self._mostrar_pixmap(label, renderizador.obtener(clave))
+            elif clave == clave_previsualizacion(clave_actual) and renderizador.obtener(clave_actual) is None:
+                self._mostrar_previsualizacion(label, numero_pagina, renderizador.obtener(clave))
+        except Exception as e:
+            logger.error(f"[PDF] Error mostrando página renderizada: {e}")
+
     def next_page(self):
         """Página siguiente - saltar 2 páginas"""
         if self.has_pdf_loaded() and (self.current_page + 2) < self.total_pages:
@@ -537,6 +890,10 @@ class _PDFControllerOptimized(QObject):
                 self.page_info.setText("Página 0 de 0")
         if self.zoom_label:
             self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
+        if self.lista_miniaturas is not None and has_pdf:
+            self.lista_miniaturas.blockSignals(True)
+            self.lista_miniaturas.setCurrentRow(self.current_page)
+            self.lista_miniaturas.blockSignals(False)
 
     
     def goto_page(self, page_number: int):
@@ -559,18 +916,16 @@ class _PDFControllerOptimized(QObject):
         if not self.has_pdf_loaded() or not self.scroll_area or not _fitz_module:
             return
         try:
-            page = self.pdf_document[self.current_page]
-            pix = page.get_pixmap(matrix=_fitz_module.Matrix(1, 1))
-            if not pix:
-                return
+            # Tamaño de la página a zoom 1 sin rasterizarla
+            rect = self.pdf_document[self.current_page].rect
                 
             viewport_size = self.scroll_area.viewport().size()
             area_width = viewport_size.width() - 20
             area_height = viewport_size.height() - 20
             
-            if pix.width and pix.height:
-                zoom_width = area_width / pix.width
-                zoom_height = area_height / pix.height
+            if rect.width and rect.height:
+                zoom_width = area_width / rect.width
+                zoom_height = area_height / rect.height
                 
                 self.zoom_level = max(0.25, min(3.0, min(zoom_width, zoom_height)))
                 
@@ -600,6 +955,12 @@ class _PDFControllerOptimized(QObject):
 
     def clear_pdf(self):
         """Limpiar PDF"""
+        if self._renderizador is not None:
+            self._renderizador.invalidar(self._id_documento)
+        self._detener_miniaturas()
+        self._resultados_busqueda = []
+        self._mostrar_info_busqueda("")
+        self._id_documento = None
         self.pdf_document = None
         self.current_pdf_path = None
         self.total_pages = 0
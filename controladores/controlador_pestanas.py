@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_pestanas.py - Carga diferida de las pestañas de la ventana principal
+- Los campos de cada pestaña se agrupan una vez (la interfaz es fija)
+- Al cambiar de contrato solo se rellena la pestaña visible; el resto queda pendiente
+- Una pestaña pendiente se rellena la primera vez que se activa (o antes de un cálculo que
+  lee campos de otras pestañas); las que no se abren no cuestan nada
+- Los eventos de los campos de una pestaña se conectan la primera vez que se abre
+"""
+
+import logging
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def agrupar_widgets_por_pagina(widgets: Iterable, paginas: Dict[object, str],
+                               padre_de: Callable[[object], Optional[object]]) -> Dict[Optional[str], List]:
+    """
+    Agrupa los widgets por la pestaña que los contiene
+
+    Args:
+        paginas: widget de página -> clave de la pestaña
+        padre_de: función que devuelve el padre de un widget (None en la raíz)
+
+    Returns:
+        clave de pestaña (None para los widgets fuera de las pestañas) -> widgets
+    """
+    grupos: Dict[Optional[str], List] = {clave: [] for clave in paginas.values()}
+    grupos[None] = []
+    for widget in widgets:
+        padre = padre_de(widget)
+        while padre is not None and padre not in paginas:
+            padre = padre_de(padre)
+        grupos[paginas.get(padre) if padre is not None else None].append(widget)
+    return grupos
+
+
+class CargaDiferidaPestanas:
+    """
+    Estado de carga de las pestañas: cada una se conecta una sola vez
+    y se rellena una vez por contrato, cuando se necesita
+    """
+
+    def __init__(self, claves: Iterable[Hashable],
+                 conectar: Callable[[Hashable], None],
+                 poblar: Callable[[Hashable, dict], None]):
+        self.claves = list(claves)
+        self._conectar = conectar
+        self._poblar = poblar
+        self.datos: Optional[dict] = None
+        self.conectadas = set()
+        self.pobladas = set()
+
+    def nuevo_contrato(self, datos: dict):
+        """Dejar todas las pestañas pendientes de rellenar con los datos del contrato"""
+        # Copia: los guardados que se disparan al rellenar una pestaña no deben cambiar
+        # los datos con los que se rellenan las siguientes
+        self.datos = dict(datos)
+        self.pobladas.clear()
+
+    def actualizar_datos(self, datos: dict):
+        """Datos más recientes del mismo contrato para las pestañas que aún no se han rellenado"""
+        if self.datos is not None:
+            self.datos = dict(datos)
+
+    def pendientes(self) -> List[Hashable]:
+        if self.datos is None:
+            return []
+        return [clave for clave in self.claves if clave not in self.pobladas]
+
+    def activar(self, clave: Hashable):
+        """La pestaña se va a mostrar: conectarla si es la primera vez y rellenarla si está pendiente"""
+        if clave not in self.claves:
+            return
+        if clave not in self.conectadas:
+            self.conectadas.add(clave)
+            self._conectar(clave)
+        self.poblar(clave)
+
+    def poblar(self, clave: Hashable) -> bool:
+        """Rellenar la pestaña con los datos del contrato actual si aún no lo está"""
+        if self.datos is None or clave in self.pobladas or clave not in self.claves:
+            return False
+        self.pobladas.add(clave)
+        self._poblar(clave, self.datos)
+        return True
+
+    def poblar_siguiente(self) -> bool:
+        """Rellenar la siguiente pestaña pendiente"""
+        pendientes = self.pendientes()
+        return self.poblar(pendientes[0]) if pendientes else False
+
+    def poblar_todas(self):
+        """Rellenar todas las pendientes (antes de leer campos de cualquier pestaña)"""
+        while self.poblar_siguiente():
+            pass
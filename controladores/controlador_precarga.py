@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_precarga.py - Precarga de módulos pesados tras el arranque
+- Importa y prepara PyMuPDF, python-docx, openpyxl/pandas, PyPDF2 y cryptography
+  en un hilo de baja prioridad cuando la ventana ya está visible
+- Orden por prioridad; un módulo que se necesita antes pasa al principio de la cola
+- Los avisos de "módulo listo" llegan en el hilo de la GUI
+- Guarda el tiempo de cada precarga
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+ESTADO_LISTO = "listo"
+ESTADO_NO_DISPONIBLE = "no_disponible"
+ESTADO_ERROR = "error"
+
+
+# =================== TAREAS DE PRECARGA ===================
+
+def _preparar_fitz():
+    import fitz  # PyMuPDF
+    fitz.open().close()  # Inicializa el contexto de MuPDF
+
+
+def _preparar_docx():
+    from docx import Document
+    Document()  # Carga y parsea la plantilla por defecto de python-docx
+
+
+def _preparar_openpyxl():
+    import openpyxl
+    openpyxl.Workbook()
+
+
+def _preparar_pandas():
+    import pandas  # noqa: F401  (opcional, solo para la ventana de doble tabla)
+
+
+def _preparar_pypdf2():
+    from PyPDF2 import PdfReader  # noqa: F401
+
+
+def _preparar_cryptography():
+    from cryptography import x509  # noqa: F401
+    from cryptography.hazmat.primitives.serialization import pkcs7  # noqa: F401
+
+
+# (nombre, función, opcional) en orden de prioridad
+TAREAS_PRECARGA: List[Tuple[str, Callable[[], None], bool]] = [
+    ("fitz", _preparar_fitz, False),
+    ("docx", _preparar_docx, False),
+    ("openpyxl", _preparar_openpyxl, False),
+    ("PyPDF2", _preparar_pypdf2, False),
+    ("cryptography", _preparar_cryptography, False),
+    ("pandas", _preparar_pandas, True),
+]
+
+
+class ColaPrecarga:
+    """Cola de módulos por prioridad con su estado y tiempo (sin Qt: la usa PrecargadorModulos)"""
+
+    def __init__(self, tareas=None):
+        tareas = TAREAS_PRECARGA if tareas is None else tareas
+        self._funciones = {nombre: (funcion, opcional) for nombre, funcion, opcional in tareas}
+        self._pendientes = [nombre for nombre, _, _ in tareas]
+        self._en_curso: Optional[str] = None
+        self._lock = threading.Lock()
+        self.estados: Dict[str, Tuple[str, str]] = {}   # nombre -> (estado, error)
+        self.tiempos: Dict[str, float] = {}             # nombre -> segundos
+
+    def tiene(self, nombre: str) -> bool:
+        return nombre in self._funciones
+
+    def hay_pendientes(self) -> bool:
+        with self._lock:
+            return bool(self._pendientes)
+
+    def priorizar(self, nombre: str):
+        """Poner el módulo el primero de la cola (o volver a encolarlo tras vaciar())"""
+        with self._lock:
+            if nombre == self._en_curso or nombre in self.estados:
+                return
+            if nombre in self._pendientes:
+                self._pendientes.remove(nombre)
+            self._pendientes.insert(0, nombre)
+
+    def vaciar(self):
+        with self._lock:
+            self._pendientes.clear()
+
+    def siguiente(self) -> Optional[str]:
+        with self._lock:
+            self._en_curso = self._pendientes.pop(0) if self._pendientes else None
+            return self._en_curso
+
+    def ejecutar_pendientes(self, al_terminar: Callable[[str, bool, str], None] = None):
+        """Precargar la cola en orden; al_terminar(nombre, correcto, error) tras cada módulo"""
+        inicio_total = time.perf_counter()
+        while True:
+            nombre = self.siguiente()
+            if nombre is None:
+                break
+            estado, error = self.precargar(nombre)
+            if al_terminar:
+                al_terminar(nombre, estado == ESTADO_LISTO, error)
+        if self.tiempos:
+            detalle = ", ".join(f"{nombre} {segundos:.2f}s" for nombre, segundos in self.tiempos.items())
+            logger.info(f"Precarga de módulos en {time.perf_counter() - inicio_total:.2f}s: {detalle}")
+
+    def precargar(self, nombre: str) -> Tuple[str, str]:
+        """Importar y preparar un módulo (una sola vez); devuelve (estado, error)"""
+        if nombre in self.estados:
+            return self.estados[nombre]
+        funcion, opcional = self._funciones[nombre]
+        inicio = time.perf_counter()
+        try:
+            funcion()
+            estado, error = ESTADO_LISTO, ""
+        except ImportError as e:
+            estado, error = ESTADO_NO_DISPONIBLE, str(e)
+            if not opcional:
+                logger.warning(f"Precarga: {nombre} no disponible: {e}")
+        except Exception as e:
+            estado, error = ESTADO_ERROR, str(e)
+            logger.error(f"Precarga: error preparando {nombre}: {e}")
+        with self._lock:
+            self.tiempos[nombre] = time.perf_counter() - inicio
+            self.estados[nombre] = (estado, error)
+            if self._en_curso == nombre:
+                self._en_curso = None
+        return estado, error
+
+    def resumen(self) -> Dict[str, dict]:
+        """Estado y segundos de cada módulo precargado"""
+        return {
+            nombre: {'estado': estado, 'segundos': round(self.tiempos.get(nombre, 0.0), 4), 'error': error}
+            for nombre, (estado, error) in self.estados.items()
+        }
+
+
+class _HiloPrecarga(QThread):
+    def __init__(self, precargador: 'PrecargadorModulos'):
+        super().__init__(precargador)
+        self.precargador = precargador
+
+    def run(self):
+        self.precargador.cola.ejecutar_pendientes(self.precargador.modulo_listo.emit)
+
+
+class PrecargadorModulos(QObject):
+    """Cola de precarga de módulos pesados ejecutada en un hilo de baja prioridad"""
+
+    # nombre, correcto, error (se emite desde el hilo de precarga)
+    modulo_listo = pyqtSignal(str, bool, str)
+    precarga_finalizada = pyqtSignal()
+
+    def __init__(self, tareas=None, parent=None):
+        super().__init__(parent)
+        self.cola = ColaPrecarga(tareas)
+        self._callbacks: Dict[str, List[Callable[[bool, str], None]]] = {}
+        self._hilo: Optional[QThread] = None
+        self.modulo_listo.connect(self._on_modulo_listo)
+
+    @property
+    def estados(self) -> Dict[str, Tuple[str, str]]:
+        return self.cola.estados
+
+    @property
+    def tiempos(self) -> Dict[str, float]:
+        return self.cola.tiempos
+
+    # =================== API ===================
+
+    def iniciar(self):
+        """Arrancar la precarga (no hace nada si ya está en marcha o terminada)"""
+        if self.en_marcha() or not self.cola.hay_pendientes():
+            return
+        self._hilo = _HiloPrecarga(self)
+        self._hilo.finished.connect(self.precarga_finalizada)
+        self._hilo.start(QThread.LowPriority)
+
+    def al_cargar(self, nombre: str, callback: Callable[[bool, str], None]):
+        """
+        Llamar a callback(correcto, error) en el hilo de la GUI cuando el módulo esté listo.
+        Si aún no se ha precargado, pasa el primero de la cola y se arranca la precarga.
+        """
+        if nombre in self.estados:
+            estado, error = self.estados[nombre]
+            callback(estado == ESTADO_LISTO, error)
+            return
+        if not self.cola.tiene(nombre):
+            callback(False, f"Módulo sin precarga: {nombre}")
+            return
+        self._callbacks.setdefault(nombre, []).append(callback)
+        self.priorizar(nombre)
+        self.iniciar()
+
+    def priorizar(self, nombre: str):
+        """Poner el módulo el primero de la cola (o volver a encolarlo tras detener())"""
+        self.cola.priorizar(nombre)
+
+    def en_marcha(self) -> bool:
+        return self._hilo is not None and self._hilo.isRunning()
+
+    def esta_listo(self, nombre: str) -> bool:
+        return self.estados.get(nombre, (None, ""))[0] == ESTADO_LISTO
+
+    def detener(self, esperar_ms: int = 3000):
+        """Vaciar la cola y esperar al módulo en curso (un import no se puede interrumpir)"""
+        self.cola.vaciar()
+        if self.en_marcha():
+            self._hilo.wait(esperar_ms)
+
+    def resumen(self) -> Dict[str, dict]:
+        """Estado y segundos de cada módulo precargado"""
+        return self.cola.resumen()
+
+    # =================== AVISOS ===================
+
+    def _on_modulo_listo(self, nombre: str, correcto: bool, error: str):
+        """En el hilo de la GUI: avisar a quien esperaba el módulo"""
+        for callback in self._callbacks.pop(nombre, []):
+            try:
+                callback(correcto, error)
+            except Exception as e:
+                logger.error(f"Error en aviso de precarga de {nombre}: {e}")
+
+
+_precargador = None  # PrecargadorModulos compartido (se crea al pedirlo)
+
+
+def obtener_precargador() -> PrecargadorModulos:
+    """Precargador compartido por toda la aplicación"""
+    global _precargador
+    if _precargador is None:
+        _precargador = PrecargadorModulos()
+    return _precargador
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Almacén de actuaciones y facturas de obra, separado de BaseDatos.json
+- Un archivo por contrato (basedatos/actuaciones_facturas/<contrato>.json) con sus dos tablas
+- Cada alta, modificación o baja de una fila añade una línea al diario del contrato
+  (<contrato>.diario.jsonl) en lugar de reescribir toda la base de datos
+- Al abrir el contrato se lee la instantánea y se aplican las operaciones del diario; cuando
+  el diario pasa de LIMITE_DIARIO operaciones se compacta (instantánea atómica y diario vacío)
+- Las operaciones llevan número de secuencia: las que ya recoge la instantánea se ignoran
+  (por si la compactación se cortó entre escribir la instantánea y borrar el diario)
+- La primera vez que se abre un contrato se siembra con las listas que tenía en BaseDatos.json;
+  después, cada compactación con cambios avisa (al_compactar) para volver a copiarlas allí
+- Al eliminar el contrato se elimina su almacén (eliminar_almacen_contrato): otro contrato
+  con el mismo nombre empieza con el suyo
+"""
+import os
+import json
+import hashlib
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLAS = ("actuaciones", "facturas")
+LIMITE_DIARIO = 200
+
+
+def nombre_archivo_contrato(clave: str) -> str:
+    """Nombre de archivo (sin extensión) legible y sin colisiones para un contrato"""
+    limpio = "".join(c if c.isalnum() or c in "-_" else "_" for c in clave).strip("_")[:60]
+    return f"{limpio or 'contrato'}_{hashlib.sha1(clave.encode('utf-8')).hexdigest()[:10]}"
+
+
+def eliminar_almacen_contrato(carpeta: str, clave: str) -> bool:
+    """Borrar la instantánea y el diario del contrato; True si había alguno"""
+    base = os.path.join(carpeta, nombre_archivo_contrato(clave))
+    borrado = False
+    for ruta in (base + ".json", base + ".diario.jsonl", base + ".json.tmp"):
+        try:
+            os.remove(ruta)
+            borrado = True
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error eliminando {os.path.basename(ruta)}: {e}")
+    if borrado:
+        logger.info(f"Almacén de actuaciones y facturas eliminado: {clave}")
+    return borrado
+
+
+class RepositorioActuacionesFacturas:
+    """Actuaciones y facturas de un contrato: instantánea más diario de operaciones por fila"""
+
+    def __init__(self, carpeta: str, clave: str, datos_iniciales: Optional[Dict] = None,
+                 al_compactar: Optional[Callable[[str, Dict[str, List[Dict]]], None]] = None):
+        self.carpeta = carpeta
+        self.clave = clave
+        # al_compactar(clave, tablas) tras cada compactación con filas que BaseDatos.json no tiene
+        self.al_compactar = al_compactar
+        self._sin_volcar = False
+        base = os.path.join(carpeta, nombre_archivo_contrato(clave))
+        self.archivo = base + ".json"
+        self.archivo_diario = base + ".diario.jsonl"
+        self.tablas: Dict[str, List[Dict]] = {tabla: [] for tabla in TABLAS}
+        self._secuencia = 0
+        self._operaciones_diario = 0
+        self._cargar(datos_iniciales or {})
+
+    # =================== LECTURA ===================
+
+    def filas(self, tabla: str) -> List[Dict]:
+        """Lista de filas de la tabla (la misma lista que se modifica con cada operación)"""
+        return self.tablas[tabla]
+
+    def _cargar(self, datos_iniciales: Dict):
+        existe = os.path.exists(self.archivo)
+        if existe:
+            try:
+                with open(self.archivo, 'r', encoding='utf-8') as f:
+                    datos = json.load(f)
+            except Exception as e:
+                logger.error(f"Error leyendo {os.path.basename(self.archivo)}: {e}")
+                datos = {}
+        else:
+            # Primera vez: las filas que el contrato tenía en BaseDatos.json
+            datos = datos_iniciales
+        for tabla in TABLAS:
+            self.tablas[tabla] = [dict(fila) for fila in datos.get(tabla) or []]
+        self._secuencia = datos.get("secuencia", 0) if existe else 0
+        diario_completo = self._aplicar_diario()
+        # Sin instantánea se crea ya, para que BaseDatos.json solo se lea esta vez; con el
+        # diario cortado también (las operaciones siguientes no quedarían detrás de la línea rota)
+        if self._ids_unicos() or not existe or not diario_completo:
+            self.compactar()
+
+    def _aplicar_diario(self) -> bool:
+        """Aplicar las operaciones pendientes del diario; False si tenía una línea incompleta"""
+        try:
+            with open(self.archivo_diario, 'r', encoding='utf-8') as f:
+                for linea in f:
+                    try:
+                        operacion = json.loads(linea)
+                    except ValueError:
+                        # Última línea a medio escribir (cierre inesperado): se descarta
+                        logger.warning(f"Operación incompleta en {os.path.basename(self.archivo_diario)}")
+                        return False
+                    if operacion.get("n", 0) <= self._secuencia:
+                        continue
+                    self._aplicar(operacion)
+                    self._sin_volcar = True
+                    self._secuencia = operacion["n"]
+                    self._operaciones_diario += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error leyendo diario de {self.clave}: {e}")
+        return True
+
+    def _aplicar(self, operacion: Dict):
+        filas = self.tablas[operacion["tabla"]]
+        posicion = self._posicion(filas, operacion["id"])
+        if operacion["op"] == "borrar":
+            if posicion is not None:
+                del filas[posicion]
+        elif posicion is None:
+            filas.append(operacion["fila"])
+        else:
+            filas[posicion] = operacion["fila"]
+
+    def _ids_unicos(self) -> bool:
+        """Dar id a las filas sin él o con uno repetido (ids por segundo de creación); True si cambió alguno"""
+        cambiado = False
+        for tabla, filas in self.tablas.items():
+            vistos = set()
+            for fila in filas:
+                if not fila.get("id") or fila["id"] in vistos:
+                    fila["id"] = self._id_libre(vistos, fila.get("id"))
+                    logger.warning(f"Fila de {tabla} sin id único en {self.clave}: se le asigna {fila['id']}")
+                    cambiado = self._sin_volcar = True
+                vistos.add(fila["id"])
+        return cambiado
+
+    @staticmethod
+    def _id_libre(ids, id_propuesto) -> str:
+        base = str(id_propuesto or "fila")
+        candidato = base
+        contador = 2
+        while candidato in ids:
+            candidato = f"{base}_{contador}"
+            contador += 1
+        return candidato
+
+    @staticmethod
+    def _posicion(filas: List[Dict], id_fila) -> Optional[int]:
+        for posicion, fila in enumerate(filas):
+            if fila.get("id") == id_fila:
+                return posicion
+        return None
+
+    # =================== ESCRITURA ===================
+
+    def insertar(self, tabla: str, fila: Dict) -> str:
+        """Añadir la fila (su id se cambia si ya existe en la tabla); devuelve el id, '' si no se pudo guardar"""
+        fila["id"] = self._id_libre({f.get("id") for f in self.tablas[tabla]}, fila.get("id"))
+        if not self._registrar("insertar", tabla, fila["id"], fila):
+            return ""
+        self.tablas[tabla].append(fila)
+        self._compactar_si_toca()
+        return fila["id"]
+
+    def actualizar(self, tabla: str, fila: Dict) -> bool:
+        """Sustituir la fila con el mismo id; False si no existe o no se pudo guardar"""
+        posicion = self._posicion(self.tablas[tabla], fila.get("id"))
+        if posicion is None or not self._registrar("actualizar", tabla, fila["id"], fila):
+            return False
+        self.tablas[tabla][posicion] = fila
+        self._compactar_si_toca()
+        return True
+
+    def borrar(self, tabla: str, id_fila) -> bool:
+        """Quitar la fila con ese id; False si no existe o no se pudo guardar"""
+        posicion = self._posicion(self.tablas[tabla], id_fila)
+        if posicion is None or not self._registrar("borrar", tabla, id_fila):
+            return False
+        del self.tablas[tabla][posicion]
+        self._compactar_si_toca()
+        return True
+
+    def _registrar(self, op: str, tabla: str, id_fila, fila: Dict = None) -> bool:
+        """Añadir la operación al diario (una línea); la memoria solo cambia si se escribió"""
+        operacion = {"n": self._secuencia + 1, "op": op, "tabla": tabla, "id": id_fila}
+        if fila is not None:
+            operacion["fila"] = fila
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            with open(self.archivo_diario, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(operacion, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.error(f"Error guardando {op} de {tabla} en {self.clave}: {e}")
+            return False
+        self._secuencia += 1
+        self._operaciones_diario += 1
+        self._sin_volcar = True
+        return True
+
+    def _compactar_si_toca(self):
+        if self._operaciones_diario >= LIMITE_DIARIO:
+            self.compactar()
+
+    def compactar(self) -> bool:
+        """Escribir la instantánea completa (escritura atómica) y vaciar el diario"""
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            ruta_temporal = self.archivo + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump({"contrato": self.clave, "secuencia": self._secuencia, **self.tablas},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(ruta_temporal, self.archivo)
+            if os.path.exists(self.archivo_diario):
+                os.remove(self.archivo_diario)
+            self._operaciones_diario = 0
+        except Exception as e:
+            logger.error(f"Error guardando actuaciones y facturas de {self.clave}: {e}")
+            return False
+        if self._sin_volcar and self.al_compactar:
+            try:
+                self.al_compactar(self.clave, self.tablas)
+                self._sin_volcar = False
+            except Exception as e:
+                logger.error(f"Error copiando actuaciones y facturas de {self.clave} a la base de datos: {e}")
+        return True
+
+    def cerrar(self):
+        """Al dejar el contrato: compactar lo pendiente, salvo que su almacén se haya eliminado"""
+        if self.pendiente and os.path.exists(self.archivo):
+            self.compactar()
+
+    @property
+    def pendiente(self) -> bool:
+        """Hay operaciones en el diario que aún no recoge la instantánea"""
+        return self._operaciones_diario > 0
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Repositorio en memoria de las facturas directas
+- El JSON se parsea una vez y se mantiene en memoria con un índice por id
+- Antes de cada lectura se compara el tamaño/mtime del archivo: si otro proceso
+  (u otro controlador) lo ha cambiado, se vuelve a cargar
+- Las escrituras son atómicas (.tmp + os.replace) y dentro de un lote se agrupan
+  en una sola al terminarlo
+"""
+import os
+import json
+import copy
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def datos_iniciales() -> Dict:
+    """Estructura de un facturas_directas.json nuevo"""
+    return {
+        "version": "1.1",
+        "fecha_creacion": datetime.now().isoformat(),
+        "facturas": [],
+        "configuracion": {
+            "categorias": ["Agua", "Vegetal", "Limpieza", "Actuaciones mantenimiento", "Otras"],
+            "estados": ["Emitida", "Tramitada", "Pagada", "Con deficiencias"],
+            "ultimo_id": 0
+        }
+    }
+
+
+class RepositorioFacturasDirectas:
+    """Facturas directas en memoria, revalidadas por (tamaño, mtime) del JSON"""
+
+    def __init__(self, archivo_json: str):
+        self.archivo_json = archivo_json
+        self._datos: Dict = {"facturas": [], "configuracion": {"categorias": [], "ultimo_id": 0}}
+        self._indice: Dict[int, dict] = {}
+        self._firma_archivo = None
+        self._modificado = False
+        self._profundidad_lote = 0
+        # Aumenta cada vez que se sustituye todo el contenido (carga o reemplazar)
+        self._generacion = 0
+
+    # =================== LECTURA ===================
+
+    def _firma_actual(self):
+        try:
+            stat = os.stat(self.archivo_json)
+            return (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _revalidar(self):
+        """Recargar si el archivo ha cambiado desde la última lectura/escritura"""
+        firma = self._firma_actual()
+        if firma == self._firma_archivo:
+            return
+        if self._modificado:
+            # Hay cambios sin guardar: prevalecen sobre los del disco (como antes, gana el último que escribe)
+            logger.warning("facturas_directas.json ha cambiado con cambios pendientes; se conservan los de memoria")
+            return
+        self.cargar()
+
+    def cargar(self) -> bool:
+        """Parsear el JSON completo y reconstruir el índice"""
+        firma = self._firma_actual()
+        try:
+            with open(self.archivo_json, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except Exception as e:
+            logger.error(f"Error leyendo JSON: {e}")
+            datos = {"facturas": [], "configuracion": {"categorias": [], "ultimo_id": 0}}
+        datos.setdefault("facturas", [])
+        datos.setdefault("configuracion", {}).setdefault("ultimo_id", 0)
+        self._establecer(datos)
+        self._firma_archivo = firma
+        self._modificado = False
+        return True
+
+    def _establecer(self, datos: Dict):
+        self._datos = datos
+        self._generacion += 1
+        self._indice = {factura.get("id"): factura for factura in datos["facturas"]}
+
+    def datos(self) -> Dict:
+        """Copia completa del contenido (compatibilidad con leer_datos_json)"""
+        self._revalidar()
+        return copy.deepcopy(self._datos)
+
+    def generacion(self) -> int:
+        """Cambia cuando el contenido se ha sustituido entero (lo derivado de él deja de valer)"""
+        self._revalidar()
+        return self._generacion
+
+    def datos_configuracion(self) -> Dict:
+        """Copia de la sección configuracion (categorías, estados, ultimo_id)"""
+        self._revalidar()
+        return copy.deepcopy(self._datos["configuracion"])
+
+    def ultimo_id(self) -> int:
+        self._revalidar()
+        return self._datos["configuracion"].get("ultimo_id", 0)
+
+    def obtener(self, factura_id: int) -> Optional[Dict]:
+        """Copia de la factura con ese id (activa o no), o None"""
+        self._revalidar()
+        factura = self._indice.get(factura_id)
+        return dict(factura) if factura is not None else None
+
+    def facturas_activas(self) -> List[Dict]:
+        """Copias de las facturas activas, en el orden del archivo"""
+        self._revalidar()
+        return [dict(f) for f in self._datos["facturas"] if f.get("activa", True)]
+
+    def todas(self) -> List[Dict]:
+        """Copias de todas las facturas, también las eliminadas (inactivas)"""
+        self._revalidar()
+        return [dict(f) for f in self._datos["facturas"]]
+
+    # =================== ESCRITURA ===================
+
+    def reemplazar(self, datos: Dict) -> bool:
+        """Sustituir todo el contenido (compatibilidad con guardar_datos_json)"""
+        datos = copy.deepcopy(datos)
+        datos.setdefault("facturas", [])
+        datos.setdefault("configuracion", {}).setdefault("ultimo_id", 0)
+        self._establecer(datos)
+        return self._marcar_modificado()
+
+    def agregar(self, factura: Dict) -> int:
+        """Añadir una factura con el siguiente id; devuelve el id (0 si no se pudo guardar)"""
+        self._revalidar()
+        configuracion = self._datos["configuracion"]
+        configuracion["ultimo_id"] = configuracion.get("ultimo_id", 0) + 1
+        factura = {"id": configuracion["ultimo_id"], **{k: v for k, v in factura.items() if k != "id"}}
+        self._datos["facturas"].append(factura)
+        self._indice[factura["id"]] = factura
+        if self._marcar_modificado():
+            return factura["id"]
+        # No se pudo guardar: no dejar en memoria una factura que el usuario cree no creada
+        self._datos["facturas"].pop()
+        del self._indice[factura["id"]]
+        configuracion["ultimo_id"] -= 1
+        return 0
+
+    def agregar_lote(self, facturas: List[Dict]) -> List[int]:
+        """Añadir varias facturas con ids consecutivos y una sola escritura; [] si no se pudo guardar"""
+        self._revalidar()
+        if not facturas:
+            return []
+        configuracion = self._datos["configuracion"]
+        primer_id = configuracion.get("ultimo_id", 0) + 1
+        nuevas = [{"id": primer_id + i, **{k: v for k, v in factura.items() if k != "id"}}
+                  for i, factura in enumerate(facturas)]
+        self._datos["facturas"].extend(nuevas)
+        self._indice.update((factura["id"], factura) for factura in nuevas)
+        configuracion["ultimo_id"] = primer_id + len(nuevas) - 1
+        if self._marcar_modificado():
+            return [factura["id"] for factura in nuevas]
+        del self._datos["facturas"][-len(nuevas):]
+        for factura in nuevas:
+            del self._indice[factura["id"]]
+        configuracion["ultimo_id"] = primer_id - 1
+        return []
+
+    def modificar(self, factura_id: int, cambios: Dict, solo_activas: bool = False) -> bool:
+        """Aplicar cambios a una factura; False si no existe o no se pudo guardar"""
+        self._revalidar()
+        factura = self._indice.get(factura_id)
+        if factura is None or (solo_activas and not factura.get("activa", True)):
+            return False
+        anteriores = {clave: factura[clave] for clave in cambios if clave in factura}
+        factura.update(cambios)
+        if self._marcar_modificado():
+            return True
+        for clave in cambios:
+            if clave in anteriores:
+                factura[clave] = anteriores[clave]
+            else:
+                factura.pop(clave, None)
+        return False
+
+    def _marcar_modificado(self) -> bool:
+        self._modificado = True
+        if self._profundidad_lote:
+            return True
+        return self.guardar()
+
+    @contextmanager
+    def lote(self):
+        """Agrupar las escrituras: se guarda una sola vez al salir del lote más externo"""
+        self._profundidad_lote += 1
+        try:
+            yield self
+        finally:
+            self._profundidad_lote -= 1
+            if not self._profundidad_lote:
+                self.guardar()
+
+    def guardar(self) -> bool:
+        """Persistir los cambios pendientes (escritura atómica)"""
+        if not self._modificado:
+            return True
+        try:
+            directorio = os.path.dirname(self.archivo_json)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+
+            ruta_temporal = self.archivo_json + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump(self._datos, f, ensure_ascii=False, indent=4)
+            os.replace(ruta_temporal, self.archivo_json)
+
+            self._firma_archivo = self._firma_actual()
+            self._modificado = False
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando JSON: {e}")
+            return False
+
+    @property
+    def pendiente(self) -> bool:
+        return self._modificado
@@ -18,6 +18,7 @@ import datetime
 import re
 import glob
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -66,6 +67,41 @@ class DocumentoGenerado:
     plantilla_usada: str = ""
 
 
+ICONOS_TIPO_DOCUMENTO = {
+    TipoDocumento.INVITACION: "📧",
+    TipoDocumento.ADJUDICACION: "🏆", 
+    TipoDocumento.ACTA_INICIO: "🚀",
+    TipoDocumento.ACTA_REPLANTEO: "📐",
+    TipoDocumento.ACTA_RECEPCION: "✅",
+    TipoDocumento.ACTA_FINALIZACION: "🏁",
+    TipoDocumento.LIQUIDACION: "💰",
+    TipoDocumento.CONTRATO: "📋",
+    TipoDocumento.OTRO: "📄"
+}
+
+COLORES_ESTADO_DOCUMENTO = {
+    EstadoDocumento.GENERADO: "#4CAF50",
+    EstadoDocumento.ERROR: "#F44336", 
+    EstadoDocumento.GENERANDO: "#FF9800",
+    EstadoDocumento.MODIFICADO: "#9C27B0",
+    EstadoDocumento.ENVIADO: "#2196F3",
+    EstadoDocumento.FIRMADO: "#4CAF50"
+}
+
+# Palabras clave en el nombre del PDF -> fase del proyecto (el orden importa: gana la primera)
+MAPEO_ARCHIVOS_PDF_FASES = {
+    'CREACION': ['proyecto', 'creacion'],
+    'INICIO': ['inicio', 'acta_inicio', 'inicio_contrato'],
+    'CARTASINVITACION': ['cartas_invitacion', 'invitacion', 'carta_invitacion'],
+    'ADJUDICACION': ['adjudicacion', 'adjudicar'],
+    'CARTASADJUDICACION': ['cartas_adjudicacion', 'carta_adjudicacion'],
+    'CONTRATO': ['contrato'],
+    'REPLANTEO': ['replanteo', 'acta_replanteo'],
+    'ACTUACION': ['actuacion', 'actuaciones'],
+    'RECEPCION': ['recepcion', 'acta_recepcion'],
+    'FINALIZACION': ['finalizacion', 'final', 'acta_finalizacion']
+}
+
 
 # =================== TRACKER DE DOCUMENTOS ===================
 
@@ -82,9 +118,13 @@ class TrackerDocumentos:
             self.ruta_base = rutas.get_base_path()
             self.archivo_historial = rutas.get_ruta_historial_documentos()
         self.documentos: Dict[str, List[DocumentoGenerado]] = {}
+        # Cache de HTML: id documento -> (firma, <li>) y contrato -> (firmas, html completo)
+        self._cache_fragmentos_html: Dict[str, tuple] = {}
+        self._cache_reportes_html: Dict[str, tuple] = {}
         self.cargar_historial()
     
     def cargar_historial(self):
+        self.invalidar_cache_html()
         try:
             if os.path.exists(self.archivo_historial):
                 with open(self.archivo_historial, 'r', encoding='utf-8') as f:
@@ -257,74 +297,97 @@ class TrackerDocumentos:
         if not documentos:
             return "<p style='color: #666; text-align: center; padding: 20px;'>📄 No hay documentos generados para este contrato.</p>"
         
+        # Firmas de estado de cada documento: si ninguna ha cambiado se reutiliza el HTML completo
+        ordenados = sorted(documentos, key=lambda d: d.fecha_generacion, reverse=True)
+        firmas = tuple(self._firma_documento(doc) for doc in ordenados)
+        cacheado = self._cache_reportes_html.get(contrato)
+        if cacheado and cacheado[0] == firmas:
+            return cacheado[1]
+        
         html = f"<div class='historial-documentos'>"
         html += f"<h3 style='color: #1976D2; margin-bottom: 15px;'>📄 Historial de Documentos - {contrato}</h3>"
         
         # Agrupar por fecha
         por_fecha = {}
-        for doc in sorted(documentos, key=lambda d: d.fecha_generacion, reverse=True):
+        for doc, firma in zip(ordenados, firmas):
             fecha = doc.fecha_generacion.strftime('%Y-%m-%d')
             if fecha not in por_fecha:
                 por_fecha[fecha] = []
-            por_fecha[fecha].append(doc)
-        
-        iconos = {
-            TipoDocumento.INVITACION: "📧",
-            TipoDocumento.ADJUDICACION: "🏆", 
-            TipoDocumento.ACTA_INICIO: "🚀",
-            TipoDocumento.ACTA_REPLANTEO: "📐",
-            TipoDocumento.ACTA_RECEPCION: "✅",
-            TipoDocumento.ACTA_FINALIZACION: "🏁",
-            TipoDocumento.LIQUIDACION: "💰",
-            TipoDocumento.CONTRATO: "📋",
-            TipoDocumento.OTRO: "📄"
-        }
+            por_fecha[fecha].append(self._obtener_fragmento_html(doc, firma))
         
-        colores = {
-            EstadoDocumento.GENERADO: "#4CAF50",
-            EstadoDocumento.ERROR: "#F44336", 
-            EstadoDocumento.GENERANDO: "#FF9800",
-            EstadoDocumento.MODIFICADO: "#9C27B0",
-            EstadoDocumento.ENVIADO: "#2196F3",
-            EstadoDocumento.FIRMADO: "#4CAF50"
-        }
-        
-        for fecha, docs_fecha in por_fecha.items():
+        for fecha, fragmentos in por_fecha.items():
             html += f"<h4 style='color: #555; border-bottom: 1px solid #ddd; padding-bottom: 5px;'>📅 {fecha}</h4>"
             html += "<ul style='list-style: none; padding-left: 0;'>"
-            
-            for doc in docs_fecha:
-                icono = iconos.get(doc.tipo, "📄")
-                color = colores.get(doc.estado, "#666")
-                hora = doc.fecha_generacion.strftime('%H:%M')
-                
-                html += f"<li style='margin: 8px 0; padding: 8px; background: #f9f9f9; border-radius: 5px;'>"
-                html += f"<div style='display: flex; align-items: center; justify-content: space-between;'>"
-                html += f"<div>{icono} <strong>{doc.nombre}</strong></div>"
-                html += f"<div style='font-size: 12px; color: #666;'>{hora}</div>"
-                html += f"</div>"
-                
-                html += f"<div style='margin-top: 4px; font-size: 11px;'>"
-                html += f"<span style='color: {color}; font-weight: bold;'>● {doc.estado.value.upper()}</span>"
-                
-                if os.path.exists(doc.ruta_archivo):
-                    html += f" • {doc.tamano_kb:.1f} KB"
-                else:
-                    html += f" • <span style='color: #F44336;'>Archivo no encontrado</span>"
-                
-                if doc.plantilla_usada:
-                    html += f" • {doc.plantilla_usada}"
-                
-                html += f"</div>"
-                
-                if doc.observaciones:
-                    html += f"<div style='margin-top: 4px; font-size: 10px; color: #666; font-style: italic;'>{doc.observaciones}</div>"
-                
-                html += "</li>"
-            
+            html += "".join(fragmentos)
             html += "</ul>"
         
         html += "</div>"
+        self._cache_reportes_html[contrato] = (firmas, html)
+        return html
+    
+    def invalidar_cache_html(self, contrato: str = None):
+        """Descarta los fragmentos HTML cacheados (de un contrato o de todos)"""
+        if contrato is None:
+            self._cache_fragmentos_html.clear()
+            self._cache_reportes_html.clear()
+            return
+        self._cache_reportes_html.pop(contrato, None)
+        for doc in self.documentos.get(contrato, []):
+            self._cache_fragmentos_html.pop(doc.id, None)
+    
+    def _firma_documento(self, doc: DocumentoGenerado) -> tuple:
+        """Clave de estado de un documento: cambia cuando cambia lo que se pinta en su fila"""
+        return (
+            doc.id,
+            doc.tipo,
+            doc.nombre,
+            doc.fecha_generacion,
+            doc.estado,
+            doc.ruta_archivo,
+            os.path.exists(doc.ruta_archivo),
+            doc.tamano_kb,
+            doc.observaciones,
+            doc.plantilla_usada,
+        )
+    
+    def _obtener_fragmento_html(self, doc: DocumentoGenerado, firma: tuple) -> str:
+        """Devuelve el <li> de un documento, renderizándolo solo si su estado ha cambiado"""
+        cacheado = self._cache_fragmentos_html.get(doc.id)
+        if cacheado and cacheado[0] == firma:
+            return cacheado[1]
+        
+        fragmento = self._renderizar_fragmento_html(doc, existe_archivo=firma[6])
+        self._cache_fragmentos_html[doc.id] = (firma, fragmento)
+        return fragmento
+    
+    def _renderizar_fragmento_html(self, doc: DocumentoGenerado, existe_archivo: bool) -> str:
+        icono = ICONOS_TIPO_DOCUMENTO.get(doc.tipo, "📄")
+        color = COLORES_ESTADO_DOCUMENTO.get(doc.estado, "#666")
+        hora = doc.fecha_generacion.strftime('%H:%M')
+        
+        html = f"<li style='margin: 8px 0; padding: 8px; background: #f9f9f9; border-radius: 5px;'>"
+        html += f"<div style='display: flex; align-items: center; justify-content: space-between;'>"
+        html += f"<div>{icono} <strong>{doc.nombre}</strong></div>"
+        html += f"<div style='font-size: 12px; color: #666;'>{hora}</div>"
+        html += f"</div>"
+        
+        html += f"<div style='margin-top: 4px; font-size: 11px;'>"
+        html += f"<span style='color: {color}; font-weight: bold;'>● {doc.estado.value.upper()}</span>"
+        
+        if existe_archivo:
+            html += f" • {doc.tamano_kb:.1f} KB"
+        else:
+            html += f" • <span style='color: #F44336;'>Archivo no encontrado</span>"
+        
+        if doc.plantilla_usada:
+            html += f" • {doc.plantilla_usada}"
+        
+        html += f"</div>"
+        
+        if doc.observaciones:
+            html += f"<div style='margin-top: 4px; font-size: 10px; color: #666; font-style: italic;'>{doc.observaciones}</div>"
+        
+        html += "</li>"
         return html
     
     def _buscar_documento(self, contrato: str, documento_id: str) -> Optional[DocumentoGenerado]:
@@ -343,6 +406,149 @@ class TrackerDocumentos:
             return 0.0
 
 
+# =================== CRONOGRAMA DE FIRMAS ===================
+
+# Fases del cronograma (mismo orden que la tabla de seguimiento)
+FASES_CRONOGRAMA = ['CREACION', 'INICIO', 'CARTASINVITACION', 'ADJUDICACION', 'CARTASADJUDICACION', 'CONTRATO',
+                    'REPLANTEO', 'ACTUACION', 'RECEPCION', 'FINALIZACION']
+
+# Estado de fase -> (color RGB de la barra, texto del estado)
+ESTADOS_FASE_CRONOGRAMA = {
+    'firmado': ((144, 238, 144), "✅ Firmado"),
+    'documento': ((255, 255, 200), "📄 Documento"),
+    'pendiente': ((255, 200, 200), "⏸️ Pendiente"),
+}
+
+MENSAJE_CRONOGRAMA_SIN_DATOS = "Datos de seguimiento no disponibles\nPulsa 'Actualizar' para cargar los datos"
+MENSAJE_CRONOGRAMA_SIN_FIRMAS = "No hay datos de firmas disponibles"
+
+
+def modelo_fase_cronograma(fase: str, info_fase: Optional[dict]) -> tuple:
+    """Estado visual de una fase: (clave de estado, título, detalle)"""
+    info_fase = info_fase or {}
+    if info_fase.get('firmas'):
+        estado = 'firmado'
+    elif info_fase.get('fecha_creacion'):
+        estado = 'documento'
+    else:
+        estado = 'pendiente'
+
+    detalles = []
+    if info_fase.get('fecha_creacion'):
+        detalles.append(f"📅 Doc: {info_fase['fecha_creacion']}")
+    if info_fase.get('firmas'):
+        fechas_firmas = [f['fecha'] for f in info_fase['firmas'] if 'fecha' in f]
+        if fechas_firmas:
+            detalles.append(f"✍️ Última firma: {max(fechas_firmas)}")
+        detalles.append(f"👥 {len(info_fase['firmas'])} firmante(s)")
+
+    return estado, f"{fase} - {ESTADOS_FASE_CRONOGRAMA[estado][1]}", " | ".join(detalles)
+
+
+class CronogramaFirmas:
+    """
+    Timeline de fases de un contrato sobre una QGraphicsScene propia
+    
+    Los elementos se crean una sola vez; actualizar() solo cambia el color y los
+    textos de las fases cuyo estado ha variado
+    """
+
+    ANCHO_BARRA = 800
+    ALTO_FASE = 60
+    MARGEN_SUPERIOR = 50
+    MARGEN_IZQUIERDO = 20
+
+    def __init__(self, scene: QGraphicsScene = None):
+        self.scene = scene if scene is not None else QGraphicsScene()
+        self.items_fases: Dict[str, dict] = {}
+        self.items_leyenda = []
+        self.modelo: Dict[str, tuple] = {}
+        self.mensaje = None
+        self._construir()
+
+    def _construir(self):
+        """Crear todos los elementos del timeline (solo una vez por escena)"""
+        pen = QPen(QColor(0, 0, 0))
+        y_pos = self.MARGEN_SUPERIOR
+
+        for fase in FASES_CRONOGRAMA:
+            estado, titulo, detalle = modelo_fase_cronograma(fase, None)
+            color = QBrush(QColor(*ESTADOS_FASE_CRONOGRAMA[estado][0]))
+
+            barra = self.scene.addRect(QRectF(self.MARGEN_IZQUIERDO, y_pos, self.ANCHO_BARRA, self.ALTO_FASE - 10), pen, color)
+            item_titulo = self.scene.addText(titulo, QFont("Arial", 12, QFont.Bold))
+            item_titulo.setPos(self.MARGEN_IZQUIERDO + 10, y_pos + 5)
+            item_detalle = self.scene.addText(detalle, QFont("Arial", 9))
+            item_detalle.setPos(self.MARGEN_IZQUIERDO + 10, y_pos + 25)
+
+            self.items_fases[fase] = {'barra': barra, 'titulo': item_titulo, 'detalle': item_detalle}
+            self.modelo[fase] = (estado, titulo, detalle)
+            y_pos += self.ALTO_FASE
+
+        # Leyenda
+        y_leyenda = y_pos + 20
+        leyenda_titulo = self.scene.addText("📋 Leyenda:", QFont("Arial", 10, QFont.Bold))
+        leyenda_titulo.setPos(self.MARGEN_IZQUIERDO, y_leyenda)
+        self.items_leyenda.append(leyenda_titulo)
+
+        leyenda_items = [
+            "✅ Firmado: Fase con documentos y firmas",
+            "📄 Documento: Documento generado pero sin firmas",
+            "⏸️ Pendiente: No hay documento ni firmas"
+        ]
+        for i, item in enumerate(leyenda_items):
+            item_texto = self.scene.addText(item, QFont("Arial", 9))
+            item_texto.setPos(self.MARGEN_IZQUIERDO, y_leyenda + 20 + (i * 15))
+            self.items_leyenda.append(item_texto)
+
+        # Mensaje para cuando no hay datos (oculto mientras haya fases que mostrar)
+        self.mensaje = self.scene.addText("", QFont("Arial", 12))
+        self.mensaje.setPos(20, 20)
+        self.mensaje.setVisible(False)
+
+    def actualizar(self, datos_firmas: Optional[dict]) -> int:
+        """
+        Aplicar nuevos datos de firmas sin reconstruir la escena
+        
+        Args:
+            datos_firmas: fase -> info (None si aún no se han cargado datos)
+        
+        Returns:
+            int: Número de fases cuyo aspecto ha cambiado
+        """
+        if not datos_firmas:
+            self.mensaje.setPlainText(MENSAJE_CRONOGRAMA_SIN_DATOS if datos_firmas is None else MENSAJE_CRONOGRAMA_SIN_FIRMAS)
+            self._mostrar_timeline(False)
+            return 0
+
+        self._mostrar_timeline(True)
+        cambios = 0
+        for fase, items in self.items_fases.items():
+            nuevo = modelo_fase_cronograma(fase, datos_firmas.get(fase))
+            anterior = self.modelo.get(fase)
+            if nuevo == anterior:
+                continue
+
+            estado, titulo, detalle = nuevo
+            if not anterior or anterior[0] != estado:
+                items['barra'].setBrush(QBrush(QColor(*ESTADOS_FASE_CRONOGRAMA[estado][0])))
+            if not anterior or anterior[1] != titulo:
+                items['titulo'].setPlainText(titulo)
+            if not anterior or anterior[2] != detalle:
+                items['detalle'].setPlainText(detalle)
+            self.modelo[fase] = nuevo
+            cambios += 1
+        return cambios
+
+    def _mostrar_timeline(self, visible: bool):
+        for items in self.items_fases.values():
+            for item in items.values():
+                item.setVisible(visible)
+        for item in self.items_leyenda:
+            item.setVisible(visible)
+        self.mensaje.setVisible(not visible)
+
+
 # =================== WIDGET DE RESUMEN INTEGRADO ===================
 
 
@@ -352,10 +558,17 @@ class TrackerDocumentos:
 class IntegradorResumen:
     """Integrador principal para agregar el resumen a la aplicación"""
     
+    MAX_CRONOGRAMAS_CACHE = 8
+    
     def __init__(self, main_window):
         self.main_window = main_window
         self.widget_resumen = None
         self.tab_index = None
+        self._cache_firmas = None
+        self._servicio_firmas = None
+        # Cronogramas ya construidos de los últimos contratos vistos (LRU)
+        self._cronogramas: Dict[str, CronogramaFirmas] = OrderedDict()
+        self._contrato_datos_firmas = None
     
     def _obtener_nombre_carpeta_actual(self, nombre_contrato: str) -> str:
         """Obtener el nombre real de la carpeta desde el JSON (considerando cambios de expediente)"""
@@ -598,7 +811,7 @@ class IntegradorResumen:
             logger.warning(f"[IntegradorResumen] Error configurando cronograma visual: {e}")
     
     def _actualizar_cronograma_visual(self, nombre_contrato: str):
-        """Actualizar el cronograma visual existente en el UI"""
+        """Mostrar el cronograma del contrato, reutilizando su escena si ya se construyó"""
         try:
             # Buscar el QGraphicsView que está definido en actas.ui
             cronograma_view = self.main_window.findChild(QGraphicsView, "cronograma_fases_timeline")
@@ -607,134 +820,50 @@ class IntegradorResumen:
                 logger.info("[IntegradorResumen] ⚠️ No se encontró el QGraphicsView cronograma_fases_timeline en el UI")
                 return
             
-            # Limpiar la escena actual
-            if cronograma_view.scene():
-                cronograma_view.scene().clear()
-            else:
-                # Crear nueva escena si no existe
-                scene = QGraphicsScene()
-                cronograma_view.setScene(scene)
+            es_nuevo = nombre_contrato not in self._cronogramas
+            cronograma = self._obtener_cronograma(nombre_contrato)
             
-            # Dibujar el timeline actualizado
-            scene = cronograma_view.scene()
+            # Usar datos de firmas (mismos que la tabla de seguimiento) solo si son de este contrato
+            datos_firmas = getattr(self, '_datos_firmas_cache', None)
+            if datos_firmas is not None and self._contrato_datos_firmas in (None, nombre_contrato):
+                cronograma.actualizar(datos_firmas)
+            elif es_nuevo:
+                cronograma.actualizar(None)
             
-            # Usar datos de firmas (mismos que la tabla de seguimiento)
-            if hasattr(self, '_datos_firmas_cache') and hasattr(self, '_firmantes_unicos_cache'):
-                datos_firmas = self._datos_firmas_cache
-                firmantes_unicos = self._firmantes_unicos_cache
-                
-                if datos_firmas:
-                    self._dibujar_timeline_firmas(scene, datos_firmas, firmantes_unicos)
-                else:
-                    # Mostrar mensaje si no hay firmas
-                    texto = scene.addText("No hay datos de firmas disponibles", QFont("Arial", 12))
-                    texto.setPos(20, 20)
-            else:
-                # Mostrar mensaje de error
-                texto = scene.addText("Datos de seguimiento no disponibles\nPulsa 'Actualizar' para cargar los datos", QFont("Arial", 12))
-                texto.setPos(20, 20)
+            if cronograma_view.scene() is not cronograma.scene:
+                cronograma_view.setScene(cronograma.scene)
                 
         except Exception as e:
             logger.warning(f"[IntegradorResumen] Error actualizando cronograma visual: {e}")
     
+    def _obtener_cronograma(self, nombre_contrato: str) -> CronogramaFirmas:
+        """Cronograma del contrato desde la cache LRU, construyéndolo la primera vez"""
+        cronograma = self._cronogramas.get(nombre_contrato)
+        if cronograma is not None:
+            self._cronogramas.move_to_end(nombre_contrato)
+            return cronograma
+        
+        cronograma = CronogramaFirmas()
+        self._cronogramas[nombre_contrato] = cronograma
+        while len(self._cronogramas) > self.MAX_CRONOGRAMAS_CACHE:
+            self._cronogramas.popitem(last=False)
+        return cronograma
+    
+    def _refrescar_cronograma(self, nombre_contrato: str, datos_firmas: dict):
+        """Aplicar datos parciales al cronograma ya construido del contrato (si existe)"""
+        cronograma = self._cronogramas.get(nombre_contrato)
+        if cronograma is not None:
+            cronograma.actualizar(datos_firmas)
+    
     def _dibujar_timeline_firmas(self, scene: QGraphicsScene, datos_firmas: dict, firmantes_unicos: list):
         """Dibujar timeline usando datos de firmas (igual que la tabla de seguimiento)"""
         try:
-            from PyQt5.QtCore import QRectF
-            from PyQt5.QtGui import QBrush, QPen
-            
-            # Configuración visual
-            ANCHO_BARRA = 800
-            ALTO_FASE = 60
-            MARGEN_SUPERIOR = 50
-            MARGEN_IZQUIERDO = 20
-            
-            # Fases a mostrar (mismo orden que la tabla)
-            fases_mostrar = ['CREACION', 'INICIO', 'CARTASINVITACION', 'ADJUDICACION', 'CARTASADJUDICACION', 'CONTRATO', 
-                           'REPLANTEO', 'ACTUACION', 'RECEPCION', 'FINALIZACION']
-            
-            # Colores por estado
-            COLOR_COMPLETADO = QBrush(QColor(144, 238, 144))  # Verde claro
-            COLOR_DOCUMENTO = QBrush(QColor(255, 255, 200))   # Amarillo
-            COLOR_SIN_DATOS = QBrush(QColor(255, 200, 200))   # Rojo claro
-            
-            y_pos = MARGEN_SUPERIOR
-            
-            for i, fase in enumerate(fases_mostrar):
-                # Determinar estado de la fase
-                tiene_documento = False
-                tiene_firmas = False
-                
-                if fase in datos_firmas:
-                    info_fase = datos_firmas[fase]
-                    tiene_documento = bool(info_fase.get('fecha_creacion'))
-                    tiene_firmas = bool(info_fase.get('firmas'))
-                
-                # Elegir color según estado
-                if tiene_firmas:
-                    color = COLOR_COMPLETADO
-                    estado = "✅ Firmado"
-                elif tiene_documento:
-                    color = COLOR_DOCUMENTO
-                    estado = "📄 Documento"
-                else:
-                    color = COLOR_SIN_DATOS
-                    estado = "⏸️ Pendiente"
-                
-                # Dibujar barra de fase
-                rect = QRectF(MARGEN_IZQUIERDO, y_pos, ANCHO_BARRA, ALTO_FASE - 10)
-                barra = scene.addRect(rect, QPen(QColor(0, 0, 0)), color)
-                
-                # Título de la fase
-                titulo = scene.addText(f"{fase} - {estado}", QFont("Arial", 12, QFont.Bold))
-                titulo.setPos(MARGEN_IZQUIERDO + 10, y_pos + 5)
-                
-                # Información adicional
-                if fase in datos_firmas:
-                    info_fase = datos_firmas[fase]
-                    detalles = []
-                    
-                    # Fecha de creación de documento
-                    if info_fase.get('fecha_creacion'):
-                        detalles.append(f"📅 Doc: {info_fase['fecha_creacion']}")
-                    
-                    # Última fecha de firma
-                    if info_fase.get('firmas'):
-                        fechas_firmas = [f['fecha'] for f in info_fase['firmas'] if 'fecha' in f]
-                        if fechas_firmas:
-                            fecha_ultima = max(fechas_firmas)
-                            detalles.append(f"✍️ Última firma: {fecha_ultima}")
-                        
-                        # Número de firmantes
-                        num_firmantes = len(info_fase['firmas'])
-                        detalles.append(f"👥 {num_firmantes} firmante(s)")
-                    
-                    if detalles:
-                        detalle_texto = " | ".join(detalles)
-                        detalle_item = scene.addText(detalle_texto, QFont("Arial", 9))
-                        detalle_item.setPos(MARGEN_IZQUIERDO + 10, y_pos + 25)
-                
-                y_pos += ALTO_FASE
-            
-            # Agregar leyenda
-            y_leyenda = y_pos + 20
-            leyenda_titulo = scene.addText("📋 Leyenda:", QFont("Arial", 10, QFont.Bold))
-            leyenda_titulo.setPos(MARGEN_IZQUIERDO, y_leyenda)
-            
-            leyenda_items = [
-                "✅ Firmado: Fase con documentos y firmas",
-                "📄 Documento: Documento generado pero sin firmas",
-                "⏸️ Pendiente: No hay documento ni firmas"
-            ]
-            
-            for i, item in enumerate(leyenda_items):
-                item_texto = scene.addText(item, QFont("Arial", 9))
-                item_texto.setPos(MARGEN_IZQUIERDO, y_leyenda + 20 + (i * 15))
-            
-
-            
+            cronograma = CronogramaFirmas(scene)
+            cronograma.actualizar(datos_firmas)
+            return cronograma
         except Exception as e:
             logger.error(f"[IntegradorResumen] Error dibujando timeline de firmas: {e}")
+            return None
     
     def _on_generar_fichero_resumen(self):
         """Generar documento Word con resumen del contrato"""
@@ -855,12 +984,9 @@ class IntegradorResumen:
             if not datos_contrato:
                 return
             
-            # 5. Test completo de escaneo de PDFs y firmas
+            # 5. Escaneo de firmas: los PDFs no cacheados se analizan en segundo plano
             try:
-                self.test_escaneo_pdf_completo(nombre_contrato)
-                
-                # Después del test, ejecutar escaneo normal
-                self._escanear_y_actualizar_tabla_firmas(nombre_contrato)
+                self._escanear_y_actualizar_tabla_firmas(nombre_contrato, asincrono=True)
             except Exception as e:
                 logger.warning(f"[IntegradorResumen] Error escaneando firmas: {e}")
                 import traceback
@@ -1560,132 +1686,195 @@ class IntegradorResumen:
     
     # =================== FUNCIONES DE ESCANEO DE FIRMAS PDF ===================
     
-    def _escanear_y_actualizar_tabla_firmas(self, nombre_contrato: str):
-        """Escanear firmas digitales en PDFs y actualizar la tabla de seguimiento"""
+    def _escanear_y_actualizar_tabla_firmas(self, nombre_contrato: str, asincrono: bool = False):
+        """Escanear firmas digitales en PDFs y actualizar la tabla de seguimiento
+        
+        Con asincrono=True los PDFs que no están en cache se analizan en procesos en
+        segundo plano y la tabla se va actualizando según llegan los resultados.
+        """
         try:
             logger.debug(f"[IntegradorResumen] Iniciando escaneo de firmas para: {nombre_contrato}")
             
-            # 1. Obtener ruta base de obras
-            if hasattr(self.main_window, 'controlador_routes'):
-                logger.info(f"[IntegradorResumen] Usando controlador_routes para obtener ruta obras")
-                obras_path = self.main_window.controlador_routes.get_ruta_carpeta_obras()
-                logger.info(f"[IntegradorResumen] 📂 Ruta obras: {obras_path}")
-            else:
-                logger.warning(f"[IntegradorResumen] Fallback: controlador_routes no disponible")
-                # Fallback usando ruta relativa
-                current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                obras_path = os.path.join(current_dir, "obras")
-                logger.info(f"[IntegradorResumen] 📂 Ruta obras (fallback): {obras_path}")
-            
-            # 2. Obtener ruta de la carpeta 02-documentacion-finales
-            carpeta_documentos = self._obtener_carpeta_documentacion_finales(nombre_contrato)
-            if not carpeta_documentos or not os.path.exists(carpeta_documentos):
-                logger.warning(f"[IntegradorResumen] No se encontró carpeta 02-documentacion-finales para {nombre_contrato}")
+            # 1-3. Localizar PDFs de 02-documentacion-finales (y proyecto en 01-proyecto) con su fase
+            entradas = self._listar_pdfs_firmas(nombre_contrato)
+            if entradas is None:
                 return
             
-            logger.info(f"[IntegradorResumen] 📂 Escaneando carpeta: {carpeta_documentos}")
-            
-            # 3. Mapear archivos PDF a fases
-            mapeo_fases = self._crear_mapeo_archivos_pdf_fases()
-            
-            # 4. Escanear archivos PDF y extraer firmas
-            datos_firmas = {}
-            todas_firmas = []  # Para ordenamiento cronológico
-            
-            # Buscar archivos PDF en 02-documentacion-finales
-            archivos_pdf_encontrados = [f for f in os.listdir(carpeta_documentos) if f.lower().endswith('.pdf')]
-            logger.debug(f"[IntegradorResumen] Archivos PDF encontrados en 02-documentacion-finales: {archivos_pdf_encontrados}")
-            
-            # Buscar documento de CREACION en 01-proyecto (excepción especial)
-            nombre_carpeta_real = self._obtener_nombre_carpeta_actual(nombre_contrato)
-            carpeta_proyecto = os.path.join(obras_path, nombre_carpeta_real, "01-proyecto")
-            if os.path.exists(carpeta_proyecto):
-                archivos_proyecto = [f for f in os.listdir(carpeta_proyecto) if f.lower().endswith('.pdf') and 'proyecto' in f.lower()]
-                if archivos_proyecto:
-                    logger.debug(f"[IntegradorResumen] Archivos proyecto encontrados en 01-proyecto: {archivos_proyecto}")
-                    # Añadir a la lista con ruta especial para procesamiento posterior
-                    for archivo in archivos_proyecto:
-                        archivos_pdf_encontrados.append(f"01-proyecto/{archivo}")
-            
-            for archivo_pdf in archivos_pdf_encontrados:
-                logger.debug(f"[IntegradorResumen] Analizando archivo: {archivo_pdf}")
-                
-                # Manejar rutas especiales para documentos de 01-proyecto
-                if archivo_pdf.startswith("01-proyecto/"):
-                    nombre_archivo_real = archivo_pdf.replace("01-proyecto/", "")
-                    ruta_pdf = os.path.join(obras_path, nombre_carpeta_real, archivo_pdf)
-                    fase = 'CREACION'  # Los documentos de proyecto se mapean a fase CREACION
+            # 4. Resolver desde cache; solo los PDFs nuevos o modificados se parsean
+            cache = self._obtener_cache_firmas()
+            firmas_por_ruta = {}
+            pendientes = []
+            for _, ruta_pdf, _ in entradas:
+                firmas = cache.consultar(ruta_pdf)
+                if firmas is None:
+                    pendientes.append(ruta_pdf)
                 else:
-                    nombre_archivo_real = archivo_pdf
-                    ruta_pdf = os.path.join(carpeta_documentos, archivo_pdf)
-                    fase = self._determinar_fase_por_archivo(archivo_pdf, mapeo_fases)
-                
-                logger.info(f"[IntegradorResumen] 📋 Archivo {archivo_pdf} -> Fase determinada: {fase}")
-                
-                if fase:
-                    logger.debug(f"[IntegradorResumen] Procesando {archivo_pdf} -> Fase: {fase}")
-                    
-                    # Extraer firmas usando la función existente
-                    firmas = self._extraer_firmas_pdf(ruta_pdf)
-                    logger.debug(f"[IntegradorResumen] Firmas extraídas de {archivo_pdf}: {len(firmas) if firmas else 0}")
-                    
-                    if firmas:
-                        logger.info(f"[IntegradorResumen] 📝 Firmas encontradas: {firmas}")
-                        datos_firmas[fase] = {
-                            'archivo': nombre_archivo_real,
-                            'fecha_creacion': self._obtener_fecha_creacion_archivo(ruta_pdf),
-                            'firmas': firmas
-                        }
-                        
-                        # Recopilar todas las firmas para ordenamiento cronológico
-                        todas_firmas.extend(firmas)
-                        
-                        logger.info(f"[IntegradorResumen] Encontradas {len(firmas)} firmas en {archivo_pdf}")
-                    else:
-                        # Agregar fase sin firmas pero con documento
-                        datos_firmas[fase] = {
-                            'archivo': nombre_archivo_real,
-                            'fecha_creacion': self._obtener_fecha_creacion_archivo(ruta_pdf),
-                            'firmas': []  # Lista vacía para documentos sin firmas
-                        }
-                        logger.debug(f"[IntegradorResumen] Documento sin firmas agregado: {archivo_pdf} -> Fase: {fase}")
-                else:
-                    logger.warning(f"[IntegradorResumen] No se pudo determinar fase para {archivo_pdf}")
-            
-            # Ordenar firmantes cronológicamente por fecha de primera firma
-            firmantes_con_fechas = {}
-            for firma in todas_firmas:
-                firmante = firma['firmante']
-                fecha = firma['fecha']
-                if firmante not in firmantes_con_fechas or fecha < firmantes_con_fechas[firmante]:
-                    firmantes_con_fechas[firmante] = fecha
-            
-            # Crear lista ordenada cronológicamente
-            firmantes_ordenados = sorted(firmantes_con_fechas.items(), key=lambda x: x[1])
-            firmantes_unicos = [firmante for firmante, fecha in firmantes_ordenados]
-            
-            logger.info(f"[IntegradorResumen] Resumen final: {len(datos_firmas)} fases con firmas, {len(firmantes_unicos)} firmantes únicos")
-            logger.info(f"[IntegradorResumen] Datos de firmas: {datos_firmas}")
-            logger.info(f"[IntegradorResumen] Firmantes únicos: {firmantes_unicos}")
+                    firmas_por_ruta[ruta_pdf] = firmas
             
-            # Guardar en cache para uso posterior (generación de documentos)
-            self._datos_firmas_cache = datos_firmas
-            self._firmantes_unicos_cache = firmantes_unicos
+            logger.info(f"[IntegradorResumen] {len(entradas)} PDFs, {len(pendientes)} pendientes de analizar")
             
-            # 5. Actualizar tabla de seguimiento
-            self._actualizar_tabla_seguimiento(datos_firmas, firmantes_unicos, nombre_contrato)
+            self._cancelar_escaneo_firmas()
+            if pendientes and asincrono:
+                self._iniciar_escaneo_firmas_segundo_plano(nombre_contrato, entradas, firmas_por_ruta, pendientes)
+                return
             
-            # 6. Mostrar mensaje si no hay firmas registradas
-            if len(datos_firmas) == 0:
-                self._mostrar_mensaje_sin_firmas()
+            if pendientes:
+                from .controlador_escaneo_firmas import extraer_firmas_en_paralelo
+                for ruta_pdf, firmas in extraer_firmas_en_paralelo(pendientes).items():
+                    cache.registrar(ruta_pdf, firmas)
+                    firmas_por_ruta[ruta_pdf] = firmas
+                # Los que no se pudieron leer se muestran sin firmas pero no se cachean
+                for ruta_pdf in pendientes:
+                    firmas_por_ruta.setdefault(ruta_pdf, [])
             
-            logger.info(f"[IntegradorResumen] Escaneo completado. {len(datos_firmas)} fases con firmas encontradas")
+            self._finalizar_escaneo_firmas(nombre_contrato, entradas, firmas_por_ruta)
             
         except Exception as e:
             logger.error(f"[IntegradorResumen] Error en escaneo de firmas: {e}")
             import traceback
             logger.exception("Error completo:")
     
+    def _listar_pdfs_firmas(self, nombre_contrato: str) -> Optional[List[tuple]]:
+        """Lista (nombre_archivo, ruta_pdf, fase) de los PDFs a escanear, o None si no hay carpeta"""
+        # 1. Obtener ruta base de obras
+        if hasattr(self.main_window, 'controlador_routes'):
+            obras_path = self.main_window.controlador_routes.get_ruta_carpeta_obras()
+        else:
+            logger.warning(f"[IntegradorResumen] Fallback: controlador_routes no disponible")
+            # Fallback usando ruta relativa
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            obras_path = os.path.join(current_dir, "obras")
+        logger.info(f"[IntegradorResumen] 📂 Ruta obras: {obras_path}")
+        
+        # 2. Obtener ruta de la carpeta 02-documentacion-finales
+        carpeta_documentos = self._obtener_carpeta_documentacion_finales(nombre_contrato)
+        if not carpeta_documentos or not os.path.exists(carpeta_documentos):
+            logger.warning(f"[IntegradorResumen] No se encontró carpeta 02-documentacion-finales para {nombre_contrato}")
+            return None
+        
+        logger.info(f"[IntegradorResumen] 📂 Escaneando carpeta: {carpeta_documentos}")
+        
+        # 3. Mapear archivos PDF a fases
+        mapeo_fases = self._crear_mapeo_archivos_pdf_fases()
+        entradas = []
+        
+        for archivo_pdf in os.listdir(carpeta_documentos):
+            if not archivo_pdf.lower().endswith('.pdf'):
+                continue
+            fase = self._determinar_fase_por_archivo(archivo_pdf, mapeo_fases)
+            if fase:
+                entradas.append((archivo_pdf, os.path.join(carpeta_documentos, archivo_pdf), fase))
+            else:
+                logger.warning(f"[IntegradorResumen] No se pudo determinar fase para {archivo_pdf}")
+        
+        # Documento de CREACION en 01-proyecto (excepción especial)
+        nombre_carpeta_real = self._obtener_nombre_carpeta_actual(nombre_contrato)
+        carpeta_proyecto = os.path.join(obras_path, nombre_carpeta_real, "01-proyecto")
+        if os.path.exists(carpeta_proyecto):
+            for archivo in os.listdir(carpeta_proyecto):
+                if archivo.lower().endswith('.pdf') and 'proyecto' in archivo.lower():
+                    entradas.append((archivo, os.path.join(carpeta_proyecto, archivo), 'CREACION'))
+        
+        logger.debug(f"[IntegradorResumen] PDFs a escanear: {[(a, f) for a, _, f in entradas]}")
+        return entradas
+    
+    def _construir_datos_firmas(self, entradas: List[tuple], firmas_por_ruta: Dict[str, list]) -> tuple:
+        """Agrupa por fase las firmas ya resueltas y ordena los firmantes cronológicamente"""
+        datos_firmas = {}
+        todas_firmas = []  # Para ordenamiento cronológico
+        
+        for nombre_archivo, ruta_pdf, fase in entradas:
+            if ruta_pdf not in firmas_por_ruta:
+                continue  # Todavía en análisis
+            firmas = firmas_por_ruta[ruta_pdf]
+            datos_firmas[fase] = {
+                'archivo': nombre_archivo,
+                'fecha_creacion': self._obtener_fecha_creacion_archivo(ruta_pdf),
+                'firmas': firmas or []  # Lista vacía para documentos sin firmas
+            }
+            todas_firmas.extend(firmas or [])
+        
+        # Ordenar firmantes cronológicamente por fecha de primera firma
+        firmantes_con_fechas = {}
+        for firma in todas_firmas:
+            firmante = firma['firmante']
+            fecha = firma['fecha']
+            if firmante not in firmantes_con_fechas or fecha < firmantes_con_fechas[firmante]:
+                firmantes_con_fechas[firmante] = fecha
+        
+        # Crear lista ordenada cronológicamente
+        firmantes_ordenados = sorted(firmantes_con_fechas.items(), key=lambda x: x[1])
+        firmantes_unicos = [firmante for firmante, fecha in firmantes_ordenados]
+        
+        return datos_firmas, firmantes_unicos
+    
+    def _finalizar_escaneo_firmas(self, nombre_contrato: str, entradas: List[tuple], firmas_por_ruta: Dict[str, list]):
+        """Guardar resultados del escaneo, actualizar la tabla y avisar si no hay firmas"""
+        datos_firmas, firmantes_unicos = self._construir_datos_firmas(entradas, firmas_por_ruta)
+        
+        logger.info(f"[IntegradorResumen] Resumen final: {len(datos_firmas)} fases con firmas, {len(firmantes_unicos)} firmantes únicos")
+        logger.info(f"[IntegradorResumen] Datos de firmas: {datos_firmas}")
+        logger.info(f"[IntegradorResumen] Firmantes únicos: {firmantes_unicos}")
+        
+        # Persistir firmas extraídas para no volver a parsear PDFs sin cambios
+        self._obtener_cache_firmas().guardar()
+        
+        # Guardar en cache para uso posterior (generación de documentos)
+        self._datos_firmas_cache = datos_firmas
+        self._firmantes_unicos_cache = firmantes_unicos
+        self._contrato_datos_firmas = nombre_contrato
+        
+        # 5. Actualizar tabla de seguimiento
+        self._actualizar_tabla_seguimiento(datos_firmas, firmantes_unicos, nombre_contrato)
+        
+        # 6. Mostrar mensaje si no hay firmas registradas
+        if len(datos_firmas) == 0:
+            self._mostrar_mensaje_sin_firmas()
+        
+        logger.info(f"[IntegradorResumen] Escaneo completado. {len(datos_firmas)} fases con firmas encontradas")
+    
+    def _iniciar_escaneo_firmas_segundo_plano(self, nombre_contrato: str, entradas: List[tuple],
+                                              firmas_por_ruta: Dict[str, list], pendientes: List[str]):
+        """Lanza el análisis de los PDFs pendientes en procesos y va refrescando la tabla"""
+        from .controlador_escaneo_firmas import ServicioEscaneoFirmas
+        
+        # Mostrar ya lo que estaba en cache mientras se analiza el resto
+        datos_firmas, firmantes_unicos = self._construir_datos_firmas(entradas, firmas_por_ruta)
+        self._actualizar_tabla_seguimiento(datos_firmas, firmantes_unicos, nombre_contrato)
+        
+        servicio = ServicioEscaneoFirmas(pendientes, parent=self.main_window)
+        self._servicio_firmas = servicio
+        
+        def _on_firmas_extraidas(ruta_pdf, firmas):
+            if servicio is not self._servicio_firmas:
+                return  # Escaneo sustituido por otro contrato
+            self._obtener_cache_firmas().registrar(ruta_pdf, firmas)
+            firmas_por_ruta[ruta_pdf] = firmas
+            datos, firmantes = self._construir_datos_firmas(entradas, firmas_por_ruta)
+            self._actualizar_tabla_seguimiento(datos, firmantes, nombre_contrato)
+            self._refrescar_cronograma(nombre_contrato, datos)
+        
+        def _on_finalizado():
+            if servicio is not self._servicio_firmas:
+                return
+            self._servicio_firmas = None
+            if servicio.esta_cancelado():
+                return
+            for ruta_pdf in pendientes:
+                firmas_por_ruta.setdefault(ruta_pdf, [])  # No se pudieron leer: sin cachear
+            self._finalizar_escaneo_firmas(nombre_contrato, entradas, firmas_por_ruta)
+            self._actualizar_cronograma_visual(nombre_contrato)
+        
+        servicio.firmas_extraidas.connect(_on_firmas_extraidas)
+        servicio.finalizado.connect(_on_finalizado)
+        servicio.start()
+    
+    def _cancelar_escaneo_firmas(self):
+        """Cancela el escaneo en segundo plano en curso, si lo hay"""
+        if self._servicio_firmas is not None:
+            self._servicio_firmas.cancelar()
+            self._servicio_firmas = None
+    
     def _obtener_carpeta_documentacion_finales(self, nombre_contrato: str) -> str:
         """Obtener la ruta de la carpeta 02-documentacion-finales para un contrato"""
         try:
@@ -1863,18 +2052,7 @@ class IntegradorResumen:
     
     def _crear_mapeo_archivos_pdf_fases(self) -> dict:
         """Crear mapeo de nombres de archivos PDF a fases del proyecto"""
-        return {
-            'CREACION': ['proyecto', 'creacion'],
-            'INICIO': ['inicio', 'acta_inicio', 'inicio_contrato'],
-            'CARTASINVITACION': ['cartas_invitacion', 'invitacion', 'carta_invitacion'],
-            'ADJUDICACION': ['adjudicacion', 'adjudicar'],
-            'CARTASADJUDICACION': ['cartas_adjudicacion', 'carta_adjudicacion'],
-            'CONTRATO': ['contrato'],
-            'REPLANTEO': ['replanteo', 'acta_replanteo'],
-            'ACTUACION': ['actuacion', 'actuaciones'],
-            'RECEPCION': ['recepcion', 'acta_recepcion'],
-            'FINALIZACION': ['finalizacion', 'final', 'acta_finalizacion']
-        }
+        return {fase: list(palabras) for fase, palabras in MAPEO_ARCHIVOS_PDF_FASES.items()}
     
     def _determinar_fase_por_archivo(self, nombre_archivo: str, mapeo_fases: dict) -> str:
         """Determinar la fase basándose en el nombre del archivo"""
@@ -1902,17 +2080,8 @@ class IntegradorResumen:
             
             logger.info(f"[IntegradorResumen] Archivo existe, tamaño: {os.path.getsize(ruta_pdf)} bytes")
             
-            # Importar y usar la función existente de firmas.py
-            import sys
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            sys.path.insert(0, current_dir)
-            
-            logger.info(f"[IntegradorResumen] 📂 Buscando firmas.py en: {current_dir}")
-            
-            from firmas import obtener_firmas_pdf
-            logger.info(f"[IntegradorResumen] Función obtener_firmas_pdf importada correctamente")
-            
-            firmas = obtener_firmas_pdf(ruta_pdf)
+            # Solo se parsea el PDF si no está en cache o ha cambiado desde el último escaneo
+            firmas = self._obtener_cache_firmas().obtener_firmas(ruta_pdf, self._leer_firmas_pdf)
             logger.debug(f"[IntegradorResumen] Resultado de obtener_firmas_pdf: {firmas}")
             
             return firmas
@@ -1923,6 +2092,23 @@ class IntegradorResumen:
             logger.exception("Error completo:")
             return []
     
+    def _leer_firmas_pdf(self, ruta_pdf: str) -> list:
+        """Parsear el PDF con la función existente de firmas.py (lanza si no se puede leer)"""
+        import sys
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+        
+        from firmas import obtener_firmas_pdf
+        return obtener_firmas_pdf(ruta_pdf, lanzar_errores=True)
+    
+    def _obtener_cache_firmas(self):
+        """Cache persistente de firmas, la misma que usa el indexador de firmas de todas las obras"""
+        if self._cache_firmas is None:
+            from .controlador_cache_firmas import obtener_cache_firmas
+            self._cache_firmas = obtener_cache_firmas()
+        return self._cache_firmas
+    
     def _obtener_fecha_creacion_archivo(self, ruta_archivo: str) -> str:
         """Obtener fecha de creación del archivo"""
         try:
@@ -123,7 +123,27 @@ class ControladorRutas:
         else:
             # Para desarrollo, en carpeta basedatos
             return os.path.join(self._base_path, "basedatos", "historial_documentos.json")
-    
+
+    def get_ruta_cache_firmas(self) -> str:
+        """Ruta del archivo cache_firmas.json - junto a historial_documentos.json"""
+        return os.path.join(os.path.dirname(self.get_ruta_historial_documentos()), "cache_firmas.json")
+
+    def get_ruta_indice_firmas(self) -> str:
+        """Ruta del archivo indice_firmas.json - junto a historial_documentos.json"""
+        return os.path.join(os.path.dirname(self.get_ruta_historial_documentos()), "indice_firmas.json")
+
+    def get_ruta_actuaciones_facturas(self) -> str:
+        """Carpeta de actuaciones y facturas de obra (un archivo por contrato) - junto a historial_documentos.json"""
+        return os.path.join(os.path.dirname(self.get_ruta_historial_documentos()), "actuaciones_facturas")
+
+    def get_ruta_miniaturas(self) -> str:
+        """Carpeta de miniaturas de PDFs de fuera de las obras - junto a historial_documentos.json"""
+        return os.path.join(os.path.dirname(self.get_ruta_historial_documentos()), "miniaturas")
+
+    def get_ruta_perfiles_arranque(self) -> str:
+        """Carpeta de informes de tiempos de arranque - junto a historial_documentos.json"""
+        return os.path.join(os.path.dirname(self.get_ruta_historial_documentos()), "perfiles_arranque")
+
     # =================== RUTAS DE PLANTILLAS ===================
     
     def get_ruta_plantillas(self) -> str:
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+controlador_transferencias_pdf.py - Cola de copias de PDFs en segundo plano
+- Cada TareaTransferencia guarda un PDF en un AlmacenPDF (copia por bloques, con el hash
+  calculado al copiar)
+- ColaTransferenciasPDF las ejecuta en un QThread en orden, con progreso en KB del total,
+  cancelación entre bloques y la posibilidad de añadir tareas mientras trabaja
+- transferir_con_progreso muestra un QProgressDialog modal para toda la aplicación y devuelve
+  las tareas al terminar; la interfaz se sigue pintando aunque la copia vaya a una unidad de
+  red lenta, pero ninguna otra ventana recibe clics ni teclas mientras tanto
+"""
+
+import os
+import logging
+import threading
+from typing import Iterable, List
+
+from PyQt5.QtCore import QEventLoop, Qt, QThread, pyqtSignal
+from PyQt5.QtWidgets import QProgressDialog
+
+from .controlador_almacen_pdf import AlmacenPDF, TransferenciaCancelada
+
+logger = logging.getLogger(__name__)
+
+
+class TareaTransferencia:
+    """Un PDF a guardar en un almacén; al ejecutarla quedan rellenos destino, error o cancelada"""
+
+    def __init__(self, almacen: AlmacenPDF, origen: str, carpeta_destino: str,
+                 nombre: str = None, reemplazar: bool = False):
+        self.almacen = almacen
+        self.origen = origen
+        self.carpeta_destino = carpeta_destino
+        self.nombre = nombre
+        self.reemplazar = reemplazar
+        try:
+            self.tamano = os.path.getsize(origen)
+        except OSError:
+            self.tamano = 0
+        self.destino = ""
+        self.error = ""
+        self.cancelada = False
+
+    def ejecutar(self, progreso=None, cancelado=None) -> bool:
+        """Copiar el PDF (progreso recibe los bytes copiados de este archivo)"""
+        try:
+            self.destino = self.almacen.guardar(self.origen, self.carpeta_destino, self.nombre,
+                                                self.reemplazar, progreso, cancelado)
+            return True
+        except TransferenciaCancelada:
+            self.cancelada = True
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Error copiando {os.path.basename(self.origen)}: {e}")
+        return False
+
+
+class ColaTransferenciasPDF(QThread):
+    """Ejecuta las tareas en segundo plano, una detrás de otra"""
+
+    progreso = pyqtSignal(int, int, str)  # KB copiados, KB totales, archivo en curso
+    archivo_terminado = pyqtSignal(object)  # TareaTransferencia
+    finalizado = pyqtSignal(object)  # lista de tareas en el orden en que se añadieron
+    error = pyqtSignal(str)
+
+    def __init__(self, tareas: Iterable[TareaTransferencia] = (), parent=None):
+        super().__init__(parent)
+        self._bloqueo = threading.Lock()
+        self._pendientes: List[TareaTransferencia] = []
+        self._terminadas: List[TareaTransferencia] = []
+        self._total = 0
+        self._cancelado = False
+        for tarea in tareas:
+            self.agregar(tarea)
+
+    def agregar(self, tarea: TareaTransferencia):
+        """Añadir una tarea (también mientras la cola está trabajando)"""
+        with self._bloqueo:
+            self._pendientes.append(tarea)
+            self._total += tarea.tamano
+
+    def cancelar(self):
+        self._cancelado = True
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado
+
+    def _siguiente(self):
+        with self._bloqueo:
+            return self._pendientes.pop(0) if self._pendientes else None
+
+    def run(self):
+        hechos = 0
+        try:
+            tarea = self._siguiente()
+            while tarea is not None:
+                nombre = os.path.basename(tarea.origen)
+                if self._cancelado:
+                    tarea.cancelada = True
+                else:
+                    tarea.ejecutar(
+                        lambda copiados, base=hechos, nombre=nombre:
+                            self.progreso.emit((base + copiados) // 1024, self._total // 1024, nombre),
+                        lambda: self._cancelado)
+                hechos += tarea.tamano
+                self.progreso.emit(hechos // 1024, self._total // 1024, nombre)
+                self._terminadas.append(tarea)
+                self.archivo_terminado.emit(tarea)
+                tarea = self._siguiente()
+        except Exception as e:
+            logger.error(f"Error en la cola de copias de PDF: {e}")
+            self.error.emit(str(e))
+        finally:
+            self.finalizado.emit(self._terminadas)
+
+
+def transferir_con_progreso(parent, tareas: List[TareaTransferencia],
+                            titulo: str = "Copiando PDFs") -> List[TareaTransferencia]:
+    """
+    Ejecutar las tareas en una ColaTransferenciasPDF con un diálogo de progreso cancelable
+
+    Un bucle de eventos local atiende la interfaz hasta que la cola termina; las tareas no
+    copiadas por la cancelación quedan con cancelada=True. El diálogo es modal para toda la
+    aplicación y se muestra desde el principio: ninguna ventana puede volver a entrar en un
+    guardado mientras el que llamó espera
+    """
+    if not tareas:
+        return tareas
+    cola = ColaTransferenciasPDF(tareas)
+    dialogo = QProgressDialog("Preparando copia...", "Cancelar", 0, 0, parent)
+    dialogo.setWindowModality(Qt.ApplicationModal)
+    dialogo.setWindowTitle(titulo)
+    dialogo.setMinimumDuration(0)
+    dialogo.setAutoClose(False)
+    dialogo.setAutoReset(False)
+
+    def actualizar(hechos, total, nombre):
+        dialogo.setMaximum(max(total, 1))
+        dialogo.setValue(min(hechos, total))
+        dialogo.setLabelText(f"Copiando {nombre}\n{hechos / 1024:.1f} de {total / 1024:.1f} MB")
+
+    bucle = QEventLoop()
+    cola.progreso.connect(actualizar)
+    cola.finished.connect(bucle.quit)
+    dialogo.canceled.connect(cola.cancelar)
+    cola.start()
+    dialogo.show()
+    bucle.exec_()
+    cola.wait()
+    dialogo.close()
+    dialogo.deleteLater()
+    cola.deleteLater()
+    return tareas
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+controlador_vinculos_campos.py - Vínculos entre los campos del contrato y los widgets
+- Se construye una vez al arrancar (la interfaz es fija): nombre del campo -> widget,
+  pestaña que lo contiene y funciones de carga y extracción según el tipo de widget
+- Cargar un contrato es un solo recorrido por los campos vinculados que solo escribe
+  en los widgets cuyo valor cambia (sin vaciarlos antes)
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .controlador_pestanas import agrupar_widgets_por_pagina
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptadorCampo:
+    """
+    Cómo se carga y se lee un tipo de widget
+
+    Args:
+        desde_datos: (widget, valor del JSON) -> valor que debe mostrar el widget
+                     (None si ese tipo no se carga desde el contrato)
+        leer: widget -> valor mostrado, comparable con el de desde_datos
+        escribir: (widget, valor) -> None
+        extraer: widget -> texto que se guarda en el JSON
+    """
+
+    __slots__ = ('desde_datos', 'leer', 'escribir', 'extraer')
+
+    def __init__(self, desde_datos: Optional[Callable[[Any, Any], Any]], leer: Callable[[Any], Any],
+                 escribir: Callable[[Any, Any], None], extraer: Callable[[Any], str]):
+        self.desde_datos = desde_datos
+        self.leer = leer
+        self.escribir = escribir
+        self.extraer = extraer
+
+
+class CampoVinculado:
+    """Un campo del contrato y el widget que lo muestra"""
+
+    __slots__ = ('nombre', 'widget', 'pestana', 'adaptador')
+
+    def __init__(self, nombre: str, widget, pestana: Optional[str], adaptador: AdaptadorCampo):
+        self.nombre = nombre
+        self.widget = widget
+        self.pestana = pestana
+        self.adaptador = adaptador
+
+    def cargar(self, datos: Dict[str, Any]) -> bool:
+        """Mostrar el valor del contrato; False si el widget ya lo mostraba o no se carga"""
+        if self.adaptador.desde_datos is None:
+            return False
+        valor = self.adaptador.desde_datos(self.widget, datos.get(self.nombre, ''))
+        if self.adaptador.leer(self.widget) == valor:
+            return False
+        self.adaptador.escribir(self.widget, valor)
+        return True
+
+    def extraer(self) -> Optional[str]:
+        try:
+            return self.adaptador.extraer(self.widget)
+        except Exception:
+            return None
+
+
+class RegistroCampos:
+    """Campos vinculados de la ventana agrupados por pestaña (None: fuera de las pestañas)"""
+
+    def __init__(self, campos: Iterable[CampoVinculado], claves_pestanas: Iterable[str]):
+        self.claves_pestanas = list(claves_pestanas)
+        self._por_pestana: Dict[Optional[str], List[CampoVinculado]] = {clave: [] for clave in self.claves_pestanas}
+        self._por_pestana[None] = []
+        self._por_nombre: Dict[str, CampoVinculado] = {}
+        for campo in campos:
+            self._por_pestana.setdefault(campo.pestana, []).append(campo)
+            self._por_nombre.setdefault(campo.nombre, campo)
+
+    @classmethod
+    def construir(cls, widgets: Iterable, paginas: Dict[object, str],
+                  padre_de: Callable[[object], Optional[object]],
+                  adaptador_de: Callable[[object], Optional[AdaptadorCampo]]) -> 'RegistroCampos':
+        """
+        Vincular los widgets con nombre (los internos de Qt, 'qt_*', se ignoran)
+
+        Args:
+            paginas: widget de página -> clave de la pestaña
+            adaptador_de: widget -> adaptador de su tipo (None si no es un campo)
+        """
+        validos = [widget for widget in widgets
+                   if widget.objectName() and not widget.objectName().startswith('qt_')]
+        campos = []
+        for pestana, grupo in agrupar_widgets_por_pagina(validos, paginas, padre_de).items():
+            for widget in grupo:
+                adaptador = adaptador_de(widget)
+                if adaptador is not None:
+                    campos.append(CampoVinculado(widget.objectName(), widget, pestana, adaptador))
+        return cls(campos, paginas.values())
+
+    def __len__(self) -> int:
+        return sum(len(campos) for campos in self._por_pestana.values())
+
+    def campo(self, nombre: str) -> Optional[CampoVinculado]:
+        return self._por_nombre.get(nombre)
+
+    def campos(self, pestanas: Iterable[Optional[str]] = None) -> List[CampoVinculado]:
+        """Campos de las pestañas indicadas (todos si no se indica ninguna)"""
+        claves = self._por_pestana.keys() if pestanas is None else pestanas
+        return [campo for clave in claves for campo in self._por_pestana.get(clave, [])]
+
+    def widgets(self, pestanas: Iterable[Optional[str]] = None) -> List:
+        return [campo.widget for campo in self.campos(pestanas)]
+
+    def cargar(self, datos: Dict[str, Any], pestanas: Iterable[Optional[str]] = None) -> List[CampoVinculado]:
+        """
+        Mostrar el contrato en los campos de las pestañas indicadas
+
+        Returns:
+            Campos cuyo valor ha cambiado
+        """
+        cambiados = []
+        for campo in self.campos(pestanas):
+            try:
+                if campo.cargar(datos):
+                    cambiados.append(campo)
+            except Exception as e:
+                logger.error(f"[CAMBIO_CONTRATO] Error cargando {campo.nombre}: {e}")
+        return cambiados
+
+
+# =================== ADAPTADORES QT ===================
+
+def _a_float(valor) -> float:
+    try:
+        return float(str(valor)) if valor else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _a_int(valor) -> int:
+    try:
+        return int(float(str(valor))) if valor else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+_adaptadores_qt = None
+
+
+def adaptadores_qt() -> list:
+    """(tipo de widget, adaptador) en el orden en que se comprueba isinstance"""
+    global _adaptadores_qt
+    if _adaptadores_qt is not None:
+        return _adaptadores_qt
+
+    from PyQt5.QtCore import QDate
+    from PyQt5.QtWidgets import QComboBox, QDateEdit, QDoubleSpinBox, QLineEdit, QSpinBox, QTextEdit, QTimeEdit
+
+    def fecha_desde_datos(widget, valor):
+        # Sin fecha válida el campo muestra la de hoy (como al vaciarlo)
+        try:
+            if valor:
+                fecha = datetime.strptime(valor, "%Y-%m-%d").date()
+                return QDate(fecha.year, fecha.month, fecha.day)
+        except (ValueError, TypeError):
+            pass
+        return QDate.currentDate()
+
+    def double_desde_datos(widget, valor):
+        # Lo que mostrará el spinbox: redondeado a sus decimales y dentro de su rango
+        valor = round(_a_float(valor), widget.decimals())
+        return min(max(valor, widget.minimum()), widget.maximum())
+
+    def int_desde_datos(widget, valor):
+        return min(max(_a_int(valor), widget.minimum()), widget.maximum())
+
+    _adaptadores_qt = [
+        (QLineEdit, AdaptadorCampo(
+            lambda widget, valor: str(valor), QLineEdit.text, QLineEdit.setText,
+            lambda widget: widget.text().strip())),
+        (QTextEdit, AdaptadorCampo(
+            lambda widget, valor: str(valor), QTextEdit.toPlainText, QTextEdit.setPlainText,
+            lambda widget: widget.toPlainText().strip())),
+        (QDateEdit, AdaptadorCampo(
+            fecha_desde_datos, QDateEdit.date, QDateEdit.setDate,
+            lambda widget: widget.date().toString("yyyy-MM-dd"))),
+        (QTimeEdit, AdaptadorCampo(
+            None, QTimeEdit.time, QTimeEdit.setTime,
+            lambda widget: widget.time().toString("HH:mm"))),
+        (QSpinBox, AdaptadorCampo(
+            int_desde_datos, QSpinBox.value, QSpinBox.setValue,
+            lambda widget: str(int(widget.value())))),
+        (QDoubleSpinBox, AdaptadorCampo(
+            double_desde_datos, QDoubleSpinBox.value, QDoubleSpinBox.setValue,
+            lambda widget: str(widget.value()))),
+        (QComboBox, AdaptadorCampo(
+            None, QComboBox.currentText, QComboBox.setCurrentText,
+            lambda widget: widget.currentText().strip())),
+    ]
+    return _adaptadores_qt
+
+
+def adaptador_qt(widget) -> Optional[AdaptadorCampo]:
+    for tipo, adaptador in adaptadores_qt():
+        if isinstance(widget, tipo):
+            return adaptador
+    return None
+
+
+def extraer_valor(widget) -> Optional[str]:
+    """Texto que se guarda en el JSON para un widget (None si no es un campo)"""
+    adaptador = adaptador_qt(widget)
+    if adaptador is None:
+        return None
+    try:
+        return adaptador.extraer(widget)
+    except Exception:
+        return None
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diálogo de búsqueda de texto en los PDFs de todas las obras
+Busca en los índices guardados en disco y permite actualizarlos en segundo plano
+"""
+import logging
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from .controlador_busqueda_pdf import IndexadorTextoPDF, buscar_en_indices, cargar_indices_obras
+
+logger = logging.getLogger(__name__)
+
+# Espera tras la última tecla antes de buscar en todas las obras (ms)
+RETARDO_BUSQUEDA_MS = 250
+
+
+class DialogoBusquedaTexto(QDialog):
+    """Resultados de una búsqueda de texto en los PDFs de todas las obras"""
+
+    def __init__(self, parent=None, pdf_viewer=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.pdf_viewer = pdf_viewer
+        self.indices = []
+        self.resultados = []
+        self.indexador = None
+        self.setup_ui()
+        self.cargar_indices()
+
+    def setup_ui(self):
+        """Configurar interfaz del diálogo"""
+        self.setWindowTitle("🔍 Buscar texto en PDFs")
+        self.resize(1000, 600)
+
+        layout_principal = QVBoxLayout(self)
+
+        titulo = QLabel("🔍 Buscar texto en los PDFs de las obras")
+        titulo.setFont(QFont("Arial", 16, QFont.Bold))
+        titulo.setAlignment(Qt.AlignCenter)
+        layout_principal.addWidget(titulo)
+
+        layout_busqueda = QHBoxLayout()
+        self.campo_busqueda = QLineEdit()
+        self.campo_busqueda.setPlaceholderText("Cláusula, importe, nombre...")
+        self.campo_busqueda.setClearButtonEnabled(True)
+        layout_busqueda.addWidget(self.campo_busqueda, 1)
+        self.label_estado = QLabel()
+        layout_busqueda.addWidget(self.label_estado)
+        layout_principal.addLayout(layout_busqueda)
+
+        self.temporizador_busqueda = QTimer(self)
+        self.temporizador_busqueda.setSingleShot(True)
+        self.temporizador_busqueda.setInterval(RETARDO_BUSQUEDA_MS)
+        self.temporizador_busqueda.timeout.connect(self.buscar)
+        self.campo_busqueda.textChanged.connect(self.temporizador_busqueda.start)
+        self.campo_busqueda.returnPressed.connect(self.buscar)
+
+        self.tabla = QTableWidget()
+        self.tabla.setColumnCount(4)
+        self.tabla.setHorizontalHeaderLabels(["Obra", "Documento", "Página", "Texto"])
+        self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        cabecera = self.tabla.horizontalHeader()
+        cabecera.setSectionResizeMode(QHeaderView.ResizeToContents)
+        cabecera.setSectionResizeMode(3, QHeaderView.Stretch)
+        self.tabla.cellDoubleClicked.connect(self.abrir_resultado)
+        layout_principal.addWidget(self.tabla)
+
+        layout_botones = QHBoxLayout()
+        self.btn_actualizar = QPushButton("🔄 Actualizar índice")
+        self.btn_actualizar.clicked.connect(self.actualizar_indices)
+        layout_botones.addWidget(self.btn_actualizar)
+        layout_botones.addStretch()
+        btn_cerrar = QPushButton("❌ Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        layout_botones.addWidget(btn_cerrar)
+        layout_principal.addLayout(layout_botones)
+
+    # =================== BÚSQUEDA ===================
+
+    def cargar_indices(self):
+        """Leer los índices guardados de todas las obras (no extrae texto)"""
+        try:
+            self.indices = cargar_indices_obras()
+            num_pdfs = sum(len(indice.archivos) for indice in self.indices)
+            self.label_estado.setText(f"{num_pdfs} PDFs indexados en {len(self.indices)} obras")
+            if self.campo_busqueda.text().strip():
+                self.buscar()
+        except Exception as e:
+            logger.error(f"Error cargando índices de texto: {e}")
+            self.label_estado.setText("❌ Error cargando índices")
+
+    def buscar(self):
+        self.temporizador_busqueda.stop()
+        consulta = self.campo_busqueda.text().strip()
+        self.resultados = buscar_en_indices(self.indices, consulta) if consulta else []
+
+        self.tabla.setRowCount(len(self.resultados))
+        for fila, resultado in enumerate(self.resultados):
+            valores = [resultado['obra'], resultado['archivo'], str(resultado['pagina'] + 1), resultado['fragmento']]
+            for columna, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                item.setData(Qt.UserRole, fila)
+                self.tabla.setItem(fila, columna, item)
+
+        if consulta:
+            self.label_estado.setText(f"{len(self.resultados)} resultados")
+
+    def abrir_resultado(self, fila: int, _columna: int = 0):
+        """Ir a la página en el visor si es el PDF abierto; si no, abrir el PDF"""
+        item = self.tabla.item(fila, 0)
+        if item is None:
+            return
+        resultado = self.resultados[item.data(Qt.UserRole)]
+        if self.pdf_viewer is not None and self.pdf_viewer.mostrar_resultado(resultado['ruta'], resultado['pagina']):
+            return
+        from helpers_py import abrir_archivo
+        abrir_archivo(resultado['ruta'])
+
+    # =================== ACTUALIZACIÓN EN SEGUNDO PLANO ===================
+
+    def actualizar_indices(self):
+        """Indexar los PDFs nuevos o modificados de todas las obras sin bloquear el diálogo"""
+        if self.indexador is not None and self.indexador.isRunning():
+            return
+
+        self.btn_actualizar.setEnabled(False)
+        self.label_estado.setText("⏳ Actualizando índice...")
+
+        self.indexador = IndexadorTextoPDF(parent=self)
+        self.indexador.carpeta_indexada.connect(
+            lambda carpeta, _indice: self.label_estado.setText(f"⏳ Indexada: {os.path.basename(carpeta)}")
+        )
+        self.indexador.finalizado.connect(self._on_indexado_finalizado)
+        self.indexador.start()
+
+    def _on_indexado_finalizado(self):
+        self.btn_actualizar.setEnabled(True)
+        self.cargar_indices()
+
+    def done(self, resultado):
+        if self.indexador is not None and self.indexador.isRunning():
+            self.indexador.cancelar()
+            self.indexador.wait(2000)
+        super().done(resultado)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diálogo de pendientes de firma - Vista de todas las obras
+Se abre al instante con el índice guardado en disco y permite refrescarlo en segundo plano
+"""
+import logging
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QColor
+
+from .controlador_indice_firmas import (
+    IndiceFirmas, IndexadorFirmas, ESTADO_SIN_FIRMAS, ESTADO_SIN_FIRMAR
+)
+
+logger = logging.getLogger(__name__)
+
+TEXTOS_ESTADO = {
+    ESTADO_SIN_FIRMAS: "📄 PDF sin firmas",
+    ESTADO_SIN_FIRMAR: "📝 Solo borrador",
+}
+
+COLORES_ESTADO = {
+    ESTADO_SIN_FIRMAS: "#fff3cd",
+    ESTADO_SIN_FIRMAR: "#f8d7da",
+}
+
+TODOS_FIRMANTES = "Todos"
+
+
+class DialogoPendientesFirma(QDialog):
+    """Documentos de todas las obras que esperan alguna firma"""
+
+    def __init__(self, parent=None, archivo_indice: str = None):
+        super().__init__(parent)
+        self.parent = parent
+        self.archivo_indice = archivo_indice
+        self.indice = None
+        self.indexador = None
+        self.setup_ui()
+        self.cargar_indice()
+
+    def setup_ui(self):
+        """Configurar interfaz del diálogo"""
+        self.setWindowTitle("✍️ Pendientes de firma")
+        self.resize(1000, 600)
+
+        layout_principal = QVBoxLayout(self)
+
+        titulo = QLabel("✍️ Documentos pendientes de firma")
+        titulo.setFont(QFont("Arial", 16, QFont.Bold))
+        titulo.setAlignment(Qt.AlignCenter)
+        layout_principal.addWidget(titulo)
+
+        layout_filtro = QHBoxLayout()
+        layout_filtro.addWidget(QLabel("Pendiente de:"))
+        self.combo_firmante = QComboBox()
+        self.combo_firmante.currentTextChanged.connect(self.actualizar_tabla)
+        layout_filtro.addWidget(self.combo_firmante, 1)
+        self.label_estado = QLabel()
+        layout_filtro.addWidget(self.label_estado)
+        layout_principal.addLayout(layout_filtro)
+
+        self.tabla = QTableWidget()
+        self.tabla.setColumnCount(5)
+        self.tabla.setHorizontalHeaderLabels(["Obra", "Fase", "Documento", "Estado", "Pendiente de"])
+        self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout_principal.addWidget(self.tabla)
+
+        layout_botones = QHBoxLayout()
+        self.btn_actualizar = QPushButton("🔄 Actualizar índice")
+        self.btn_actualizar.clicked.connect(self.actualizar_indice)
+        layout_botones.addWidget(self.btn_actualizar)
+        layout_botones.addStretch()
+        btn_cerrar = QPushButton("❌ Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        layout_botones.addWidget(btn_cerrar)
+        layout_principal.addLayout(layout_botones)
+
+    # =================== CARGA DE DATOS ===================
+
+    def cargar_indice(self):
+        """Leer el índice persistido (no parsea ningún PDF)"""
+        try:
+            self.indice = IndiceFirmas(self.archivo_indice)
+            self._rellenar_firmantes()
+            self.actualizar_tabla()
+        except Exception as e:
+            logger.error(f"Error cargando índice de firmas: {e}")
+            self.label_estado.setText("❌ Error cargando índice")
+
+    def _rellenar_firmantes(self):
+        seleccionado = self.combo_firmante.currentText()
+        firmantes = sorted(self.indice.pendientes_por_firmante())
+
+        self.combo_firmante.blockSignals(True)
+        self.combo_firmante.clear()
+        self.combo_firmante.addItem(TODOS_FIRMANTES)
+        self.combo_firmante.addItems(firmantes)
+        if seleccionado in firmantes:
+            self.combo_firmante.setCurrentText(seleccionado)
+        self.combo_firmante.blockSignals(False)
+
+    def actualizar_tabla(self, *_):
+        """Rellenar la tabla con los pendientes del firmante seleccionado"""
+        if self.indice is None:
+            return
+
+        firmante = self.combo_firmante.currentText()
+        if firmante and firmante != TODOS_FIRMANTES:
+            pendientes = self.indice.pendientes_por_firmante().get(firmante, [])
+        else:
+            pendientes = self.indice.pendientes_de_firma()
+
+        self.tabla.setSortingEnabled(False)
+        self.tabla.setRowCount(len(pendientes))
+        for fila, pendiente in enumerate(pendientes):
+            valores = [
+                pendiente['obra'],
+                pendiente['fase'],
+                pendiente['archivo'],
+                TEXTOS_ESTADO.get(pendiente['estado'], pendiente['estado']),
+                ", ".join(pendiente['faltan'])
+            ]
+            color = QColor(COLORES_ESTADO.get(pendiente['estado'], "#ffffff"))
+            for columna, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                item.setBackground(color)
+                self.tabla.setItem(fila, columna, item)
+        self.tabla.setSortingEnabled(True)
+
+        actualizado = self.indice.actualizado or "nunca"
+        self.label_estado.setText(f"{len(pendientes)} pendientes · índice: {actualizado}")
+
+    # =================== ACTUALIZACIÓN EN SEGUNDO PLANO ===================
+
+    def actualizar_indice(self):
+        """Reindexar todas las obras sin bloquear el diálogo"""
+        if self.indexador is not None and self.indexador.isRunning():
+            return
+
+        self.btn_actualizar.setEnabled(False)
+        self.label_estado.setText("⏳ Actualizando índice...")
+
+        self.indexador = IndexadorFirmas(archivo_indice=self.archivo_indice, parent=self)
+        self.indexador.obra_indexada.connect(
+            lambda obra: self.label_estado.setText(f"⏳ Indexada: {obra}")
+        )
+        self.indexador.finalizado.connect(self._on_indexado_finalizado)
+        self.indexador.start()
+
+    def _on_indexado_finalizado(self, _indice):
+        self.btn_actualizar.setEnabled(True)
+        self.cargar_indice()
+
+    def done(self, resultado):
+        if self.indexador is not None and self.indexador.isRunning():
+            # Sin límite: el hilo no puede destruirse con el diálogo mientras corre; al cancelar
+            # solo terminan los PDFs que ya se estaban leyendo
+            self.indexador.detener()
+        super().done(resultado)
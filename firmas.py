@@ -1,94 +1,272 @@
 #!/usr/bin/env python3
+import os
+import re
+import time
+import mmap
+import binascii
 import PyPDF2
 from datetime import datetime
 
-def obtener_firmas_pdf(pdf_path):
+# Límites de la ruta rápida: cuánto se retrocede/avanza desde /ByteRange para
+# encontrar los límites del objeto firma (el /Contents queda fuera de la ventana)
+_VENTANA_OBJETO = 64 * 1024
+
+_PATRON_BYTERANGE = re.compile(rb'/ByteRange\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*\]')
+_PATRON_FECHA = re.compile(rb'/M\s*\((D:[^)]*)\)')
+_PATRON_ENTRADA_XREF = re.compile(rb'(\d{10}) \d{5} ([nf])')
+_PATRON_CONTENTS_HEX = re.compile(rb'/Contents\s*<[0-9A-Fa-f\s]')
+
+# Bytes que se inspeccionan al inicio de cada objeto listado en la xref
+_CABECERA_OBJETO = 4096
+
+
+def parse_pdf_date(pdf_date):
+    """Convierte fecha PDF a formato legible"""
+    try:
+        if pdf_date.startswith('D:'):
+            date_part = pdf_date[2:16]
+            year = int(date_part[0:4])
+            month = int(date_part[4:6])
+            day = int(date_part[6:8])
+            hour = int(date_part[8:10])
+            minute = int(date_part[10:12])
+            second = int(date_part[12:14])
+            
+            dt = datetime(year, month, day, hour, minute, second)
+            return dt.strftime("%d/%m/%Y %H:%M:%S")
+    except:
+        pass
+    return pdf_date
+
+
+def extract_name_from_cert(contents):
+    """Extrae nombre del certificado"""
+    try:
+        from cryptography.hazmat.primitives.serialization import pkcs7
+        from cryptography import x509
+        import warnings
+        import binascii
+        
+        if isinstance(contents, str):
+            cert_data = binascii.unhexlify(contents)
+        else:
+            cert_data = contents
+        
+        # Extraer nombre del certificado
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                p7 = pkcs7.load_der_pkcs7_certificates(cert_data)
+            
+            if p7:
+                cert = p7[0]
+                for attribute in cert.subject:
+                    if attribute.oid == x509.oid.NameOID.COMMON_NAME:
+                        name = attribute.value
+                        if len(name) > 5 and any(c.isspace() for c in name):
+                            return name
+        except:
+            pass
+        
+        # Buscar DNI si no hay nombre
+        try:
+            texts = []
+            for encoding in ['utf-8', 'latin1', 'cp1252']:
+                try:
+                    text = cert_data.decode(encoding, errors='ignore')
+                    texts.append(text.upper())
+                except:
+                    continue
+            
+            full_text = ' '.join(texts)
+            
+            dni_pattern = r'\b(\d{8}[A-Z])\b'
+            dni_matches = re.findall(dni_pattern, full_text)
+            
+            if dni_matches:
+                return dni_matches[0]
+            
+        except:
+            pass
+        
+        return "Sin identificar"
+        
+    except Exception as e:
+        return f"Error: {str(e)[:20]}"
+
+
+def obtener_firmas_pdf(pdf_path, lanzar_errores=False):
     """
     Extrae todas las firmas digitales de un PDF
     
+    Primero intenta la ruta rápida (solo lee los diccionarios de firma vía /ByteRange
+    sobre el archivo mapeado en memoria) y, si no puede, usa PyPDF2 completo
+    
     Args:
         pdf_path (str): Ruta al archivo PDF
+        lanzar_errores (bool): Si True, un PDF que no se puede leer (bloqueado, a medio
+                               escribir) lanza la excepción en lugar de devolver lista vacía
     
     Returns:
         list: Lista de diccionarios con formato:
               [{"firmante": "nombre", "fecha": "dd/mm/yyyy hh:mm:ss"}, ...]
     """
+    firmas = _obtener_firmas_byterange(pdf_path)
+    if firmas is not None:
+        return firmas
+    return _obtener_firmas_reader(pdf_path, lanzar_errores)
+
+
+def _obtener_firmas_byterange(pdf_path):
+    """
+    Ruta rápida: localiza los diccionarios de firma por su /ByteRange
     
-    def parse_pdf_date(pdf_date):
-        """Convierte fecha PDF a formato legible"""
-        try:
-            if pdf_date.startswith('D:'):
-                date_part = pdf_date[2:16]
-                year = int(date_part[0:4])
-                month = int(date_part[4:6])
-                day = int(date_part[6:8])
-                hour = int(date_part[8:10])
-                minute = int(date_part[10:12])
-                second = int(date_part[12:14])
-                
-                dt = datetime(year, month, day, hour, minute, second)
-                return dt.strftime("%d/%m/%Y %H:%M:%S")
-        except:
-            pass
-        return pdf_date
+    El /ByteRange de una firma delimita exactamente el hueco donde está su /Contents,
+    así que no hace falta construir el grafo de objetos. Los diccionarios de firma
+    nunca van comprimidos en object streams (sus offsets deben ser fijos)
+    
+    Returns:
+        list | None: Firmas encontradas, o None si hay que usar el lector completo
+    """
+    try:
+        with open(pdf_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                if datos[:1024].find(b'%PDF-') < 0:
+                    return None
+                return _extraer_firmas_mapeadas(datos)
+    except Exception:
+        return None
 
-    def extract_name_from_cert(contents):
-        """Extrae nombre del certificado"""
-        try:
-            from cryptography.hazmat.primitives.serialization import pkcs7
-            from cryptography import x509
-            import warnings
-            import binascii
-            
-            if isinstance(contents, str):
-                cert_data = binascii.unhexlify(contents)
-            else:
-                cert_data = contents
-            
-            # Extraer nombre del certificado
-            try:
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    p7 = pkcs7.load_der_pkcs7_certificates(cert_data)
-                
-                if p7:
-                    cert = p7[0]
-                    for attribute in cert.subject:
-                        if attribute.oid == x509.oid.NameOID.COMMON_NAME:
-                            name = attribute.value
-                            if len(name) > 5 and any(c.isspace() for c in name):
-                                return name
-            except:
-                pass
-            
-            # Buscar DNI si no hay nombre
+
+def _offsets_objetos_xref(datos):
+    """
+    Offsets de los objetos según las tablas xref clásicas (siguiendo /Prev)
+    
+    Returns:
+        list | None: Offsets ordenados, o None si el PDF usa xref streams o no se
+                     puede interpretar la tabla
+    """
+    fin_startxref = datos.rfind(b'startxref')
+    if fin_startxref < 0:
+        return None
+    numero = re.match(rb'startxref\s+(\d+)', datos[fin_startxref:fin_startxref + 64])
+    if not numero:
+        return None
+
+    offsets = set()
+    visitadas = set()
+    posicion_xref = int(numero.group(1))
+    while posicion_xref is not None:
+        if posicion_xref in visitadas or datos[posicion_xref:posicion_xref + 4] != b'xref':
+            return None
+        visitadas.add(posicion_xref)
+
+        posicion_trailer = datos.find(b'trailer', posicion_xref)
+        if posicion_trailer < 0:
+            return None
+        for entrada in _PATRON_ENTRADA_XREF.finditer(datos[posicion_xref:posicion_trailer]):
+            if entrada.group(2) == b'n':
+                offsets.add(int(entrada.group(1)))
+
+        trailer = datos[posicion_trailer:posicion_trailer + 4096]
+        fin_trailer = trailer.find(b'startxref')
+        if fin_trailer >= 0:
+            trailer = trailer[:fin_trailer]
+        if b'/XRefStm' in trailer:
+            return None
+        anterior = re.search(rb'/Prev\s+(\d+)', trailer)
+        posicion_xref = int(anterior.group(1)) if anterior else None
+
+    return sorted(offset for offset in offsets if 0 < offset < len(datos))
+
+
+def _es_cabecera_firma(cabecera):
+    """True si el inicio de un objeto puede ser un diccionario de firma"""
+    return (b'/ByteRange' in cabecera or b'/Sig' in cabecera or b'/Adobe.PPK' in cabecera
+            or _PATRON_CONTENTS_HEX.search(cabecera) is not None)
+
+
+def _posiciones_byterange(datos):
+    """
+    Posiciones de /ByteRange en el PDF
+    
+    Con xref clásica solo se mira la cabecera de cada objeto (un diccionario de firma
+    tiene /Contents <hex> o /ByteRange), así no se leen de disco los streams de las
+    imágenes. Si no hay xref utilizable o no aparece ninguna firma, barrido completo
+    """
+    offsets = _offsets_objetos_xref(datos)
+    posiciones = []
+    if offsets:
+        for i, offset in enumerate(offsets):
+            cabecera = datos[offset:offset + _CABECERA_OBJETO]
+            if not _es_cabecera_firma(cabecera):
+                continue
+            limite = offsets[i + 1] if i + 1 < len(offsets) else len(datos)
+            posicion = datos.find(b'/ByteRange', offset, limite)
+            if posicion >= 0:
+                posiciones.append(posicion)
+    if posiciones:
+        return posiciones
+
+    posicion = datos.find(b'/ByteRange')
+    while posicion >= 0:
+        posiciones.append(posicion)
+        posicion = datos.find(b'/ByteRange', posicion + 10)
+    return posiciones
+
+
+def _extraer_firmas_mapeadas(datos):
+    """Lee cada diccionario de firma localizado por su /ByteRange en el PDF mapeado"""
+    firmas = []
+    vistos = set()
+    tamano = len(datos)
+
+    for posicion in _posiciones_byterange(datos):
+        coincidencia = _PATRON_BYTERANGE.match(datos[posicion:posicion + 128])
+        if not coincidencia:
+            return None
+        inicio_1, longitud_1, inicio_2, longitud_2 = (int(valor) for valor in coincidencia.groups())
+
+        # El hueco [inicio_1 + longitud_1, inicio_2) debe ser exactamente <hex>
+        inicio_contents = inicio_1 + longitud_1
+        if (inicio_2 <= inicio_contents or inicio_2 + longitud_2 > tamano
+                or datos[inicio_contents:inicio_contents + 1] != b'<'
+                or datos[inicio_2 - 1:inicio_2] != b'>'):
+            return None
+
+        if inicio_contents not in vistos:
+            vistos.add(inicio_contents)
+
+            hex_contents = re.sub(rb'\s', b'', datos[inicio_contents + 1:inicio_2 - 1])
+            if len(hex_contents) % 2:
+                hex_contents += b'0'
             try:
-                texts = []
-                for encoding in ['utf-8', 'latin1', 'cp1252']:
-                    try:
-                        text = cert_data.decode(encoding, errors='ignore')
-                        texts.append(text.upper())
-                    except:
-                        continue
-                
-                full_text = ' '.join(texts)
-                
-                import re
-                dni_pattern = r'\b(\d{8}[A-Z])\b'
-                dni_matches = re.findall(dni_pattern, full_text)
-                
-                if dni_matches:
-                    return dni_matches[0]
-                
-            except:
-                pass
-            
-            return "Sin identificar"
-            
-        except Exception as e:
-            return f"Error: {str(e)[:20]}"
+                contents = binascii.unhexlify(hex_contents)
+            except (binascii.Error, ValueError):
+                return None
+
+            # Resto del diccionario: desde "obj" hasta "endobj", sin el /Contents
+            inicio_objeto = datos.rfind(b'obj', max(0, min(posicion, inicio_contents) - _VENTANA_OBJETO),
+                                        min(posicion, inicio_contents))
+            fin_objeto = datos.find(b'endobj', max(posicion, inicio_2),
+                                    max(posicion, inicio_2) + _VENTANA_OBJETO)
+            if inicio_objeto < 0 or fin_objeto < 0:
+                return None
+            diccionario = datos[inicio_objeto:inicio_contents] + datos[inicio_2:fin_objeto]
+
+            fecha = _PATRON_FECHA.search(diccionario)
+            firmas.append({
+                "firmante": extract_name_from_cert(contents),
+                "fecha": parse_pdf_date(fecha.group(1).decode('latin1')) if fecha else 'Fecha no disponible'
+            })
+
+    return firmas
+
 
-    # Función principal
+def _obtener_firmas_reader(pdf_path, lanzar_errores=False):
+    """Ruta completa: recorre /AcroForm -> /Fields con PyPDF2"""
     firmas = []
     
     try:
@@ -129,16 +307,50 @@ def obtener_firmas_pdf(pdf_path):
                         })
                         
     except Exception as e:
+        if lanzar_errores:
+            raise
         print(f"Error leyendo PDF: {e}")
         
     return firmas
 
+
+def benchmark_firmas(rutas_pdf, repeticiones=5):
+    """Compara tiempos de la ruta rápida y del lector completo (mejor de N)"""
+    resultados = []
+    for ruta in rutas_pdf:
+        tiempos = {}
+        for nombre, funcion in (("byterange", _obtener_firmas_byterange), ("pypdf2", _obtener_firmas_reader)):
+            mejor = None
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                funcion(ruta)
+                transcurrido = time.perf_counter() - inicio
+                mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+            tiempos[nombre] = mejor
+        resultados.append({
+            "archivo": ruta,
+            "tamano_mb": os.path.getsize(ruta) / (1024 * 1024),
+            "byterange_ms": tiempos["byterange"] * 1000,
+            "pypdf2_ms": tiempos["pypdf2"] * 1000,
+            "coinciden": _obtener_firmas_byterange(ruta) == _obtener_firmas_reader(ruta)
+        })
+    return resultados
+
 # Ejemplo de uso
 if __name__ == "__main__":
     import sys
     
+    if len(sys.argv) >= 3 and sys.argv[1] == "--benchmark":
+        for r in benchmark_firmas(sys.argv[2:]):
+            print(f"{r['archivo']} ({r['tamano_mb']:.1f} MB): "
+                  f"byterange {r['byterange_ms']:.2f} ms | pypdf2 {r['pypdf2_ms']:.2f} ms | "
+                  f"x{r['pypdf2_ms'] / max(r['byterange_ms'], 1e-6):.0f} | "
+                  f"{'OK' if r['coinciden'] else 'DIFERENTES'}")
+        sys.exit(0)
+    
     if len(sys.argv) != 2:
         print("Uso: python script.py archivo.pdf")
+        print("     python script.py --benchmark archivo1.pdf [archivo2.pdf ...]")
         sys.exit(1)
     
     # Test de la función
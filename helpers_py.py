@@ -178,8 +178,7 @@ def setup_ui_with_new_structure(main_window_instance) -> bool:
     ui_path = get_ui_file_path()
     if ui_path:
         try:
-            from PyQt5 import uic
-            uic.loadUi(ui_path, main_window_instance)
+            cargar_ui(main_window_instance, ui_path)
             return True
         except Exception as e:
             print(f"[helpers_py] ❌ Error cargando UI: {e}")
@@ -188,6 +187,158 @@ def setup_ui_with_new_structure(main_window_instance) -> bool:
         return False
 
 
+# =================== UI COMPILADA (pyuic5) ===================
+
+# actas.ui -> actas_ui.py (generado por compilar_ui.py)
+SUFIJO_UI_COMPILADA = "_ui.py"
+
+# Primera línea del módulo compilado: hash del .ui del que se generó
+CABECERA_HASH_UI = "# UI_SHA256: "
+
+
+def get_ruta_ui_compilada(ui_path: str) -> str:
+    """Ruta del módulo Python generado para un archivo .ui"""
+    return os.path.splitext(ui_path)[0] + SUFIJO_UI_COMPILADA
+
+
+def calcular_hash_ui(ui_path: str) -> str:
+    import hashlib
+    with open(ui_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def leer_hash_ui_compilada(ruta_compilada: str) -> Optional[str]:
+    """Hash del .ui con el que se generó el módulo, o None si no existe o no lo indica"""
+    try:
+        with open(ruta_compilada, 'r', encoding='utf-8') as f:
+            primera_linea = f.readline().strip()
+    except OSError:
+        return None
+    if primera_linea.startswith(CABECERA_HASH_UI):
+        return primera_linea[len(CABECERA_HASH_UI):]
+    return None
+
+
+def ui_compilada_vigente(ui_path: str) -> bool:
+    """
+    Comprueba que el módulo compilado se generó a partir del .ui actual
+    (por contenido, no por fecha: las copias al dist cambian las fechas)
+    """
+    hash_compilada = leer_hash_ui_compilada(get_ruta_ui_compilada(ui_path))
+    try:
+        return hash_compilada is not None and hash_compilada == calcular_hash_ui(ui_path)
+    except OSError:
+        return False
+
+
+def compilar_ui(ui_path: str) -> str:
+    """
+    Genera con pyuic5 el módulo Python de un archivo .ui (escritura atómica)
+
+    Returns:
+        Ruta del módulo generado
+    """
+    import io
+    from PyQt5 import uic
+
+    codigo = io.StringIO()
+    uic.compileUi(ui_path, codigo)
+    ruta_compilada = get_ruta_ui_compilada(ui_path)
+    ruta_temporal = ruta_compilada + ".tmp"
+    with open(ruta_temporal, 'w', encoding='utf-8') as f:
+        f.write(f"{CABECERA_HASH_UI}{calcular_hash_ui(ui_path)}\n")
+        f.write(codigo.getvalue())
+    os.replace(ruta_temporal, ruta_compilada)
+    _compilar_bytecode(ruta_compilada)
+    return ruta_compilada
+
+
+def _compilar_bytecode(ruta_compilada: str):
+    """
+    Guardar el .pyc del módulo generado (normal y -OO, como el EXE) validado por hash:
+    así no se recompilan 130 KB de código en cada arranque aunque la copia al dist cambie las fechas
+    """
+    import importlib.util
+    import py_compile
+
+    for optimizacion in (0, 2):
+        try:
+            py_compile.compile(
+                ruta_compilada,
+                cfile=importlib.util.cache_from_source(ruta_compilada, optimization=optimizacion or ''),
+                optimize=optimizacion,
+                doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+            )
+        except (OSError, py_compile.PyCompileError) as e:
+            print(f"[helpers_py] ⚠️ No se pudo guardar el bytecode de {ruta_compilada}: {e}")
+
+
+def _cargar_ui_compilada(ruta_compilada: str):
+    """Importar el módulo generado y devolver una instancia de su clase Ui_* (sin tocar la ventana)"""
+    import importlib.util
+
+    nombre_modulo = "_ui_compilada_" + os.path.basename(ruta_compilada)[:-3]
+    spec = importlib.util.spec_from_file_location(nombre_modulo, ruta_compilada)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+
+    clase_ui = next(valor for nombre, valor in vars(modulo).items() if nombre.startswith("Ui_"))
+    ui = clase_ui()
+    if not callable(getattr(ui, "setupUi", None)):
+        raise AttributeError(f"{clase_ui.__name__} no tiene setupUi")
+    return ui
+
+
+def _aplicar_ui_compilada(ventana, ui):
+    """Construir la interfaz con la clase Ui_* generada y exponer sus widgets en la ventana"""
+    ui.setupUi(ventana)
+    # Igual que uic.loadUi: cada widget como atributo de la ventana
+    for nombre, widget in vars(ui).items():
+        setattr(ventana, nombre, widget)
+
+
+def _recompilar_ui_en_segundo_plano(ui_path: str):
+    """Regenerar el módulo para el próximo arranque sin retrasar este"""
+    import threading
+
+    def recompilar():
+        try:
+            compilar_ui(ui_path)
+        except Exception as e:
+            print(f"[helpers_py] ⚠️ No se pudo compilar {ui_path}: {e}")
+
+    threading.Thread(target=recompilar, name="compilar_ui", daemon=True).start()
+
+
+def cargar_ui(ventana, ui_path: str) -> str:
+    """
+    Carga un .ui en la ventana: con el módulo compilado si está al día,
+    si no con uic.loadUi (y en desarrollo se recompila para el siguiente arranque)
+
+    Un error dentro del setupUi compilado se propaga (la ventana ya está a medio construir)
+
+    Returns:
+        "compilada" o "loadUi" según el método usado
+    """
+    if ui_compilada_vigente(ui_path):
+        # Solo se recurre a loadUi si el módulo no se puede importar: un fallo dentro de
+        # setupUi ya ha dejado widgets en la ventana y loadUi los duplicaría
+        try:
+            ui = _cargar_ui_compilada(get_ruta_ui_compilada(ui_path))
+        except Exception as e:
+            print(f"[helpers_py] ⚠️ Error con la UI compilada, se usa loadUi: {e}")
+        else:
+            _aplicar_ui_compilada(ventana, ui)
+            return "compilada"
+
+    from PyQt5 import uic
+    uic.loadUi(ui_path, ventana)
+    if not hasattr(sys, '_MEIPASS') and os.path.exists(ui_path):
+        _recompilar_ui_en_segundo_plano(ui_path)
+    return "loadUi"
+
+
 
 
 
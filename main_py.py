@@ -307,4 +307,7 @@ def principal():
         return 1
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos del escaneo de firmas en el EXE
+    import multiprocessing
+    multiprocessing.freeze_support()
     sys.exit(principal())
\ No newline at end of file
@@ -11,6 +11,10 @@ import sys, os, time, logging
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
+# PERFIL DE ARRANQUE - lo primero, para medir también los imports de PyQt5
+from perfil_arranque import perfil
+perfil.instalar_importaciones()
+
 # LOGGING OPTIMIZADO PARA EXE - RUTA INTELIGENTE
 def configurar_logging():
     """Configura logging con ruta apropiada para EXE o desarrollo"""
@@ -56,6 +60,7 @@ try:
     import datetime
     import json
     logging.info(f"Módulos críticos pre-cargados en {time.time() - start_time:.2f}s")
+    perfil.hito('modulos_criticos')
 except Exception as e:
     logging.error(f"Error pre-cargando módulos: {e}")
 
@@ -363,12 +368,15 @@ def principal_exe():
             
             splash.mostrar_mensaje("Inicializando interfaz...")
             main_window = ControladorGrafica(None)
+            perfil.hito('ventana_creada')
             
             splash.mostrar_mensaje("Finalizando...")
             time.sleep(0.2)  # Breve pausa para mostrar mensaje
             
             splash.hide()
+            perfil.vigilar_primer_frame(main_window)
             main_window.show()
+            perfil.hito('ventana_mostrada')
             
             logging.info(f"Aplicación EXE iniciada en {time.time() - start_time:.2f}s")
             
@@ -410,8 +418,11 @@ def principal():
         from controladores.controlador_grafica import ControladorGrafica
         
         main_window = ControladorGrafica(None)
+        perfil.hito('ventana_creada')
         splash.hide()
+        perfil.vigilar_primer_frame(main_window)
         main_window.show()
+        perfil.hito('ventana_mostrada')
         
         return app.exec_()
     except Exception as e:
@@ -421,6 +432,10 @@ def principal():
 # =================== PUNTO DE ENTRADA ===================
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos del escaneo de firmas en el EXE
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     # Detectar si estamos en EXE compilado
     if hasattr(sys, '_MEIPASS'):
         # Estamos en EXE - usar versión optimizada
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Perfil de arranque de la aplicación
+- Tiempo de cada import (propio y acumulado, como python -X importtime)
+- Duración de cada etapa de inicialización
+- Hitos: ventana creada, mostrada, primer frame pintado
+- Un informe JSON por arranque para medir regresiones
+Se importa lo primero en main para medir también los imports de PyQt5.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VERSION_INFORME = 1
+
+# Informes que se conservan (se borran los más antiguos)
+MAX_INFORMES = 30
+
+PREFIJO_INFORME = "arranque_"
+
+
+class PerfilArranque:
+    """Recoge tiempos de arranque hasta que se guarda el informe"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fecha = datetime.now()
+        self.activo = True
+        self.importaciones: List[dict] = []
+        self.etapas: List[dict] = []
+        self.hitos: Dict[str, float] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._find_and_load_original = None
+        self._filtro_frame = None
+
+    def ms_desde_inicio(self, instante: float = None) -> float:
+        return round(((instante or time.perf_counter()) - self.inicio) * 1000, 3)
+
+    # =================== IMPORTACIONES ===================
+
+    def instalar_importaciones(self) -> bool:
+        """Medir cada módulo importado por primera vez (en cualquier hilo)"""
+        try:
+            import importlib._bootstrap as bootstrap
+        except ImportError:
+            return False
+        if self._find_and_load_original is not None or not hasattr(bootstrap, '_find_and_load'):
+            return False
+
+        original = bootstrap._find_and_load
+        perfil = self
+
+        def _find_and_load(name, import_):
+            if name in sys.modules or not perfil.activo:
+                return original(name, import_)
+            pila = perfil._pila_importaciones()
+            nivel = len(pila)
+            pila.append(0.0)  # Tiempo de los imports anidados
+            inicio = time.perf_counter()
+            try:
+                return original(name, import_)
+            finally:
+                acumulado = time.perf_counter() - inicio
+                anidados = pila.pop()
+                if pila:
+                    pila[-1] += acumulado
+                if name in sys.modules:
+                    perfil._registrar_importacion(name, acumulado - anidados, acumulado, nivel, inicio)
+
+        bootstrap._find_and_load = _find_and_load
+        self._find_and_load_original = original
+        return True
+
+    def desinstalar_importaciones(self):
+        if self._find_and_load_original is None:
+            return
+        import importlib._bootstrap as bootstrap
+        bootstrap._find_and_load = self._find_and_load_original
+        self._find_and_load_original = None
+
+    def _pila_importaciones(self) -> List[float]:
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    def _registrar_importacion(self, modulo: str, propio: float, acumulado: float, nivel: int, inicio: float):
+        with self._lock:
+            self.importaciones.append({
+                'modulo': modulo,
+                'propio_ms': round(propio * 1000, 3),
+                'acumulado_ms': round(acumulado * 1000, 3),
+                'nivel': nivel,
+                'inicio_ms': self.ms_desde_inicio(inicio),
+                'hilo_principal': threading.current_thread() is threading.main_thread(),
+            })
+
+    # =================== ETAPAS E HITOS ===================
+
+    @contextmanager
+    def etapa(self, nombre: str):
+        """Medir un bloque de la inicialización"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.activo:
+                with self._lock:
+                    self.etapas.append({
+                        'nombre': nombre,
+                        'inicio_ms': self.ms_desde_inicio(inicio),
+                        'duracion_ms': round((time.perf_counter() - inicio) * 1000, 3),
+                    })
+
+    def hito(self, nombre: str):
+        """Marcar un instante del arranque (solo cuenta la primera vez)"""
+        if self.activo and nombre not in self.hitos:
+            self.hitos[nombre] = self.ms_desde_inicio()
+
+    def vigilar_primer_frame(self, ventana):
+        """Marcar el hito 'primer_frame' cuando la ventana se pinte por primera vez"""
+        from PyQt5.QtCore import QObject, QEvent
+
+        perfil = self
+
+        class _FiltroPrimerFrame(QObject):
+            def eventFilter(self, objeto, evento):
+                if evento.type() == QEvent.Paint:
+                    perfil.hito('primer_frame')
+                    objeto.removeEventFilter(self)
+                return False
+
+        self._filtro_frame = _FiltroPrimerFrame(ventana)
+        ventana.installEventFilter(self._filtro_frame)
+
+    # =================== INFORME ===================
+
+    def informe(self, extra: dict = None) -> dict:
+        """Informe del arranque en formato JSON"""
+        with self._lock:
+            importaciones = list(self.importaciones)
+            etapas = list(self.etapas)
+        principales = [i for i in importaciones if i['hilo_principal']]
+        return {
+            'version': VERSION_INFORME,
+            'fecha': self.fecha.isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'plataforma': sys.platform,
+            'es_exe': hasattr(sys, '_MEIPASS'),
+            'resumen': {
+                'primer_frame_ms': self.hitos.get('primer_frame'),
+                'num_importaciones': len(importaciones),
+                'importaciones_hilo_principal_ms': round(sum(i['propio_ms'] for i in principales), 3),
+                'etapas_ms': round(sum(e['duracion_ms'] for e in etapas), 3),
+            },
+            'hitos': dict(self.hitos),
+            'etapas': etapas,
+            'importaciones': importaciones,
+            'extra': extra or {},
+        }
+
+    def guardar(self, carpeta: str, extra: dict = None) -> Optional[str]:
+        """
+        Escribe el informe de este arranque y deja de medir
+
+        Returns:
+            Ruta del informe o None si no se pudo guardar
+        """
+        if not self.activo:
+            return None
+        self.hito('informe')
+        datos = self.informe(extra)
+        self.activo = False
+        self.desinstalar_importaciones()
+        try:
+            os.makedirs(carpeta, exist_ok=True)
+            ruta = os.path.join(carpeta, f"{PREFIJO_INFORME}{self.fecha.strftime('%Y%m%d_%H%M%S')}.json")
+            ruta_temporal = ruta + ".tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, ensure_ascii=False, indent=1)
+            os.replace(ruta_temporal, ruta)
+            _borrar_informes_antiguos(carpeta)
+
+            resumen = datos['resumen']
+            logger.info(f"Arranque: primer frame {resumen['primer_frame_ms']} ms, "
+                        f"{resumen['num_importaciones']} imports "
+                        f"({resumen['importaciones_hilo_principal_ms']:.0f} ms en el hilo principal), "
+                        f"etapas {resumen['etapas_ms']:.0f} ms. Informe: {ruta}")
+            return ruta
+        except Exception as e:
+            logger.error(f"Error guardando perfil de arranque: {e}")
+            return None
+
+
+def _borrar_informes_antiguos(carpeta: str):
+    informes = sorted(nombre for nombre in os.listdir(carpeta)
+                      if nombre.startswith(PREFIJO_INFORME) and nombre.endswith('.json'))
+    for nombre in informes[:-MAX_INFORMES]:
+        try:
+            os.remove(os.path.join(carpeta, nombre))
+        except OSError:
+            pass
+
+
+def formatear_informe(datos: dict, limite_importaciones: int = None) -> str:
+    """Texto del informe: imports al estilo de python -X importtime, después etapas e hitos"""
+    lineas = ["import time: self [us] | cumulative | imported package"]
+    importaciones = sorted(datos['importaciones'], key=lambda i: i['inicio_ms'])
+    if limite_importaciones:
+        importaciones = sorted(importaciones, key=lambda i: i['acumulado_ms'], reverse=True)[:limite_importaciones]
+    for i in importaciones:
+        lineas.append(f"import time: {i['propio_ms'] * 1000:>9.0f} | {i['acumulado_ms'] * 1000:>10.0f} | "
+                      f"{'  ' * i['nivel']}{i['modulo']}")
+    lineas.append("")
+    lineas.append(f"{'etapa':<50} {'inicio ms':>10} {'duración ms':>12}")
+    for e in datos['etapas']:
+        lineas.append(f"{e['nombre']:<50} {e['inicio_ms']:>10.1f} {e['duracion_ms']:>12.1f}")
+    lineas.append("")
+    for nombre, ms in datos['hitos'].items():
+        lineas.append(f"{nombre}: {ms:.1f} ms")
+    return "\n".join(lineas)
+
+
+# Perfil del proceso actual (empieza a contar al importar este módulo)
+perfil = PerfilArranque()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python perfil_arranque.py informe.json [--top N]")
+        sys.exit(1)
+
+    limite = int(sys.argv[3]) if len(sys.argv) >= 4 and sys.argv[2] == "--top" else None
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        print(formatear_informe(json.load(f), limite))
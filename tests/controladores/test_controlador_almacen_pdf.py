@@ -0,0 +1,215 @@
+"""
+Tests para controlador_almacen_pdf.py
+Almacén de PDFs direccionado por contenido con manifiesto
+"""
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores import controlador_almacen_pdf
+from controladores.controlador_almacen_pdf import AlmacenPDF, TransferenciaCancelada, copiar_por_bloques, hash_archivo
+
+
+class TestAlmacenPDF:
+    """Tests para AlmacenPDF"""
+
+    @pytest.fixture
+    def directorio(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _pdf(self, directorio, nombre, contenido):
+        ruta = os.path.join(directorio, nombre)
+        with open(ruta, "wb") as f:
+            f.write(contenido)
+        return ruta
+
+    def _leer(self, ruta):
+        with open(ruta, "rb") as f:
+            return f.read()
+
+    @pytest.mark.unit
+    def test_mismo_contenido_se_guarda_una_vez(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        carpeta = os.path.join(raiz, "08-actuaciones")
+        almacen = AlmacenPDF(raiz)
+        a = self._pdf(directorio, "acta.pdf", b"%PDF-1 uno")
+        copia = self._pdf(directorio, "acta (copia).pdf", b"%PDF-1 uno")
+
+        ruta = almacen.guardar(a, carpeta)
+        assert almacen.guardar(copia, carpeta) == ruta
+        assert os.listdir(carpeta) == ["acta.pdf"]
+        # En otra carpeta del proyecto es otro nombre, pero el mismo objeto
+        otra = almacen.guardar(a, os.path.join(raiz, "09-facturas"))
+        assert self._leer(otra) == b"%PDF-1 uno"
+        assert len(almacen.objetos) == 1
+
+    @pytest.mark.unit
+    def test_nombre_repetido_con_otro_contenido(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        carpeta = os.path.join(raiz, "08-actuaciones")
+        os.makedirs(os.path.join(directorio, "b"))
+        almacen = AlmacenPDF(raiz)
+
+        primera = almacen.guardar(self._pdf(directorio, "acta.pdf", b"uno"), carpeta)
+        segunda = almacen.guardar(self._pdf(os.path.join(directorio, "b"), "acta.pdf", b"dos"), carpeta)
+
+        assert os.path.basename(segunda) == "acta_1.pdf"
+        assert (self._leer(primera), self._leer(segunda)) == (b"uno", b"dos")
+
+    @pytest.mark.unit
+    def test_reemplazar_y_eliminar(self, directorio):
+        raiz = os.path.join(directorio, "pdfs")
+        almacen = AlmacenPDF(raiz)
+        viejo = self._pdf(directorio, "viejo.pdf", b"viejo")
+        nuevo = self._pdf(directorio, "nuevo.pdf", b"nuevo")
+
+        ruta = almacen.guardar(viejo, raiz, "1_Empresa.pdf", reemplazar=True)
+        objeto_viejo = almacen.ruta_objeto(hash_archivo(viejo))
+        assert almacen.guardar(nuevo, raiz, "1_Empresa.pdf", reemplazar=True) == ruta
+
+        assert self._leer(ruta) == b"nuevo"
+        assert not os.path.exists(objeto_viejo)  # ya no lo usaba ningún nombre
+        assert almacen.eliminar(ruta) is True
+        assert almacen.objetos == {} and almacen.nombres == {}
+        assert almacen.eliminar(ruta) is False
+
+    @pytest.mark.unit
+    def test_manifiesto_persistente_y_archivos_anteriores(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        carpeta = os.path.join(raiz, "08-actuaciones")
+        os.makedirs(carpeta)
+        # PDF copiado antes de existir el almacén
+        anterior = self._pdf(carpeta, "acta_20240101_120000_1.pdf", b"contenido")
+
+        ruta = AlmacenPDF(raiz).guardar(self._pdf(directorio, "acta.pdf", b"contenido"), carpeta)
+
+        assert ruta == anterior
+        assert os.listdir(carpeta) == ["acta_20240101_120000_1.pdf"]
+        with open(os.path.join(raiz, ".almacen_pdf", "manifiesto.json"), encoding="utf-8") as f:
+            assert list(json.load(f)["nombres"]) == ["08-actuaciones/acta_20240101_120000_1.pdf"]
+        assert AlmacenPDF(raiz).hash_de(anterior) == hash_archivo(anterior)
+
+    @pytest.mark.unit
+    def test_sin_enlaces_duros_no_hay_segunda_copia(self, directorio):
+        """Test que sin enlaces duros (FAT, red) el archivo visible hace de objeto"""
+        raiz = os.path.join(directorio, "proyecto")
+        actuaciones = os.path.join(raiz, "08-actuaciones")
+        facturas = os.path.join(raiz, "09-facturas")
+        acta = self._pdf(directorio, "acta.pdf", b"x" * 1000)
+        hash_acta = hash_archivo(acta)
+
+        with patch("os.link", side_effect=OSError("sin enlaces")):
+            almacen = AlmacenPDF(raiz)
+            ruta = almacen.guardar(acta, actuaciones)
+            assert not os.path.exists(almacen.ruta_objeto(hash_acta))
+            assert almacen.objetos[hash_acta]["ruta"] == "08-actuaciones/acta.pdf"
+
+            # Duplicados: en la misma carpeta es el mismo archivo; en otra, copia local del existente
+            os.makedirs(os.path.join(directorio, "otra"))
+            copia = self._pdf(os.path.join(directorio, "otra"), "acta.pdf", b"x" * 1000)
+            assert almacen.guardar(copia, actuaciones) == ruta
+            en_facturas = almacen.guardar(copia, facturas)
+            assert os.listdir(actuaciones) == ["acta.pdf"] and os.listdir(facturas) == ["acta.pdf"]
+
+            # Al borrar el que hacía de objeto, pasa a serlo la otra copia
+            almacen.eliminar(ruta)
+            recargado = AlmacenPDF(raiz)
+            assert recargado.objetos[hash_acta]["ruta"] == "09-facturas/acta.pdf"
+            assert recargado.guardar(acta, actuaciones, "acta_2.pdf") == os.path.join(actuaciones, "acta_2.pdf")
+            recargado.eliminar(en_facturas)
+            recargado.eliminar(os.path.join(actuaciones, "acta_2.pdf"))
+            assert recargado.objetos == {} and recargado.nombres == {}
+
+    @pytest.mark.unit
+    def test_lote_escribe_el_manifiesto_al_final(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        almacen = AlmacenPDF(raiz)
+        manifiesto = os.path.join(raiz, ".almacen_pdf", "manifiesto.json")
+
+        with almacen.lote():
+            for i in range(3):
+                almacen.guardar(self._pdf(directorio, f"{i}.pdf", bytes([i])), os.path.join(raiz, "10-otros"))
+            assert not os.path.exists(manifiesto)
+
+        assert len(AlmacenPDF(raiz).nombres) == 3
+
+    @pytest.mark.unit
+    def test_copia_por_bloques_cancelada_no_deja_nada(self, directorio):
+        raiz = os.path.join(directorio, "pdfs")
+        almacen = AlmacenPDF(raiz)
+        anterior = almacen.guardar(self._pdf(directorio, "a.pdf", b"anterior"), raiz, "1.pdf", reemplazar=True)
+        grande = self._pdf(directorio, "grande.pdf", b"x" * (3 * 1024 * 1024 + 10))
+        avisos = []
+
+        with pytest.raises(TransferenciaCancelada):
+            almacen.guardar(grande, raiz, "1.pdf", reemplazar=True,
+                            progreso=avisos.append, cancelado=lambda: len(avisos) >= 2)
+
+        assert avisos == [1024 * 1024, 2 * 1024 * 1024]
+        assert self._leer(anterior) == b"anterior"  # el anterior sigue en su sitio
+        assert not os.path.exists(almacen.ruta_objeto(hash_archivo(grande)))
+
+    @pytest.mark.unit
+    def test_origen_se_lee_una_sola_vez(self, directorio):
+        """Test que el hash se calcula al copiar y solo se lee antes si hay algo del mismo tamaño"""
+        raiz = os.path.join(directorio, "proyecto")
+        almacen = AlmacenPDF(raiz)
+        contenido = b"x" * (2 * 1024 * 1024 + 5)
+        os.makedirs(os.path.join(directorio, "b"))
+        primero = self._pdf(directorio, "acta.pdf", contenido)
+        segundo = self._pdf(os.path.join(directorio, "b"), "acta.pdf", contenido)
+        lecturas = []
+        abrir = open
+
+        def contar(ruta, modo='r', *args, **kwargs):
+            if 'r' in modo and ruta in (primero, segundo):
+                lecturas.append(ruta)
+            return abrir(ruta, modo, *args, **kwargs)
+
+        with patch.object(controlador_almacen_pdf, "open", contar, create=True):
+            avisos = []
+            ruta = almacen.guardar(primero, os.path.join(raiz, "08-actuaciones"), progreso=avisos.append)
+            assert lecturas == [primero]  # solo la copia
+            assert avisos == sorted(avisos) and avisos[-1] == len(contenido)
+
+            # Otro archivo con el mismo contenido: se lee para el hash y se enlaza, sin copiarlo
+            avisos = []
+            otra = almacen.guardar(segundo, os.path.join(raiz, "09-facturas"), progreso=avisos.append)
+            assert lecturas == [primero, segundo]
+            assert avisos == sorted(avisos) and avisos[-1] == len(contenido) // 2
+        assert self._leer(otra) == self._leer(ruta) == contenido
+
+    @pytest.mark.unit
+    def test_cancelar_mientras_se_calcula_el_hash(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        carpeta = os.path.join(raiz, "08-actuaciones")
+        os.makedirs(carpeta)
+        self._pdf(carpeta, "otro.pdf", b"y" * (3 * 1024 * 1024))  # mismo tamaño: hay que comparar
+        grande = self._pdf(directorio, "grande.pdf", b"x" * (3 * 1024 * 1024))
+        avisos = []
+
+        with pytest.raises(TransferenciaCancelada):
+            AlmacenPDF(raiz).guardar(grande, carpeta, progreso=avisos.append,
+                                     cancelado=lambda: len(avisos) >= 1)
+
+        assert avisos == [512 * 1024]
+        assert os.listdir(carpeta) == ["otro.pdf"]
+
+    @pytest.mark.unit
+    def test_copia_verificada(self, directorio):
+        origen = self._pdf(directorio, "a.pdf", b"contenido")
+        destino = os.path.join(directorio, "copia.pdf")
+
+        copiar_por_bloques(origen, destino, hash_archivo(origen))
+        assert self._leer(destino) == b"contenido"
+        with pytest.raises(IOError):
+            copiar_por_bloques(origen, destino, "0" * 64)
+        assert not os.path.exists(destino)
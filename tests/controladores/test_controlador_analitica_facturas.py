@@ -0,0 +1,84 @@
+"""
+Tests para controlador_analitica_facturas.py
+Acumulados de facturación por periodo
+"""
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_analitica_facturas import AnaliticaFacturas, SIN_FECHA, claves_periodo
+
+
+class TestAnaliticaFacturas:
+    """Tests para AnaliticaFacturas"""
+
+    @pytest.fixture
+    def facturas(self):
+        return [
+            {"id": 1, "empresa": "Aguas", "importe": 100.0, "estado": "Pagada", "categoria": "Agua",
+             "localidad": "León", "fecha_validacion": "2024-03-10"},
+            {"id": 2, "empresa": "Limpiezas", "importe": 50.5, "estado": "Emitida", "categoria": "Limpieza",
+             "localidad": "Sevilla", "fecha_validacion": "2023-12-31"},
+            {"id": 3, "empresa": "Aguas", "importe": "25", "estado": "Emitida", "categoria": "Agua",
+             "localidad": "Sevilla", "fecha_validacion": ""},
+            {"id": 4, "empresa": "Aguas", "importe": 200.0, "estado": "Emitida", "categoria": "Agua",
+             "localidad": "León", "fecha_validacion": "2024-01-01"},
+            {"id": 5, "empresa": "Borrada", "importe": 999.0, "estado": "Emitida", "categoria": "Agua",
+             "localidad": "León", "fecha_validacion": "2024-01-01", "activa": False},
+        ]
+
+    @pytest.fixture
+    def analitica(self, facturas):
+        return AnaliticaFacturas(facturas)
+
+    @pytest.mark.unit
+    def test_claves_periodo(self):
+        assert claves_periodo("2024-11-05") == ('', "2024-11", "2024-T4", "2024")
+        assert claves_periodo("2024-13-01") == ('', SIN_FECHA, SIN_FECHA, SIN_FECHA)
+        assert claves_periodo(None) == ('', SIN_FECHA, SIN_FECHA, SIN_FECHA)
+
+    @pytest.mark.unit
+    def test_totales_ignoran_las_inactivas(self, analitica):
+        assert analitica.total() == (4, 375.5)
+        assert analitica.totales_por("empresa") == {"Aguas": (3, 325.0), "Limpiezas": (1, 50.5)}
+        assert analitica.totales_por("estado", "anio", "2024") == {"Pagada": (1, 100.0), "Emitida": (1, 200.0)}
+
+    @pytest.mark.unit
+    def test_series_en_orden_cronologico(self, analitica):
+        assert list(analitica.serie("trimestre")) == ["2023-T4", "2024-T1", SIN_FECHA]
+        assert analitica.serie("anio") == {"2023": (1, 50.5), "2024": (2, 300.0), SIN_FECHA: (1, 25.0)}
+        assert analitica.serie("mes", "localidad", "León") == {"2024-01": (1, 200.0), "2024-03": (1, 100.0)}
+        assert analitica.serie("mes", "localidad", "No existe") == {}
+
+    @pytest.mark.unit
+    def test_cambios_incrementales_equivalen_a_reconstruir(self, analitica, facturas):
+        anterior = dict(facturas[1])
+        facturas[1]["estado"] = "Pagada"
+        analitica.reemplazar(anterior, facturas[1])
+
+        anterior = dict(facturas[0])
+        facturas[0]["activa"] = False
+        analitica.reemplazar(anterior, facturas[0])
+
+        nueva = {"id": 6, "empresa": "Nueva", "importe": 10, "estado": "Tramitada", "categoria": "Otras",
+                 "localidad": "León", "fecha_validacion": "2024-02-29"}
+        facturas.append(nueva)
+        analitica.reemplazar(None, nueva)
+
+        reconstruida = AnaliticaFacturas(facturas)
+        for periodo in ("mes", "trimestre", "anio"):
+            assert analitica.serie(periodo) == reconstruida.serie(periodo)
+        for dimension in ("categoria", "localidad", "empresa", "estado"):
+            assert analitica.totales_por(dimension) == reconstruida.totales_por(dimension)
+        assert analitica.totales_por("estado", "mes", "2024-03") == {}
+        assert analitica.total() == (4, 285.5)
+
+    @pytest.mark.unit
+    def test_sin_facturas(self):
+        analitica = AnaliticaFacturas()
+
+        assert analitica.total() == (0, 0.0)
+        assert analitica.serie("mes") == {}
+        assert analitica.totales_por("estado") == {}
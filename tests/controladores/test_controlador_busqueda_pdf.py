@@ -0,0 +1,178 @@
+"""
+Tests para controlador_busqueda_pdf.py
+Índice invertido del texto de los PDFs de cada contrato
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_busqueda_pdf import (
+    IndiceTextoPDF, buscar_en_indices, carpeta_contrato_de, cargar_indices_obras, tokenizar
+)
+
+
+TEXTOS = {
+    "proyecto.pdf": ["Memoria del proyecto de urbanización", "El presupuesto asciende a 12.345,67 euros"],
+    "contrato.pdf": ["Cláusula tercera: plazo de ejecución de tres meses"],
+}
+
+
+def _crear_pdf(carpeta_obra, nombre, subcarpeta="01-proyecto"):
+    directorio = os.path.join(carpeta_obra, subcarpeta)
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'wb') as f:
+        f.write(b"%PDF-1.4 " + nombre.encode())
+    return ruta
+
+
+def _extractor():
+    return Mock(side_effect=lambda ruta: TEXTOS.get(os.path.basename(ruta), []))
+
+
+class TestTokenizar:
+    """Tests para tokenizar"""
+
+    @pytest.mark.unit
+    def test_sin_acentos_ni_mayusculas(self):
+        assert tokenizar("Cláusula TERCERA") == ["clausula", "tercera"]
+
+    @pytest.mark.unit
+    def test_importes_como_un_termino(self):
+        assert tokenizar("asciende a 12.345,67 €") == ["asciende", "a", "12.345,67"]
+
+
+class TestCarpetaContrato:
+    """Tests para carpeta_contrato_de"""
+
+    @pytest.mark.unit
+    def test_pdf_dentro_de_obras(self):
+        obras = os.path.join(os.sep, "datos", "obras")
+        ruta = os.path.join(obras, "Obra Prueba", "01-proyecto", "proyecto.pdf")
+
+        assert carpeta_contrato_de(ruta, obras) == os.path.join(obras, "Obra Prueba")
+
+    @pytest.mark.unit
+    def test_pdf_fuera_de_obras(self):
+        ruta = os.path.join(os.sep, "descargas", "proyecto.pdf")
+
+        assert carpeta_contrato_de(ruta, os.path.join(os.sep, "datos", "obras")) is None
+
+
+class TestIndiceTextoPDF:
+    """Tests para IndiceTextoPDF"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def carpeta_obra(self, temp_dir):
+        carpeta = os.path.join(temp_dir, "obras", "Obra Prueba")
+        self.ruta_proyecto = _crear_pdf(carpeta, "proyecto.pdf")
+        self.ruta_contrato = _crear_pdf(carpeta, "contrato.pdf", "02-documentacion-finales")
+        _crear_pdf(carpeta, "miniatura.pdf", ".miniaturas")
+        return carpeta
+
+    @pytest.mark.unit
+    def test_busqueda_por_frase(self, carpeta_obra):
+        indice = IndiceTextoPDF(carpeta_obra)
+        indice.actualizar(_extractor())
+
+        resultados = indice.buscar("12.345,67 EUROS")
+
+        assert [(r['ruta'], r['pagina']) for r in resultados] == [(self.ruta_proyecto, 1)]
+        assert "12.345,67 euros" in resultados[0]['fragmento']
+
+    @pytest.mark.unit
+    def test_sin_acentos_y_ultima_palabra_incompleta(self, carpeta_obra):
+        indice = IndiceTextoPDF(carpeta_obra)
+        indice.actualizar(_extractor())
+
+        resultados = indice.buscar("clausula terc")
+
+        assert [r['archivo'] for r in resultados] == [os.path.join("02-documentacion-finales", "contrato.pdf")]
+
+    @pytest.mark.unit
+    def test_palabras_no_contiguas_no_coinciden(self, carpeta_obra):
+        indice = IndiceTextoPDF(carpeta_obra)
+        indice.actualizar(_extractor())
+
+        assert indice.buscar("memoria urbanizacion") == []
+
+    @pytest.mark.unit
+    def test_limitar_a_un_pdf(self, carpeta_obra):
+        indice = IndiceTextoPDF(carpeta_obra)
+        indice.actualizar(_extractor())
+
+        assert indice.buscar("de", ruta_pdf=self.ruta_contrato)[0]['ruta'] == self.ruta_contrato
+        assert all(r['ruta'] == self.ruta_proyecto for r in indice.buscar("de", ruta_pdf=self.ruta_proyecto))
+
+    @pytest.mark.unit
+    def test_actualizacion_incremental(self, carpeta_obra):
+        """Test que solo se extrae el texto de PDFs nuevos o modificados"""
+        indice = IndiceTextoPDF(carpeta_obra)
+        extractor = _extractor()
+        assert indice.actualizar(extractor) == 2
+        assert extractor.call_count == 2
+        assert indice.guardar()
+
+        with open(self.ruta_contrato, 'ab') as f:
+            f.write(b" firmado")
+        textos_modificados = {"contrato.pdf": ["Plazo ampliado a cuatro meses"]}
+        extractor = Mock(side_effect=lambda ruta: textos_modificados[os.path.basename(ruta)])
+        nuevo = IndiceTextoPDF(carpeta_obra)
+
+        assert nuevo.actualizar(extractor) == 1
+        extractor.assert_called_once_with(self.ruta_contrato)
+        assert nuevo.buscar("clausula") == []
+        assert len(nuevo.buscar("cuatro meses")) == 1
+        assert "clausula" not in nuevo.terminos
+
+    @pytest.mark.unit
+    def test_pdf_que_no_se_pudo_leer_se_reintenta(self, carpeta_obra):
+        """Test que un PDF bloqueado no queda indexado sin texto hasta que cambie en disco"""
+        def contrato_bloqueado(ruta):
+            if ruta == self.ruta_contrato:
+                raise PermissionError("bloqueado")
+            return TEXTOS[os.path.basename(ruta)]
+
+        indice = IndiceTextoPDF(carpeta_obra)
+        assert indice.actualizar(contrato_bloqueado) == 1
+        assert os.path.join("02-documentacion-finales", "contrato.pdf") not in indice.archivos
+
+        assert indice.actualizar(_extractor()) == 1
+        assert len(indice.buscar("clausula")) == 1
+
+    @pytest.mark.unit
+    def test_pdf_borrado_sale_del_indice(self, carpeta_obra):
+        indice = IndiceTextoPDF(carpeta_obra)
+        indice.actualizar(_extractor())
+
+        os.remove(self.ruta_proyecto)
+
+        assert indice.actualizar(_extractor()) == 1
+        assert indice.buscar("presupuesto") == []
+
+    @pytest.mark.unit
+    def test_busqueda_en_varias_obras(self, temp_dir, carpeta_obra):
+        otra = os.path.join(temp_dir, "obras", "Otra Obra")
+        _crear_pdf(otra, "proyecto.pdf")
+        for carpeta in (carpeta_obra, otra):
+            indice = IndiceTextoPDF(carpeta)
+            indice.actualizar(_extractor())
+            indice.guardar()
+        os.makedirs(os.path.join(temp_dir, "obras", "Sin Indexar"))
+
+        indices = cargar_indices_obras(os.path.join(temp_dir, "obras"))
+        resultados = buscar_en_indices(indices, "presupuesto")
+
+        assert len(indices) == 2
+        assert [r['obra'] for r in resultados] == ["Obra Prueba", "Otra Obra"]
@@ -0,0 +1,179 @@
+"""
+Tests para controlador_cache_firmas.py
+Cache persistente de firmas extraídas de PDFs
+"""
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_cache_firmas import CacheFirmas, firmas_en_instantanea
+
+
+FIRMAS_EJEMPLO = [{"firmante": "JUAN PEREZ GARCIA", "fecha": "15/01/2024 10:30:00"}]
+
+
+class TestCacheFirmas:
+    """Tests para CacheFirmas"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def archivo_cache(self, temp_dir):
+        return os.path.join(temp_dir, "cache_firmas.json")
+
+    @pytest.fixture
+    def pdf(self, temp_dir):
+        ruta = os.path.join(temp_dir, "acta_inicio.pdf")
+        with open(ruta, 'wb') as f:
+            f.write(b"%PDF-1.4 contenido de prueba")
+        return ruta
+
+    @pytest.mark.unit
+    def test_primera_lectura_usa_extractor(self, archivo_cache, pdf):
+        """Test que un PDF no cacheado se parsea"""
+        cache = CacheFirmas(archivo_cache)
+        extractor = Mock(return_value=FIRMAS_EJEMPLO)
+
+        firmas = cache.obtener_firmas(pdf, extractor)
+
+        assert firmas == FIRMAS_EJEMPLO
+        extractor.assert_called_once_with(pdf)
+
+    @pytest.mark.unit
+    def test_pdf_sin_cambios_no_se_parsea(self, archivo_cache, pdf):
+        """Test que un PDF sin cambios se sirve desde la cache"""
+        cache = CacheFirmas(archivo_cache)
+        extractor = Mock(return_value=FIRMAS_EJEMPLO)
+
+        cache.obtener_firmas(pdf, extractor)
+        firmas = cache.obtener_firmas(pdf, extractor)
+
+        assert firmas == FIRMAS_EJEMPLO
+        assert extractor.call_count == 1
+
+    @pytest.mark.unit
+    def test_cache_persiste_entre_instancias(self, archivo_cache, pdf):
+        """Test que la cache guardada se reutiliza en una nueva sesión"""
+        cache = CacheFirmas(archivo_cache)
+        cache.obtener_firmas(pdf, Mock(return_value=FIRMAS_EJEMPLO))
+        assert cache.guardar()
+
+        extractor = Mock(return_value=[])
+        nueva = CacheFirmas(archivo_cache)
+
+        assert nueva.obtener_firmas(pdf, extractor) == FIRMAS_EJEMPLO
+        extractor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_pdf_modificado_se_vuelve_a_parsear(self, archivo_cache, pdf):
+        """Test que un cambio de tamaño invalida la entrada"""
+        cache = CacheFirmas(archivo_cache)
+        cache.obtener_firmas(pdf, Mock(return_value=[]))
+
+        with open(pdf, 'ab') as f:
+            f.write(b" firma incremental")
+        extractor = Mock(return_value=FIRMAS_EJEMPLO)
+
+        assert cache.obtener_firmas(pdf, extractor) == FIRMAS_EJEMPLO
+        extractor.assert_called_once()
+
+    @pytest.mark.unit
+    def test_hash_reutiliza_pdf_tocado_sin_cambios(self, archivo_cache, pdf):
+        """Test que con hash activado un cambio solo de mtime no reparsea"""
+        cache = CacheFirmas(archivo_cache, usar_hash=True)
+        cache.obtener_firmas(pdf, Mock(return_value=FIRMAS_EJEMPLO))
+
+        stat = os.stat(pdf)
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        extractor = Mock(return_value=[])
+
+        assert cache.obtener_firmas(pdf, extractor) == FIRMAS_EJEMPLO
+        extractor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_error_de_lectura_no_se_cachea(self, archivo_cache, pdf):
+        """Test que un PDF que no se pudo leer (bloqueado) se reintenta en el siguiente escaneo"""
+        cache = CacheFirmas(archivo_cache)
+
+        with pytest.raises(PermissionError):
+            cache.obtener_firmas(pdf, Mock(side_effect=PermissionError("bloqueado")))
+
+        assert cache.consultar(pdf) is None
+        assert cache.obtener_firmas(pdf, Mock(return_value=FIRMAS_EJEMPLO)) == FIRMAS_EJEMPLO
+
+    @pytest.mark.unit
+    def test_archivo_inexistente_devuelve_lista_vacia(self, archivo_cache, temp_dir):
+        """Test que un PDF inexistente no llama al extractor"""
+        cache = CacheFirmas(archivo_cache)
+        extractor = Mock()
+
+        assert cache.obtener_firmas(os.path.join(temp_dir, "no_existe.pdf"), extractor) == []
+        extractor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_cache_corrupta_se_descarta(self, archivo_cache):
+        """Test que un JSON corrupto no impide arrancar"""
+        with open(archivo_cache, 'w') as f:
+            f.write("{ json invalido")
+
+        cache = CacheFirmas(archivo_cache)
+
+        assert cache.entradas == {}
+
+    @pytest.mark.unit
+    def test_purgar_inexistentes(self, archivo_cache, pdf):
+        """Test que se eliminan entradas de PDFs borrados"""
+        cache = CacheFirmas(archivo_cache)
+        cache.obtener_firmas(pdf, Mock(return_value=FIRMAS_EJEMPLO))
+        os.remove(pdf)
+
+        assert cache.purgar_inexistentes() == 1
+        assert cache.entradas == {}
+
+    @pytest.mark.unit
+    def test_guardar_escribe_version(self, archivo_cache, pdf):
+        """Test formato del archivo de cache"""
+        cache = CacheFirmas(archivo_cache)
+        cache.obtener_firmas(pdf, Mock(return_value=FIRMAS_EJEMPLO))
+        cache.guardar()
+
+        with open(archivo_cache, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        assert data['version'] == CacheFirmas.VERSION
+        assert len(data['entradas']) == 1
+
+    @pytest.mark.unit
+    def test_consultar_y_registrar(self, archivo_cache, pdf):
+        """Test API en dos pasos usada por el escaneo en segundo plano"""
+        cache = CacheFirmas(archivo_cache)
+
+        assert cache.consultar(pdf) is None
+        cache.registrar(pdf, FIRMAS_EJEMPLO)
+
+        assert cache.consultar(pdf) == FIRMAS_EJEMPLO
+
+    @pytest.mark.unit
+    def test_instantanea_para_otro_hilo(self, archivo_cache, pdf):
+        """Test que la instantánea no cambia con la cache y deja de valer si el PDF cambia"""
+        cache = CacheFirmas(archivo_cache)
+        cache.registrar(pdf, FIRMAS_EJEMPLO)
+        instantanea = cache.instantanea()
+        cache.invalidar()
+
+        assert firmas_en_instantanea(instantanea, pdf) == FIRMAS_EJEMPLO
+        with open(pdf, 'ab') as f:
+            f.write(b" modificado")
+        assert firmas_en_instantanea(instantanea, pdf) is None
+        os.remove(pdf)
+        assert firmas_en_instantanea(instantanea, pdf) is None
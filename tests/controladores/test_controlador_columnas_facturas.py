@@ -0,0 +1,105 @@
+"""
+Tests para controlador_columnas_facturas.py
+Filtros y totales de facturas con máscaras por columna
+"""
+import pytest
+import sys
+import os
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_columnas_facturas import ColumnasFacturas
+
+
+def _ids(columnas, mascara):
+    return [f["id"] for f in columnas.facturas(mascara)]
+
+
+class TestColumnasFacturas:
+    """Tests para ColumnasFacturas"""
+
+    @pytest.fixture
+    def facturas(self):
+        return [
+            {"id": 1, "empresa": "Aguas del Norte S.A.", "cif": "A111", "importe": 100.0, "estado": "Pagada",
+             "categoria": "Agua", "localidad": "León", "fecha_validacion": "2024-03-10"},
+            {"id": 2, "empresa": "Limpiezas Sur", "cif": "B222", "importe": 50.5, "estado": "Emitida",
+             "categoria": "Limpieza", "localidad": "Sevilla", "fecha_validacion": "2023-12-31"},
+            {"id": 3, "empresa": "AGUAS DEL SUR", "cif": "B333", "importe": 25, "estado": "Emitida",
+             "categoria": "Agua", "localidad": "Sevilla", "fecha_validacion": ""},
+            {"id": 4, "empresa": "Jardines", "cif": "C444", "importe": "10", "estado": "Tramitada",
+             "categoria": "Vegetal", "localidad": "León", "fecha_validacion": "no es fecha"},
+            {"id": 5, "empresa": "Aguas del Norte S.A.", "cif": "A111", "importe": 200.0, "estado": "Emitida",
+             "categoria": "Agua", "localidad": "León", "fecha_validacion": "2024-01-01"},
+        ]
+
+    @pytest.fixture
+    def columnas(self, facturas):
+        return ColumnasFacturas(facturas)
+
+    @pytest.mark.unit
+    def test_sin_filtros_mantiene_el_orden_original(self, columnas):
+        assert _ids(columnas, columnas.filtrar()) == [1, 2, 3, 4, 5]
+
+    @pytest.mark.unit
+    def test_texto_sin_distinguir_mayusculas(self, columnas):
+        assert _ids(columnas, columnas.filtrar(empresa="  aguas ")) == [1, 3, 5]
+        assert _ids(columnas, columnas.filtrar(empresa="aguas", cif="b")) == [3]
+        assert _ids(columnas, columnas.filtrar(empresa="no existe")) == []
+
+    @pytest.mark.unit
+    def test_valores_exactos_combinados(self, columnas):
+        assert _ids(columnas, columnas.filtrar(estado="Emitida", categoria="Agua")) == [3, 5]
+        assert _ids(columnas, columnas.filtrar(localidad="León", estado="Emitida")) == [5]
+        assert _ids(columnas, columnas.filtrar(estado="Con deficiencias")) == []
+
+    @pytest.mark.unit
+    def test_rango_de_fechas_incluye_las_que_no_tienen_fecha(self, columnas):
+        mascara = columnas.filtrar(desde=date(2024, 1, 1), hasta=date(2024, 3, 10))
+        assert _ids(columnas, mascara) == [1, 3, 4, 5]
+
+        mascara = columnas.filtrar(desde=date(2024, 6, 1), hasta=date(2024, 1, 1))
+        assert _ids(columnas, mascara) == [3, 4]
+
+    @pytest.mark.unit
+    def test_totales(self, columnas):
+        mascara = columnas.filtrar(categoria="Agua")
+
+        assert columnas.totales(mascara) == (3, 325.0)
+        assert columnas.totales_por("estado", mascara) == {"Pagada": (1, 100.0), "Emitida": (2, 225.0)}
+        assert columnas.totales_por("localidad", columnas.todas) == {"León": (3, 310.0), "Sevilla": (2, 75.5)}
+
+    @pytest.mark.unit
+    def test_cambiar_valor_actualiza_mascaras_y_factura(self, columnas, facturas):
+        assert _ids(columnas, columnas.filtrar(estado="Emitida")) == [2, 3, 5]
+
+        assert columnas.cambiar_valor(5, "estado", "Pagada")
+        assert columnas.cambiar_valor(2, "estado", "Con deficiencias")
+        assert not columnas.cambiar_valor(99, "estado", "Pagada")
+
+        assert _ids(columnas, columnas.filtrar(estado="Emitida")) == [3]
+        assert _ids(columnas, columnas.filtrar(estado="Pagada")) == [1, 5]
+        assert _ids(columnas, columnas.filtrar(estado="Con deficiencias")) == [2]
+        assert facturas[4]["estado"] == "Pagada"
+        assert columnas.totales_por("estado", columnas.todas)["Pagada"] == (2, 300.0)
+
+    @pytest.mark.unit
+    def test_lista_vacia(self):
+        columnas = ColumnasFacturas([])
+
+        assert columnas.facturas(columnas.filtrar(empresa="x", desde=date(2024, 1, 1))) == []
+        assert columnas.totales(columnas.todas) == (0, 0)
+
+    @pytest.mark.unit
+    def test_columna_con_muchos_valores_distintos(self):
+        facturas = [{"id": i, "empresa": f"Empresa {i}", "localidad": f"L{i % 300}", "importe": 1}
+                    for i in range(600)]
+        columnas = ColumnasFacturas(facturas)
+
+        assert _ids(columnas, columnas.filtrar(empresa="empresa 59")) == [59] + list(range(590, 600))
+        assert _ids(columnas, columnas.filtrar(localidad="L7")) == [7, 307]
+
+        columnas.cambiar_valor(7, "localidad", "Nueva")
+        assert _ids(columnas, columnas.filtrar(localidad="L7")) == [307]
+        assert _ids(columnas, columnas.filtrar(localidad="Nueva")) == [7]
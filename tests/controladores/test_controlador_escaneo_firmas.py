@@ -0,0 +1,127 @@
+"""
+Tests para controlador_escaneo_firmas.py
+Extracción de firmas en paralelo y listado de PDFs por obra
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_escaneo_firmas import (
+    calcular_numero_procesos,
+    extraer_firmas_en_paralelo,
+    listar_pdfs_obra,
+    listar_pdfs_obras
+)
+
+
+def _crear_archivo(ruta, contenido=b"%PDF-1.4 prueba"):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'wb') as f:
+        f.write(contenido)
+    return ruta
+
+
+class TestListadoPdfs:
+    """Tests para el listado de PDFs con posibles firmas"""
+
+    @pytest.fixture
+    def obras(self):
+        temp_dir = tempfile.mkdtemp()
+        obra = os.path.join(temp_dir, "OBRA 1")
+        _crear_archivo(os.path.join(obra, "02-documentacion-finales", "acta_inicio.pdf"))
+        _crear_archivo(os.path.join(obra, "02-documentacion-finales", "notas.txt"))
+        _crear_archivo(os.path.join(obra, "01-proyecto", "Proyecto.pdf"))
+        _crear_archivo(os.path.join(obra, "01-proyecto", "plano.pdf"))
+        _crear_archivo(os.path.join(temp_dir, "OBRA 2", "02-documentacion-finales", "contrato.pdf"))
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.mark.unit
+    def test_listar_pdfs_obra(self, obras):
+        """Test que solo se listan PDFs de documentación y el proyecto"""
+        rutas = listar_pdfs_obra(os.path.join(obras, "OBRA 1"))
+        nombres = [os.path.basename(r) for r in rutas]
+
+        assert nombres == ["acta_inicio.pdf", "Proyecto.pdf"]
+
+    @pytest.mark.unit
+    def test_listar_pdfs_obras(self, obras):
+        """Test listado de todas las obras"""
+        rutas = listar_pdfs_obras(obras)
+
+        assert len(rutas) == 3
+        assert any(r.endswith("contrato.pdf") for r in rutas)
+
+    @pytest.mark.unit
+    def test_listar_pdfs_obras_carpeta_inexistente(self):
+        """Test carpeta de obras inexistente"""
+        assert listar_pdfs_obras("/ruta/que/no/existe") == []
+
+
+class TestExtraccionParalela:
+    """Tests para extraer_firmas_en_paralelo"""
+
+    @pytest.mark.unit
+    def test_calcular_numero_procesos(self):
+        """Test límites del número de procesos"""
+        assert calcular_numero_procesos(1) == 1
+        assert calcular_numero_procesos(0) == 1
+        assert calcular_numero_procesos(10, max_procesos=3) == 3
+        assert calcular_numero_procesos(2, max_procesos=8) == 2
+
+    @pytest.mark.unit
+    def test_extraccion_secuencial_con_un_proceso(self):
+        """Test que con un proceso se extrae en el propio hilo y se notifica cada PDF"""
+        al_completar = Mock()
+        with patch('controladores.controlador_escaneo_firmas._extraer_firmas_proceso',
+                   side_effect=lambda ruta: (ruta, [{"firmante": ruta, "fecha": ""}])):
+            resultados = extraer_firmas_en_paralelo(["a.pdf", "b.pdf"], max_procesos=1,
+                                                    al_completar=al_completar)
+
+        assert set(resultados) == {"a.pdf", "b.pdf"}
+        assert al_completar.call_count == 2
+
+    @pytest.mark.unit
+    def test_pdf_ilegible_no_se_entrega(self):
+        """Test que un PDF que falla no aparece en el resultado ni se notifica"""
+        def _extraer(ruta):
+            if ruta == "bloqueado.pdf":
+                raise PermissionError(ruta)
+            return ruta, []
+
+        al_completar = Mock()
+        with patch('controladores.controlador_escaneo_firmas._extraer_firmas_proceso', side_effect=_extraer):
+            resultados = extraer_firmas_en_paralelo(["bloqueado.pdf", "b.pdf"], max_procesos=1,
+                                                    al_completar=al_completar)
+
+        assert resultados == {"b.pdf": []}
+        al_completar.assert_called_once_with("b.pdf", [])
+
+    @pytest.mark.unit
+    def test_extraccion_cancelada(self):
+        """Test que la cancelación detiene la extracción"""
+        with patch('controladores.controlador_escaneo_firmas._extraer_firmas_proceso') as mock_extraer:
+            resultados = extraer_firmas_en_paralelo(["a.pdf", "b.pdf"], max_procesos=1,
+                                                    cancelado=lambda: True)
+
+        assert resultados == {}
+        mock_extraer.assert_not_called()
+
+    @pytest.mark.slow
+    def test_extraccion_en_varios_procesos(self):
+        """Test extracción real en pool de procesos con PDFs sin firmas"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            rutas = [_crear_archivo(os.path.join(temp_dir, f"doc_{i}.pdf")) for i in range(3)]
+
+            resultados = extraer_firmas_en_paralelo(rutas, max_procesos=2)
+
+            assert set(resultados) == set(rutas)
+            assert all(firmas == [] for firmas in resultados.values())
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -337,6 +337,41 @@ class TestEventosUIIntegracion:
         for i, (_, _, esperado) in enumerate(widgets_y_valores):
             assert resultados[i] == esperado
 
+class TestRecalcularCamposCargados:
+    """Cálculos explícitos tras cargar una pestaña sin eventos"""
+
+    def _widget(self, nombre):
+        widget = Mock()
+        widget.objectName.return_value = nombre
+        return widget
+
+    @pytest.fixture
+    def controlador(self):
+        controlador = ControladorEventosUI(Mock())
+        controlador.controlador_calculos = Mock()
+        controlador._guardar_cambios_pendientes = Mock()
+        return controlador
+
+    @pytest.mark.unit
+    def test_solo_guarda_resultados_distintos_del_contrato(self, controlador):
+        def liquidacion(window):
+            controlador._guardar_campo_en_json('certIva', '21.00')
+            controlador._guardar_campo_en_json('saldoBaseLiquidacion', '50.00')
+        controlador.controlador_calculos.calcular_liquidacion.side_effect = liquidacion
+
+        guardado = controlador.recalcular_campos_cargados(
+            [self._widget('certBase')], {'certIva': 21, 'saldoBaseLiquidacion': '0.00'})
+
+        assert guardado
+        assert controlador._cambios_pendientes == {'saldoBaseLiquidacion': '50.00'}
+        controlador._guardar_cambios_pendientes.assert_called_once()
+
+    @pytest.mark.unit
+    def test_pestana_sin_campos_calculados(self, controlador):
+        assert not controlador.recalcular_campos_cargados([self._widget('nombreObra')], {})
+        controlador.controlador_calculos.calcular_liquidacion.assert_not_called()
+        controlador._guardar_cambios_pendientes.assert_not_called()
+
 
 # Marks para organizar los tests
-pytestmark = [pytest.mark.unit]
\ No newline at end of file
+pytestmark = [pytest.mark.unit]
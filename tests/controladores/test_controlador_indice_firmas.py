@@ -0,0 +1,165 @@
+"""
+Tests para controlador_indice_firmas.py
+Índice de estado de firmas de todas las obras
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_indice_firmas import (
+    IndiceFirmas, determinar_fase_archivo,
+    ESTADO_FIRMADO, ESTADO_SIN_FIRMAS, ESTADO_SIN_FIRMAR, SIN_FIRMANTES
+)
+
+
+FIRMA_JUAN = {"firmante": "JUAN PEREZ GARCIA", "fecha": "15/01/2024 10:30:00"}
+FIRMA_ANA = {"firmante": "ANA LOPEZ RUIZ", "fecha": "16/01/2024 09:00:00"}
+
+
+def _crear_archivo(carpeta_obra, subcarpeta, nombre, contenido=b"%PDF-1.4 prueba"):
+    directorio = os.path.join(carpeta_obra, subcarpeta)
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'wb') as f:
+        f.write(contenido)
+    return ruta
+
+
+class TestDeterminarFase:
+    """Tests para determinar_fase_archivo"""
+
+    @pytest.mark.unit
+    def test_fase_por_nombre(self):
+        assert determinar_fase_archivo("Acta_Inicio_obra.pdf") == "INICIO"
+        assert determinar_fase_archivo("cartas_invitacion.pdf") == "CARTASINVITACION"
+
+    @pytest.mark.unit
+    def test_archivo_sin_fase(self):
+        assert determinar_fase_archivo("presupuesto.pdf") is None
+
+
+class TestIndiceFirmas:
+    """Tests para IndiceFirmas"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def archivo_indice(self, temp_dir):
+        return os.path.join(temp_dir, "indice_firmas.json")
+
+    @pytest.fixture
+    def carpeta_obra(self, temp_dir):
+        carpeta = os.path.join(temp_dir, "obras", "Obra Prueba")
+        self.ruta_inicio = _crear_archivo(carpeta, "02-documentacion-finales", "acta_inicio.pdf")
+        self.ruta_contrato = _crear_archivo(carpeta, "02-documentacion-finales", "contrato.pdf")
+        _crear_archivo(carpeta, "04-documentos-sin-firmar", "acta_replanteo.docx")
+        _crear_archivo(carpeta, "04-documentos-sin-firmar", "~$acta_recepcion.docx")
+        return carpeta
+
+    def _extractor(self):
+        return Mock(side_effect=lambda rutas: {
+            ruta: [FIRMA_JUAN, FIRMA_ANA] if ruta.endswith("acta_inicio.pdf") else []
+            for ruta in rutas
+        })
+
+    @pytest.mark.unit
+    def test_estados_por_fase(self, archivo_indice, carpeta_obra):
+        """Test estado de cada fase según archivos y firmas"""
+        indice = IndiceFirmas(archivo_indice)
+
+        assert indice.indexar_obra(carpeta_obra, self._extractor())
+
+        fases = indice.obras["Obra Prueba"]["fases"]
+        assert fases["INICIO"]["estado"] == ESTADO_FIRMADO
+        assert fases["CONTRATO"]["estado"] == ESTADO_SIN_FIRMAS
+        assert fases["REPLANTEO"]["estado"] == ESTADO_SIN_FIRMAR
+        assert "RECEPCION" not in fases
+
+    @pytest.mark.unit
+    def test_obra_sin_cambios_no_se_reparsea(self, archivo_indice, carpeta_obra):
+        """Test que una obra sin cambios no vuelve a extraer firmas"""
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, self._extractor())
+
+        extractor = self._extractor()
+        assert not indice.indexar_obra(carpeta_obra, extractor)
+        extractor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_solo_se_parsean_pdfs_modificados(self, archivo_indice, carpeta_obra):
+        """Test reindexado incremental de una obra"""
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, self._extractor())
+
+        with open(self.ruta_contrato, 'ab') as f:
+            f.write(b" firmado")
+        extractor = Mock(return_value={self.ruta_contrato: [FIRMA_JUAN]})
+
+        assert indice.indexar_obra(carpeta_obra, extractor)
+        extractor.assert_called_once_with([self.ruta_contrato])
+        fases = indice.obras["Obra Prueba"]["fases"]
+        assert fases["INICIO"]["estado"] == ESTADO_FIRMADO
+        assert fases["CONTRATO"]["estado"] == ESTADO_FIRMADO
+        assert fases["CONTRATO"]["faltan"] == ["ANA LOPEZ RUIZ"]
+
+    @pytest.mark.unit
+    def test_pdf_no_leido_se_reintenta(self, archivo_indice, carpeta_obra):
+        """Test que un PDF que no se pudo leer no queda registrado como sin firmas"""
+        indice = IndiceFirmas(archivo_indice)
+        assert indice.indexar_obra(carpeta_obra, Mock(return_value={self.ruta_contrato: []}))
+        assert indice.obras["Obra Prueba"]["fases"]["INICIO"]["estado"] == ESTADO_SIN_FIRMAS
+
+        extractor = self._extractor()
+        assert indice.indexar_obra(carpeta_obra, extractor)
+        extractor.assert_called_once_with([self.ruta_inicio])
+        assert indice.obras["Obra Prueba"]["fases"]["INICIO"]["estado"] == ESTADO_FIRMADO
+
+    @pytest.mark.unit
+    def test_pendientes_de_firma(self, archivo_indice, carpeta_obra):
+        """Test vista de pendientes con firmantes esperados"""
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, self._extractor())
+
+        pendientes = indice.pendientes_de_firma()
+
+        assert [p['fase'] for p in pendientes] == ["CONTRATO", "REPLANTEO"]
+        assert pendientes[0]['faltan'] == ["JUAN PEREZ GARCIA", "ANA LOPEZ RUIZ"]
+        por_firmante = indice.pendientes_por_firmante()
+        assert len(por_firmante["ANA LOPEZ RUIZ"]) == 2
+
+    @pytest.mark.unit
+    def test_obra_sin_firmantes_conocidos(self, archivo_indice, carpeta_obra):
+        """Test que sin firmas en la obra se indica que no hay firmantes registrados"""
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, Mock(side_effect=lambda rutas: {}))
+
+        assert all(p['faltan'] == [SIN_FIRMANTES] for p in indice.pendientes_de_firma())
+
+    @pytest.mark.unit
+    def test_indice_persiste(self, archivo_indice, carpeta_obra):
+        """Test que el índice guardado se carga sin reindexar"""
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, self._extractor())
+        assert indice.guardar()
+
+        nuevo = IndiceFirmas(archivo_indice)
+
+        assert nuevo.actualizado is not None
+        assert nuevo.pendientes_de_firma() == indice.pendientes_de_firma()
+
+    @pytest.mark.unit
+    def test_eliminar_obras_inexistentes(self, archivo_indice, carpeta_obra):
+        indice = IndiceFirmas(archivo_indice)
+        indice.indexar_obra(carpeta_obra, self._extractor())
+
+        assert indice.eliminar_obras_inexistentes([]) == 1
+        assert indice.obras == {}
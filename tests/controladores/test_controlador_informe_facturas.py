@@ -0,0 +1,108 @@
+"""
+Tests para controlador_informe_facturas.py
+Informe Word de facturas generado por bloques de XML
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_informe_facturas import GeneradorInformeFacturas, plantilla_fila, _texto_xml
+from controladores.controlador_analitica_facturas import AnaliticaFacturas
+
+# Otros tests sustituyen docx por un MagicMock en sys.modules: leer el .docx solo con el real
+docx = sys.modules.get("docx")
+DOCX_REAL = docx is not None and not isinstance(docx, MagicMock)
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class TestGeneradorInformeFacturas:
+    """Tests para GeneradorInformeFacturas"""
+
+    @pytest.fixture
+    def directorio(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _facturas(self, n):
+        return [{"id": i, "empresa": f"Empresa {i} <S&A>", "cif": "B123", "importe": 10.5,
+                 "estado": "Pagada" if i % 2 else "Emitida", "categoria": "Agua", "localidad": "León",
+                 "fecha_validacion": "2024-05-01"} for i in range(1, n + 1)]
+
+    def _generador(self, facturas, directorio, facturas_por_archivo=0):
+        return GeneradorInformeFacturas(facturas, AnaliticaFacturas(facturas), directorio, facturas_por_archivo)
+
+    @pytest.mark.unit
+    def test_plantilla_de_fila(self):
+        xml = plantilla_fila("Pagada").format(**{f"c{i}": _texto_xml(v) for i, v in enumerate(
+            [1, "Empresa <S&A>\x07", "B1", "10.50 €", "Pagada", "Agua", "León", "2024-05-01"])})
+        fila = ET.fromstring(f'<w:tbl xmlns:w="{W[1:-1]}">{xml}</w:tbl>')[0]
+
+        assert ["".join(t.text or "" for t in celda.iter(f"{W}t")) for celda in fila] == [
+            "1", "Empresa <S&A>", "B1", "10.50 €", "Pagada", "Agua", "León", "2024-05-01"]
+        assert [c.get(f"{W}val") for c in fila.iter(f"{W}color")] == ["4CAF50"]
+        assert "<w:color" not in plantilla_fila("Emitida")
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not DOCX_REAL, reason="python-docx sustituido por un mock en esta sesión")
+    def test_filas_con_el_formato_de_la_plantilla(self, directorio):
+        rutas = self._generador(self._facturas(3), directorio).generar()
+
+        assert len(rutas) == 1
+        tabla = docx.Document(rutas[0]).tables[0]
+        assert [c.text for c in tabla.rows[0].cells][:3] == ["ID", "Empresa", "CIF"]
+        assert [c.text for c in tabla.rows[1].cells] == [
+            "1", "Empresa 1 <S&A>", "B123", "10.50 €", "Pagada", "Agua", "León", "2024-05-01"]
+        estado = tabla.rows[1].cells[4].paragraphs[0].runs[0]
+        assert str(estado.font.color.rgb) == "4CAF50"
+        assert estado.font.size.pt == 9
+        assert tabla.rows[2].cells[4].paragraphs[0].runs[0].font.color.rgb is None
+
+    @pytest.mark.unit
+    def test_divide_en_partes_y_avisa_del_progreso(self, directorio):
+        avisos = []
+        rutas = self._generador(self._facturas(5), directorio, 2).generar(
+            lambda hechas, total, mensaje: avisos.append((hechas, total)))
+
+        assert [os.path.basename(r).split("_parte")[1] for r in rutas] == ["1de3.docx", "2de3.docx", "3de3.docx"]
+        if DOCX_REAL:
+            assert [len(docx.Document(r).tables[0].rows) - 1 for r in rutas] == [2, 2, 1]
+        assert avisos[-1] == (8, 8)
+        assert [hechas for hechas, _ in avisos] == sorted(hechas for hechas, _ in avisos)
+
+    @pytest.mark.unit
+    def test_cancelar_no_guarda(self, directorio):
+        rutas = self._generador(self._facturas(5), directorio).generar(cancelado=lambda: True)
+
+        assert rutas == []
+        assert os.listdir(directorio) == []
+
+    @pytest.mark.unit
+    def test_cancelar_o_fallar_borra_las_partes_guardadas(self, directorio, monkeypatch):
+        avisos = []
+        rutas = self._generador(self._facturas(5), directorio, 2).generar(
+            lambda hechas, total, mensaje: avisos.append(mensaje), cancelado=lambda: "Parte 1 de 3 guardada" in avisos)
+
+        assert rutas == [] and os.listdir(directorio) == []
+
+        generador = self._generador(self._facturas(5), directorio, 2)
+        pies = []
+        monkeypatch.setattr(generador, "_pie", lambda doc: pies.append(doc) if not pies else 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            generador.generar()
+        assert os.listdir(directorio) == []
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not DOCX_REAL, reason="python-docx sustituido por un mock en esta sesión")
+    def test_sin_facturas(self, directorio):
+        rutas = self._generador([], directorio).generar()
+
+        documento = docx.Document(rutas[0])
+        assert documento.tables == []
+        assert any(p.text == "No hay facturas para mostrar." for p in documento.paragraphs)
@@ -0,0 +1,127 @@
+"""
+Tests para controlador_intercambio_facturas.py
+Exportación e importación de facturas directas en CSV y Excel
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_intercambio_facturas import (
+    convertir_fecha, convertir_importe, exportar_facturas, leer_filas, preparar_importacion
+)
+
+ESTADOS = ["Emitida", "Tramitada", "Pagada", "Con deficiencias"]
+CATEGORIAS = ["Agua", "Vegetal", "Limpieza", "Otras"]
+
+
+class TestIntercambioFacturas:
+    """Tests de exportación/importación"""
+
+    @pytest.fixture
+    def directorio(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def existentes(self):
+        return [
+            {"id": 1, "empresa": "Aguas", "cif": "A111", "importe": 100.0, "estado": "Pagada",
+             "categoria": "Agua", "localidad": "León", "fecha_validacion": "2024-03-10",
+             "identificador_especial": "F-1", "activa": True},
+            {"id": 2, "empresa": "Limpiezas", "cif": "B222", "importe": 50.5, "estado": "Emitida",
+             "categoria": "Limpieza", "localidad": "Sevilla", "fecha_validacion": "2024-01-02", "activa": True},
+        ]
+
+    def _preparar(self, ruta, existentes):
+        campos, filas = leer_filas(ruta)
+        return preparar_importacion(campos, filas, existentes, ESTADOS, CATEGORIAS)
+
+    def _csv(self, directorio, texto):
+        ruta = os.path.join(directorio, "facturas.csv")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto)
+        return ruta
+
+    @pytest.mark.unit
+    def test_exportar_csv_y_volver_a_leer(self, directorio, existentes):
+        ruta = os.path.join(directorio, "export.csv")
+
+        assert exportar_facturas(existentes, ruta) == 2
+
+        campos, filas = leer_filas(ruta)
+        filas = list(filas)
+        assert campos[:4] == ["id", "empresa", "cif", "importe"]
+        assert filas[0][:3] == ["1", "Aguas", "A111"]
+        # Todas duplicadas de las existentes
+        resultado = self._preparar(ruta, existentes)
+        assert resultado.facturas == []
+        assert [linea for linea, _ in resultado.duplicadas] == [2, 3]
+
+    @pytest.mark.unit
+    def test_validacion_y_duplicados(self, directorio, existentes):
+        ruta = self._csv(directorio, "\n".join([
+            "Empresa,CIF,Importe,Estado,Categoria,Localidad,Fecha Validacion,ID Especial",
+            "Nueva,C333,\"1.234,56 €\",,Agua,Burgos,05/02/2024,F-9",     # 2: válida
+            "Aguas,a 111,999,Pagada,Agua,León,2024-06-01,F-1",           # 3: mismo CIF e identificador
+            "Limpiezas,B222,50.50,Emitida,Limpieza,Sevilla,2024-01-02,",  # 4: mismo CIF, fecha e importe
+            "Nueva,C333,10,Emitida,Agua,Burgos,2024-02-05,F-9",           # 5: repetida en el propio archivo
+            ",D444,10,Emitida,Agua,Burgos,2024-02-05,",                   # 6: sin empresa
+            "Otra,D444,cero,Emitida,Agua,Burgos,2024-02-05,",             # 7: importe no numérico
+            "Otra,D444,10,Archivada,Agua,Burgos,2024-02-05,",             # 8: estado desconocido
+            "Otra,D444,10,Emitida,Agua,Burgos,31/31/2024,",               # 9: fecha no válida
+            ",,,,,,,",                                                    # vacía: se ignora
+        ]))
+
+        resultado = self._preparar(ruta, existentes)
+
+        assert len(resultado.facturas) == 1
+        factura = resultado.facturas[0]
+        assert (factura["importe"], factura["estado"], factura["fecha_validacion"]) == (1234.56, "Emitida", "2024-02-05")
+        assert "id" not in factura
+        assert [linea for linea, _ in resultado.duplicadas] == [3, 4, 5]
+        assert [linea for linea, _ in resultado.errores] == [6, 7, 8, 9]
+
+    @pytest.mark.unit
+    def test_id_existente_es_duplicado(self, directorio, existentes):
+        ruta = self._csv(directorio, "ID;Empresa;Localidad;Importe\n2;Otra;León;10\n77;Otra;León;10\n")
+
+        resultado = self._preparar(ruta, existentes)
+
+        assert [linea for linea, _ in resultado.duplicadas] == [2]
+        assert len(resultado.facturas) == 1
+
+    @pytest.mark.unit
+    def test_faltan_columnas_obligatorias(self, directorio, existentes):
+        ruta = self._csv(directorio, "Empresa;Importe\nNueva;10\n")
+
+        resultado = self._preparar(ruta, existentes)
+
+        assert resultado.facturas == []
+        assert resultado.errores == [(1, "faltan columnas obligatorias: localidad")]
+
+    @pytest.mark.unit
+    def test_conversiones(self):
+        assert convertir_importe("1.234,5") == 1234.5
+        assert convertir_importe("12.5") == 12.5
+        assert convertir_importe(7) == 7.0
+        assert convertir_fecha(datetime(2024, 5, 6, 10, 30)) == "2024-05-06"
+        assert convertir_fecha("2024/05/06") == "2024-05-06"
+        with pytest.raises(ValueError):
+            convertir_importe("abc")
+
+    @pytest.mark.unit
+    def test_excel(self, directorio, existentes):
+        pytest.importorskip("openpyxl")
+        ruta = os.path.join(directorio, "export.xlsx")
+
+        assert exportar_facturas(existentes, ruta) == 2
+
+        campos, filas = leer_filas(ruta)
+        assert campos[1] == "empresa"
+        assert [fila[1] for fila in filas] == ["Aguas", "Limpiezas"]
@@ -591,7 +591,26 @@ class TestOperacionesEscritura:
             assert "CONTRATO_B" not in nombres
             assert "CONTRATO_A" in nombres
             assert "CONTRATO_C" in nombres
-    
+
+    @pytest.mark.unit
+    def test_eliminar_contrato_elimina_su_almacen_de_actuaciones(self, gestor_escritura):
+        """Test que las actuaciones y facturas del contrato eliminado no pasan a otro con su nombre"""
+        from controladores.controlador_repositorio_actuaciones import RepositorioActuacionesFacturas
+        gestor_escritura.datos["obras"] = [{"nombreObra": "CONTRATO_A"}, {"nombreObra": "CONTRATO_B"}]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            carpeta = os.path.join(temp_dir, "actuaciones_facturas")
+            RepositorioActuacionesFacturas(carpeta, "CONTRATO_A").insertar("facturas", {"id": "f1"})
+            RepositorioActuacionesFacturas(carpeta, "CONTRATO_B").insertar("facturas", {"id": "f2"})
+
+            with patch.object(gestor_escritura, 'guardar_datos', return_value=True), \
+                 patch('controladores.controlador_json.rutas') as mock_rutas:
+                mock_rutas.get_ruta_actuaciones_facturas.return_value = carpeta
+                assert gestor_escritura.eliminar_contrato("CONTRATO_B") is True
+
+            assert RepositorioActuacionesFacturas(carpeta, "CONTRATO_B").filas("facturas") == []
+            assert RepositorioActuacionesFacturas(carpeta, "CONTRATO_A").filas("facturas") == [{"id": "f1"}]
+
     @pytest.mark.unit
     def test_eliminar_contrato_no_existente(self, gestor_escritura):
         """Test eliminación de contrato inexistente"""
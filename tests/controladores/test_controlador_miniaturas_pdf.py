@@ -0,0 +1,140 @@
+"""
+Tests para controlador_miniaturas_pdf.py
+Cache persistente de miniaturas por hash del PDF
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores import controlador_miniaturas_pdf
+from controladores.controlador_miniaturas_pdf import (
+    CacheMiniaturasPDF, ColaPaginas, calcular_hash_archivo, carpeta_miniaturas_de, CARPETA_MINIATURAS
+)
+from controladores.controlador_routes import rutas
+
+
+class TestCacheMiniaturasPDF:
+    """Tests para CacheMiniaturasPDF"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture(autouse=True)
+    def carpetas_app(self, temp_dir):
+        """Carpeta de obras y de miniaturas del usuario dentro del directorio temporal"""
+        with patch.object(rutas, 'get_ruta_carpeta_obras', return_value=os.path.join(temp_dir, "obras")), \
+             patch.object(rutas, 'get_ruta_miniaturas', return_value=os.path.join(temp_dir, "usuario")):
+            yield
+
+    @pytest.fixture
+    def ruta_pdf(self, temp_dir):
+        ruta = os.path.join(temp_dir, "obras", "OBRA", "01-proyecto", "proyecto.pdf")
+        os.makedirs(os.path.dirname(ruta))
+        with open(ruta, 'wb') as f:
+            f.write(b"%PDF-1.4 proyecto")
+        return ruta
+
+    def _crear_miniatura(self, cache, pagina):
+        cache.preparar()
+        with open(cache.ruta_miniatura(pagina), 'wb') as f:
+            f.write(b"png")
+
+    @pytest.mark.unit
+    def test_carpeta_junto_al_pdf_por_hash(self, ruta_pdf):
+        cache = CacheMiniaturasPDF(ruta_pdf)
+
+        assert cache.hash == calcular_hash_archivo(ruta_pdf)
+        assert cache.carpeta == os.path.join(os.path.dirname(ruta_pdf), CARPETA_MINIATURAS, cache.hash)
+
+    @pytest.mark.unit
+    def test_miniaturas_persisten_al_reabrir(self, ruta_pdf):
+        """Test que al reabrir el PDF se encuentran las miniaturas sin recalcular el hash"""
+        self._crear_miniatura(CacheMiniaturasPDF(ruta_pdf), 0)
+
+        with patch.object(controlador_miniaturas_pdf, 'calcular_hash_archivo') as mock_hash:
+            cache = CacheMiniaturasPDF(ruta_pdf)
+
+        mock_hash.assert_not_called()
+        assert cache.tiene(0)
+        assert not cache.tiene(1)
+
+    @pytest.mark.unit
+    def test_pdf_modificado_descarta_miniaturas_anteriores(self, ruta_pdf):
+        anterior = CacheMiniaturasPDF(ruta_pdf)
+        self._crear_miniatura(anterior, 0)
+
+        with open(ruta_pdf, 'ab') as f:
+            f.write(b" nueva version")
+        cache = CacheMiniaturasPDF(ruta_pdf)
+
+        assert cache.hash != anterior.hash
+        assert not cache.tiene(0)
+        assert not os.path.exists(anterior.carpeta)
+
+    @pytest.mark.unit
+    def test_copia_con_mismo_contenido_comparte_miniaturas(self, ruta_pdf):
+        self._crear_miniatura(CacheMiniaturasPDF(ruta_pdf), 0)
+        copia = os.path.join(os.path.dirname(ruta_pdf), "proyecto_1.pdf")
+        shutil.copy2(ruta_pdf, copia)
+
+        assert CacheMiniaturasPDF(copia).tiene(0)
+
+    @pytest.mark.unit
+    def test_pdf_fuera_de_obras_usa_carpeta_del_usuario(self, temp_dir):
+        """Test que un PDF de descargas no deja .miniaturas a su lado ni choca con otro del mismo nombre"""
+        descargas = []
+        for carpeta in ("descargas", "compartida"):
+            ruta = os.path.join(temp_dir, carpeta, "acta.pdf")
+            os.makedirs(os.path.dirname(ruta))
+            with open(ruta, 'wb') as f:
+                f.write(carpeta.encode())
+            descargas.append(ruta)
+
+        caches = [CacheMiniaturasPDF(ruta) for ruta in descargas]
+        self._crear_miniatura(caches[0], 0)
+
+        assert caches[0].carpeta_cache == os.path.join(temp_dir, "usuario")
+        assert not os.path.exists(os.path.join(temp_dir, "descargas", CARPETA_MINIATURAS))
+        assert CacheMiniaturasPDF(descargas[0]).tiene(0)
+        assert not CacheMiniaturasPDF(descargas[1]).tiene(0)
+
+    @pytest.mark.unit
+    def test_carpeta_de_obra_sin_escritura_usa_carpeta_del_usuario(self, ruta_pdf, temp_dir):
+        with patch.object(controlador_miniaturas_pdf.os, 'access', return_value=False):
+            assert carpeta_miniaturas_de(ruta_pdf) == os.path.join(temp_dir, "usuario")
+
+    @pytest.mark.unit
+    def test_pdf_inexistente(self, temp_dir):
+        cache = CacheMiniaturasPDF(os.path.join(temp_dir, "no_existe.pdf"))
+
+        assert cache.hash is None
+        assert cache.ruta_miniatura(0) is None
+        assert not cache.preparar()
+
+
+class TestColaPaginas:
+    """Tests para ColaPaginas"""
+
+    @pytest.mark.unit
+    def test_orden_por_defecto(self):
+        cola = ColaPaginas(3)
+
+        assert [cola.siguiente() for _ in range(4)] == [0, 1, 2, None]
+
+    @pytest.mark.unit
+    def test_paginas_visibles_pasan_delante(self):
+        cola = ColaPaginas(10)
+        cola.siguiente()
+
+        cola.priorizar(range(6, 12))
+
+        assert [cola.siguiente() for _ in range(5)] == [6, 7, 8, 9, 1]
+        assert len(cola) == 4
@@ -0,0 +1,176 @@
+"""
+Tests para controlador_modelos_tabla.py
+Modelo de tabla sobre listas de diccionarios, proxy de selección y delegado de botones
+
+conftest.py sustituye PyQt5 por mocks en este proceso: cada test ejecuta su código con
+el PyQt5 real en un intérprete aparte (QApplication offscreen)
+"""
+import pytest
+import sys
+import os
+import subprocess
+import textwrap
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(RAIZ)
+
+SIN_PYQT5 = 77
+
+PREAMBULO = f"""
+import os, sys
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+sys.path.insert(0, {RAIZ!r})
+try:
+    from PyQt5.QtWidgets import QApplication
+except ImportError:
+    sys.exit({SIN_PYQT5})
+from PyQt5.QtCore import QEvent, QPointF, QRect, Qt
+from PyQt5.QtGui import QColor, QMouseEvent
+from PyQt5.QtWidgets import QStyleOptionViewItem
+app = QApplication([])
+from controladores.controlador_modelos_tabla import (
+    ColumnaTabla, DelegadoBotones, ModeloTablaDiccionarios, ProxySeleccion, ROL_FILA, fila_origen
+)
+
+FILAS = [{{'id': i, 'importe': i * 10.0}} for i in range(5)]
+COLUMNAS = [
+    ColumnaTabla('Id', lambda f: str(f['id'])),
+    ColumnaTabla('Importe', lambda f: f"{{f['importe']:.2f}}",
+                 lambda f: QColor('red') if f['importe'] > 20 else None),
+    ColumnaTabla('Roto', lambda f: f['no_existe']),
+]
+
+def filas_visibles(proxy):
+    return [proxy.index(r, 0).data() for r in range(proxy.rowCount())]
+"""
+
+
+def _ejecutar_con_qt(codigo: str):
+    resultado = subprocess.run(
+        [sys.executable, "-c", PREAMBULO + textwrap.dedent(codigo)],
+        capture_output=True, text=True, timeout=60
+    )
+    if resultado.returncode == SIN_PYQT5:
+        pytest.skip("PyQt5 no está instalado")
+    assert resultado.returncode == 0, resultado.stderr
+
+
+class TestModeloTablaDiccionarios:
+    """Tests para ModeloTablaDiccionarios"""
+
+    @pytest.mark.unit
+    @pytest.mark.ui
+    def test_dimensiones_y_roles(self):
+        _ejecutar_con_qt("""
+            modelo = ModeloTablaDiccionarios(COLUMNAS, FILAS)
+
+            assert (modelo.rowCount(), modelo.columnCount()) == (5, 3)
+            assert modelo.rowCount(modelo.index(0, 0)) == 0  # sin hijos
+            assert modelo.index(3, 1).data() == "30.00"
+            assert modelo.index(3, 1).data(Qt.BackgroundRole) == QColor('red')
+            assert modelo.index(1, 1).data(Qt.BackgroundRole) is None
+            assert modelo.index(0, 0).data(Qt.BackgroundRole) is None  # columna sin fondo
+            assert modelo.index(2, 0).data(ROL_FILA) == FILAS[2]  # QVariant: copia del diccionario
+            assert modelo.index(0, 2).data() is None  # error al formatear: celda vacía
+            assert modelo.headerData(1, Qt.Horizontal) == "Importe"
+            assert modelo.headerData(0, Qt.Vertical) == "1"
+            assert modelo.fila(4) is FILAS[4] and modelo.fila(5) is None
+
+            modelo.establecer_filas(FILAS[:2])
+            assert modelo.rowCount() == 2
+        """)
+
+    @pytest.mark.unit
+    @pytest.mark.ui
+    def test_actualizar_fila_emite_solo_esa_fila(self):
+        _ejecutar_con_qt("""
+            modelo = ModeloTablaDiccionarios(COLUMNAS, FILAS)
+            cambios = []
+            modelo.dataChanged.connect(
+                lambda arriba, abajo, roles: cambios.append(
+                    (arriba.row(), arriba.column(), abajo.row(), abajo.column())))
+
+            FILAS[3]['importe'] = 99.0
+            modelo.actualizar_fila(3)
+            modelo.actualizar_fila(5)
+            modelo.actualizar_fila(-1)
+
+            assert cambios == [(3, 0, 3, 2)]
+            assert modelo.index(3, 1).data() == "99.00"
+        """)
+
+
+class TestProxySeleccion:
+    """Tests para ProxySeleccion y fila_origen"""
+
+    @pytest.mark.unit
+    @pytest.mark.ui
+    def test_establecer_seleccion(self):
+        _ejecutar_con_qt("""
+            modelo = ModeloTablaDiccionarios(COLUMNAS, FILAS)
+            proxy = ProxySeleccion()
+            proxy.setSourceModel(modelo)
+            reinicios = []
+            proxy.modelReset.connect(lambda: reinicios.append(proxy.seleccion))
+
+            proxy.establecer_seleccion(None)  # ya sin filtrar: no reinicia
+            assert reinicios == [] and filas_visibles(proxy) == ['0', '1', '2', '3', '4']
+
+            proxy.establecer_seleccion(bytes([1, 0, 1, 0, 1]))
+            assert filas_visibles(proxy) == ['0', '2', '4']
+            assert proxy.seleccion == bytes([1, 0, 1, 0, 1])
+
+            # Selección calculada antes de añadir filas: las que no cubre quedan ocultas
+            proxy.establecer_seleccion(bytes([0, 1]))
+            assert filas_visibles(proxy) == ['1']
+
+            proxy.establecer_seleccion(None)
+            assert filas_visibles(proxy) == ['0', '1', '2', '3', '4']
+            assert proxy.seleccion is None and len(reinicios) == 3
+        """)
+
+    @pytest.mark.unit
+    @pytest.mark.ui
+    def test_fila_origen_con_y_sin_proxy(self):
+        _ejecutar_con_qt("""
+            modelo = ModeloTablaDiccionarios(COLUMNAS, FILAS)
+            proxy = ProxySeleccion()
+            proxy.setSourceModel(modelo)
+            proxy.establecer_seleccion(bytes([0, 0, 1, 0, 1]))
+
+            assert [fila_origen(proxy.index(r, 1)) for r in range(proxy.rowCount())] == [2, 4]
+            assert proxy.index(1, 0).data(ROL_FILA) == FILAS[4]
+            assert fila_origen(modelo.index(3, 0)) == 3
+        """)
+
+
+class TestDelegadoBotones:
+    """Tests para DelegadoBotones"""
+
+    @pytest.mark.unit
+    @pytest.mark.ui
+    def test_pulsar_boton_llama_a_su_accion_con_la_fila_de_origen(self):
+        _ejecutar_con_qt("""
+            modelo = ModeloTablaDiccionarios(COLUMNAS, FILAS)
+            proxy = ProxySeleccion()
+            proxy.setSourceModel(modelo)
+            proxy.establecer_seleccion(bytes([0, 0, 0, 1, 1]))
+            pulsados = []
+            delegado = DelegadoBotones([
+                ("Editar", "#1", "#2", lambda fila: pulsados.append(("editar", fila))),
+                ("Borrar", "#3", "#4", lambda fila: pulsados.append(("borrar", fila))),
+            ])
+            opcion = QStyleOptionViewItem()
+            opcion.rect = QRect(0, 0, 100, 100)
+            superior, inferior = delegado._rectangulos(opcion.rect)
+
+            def soltar(punto, boton=Qt.LeftButton):
+                evento = QMouseEvent(QEvent.MouseButtonRelease, punto, boton, boton, Qt.NoModifier)
+                return delegado.editorEvent(evento, proxy, opcion, proxy.index(1, 0))
+
+            assert soltar(superior.center())
+            assert soltar(inferior.center())
+            assert not soltar(QPointF(2, 2))  # en el margen, fuera de los botones
+            assert not soltar(superior.center(), Qt.RightButton)
+            assert pulsados == [("editar", 4), ("borrar", 4)]
+        """)
@@ -0,0 +1,176 @@
+"""
+Tests para controlador_pdf_render.py
+Cache de páginas renderizadas del visor PDF
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores import controlador_pdf_render
+from controladores.controlador_pdf_render import (
+    CachePaginasPDF, clave_pagina, clave_previsualizacion, clave_tesela, es_clave_tesela,
+    identificador_documento, requiere_teselado, teselas_en_rect, TAMANO_TESELA, ZOOM_PREVISUALIZACION
+)
+
+
+class TestCachePaginasPDF:
+    """Tests para CachePaginasPDF"""
+
+    @pytest.mark.unit
+    def test_guardar_y_obtener(self):
+        cache = CachePaginasPDF(presupuesto_bytes=1000)
+        clave = clave_pagina("doc", 0, 1.0)
+
+        cache.guardar(clave, "pagina0", coste=100)
+
+        assert cache.obtener(clave) == "pagina0"
+        assert cache.memoria_usada == 100
+
+    @pytest.mark.unit
+    def test_zoom_forma_parte_de_la_clave(self):
+        cache = CachePaginasPDF(presupuesto_bytes=1000)
+        cache.guardar(clave_pagina("doc", 0, 1.0), "zoom100", coste=100)
+
+        assert cache.obtener(clave_pagina("doc", 0, 1.5)) is None
+        assert cache.obtener(clave_pagina("doc", 0, 1.0000001)) == "zoom100"
+
+    @pytest.mark.unit
+    def test_expulsa_menos_recientes_al_superar_presupuesto(self):
+        """Test que la memoria usada nunca supera el presupuesto"""
+        cache = CachePaginasPDF(presupuesto_bytes=300)
+        for pagina in range(3):
+            cache.guardar(clave_pagina("doc", pagina, 1.0), f"p{pagina}", coste=100)
+        cache.obtener(clave_pagina("doc", 0, 1.0))  # La página 0 pasa a ser la más reciente
+
+        cache.guardar(clave_pagina("doc", 3, 1.0), "p3", coste=100)
+
+        assert cache.memoria_usada == 300
+        assert clave_pagina("doc", 1, 1.0) not in cache
+        assert clave_pagina("doc", 0, 1.0) in cache
+
+    @pytest.mark.unit
+    def test_pagina_mayor_que_presupuesto_no_se_cachea(self):
+        cache = CachePaginasPDF(presupuesto_bytes=100)
+
+        cache.guardar(clave_pagina("doc", 0, 3.0), "enorme", coste=500)
+
+        assert len(cache) == 0
+        assert cache.memoria_usada == 0
+
+    @pytest.mark.unit
+    def test_reemplazar_entrada_actualiza_memoria(self):
+        cache = CachePaginasPDF(presupuesto_bytes=1000)
+        clave = clave_pagina("doc", 0, 1.0)
+        cache.guardar(clave, "v1", coste=100)
+
+        cache.guardar(clave, "v2", coste=200)
+
+        assert cache.obtener(clave) == "v2"
+        assert cache.memoria_usada == 200
+
+    @pytest.mark.unit
+    def test_invalidar_documento(self):
+        cache = CachePaginasPDF(presupuesto_bytes=1000)
+        cache.guardar(clave_pagina("doc_a", 0, 1.0), "a0", coste=100)
+        cache.guardar(clave_pagina("doc_b", 0, 1.0), "b0", coste=100)
+
+        cache.invalidar_documento("doc_a")
+
+        assert len(cache) == 1
+        assert cache.memoria_usada == 100
+        cache.invalidar_documento()
+        assert len(cache) == 0
+
+
+class TestClavePrevisualizacion:
+    """Tests para clave_previsualizacion"""
+
+    @pytest.mark.unit
+    def test_previsualizacion_a_baja_resolucion(self):
+        previa = clave_previsualizacion(clave_pagina("doc", 4, 2.0))
+
+        assert previa == clave_pagina("doc", 4, ZOOM_PREVISUALIZACION)
+
+    @pytest.mark.unit
+    def test_sin_previsualizacion_a_zoom_bajo(self):
+        assert clave_previsualizacion(clave_pagina("doc", 4, ZOOM_PREVISUALIZACION)) is None
+
+
+class TestTeselado:
+    """Tests para el renderizado por teselas a zoom alto"""
+
+    @pytest.mark.unit
+    def test_solo_paginas_grandes_se_teselan(self):
+        assert not requiere_teselado(1190, 1684)
+        assert requiere_teselado(5960, 8425)
+
+    @pytest.mark.unit
+    def test_teselas_de_la_zona_visible(self):
+        """Test que solo se piden las teselas que cortan el viewport"""
+        teselas = teselas_en_rect(TAMANO_TESELA, 0, TAMANO_TESELA + 1, 10, 5000, 5000)
+
+        assert teselas == [(1, 0), (2, 0)]
+
+    @pytest.mark.unit
+    def test_teselas_recortadas_al_borde_de_la_pagina(self):
+        teselas = teselas_en_rect(-100, -100, 10000, 700, 2 * TAMANO_TESELA - 1, 5000)
+
+        assert teselas == [(0, 0), (1, 0), (0, 1), (1, 1)]
+        assert teselas_en_rect(0, 0, 0, 100, 5000, 5000) == []
+
+    @pytest.mark.unit
+    def test_clave_tesela(self):
+        clave = clave_tesela("doc", 2, 4.0, 3, 1)
+
+        assert es_clave_tesela(clave)
+        assert not es_clave_tesela(clave_pagina("doc", 2, 4.0))
+        assert clave[:3] == clave_pagina("doc", 2, 4.0)
+        assert clave_previsualizacion(clave) == clave_pagina("doc", 2, ZOOM_PREVISUALIZACION)
+
+
+class TestIdentificadorDocumento:
+    """Tests para identificador_documento"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.mark.unit
+    def test_cambia_si_se_modifica_el_archivo(self, temp_dir):
+        ruta = os.path.join(temp_dir, "proyecto.pdf")
+        with open(ruta, 'wb') as f:
+            f.write(b"%PDF-1.4")
+        antes = identificador_documento(ruta)
+
+        with open(ruta, 'ab') as f:
+            f.write(b" modificado")
+
+        assert identificador_documento(ruta) != antes
+
+    @pytest.mark.unit
+    def test_documento_del_hilo_se_reabre_si_cambia_el_archivo(self, temp_dir):
+        """Test que un PDF sustituido en disco no se sigue renderizando desde el documento viejo"""
+        ruta = os.path.join(temp_dir, "proyecto.pdf")
+        with open(ruta, 'wb') as f:
+            f.write(b"%PDF-1.4")
+        fitz = Mock()
+        fitz.open.side_effect = lambda _ruta: Mock()
+        controlador_pdf_render._estado_hilo.documentos = None
+
+        viejo = controlador_pdf_render._documento_del_hilo(fitz, ruta, identificador_documento(ruta))
+        assert controlador_pdf_render._documento_del_hilo(fitz, ruta, identificador_documento(ruta)) is viejo
+
+        with open(ruta, 'ab') as f:
+            f.write(b" sustituido")
+        nuevo = controlador_pdf_render._documento_del_hilo(fitz, ruta, identificador_documento(ruta))
+
+        assert nuevo is not viejo
+        viejo.close.assert_called_once()
+        assert list(controlador_pdf_render._estado_hilo.documentos) == [identificador_documento(ruta)]
@@ -0,0 +1,100 @@
+"""
+Tests para controlador_pestanas.py
+Carga diferida de los campos de cada pestaña
+"""
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_pestanas import CargaDiferidaPestanas, agrupar_widgets_por_pagina
+
+
+class TestAgruparWidgetsPorPagina:
+    """Tests para agrupar_widgets_por_pagina"""
+
+    @pytest.mark.unit
+    def test_agrupa_por_pagina_ascendente(self):
+        padres = {
+            'basePresupuesto': 'grupo_presupuesto', 'grupo_presupuesto': 'pagina_actas',
+            'nombreObra': 'pagina_inicio', 'pagina_actas': 'tabWidget', 'pagina_inicio': 'tabWidget',
+            'comboBox': 'ventana',
+        }
+        paginas = {'pagina_actas': 'ActasGenerales', 'pagina_inicio': 'Inicio', 'pagina_vacia': 'Resumen'}
+
+        grupos = agrupar_widgets_por_pagina(['basePresupuesto', 'nombreObra', 'comboBox'], paginas, padres.get)
+
+        assert grupos == {
+            'ActasGenerales': ['basePresupuesto'], 'Inicio': ['nombreObra'], 'Resumen': [], None: ['comboBox'],
+        }
+
+
+class TestCargaDiferidaPestanas:
+    """Tests para CargaDiferidaPestanas"""
+
+    @pytest.fixture
+    def carga(self):
+        carga = CargaDiferidaPestanas(
+            ['Inicio', 'ActasGenerales', 'ActasObra'],
+            conectar=lambda clave: carga.llamadas.append(('conectar', clave)),
+            poblar=lambda clave, datos: carga.llamadas.append(('poblar', clave, datos['nombreObra'])),
+        )
+        carga.llamadas = []
+        return carga
+
+    @pytest.mark.unit
+    def test_sin_contrato_no_hay_pendientes(self, carga):
+        carga.activar('Inicio')
+
+        assert carga.pendientes() == []
+        assert carga.llamadas == [('conectar', 'Inicio')]
+
+    @pytest.mark.unit
+    def test_activar_conecta_una_vez_y_rellena_por_contrato(self, carga):
+        carga.nuevo_contrato({'nombreObra': 'c1'})
+        carga.activar('Inicio')
+        carga.activar('Inicio')
+        carga.nuevo_contrato({'nombreObra': 'c2'})
+        carga.activar('Inicio')
+
+        assert carga.llamadas == [('conectar', 'Inicio'), ('poblar', 'Inicio', 'c1'), ('poblar', 'Inicio', 'c2')]
+        assert carga.pendientes() == ['ActasGenerales', 'ActasObra']
+
+    @pytest.mark.unit
+    def test_poblar_siguiente_en_orden_sin_conectar(self, carga):
+        carga.nuevo_contrato({'nombreObra': 'c1'})
+        carga.activar('ActasGenerales')
+
+        assert carga.poblar_siguiente()
+        assert carga.poblar_siguiente()
+        assert not carga.poblar_siguiente()
+        assert carga.llamadas == [('conectar', 'ActasGenerales'), ('poblar', 'ActasGenerales', 'c1'),
+                                  ('poblar', 'Inicio', 'c1'), ('poblar', 'ActasObra', 'c1')]
+
+    @pytest.mark.unit
+    def test_actualizar_datos_solo_afecta_a_pendientes(self, carga):
+        carga.nuevo_contrato({'nombreObra': 'c1'})
+        carga.activar('Inicio')
+        carga.actualizar_datos({'nombreObra': 'c1 guardado'})
+        carga.poblar_todas()
+
+        assert carga.llamadas[1:] == [('poblar', 'Inicio', 'c1'), ('poblar', 'ActasGenerales', 'c1 guardado'),
+                                      ('poblar', 'ActasObra', 'c1 guardado')]
+
+    @pytest.mark.unit
+    def test_pestana_desconocida_se_ignora(self, carga):
+        carga.nuevo_contrato({'nombreObra': 'c1'})
+        carga.activar('Facturas')
+
+        assert carga.llamadas == []
+
+    @pytest.mark.unit
+    def test_guardados_al_rellenar_no_cambian_los_datos(self, carga):
+        """Test que los datos son una copia (el JSON puede cambiar al disparar eventos)"""
+        datos_json = {'nombreObra': 'c1'}
+        carga.nuevo_contrato(datos_json)
+        datos_json['nombreObra'] = 'modificado al guardar'
+        carga.poblar_todas()
+
+        assert {llamada[2] for llamada in carga.llamadas} == {'c1'}
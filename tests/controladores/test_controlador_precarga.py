@@ -0,0 +1,86 @@
+"""
+Tests para controlador_precarga.py
+Cola de precarga de módulos pesados por prioridad
+"""
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_precarga import (
+    ColaPrecarga, TAREAS_PRECARGA, ESTADO_LISTO, ESTADO_NO_DISPONIBLE, ESTADO_ERROR
+)
+
+
+class TestColaPrecarga:
+    """Tests para ColaPrecarga"""
+
+    def _cola(self, ejecutados, nombres=("fitz", "docx", "openpyxl")):
+        return ColaPrecarga([(nombre, lambda nombre=nombre: ejecutados.append(nombre), False)
+                             for nombre in nombres])
+
+    @pytest.mark.unit
+    def test_orden_por_prioridad(self):
+        ejecutados = []
+        cola = self._cola(ejecutados)
+
+        cola.ejecutar_pendientes()
+
+        assert ejecutados == ["fitz", "docx", "openpyxl"]
+        assert [nombre for nombre, _, _ in TAREAS_PRECARGA][:2] == ["fitz", "docx"]
+
+    @pytest.mark.unit
+    def test_modulo_pedido_pasa_al_principio(self):
+        ejecutados = []
+        cola = self._cola(ejecutados)
+        avisos = []
+
+        assert cola.siguiente() == "fitz"
+        cola.priorizar("fitz")  # en curso: no se vuelve a encolar
+        cola.priorizar("openpyxl")
+        cola.precargar("fitz")
+        cola.ejecutar_pendientes(lambda *aviso: avisos.append(aviso))
+
+        assert ejecutados == ["fitz", "openpyxl", "docx"]
+        assert avisos == [("openpyxl", True, ""), ("docx", True, "")]
+
+    @pytest.mark.unit
+    def test_modulo_ya_precargado_no_se_repite(self):
+        ejecutados = []
+        cola = self._cola(ejecutados)
+        cola.ejecutar_pendientes()
+
+        cola.priorizar("docx")
+        assert not cola.hay_pendientes()
+        assert cola.precargar("docx") == (ESTADO_LISTO, "")
+        assert ejecutados == ["fitz", "docx", "openpyxl"]
+
+    @pytest.mark.unit
+    def test_vaciar_y_volver_a_encolar(self):
+        ejecutados = []
+        cola = self._cola(ejecutados)
+
+        cola.vaciar()
+        cola.priorizar("docx")
+        cola.ejecutar_pendientes()
+
+        assert ejecutados == ["docx"]
+
+    @pytest.mark.unit
+    def test_estados_y_resumen(self):
+        def _falla():
+            raise RuntimeError("sin memoria")
+
+        def _no_instalado():
+            raise ImportError("No module named 'pandas'")
+
+        cola = ColaPrecarga([("fitz", lambda: None, False), ("docx", _falla, False),
+                             ("pandas", _no_instalado, True)])
+        cola.ejecutar_pendientes()
+
+        resumen = cola.resumen()
+        assert [resumen[n]['estado'] for n in ("fitz", "docx", "pandas")] == [
+            ESTADO_LISTO, ESTADO_ERROR, ESTADO_NO_DISPONIBLE]
+        assert resumen["docx"]['error'] == "sin memoria"
+        assert all(datos['segundos'] >= 0 for datos in resumen.values())
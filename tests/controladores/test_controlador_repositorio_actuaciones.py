@@ -0,0 +1,137 @@
+"""
+Tests para controlador_repositorio_actuaciones.py
+Almacén por contrato de actuaciones y facturas con diario de operaciones
+"""
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores import controlador_repositorio_actuaciones
+from controladores.controlador_repositorio_actuaciones import RepositorioActuacionesFacturas, eliminar_almacen_contrato
+
+
+class TestRepositorioActuacionesFacturas:
+    """Tests para RepositorioActuacionesFacturas"""
+
+    @pytest.fixture
+    def carpeta(self):
+        temp_dir = tempfile.mkdtemp()
+        yield os.path.join(temp_dir, "actuaciones_facturas")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _lineas_diario(self, repositorio):
+        if not os.path.exists(repositorio.archivo_diario):
+            return []
+        with open(repositorio.archivo_diario, encoding="utf-8") as f:
+            return [json.loads(linea) for linea in f]
+
+    @pytest.mark.unit
+    def test_siembra_desde_base_datos_una_sola_vez(self, carpeta):
+        obra = {"nombreObra": "Obra 1", "actuaciones": [{"id": "a1", "actuacion": "Desbroce"}],
+                "facturas": [{"id": "f1", "importe": 10.0}]}
+
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1", obra)
+        assert [a["id"] for a in repositorio.filas("actuaciones")] == ["a1"]
+        assert os.path.exists(repositorio.archivo)
+
+        # Ya tiene instantánea: lo que diga BaseDatos.json después no cuenta
+        otra = RepositorioActuacionesFacturas(carpeta, "Obra 1", {"actuaciones": [], "facturas": []})
+        assert [f["id"] for f in otra.filas("facturas")] == ["f1"]
+
+    @pytest.mark.unit
+    def test_operaciones_por_fila_se_anaden_al_diario(self, carpeta):
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+        tamano_instantanea = os.path.getsize(repositorio.archivo)
+
+        primera = {"id": "20240101_100000", "actuacion": "A"}
+        segunda = {"id": "20240101_100000", "actuacion": "B"}  # mismo segundo de creación
+        assert repositorio.insertar("actuaciones", primera) == "20240101_100000"
+        assert repositorio.insertar("actuaciones", segunda) == "20240101_100000_2"
+        assert repositorio.actualizar("actuaciones", {"id": "20240101_100000", "actuacion": "A2"})
+        assert repositorio.borrar("actuaciones", "20240101_100000_2")
+        assert not repositorio.borrar("actuaciones", "no-existe")
+
+        assert os.path.getsize(repositorio.archivo) == tamano_instantanea  # no se reescribe
+        assert [(op["n"], op["op"]) for op in self._lineas_diario(repositorio)] == [
+            (1, "insertar"), (2, "insertar"), (3, "actualizar"), (4, "borrar")]
+
+        recargado = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+        assert recargado.filas("actuaciones") == [{"id": "20240101_100000", "actuacion": "A2"}]
+        assert recargado.pendiente
+
+    @pytest.mark.unit
+    def test_compacta_al_llegar_al_limite(self, carpeta, monkeypatch):
+        monkeypatch.setattr(controlador_repositorio_actuaciones, "LIMITE_DIARIO", 3)
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+
+        for i in range(4):
+            repositorio.insertar("facturas", {"id": f"f{i}", "importe": i})
+
+        assert len(self._lineas_diario(repositorio)) == 1
+        with open(repositorio.archivo, encoding="utf-8") as f:
+            instantanea = json.load(f)
+        assert instantanea["secuencia"] == 3 and len(instantanea["facturas"]) == 3
+        assert len(RepositorioActuacionesFacturas(carpeta, "Obra 1").filas("facturas")) == 4
+
+    @pytest.mark.unit
+    def test_diario_ya_compactado_y_linea_cortada(self, carpeta):
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+        repositorio.insertar("facturas", {"id": "f1"})
+        repositorio.insertar("facturas", {"id": "f2"})
+        with open(repositorio.archivo_diario, encoding="utf-8") as f:
+            diario = f.read()
+        repositorio.compactar()
+        # Compactación cortada antes de borrar el diario, más una operación a medio escribir
+        with open(repositorio.archivo_diario, "w", encoding="utf-8") as f:
+            f.write(diario + '{"n": 3, "op": "borr')
+
+        recargado = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+
+        assert [f["id"] for f in recargado.filas("facturas")] == ["f1", "f2"]
+        assert not os.path.exists(recargado.archivo_diario)  # se compactó al cargar
+        recargado.borrar("facturas", "f1")
+        assert [f["id"] for f in RepositorioActuacionesFacturas(carpeta, "Obra 1").filas("facturas")] == ["f2"]
+
+    @pytest.mark.unit
+    def test_contratos_separados_e_ids_repetidos(self, carpeta):
+        obra = {"actuaciones": [{"id": "x", "n": 1}, {"id": "x", "n": 2}, {"n": 3}]}
+
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra/2 ñ", obra)
+        RepositorioActuacionesFacturas(carpeta, "Obra 3").insertar("actuaciones", {"id": "y"})
+
+        assert [a["id"] for a in repositorio.filas("actuaciones")] == ["x", "x_2", "fila"]
+        assert os.path.basename(repositorio.archivo).startswith("Obra_2_ñ_")
+        assert len([n for n in os.listdir(carpeta) if n.endswith(".json")]) == 2
+
+    @pytest.mark.unit
+    def test_compactar_con_cambios_avisa_para_base_datos(self, carpeta):
+        avisos = []
+        obra = {"actuaciones": [{"id": "a1"}], "facturas": []}
+        al_compactar = lambda clave, tablas: avisos.append((clave, [a["id"] for a in tablas["actuaciones"]]))
+
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1", obra, al_compactar)
+        repositorio.compactar()
+        assert avisos == []  # sembrado desde BaseDatos.json: nada que copiar
+
+        repositorio.insertar("actuaciones", {"id": "a2"})
+        repositorio.compactar()
+        repositorio.compactar()
+        assert avisos == [("Obra 1", ["a1", "a2"])]
+
+    @pytest.mark.unit
+    def test_eliminar_almacen_con_su_contrato(self, carpeta):
+        repositorio = RepositorioActuacionesFacturas(carpeta, "Obra 1")
+        repositorio.insertar("facturas", {"id": "f1"})
+
+        assert eliminar_almacen_contrato(carpeta, "Obra 1")
+        assert not eliminar_almacen_contrato(carpeta, "Obra 1")
+        repositorio.cerrar()  # el contrato abierto no vuelve a crearlo al dejarlo
+        assert os.listdir(carpeta) == []
+
+        nuevo = RepositorioActuacionesFacturas(carpeta, "Obra 1", {"facturas": [{"id": "f9"}]})
+        assert [f["id"] for f in nuevo.filas("facturas")] == ["f9"]
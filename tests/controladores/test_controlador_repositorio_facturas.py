@@ -0,0 +1,138 @@
+"""
+Tests para controlador_repositorio_facturas.py
+Repositorio en memoria de las facturas directas
+"""
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_repositorio_facturas import RepositorioFacturasDirectas, datos_iniciales
+
+
+class TestRepositorioFacturasDirectas:
+    """Tests para RepositorioFacturasDirectas"""
+
+    @pytest.fixture
+    def archivo(self):
+        temp_dir = tempfile.mkdtemp()
+        archivo = os.path.join(temp_dir, "facturas_directas.json")
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos_iniciales(), f, ensure_ascii=False, indent=4)
+        yield archivo
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def repositorio(self, archivo):
+        return RepositorioFacturasDirectas(archivo)
+
+    def _leer(self, archivo):
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @pytest.mark.unit
+    def test_agregar_asigna_ids_y_guarda(self, repositorio, archivo):
+        assert repositorio.agregar({"empresa": "A"}) == 1
+        assert repositorio.agregar({"empresa": "B", "id": 99}) == 2
+
+        datos = self._leer(archivo)
+        assert [f["id"] for f in datos["facturas"]] == [1, 2]
+        assert list(datos["facturas"][0]) == ["id", "empresa"]
+        assert datos["configuracion"]["ultimo_id"] == 2
+        assert not os.path.exists(archivo + ".tmp")
+
+    @pytest.mark.unit
+    def test_lote_escribe_una_sola_vez(self, repositorio, archivo):
+        for empresa in ("A", "B", "C"):
+            repositorio.agregar({"empresa": empresa})
+
+        with patch('controladores.controlador_repositorio_facturas.os.replace',
+                   wraps=os.replace) as reemplazos:
+            with repositorio.lote():
+                for factura_id in (1, 2, 3):
+                    assert repositorio.modificar(factura_id, {"estado": "Pagada"})
+                with repositorio.lote():
+                    repositorio.modificar(1, {"estado": "Tramitada"})
+                assert self._leer(archivo)["facturas"][0].get("estado") is None
+                assert repositorio.pendiente
+
+        assert reemplazos.call_count == 1
+        assert [f["estado"] for f in self._leer(archivo)["facturas"]] == ["Tramitada", "Pagada", "Pagada"]
+
+    @pytest.mark.unit
+    def test_recarga_si_el_archivo_cambia(self, repositorio, archivo):
+        repositorio.agregar({"empresa": "A"})
+
+        datos = self._leer(archivo)
+        datos["facturas"].append({"id": 7, "empresa": "Externa", "activa": True})
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2)
+
+        assert [f["empresa"] for f in repositorio.facturas_activas()] == ["A", "Externa"]
+        assert repositorio.obtener(7)["empresa"] == "Externa"
+
+    @pytest.mark.unit
+    def test_modificar_solo_activas(self, repositorio):
+        repositorio.agregar({"empresa": "A"})
+        repositorio.modificar(1, {"activa": False})
+
+        assert not repositorio.modificar(1, {"estado": "Pagada"}, solo_activas=True)
+        assert not repositorio.modificar(42, {"estado": "Pagada"})
+        assert repositorio.facturas_activas() == []
+        assert repositorio.obtener(1).get("estado") is None
+
+    @pytest.mark.unit
+    def test_las_lecturas_devuelven_copias(self, repositorio):
+        repositorio.agregar({"empresa": "A"})
+
+        repositorio.facturas_activas()[0]["empresa"] = "cambiada"
+        repositorio.datos()["facturas"][0]["empresa"] = "cambiada"
+
+        assert repositorio.obtener(1)["empresa"] == "A"
+
+    @pytest.mark.unit
+    def test_error_al_guardar_deshace_el_cambio(self, repositorio):
+        repositorio.agregar({"empresa": "A", "estado": "Emitida"})
+
+        with patch('controladores.controlador_repositorio_facturas.os.replace', side_effect=OSError("disco lleno")):
+            assert not repositorio.modificar(1, {"estado": "Pagada", "fecha_modificacion_estado": "hoy"})
+            assert repositorio.agregar({"empresa": "B"}) == 0
+
+        assert repositorio.obtener(1) == {"id": 1, "empresa": "A", "estado": "Emitida"}
+        assert repositorio.ultimo_id() == 1
+
+    @pytest.mark.unit
+    def test_generacion_cambia_al_recargar_o_reemplazar(self, repositorio, archivo):
+        generacion = repositorio.generacion()
+        repositorio.agregar({"empresa": "A"})
+        assert repositorio.generacion() == generacion
+
+        datos = self._leer(archivo)
+        datos["facturas"].append({"id": 7, "empresa": "Externa"})
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2)
+        assert repositorio.generacion() > generacion
+
+        generacion = repositorio.generacion()
+        repositorio.reemplazar(repositorio.datos())
+        assert repositorio.generacion() > generacion
+
+    @pytest.mark.unit
+    def test_agregar_lote(self, repositorio, archivo):
+        repositorio.agregar({"empresa": "A"})
+
+        with patch('controladores.controlador_repositorio_facturas.os.replace',
+                   wraps=os.replace) as reemplazos:
+            assert repositorio.agregar_lote([{"empresa": "B", "id": 50}, {"empresa": "C"}]) == [2, 3]
+        assert reemplazos.call_count == 1
+        assert self._leer(archivo)["configuracion"]["ultimo_id"] == 3
+
+        with patch('controladores.controlador_repositorio_facturas.os.replace', side_effect=OSError("disco lleno")):
+            assert repositorio.agregar_lote([{"empresa": "D"}]) == []
+        assert repositorio.ultimo_id() == 3
+        assert [f["empresa"] for f in repositorio.todas()] == ["A", "B", "C"]
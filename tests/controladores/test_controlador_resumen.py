@@ -514,6 +514,53 @@ class TestTrackerDocumentos:
         assert "Documento de prueba" in html
         assert "📋" in html  # Icono de contrato
     
+    def test_generar_reporte_html_reutiliza_cache(self, tracker, sample_documento):
+        """Test que un reporte sin cambios se sirve desde la cache"""
+        tracker.documentos["test_contrato"] = [sample_documento]
+        
+        html1 = tracker.generar_reporte_html("test_contrato")
+        with patch.object(tracker, '_renderizar_fragmento_html') as mock_render:
+            html2 = tracker.generar_reporte_html("test_contrato")
+        
+        assert html1 == html2
+        mock_render.assert_not_called()
+    
+    def test_generar_reporte_html_solo_renderiza_documentos_cambiados(self, tracker, sample_documento):
+        """Test que solo se re-renderiza la fila del documento que cambia de estado"""
+        otro = DocumentoGenerado(
+            id="doc456",
+            tipo=TipoDocumento.INVITACION,
+            nombre="Invitacion Test",
+            ruta_archivo="/path/invitacion.docx",
+            fecha_generacion=datetime(2024, 1, 16, 9, 0),
+            estado=EstadoDocumento.GENERANDO,
+            tamano_kb=0.0
+        )
+        tracker.documentos["test_contrato"] = [sample_documento, otro]
+        tracker.generar_reporte_html("test_contrato")
+        
+        otro.estado = EstadoDocumento.ERROR
+        otro.observaciones = "Error: plantilla no encontrada"
+        render_original = tracker._renderizar_fragmento_html
+        with patch.object(tracker, '_renderizar_fragmento_html', side_effect=render_original) as mock_render:
+            html = tracker.generar_reporte_html("test_contrato")
+        
+        assert mock_render.call_count == 1
+        assert mock_render.call_args[0][0] is otro
+        assert "ERROR" in html
+        assert "plantilla no encontrada" in html
+        assert "Contrato Test" in html
+    
+    def test_cargar_historial_invalida_cache_html(self, tracker, sample_documento):
+        """Test que recargar el historial descarta el HTML cacheado"""
+        tracker.documentos["test_contrato"] = [sample_documento]
+        tracker.generar_reporte_html("test_contrato")
+        
+        tracker.cargar_historial()
+        
+        assert tracker._cache_fragmentos_html == {}
+        assert tracker._cache_reportes_html == {}
+    
     def test_buscar_documento_existente(self, tracker, sample_documento):
         """Test buscar documento existente"""
         tracker.documentos["test_contrato"] = [sample_documento]
@@ -808,10 +855,9 @@ class TestIntegradorResumen:
         integrador._agregar_cronograma_visual()
     
     def test_actualizar_cronograma_visual_con_datos(self, integrador):
-        """Test actualizar cronograma visual con datos"""
+        """Test que el cronograma se construye una vez y se actualiza en su sitio"""
         mock_view = Mock(spec=QGraphicsView)
-        mock_scene = Mock(spec=QGraphicsScene)
-        mock_view.scene.return_value = mock_scene
+        mock_view.scene.return_value = None
         integrador.main_window.findChild = Mock(return_value=mock_view)
         
         # Simular datos en cache
@@ -823,26 +869,27 @@ class TestIntegradorResumen:
         }
         integrador._firmantes_unicos_cache = ['Firmante 1']
         
-        with patch.object(integrador, '_dibujar_timeline_firmas') as mock_dibujar:
+        with patch('controladores.controlador_resumen.CronogramaFirmas') as mock_cronograma:
+            integrador._actualizar_cronograma_visual("contrato_test")
+            mock_view.scene.return_value = mock_cronograma.return_value.scene
             integrador._actualizar_cronograma_visual("contrato_test")
             
-            mock_scene.clear.assert_called()
-            mock_dibujar.assert_called_once()
+            mock_cronograma.assert_called_once()
+            assert mock_cronograma.return_value.actualizar.call_count == 2
+            mock_view.setScene.assert_called_once_with(mock_cronograma.return_value.scene)
     
     def test_actualizar_cronograma_visual_sin_datos(self, integrador):
         """Test actualizar cronograma visual sin datos"""
         mock_view = Mock(spec=QGraphicsView)
-        mock_scene = Mock(spec=QGraphicsScene)
-        mock_view.scene.return_value = mock_scene
         integrador.main_window.findChild = Mock(return_value=mock_view)
         
         # Sin datos en cache
         integrador._datos_firmas_cache = {}
         
-        integrador._actualizar_cronograma_visual("contrato_test")
-        
-        mock_scene.clear.assert_called()
-        mock_scene.addText.assert_called()
+        with patch('controladores.controlador_resumen.CronogramaFirmas') as mock_cronograma:
+            integrador._actualizar_cronograma_visual("contrato_test")
+            
+            mock_cronograma.return_value.actualizar.assert_called_once_with({})
     
     def test_dibujar_timeline_firmas(self, integrador):
         """Test dibujar timeline de firmas"""
@@ -867,6 +914,67 @@ class TestIntegradorResumen:
         assert mock_scene.addText.call_count >= 2  # Títulos y leyenda
 
 
+class TestCronogramaFirmas:
+    """Tests para el modelo del cronograma de firmas"""
+    
+    def test_modelo_fase(self):
+        """Test estado visual de cada fase"""
+        from controladores.controlador_resumen import modelo_fase_cronograma
+        
+        assert modelo_fase_cronograma('INICIO', None)[0] == 'pendiente'
+        assert modelo_fase_cronograma('INICIO', {'fecha_creacion': '15/01/2024'})[0] == 'documento'
+        estado, titulo, detalle = modelo_fase_cronograma('INICIO', {'firmas': [{'fecha': '16/01/2024'}]})
+        assert estado == 'firmado'
+        assert titulo.startswith('INICIO')
+        assert '1 firmante(s)' in detalle
+    
+    def test_actualizar_solo_fases_cambiadas(self):
+        """Test que actualizar no reconstruye la escena y solo toca las fases cambiadas"""
+        from controladores.controlador_resumen import CronogramaFirmas
+        scene = MagicMock()
+        cronograma = CronogramaFirmas(scene)
+        elementos_creados = scene.addRect.call_count + scene.addText.call_count
+        datos = {'INICIO': {'fecha_creacion': '15/01/2024', 'firmas': [{'fecha': '16/01/2024'}]}}
+        
+        assert cronograma.actualizar(datos) == 1
+        assert cronograma.actualizar(datos) == 0
+        assert scene.addRect.call_count + scene.addText.call_count == elementos_creados
+        scene.clear.assert_not_called()
+    
+    def test_cronograma_datos_de_otro_contrato(self):
+        """Test que los datos de firmas de otro contrato no se pintan"""
+        integrador = IntegradorResumen(Mock())
+        integrador.main_window.findChild = Mock(return_value=Mock())
+        integrador._datos_firmas_cache = {'INICIO': {'firmas': [{'fecha': '16/01/2024'}]}}
+        integrador._contrato_datos_firmas = "otro_contrato"
+        
+        with patch('controladores.controlador_resumen.CronogramaFirmas') as mock_cronograma:
+            integrador._actualizar_cronograma_visual("contrato_test")
+            
+            mock_cronograma.return_value.actualizar.assert_called_once_with(None)
+        
+        # Con los datos ya del contrato mostrado, el cronograma cacheado se actualiza con ellos
+        integrador._contrato_datos_firmas = "contrato_test"
+        cronograma = integrador._cronogramas["contrato_test"]
+        integrador._actualizar_cronograma_visual("contrato_test")
+        cronograma.actualizar.assert_called_with(integrador._datos_firmas_cache)
+    
+    def test_cache_cronogramas_lru(self):
+        """Test que solo se conservan los cronogramas de los últimos contratos"""
+        integrador = IntegradorResumen(Mock())
+        with patch('controladores.controlador_resumen.CronogramaFirmas', side_effect=lambda: Mock()):
+            for i in range(IntegradorResumen.MAX_CRONOGRAMAS_CACHE + 2):
+                integrador._obtener_cronograma(f"contrato_{i}")
+            reutilizado = integrador._cronogramas["contrato_2"]
+            assert integrador._obtener_cronograma("contrato_2") is reutilizado
+            integrador._obtener_cronograma("contrato_nuevo")
+        
+        assert len(integrador._cronogramas) == IntegradorResumen.MAX_CRONOGRAMAS_CACHE
+        assert "contrato_2" in integrador._cronogramas
+        assert "contrato_3" not in integrador._cronogramas
+        assert list(integrador._cronogramas)[-1] == "contrato_nuevo"
+
+
 @pytest.mark.integration
 class TestIntegrationResumen:
     """Tests de integración para el sistema de resumen"""
@@ -0,0 +1,56 @@
+"""
+Tests para controlador_transferencias_pdf.py
+Tareas de la cola de copias de PDFs
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_almacen_pdf import AlmacenPDF
+from controladores.controlador_transferencias_pdf import TareaTransferencia
+
+
+class TestTareaTransferencia:
+    """Tests para TareaTransferencia"""
+
+    @pytest.fixture
+    def directorio(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _pdf(self, directorio, nombre, contenido):
+        ruta = os.path.join(directorio, nombre)
+        with open(ruta, "wb") as f:
+            f.write(contenido)
+        return ruta
+
+    @pytest.mark.unit
+    def test_ejecutar_copia_y_avisa(self, directorio):
+        raiz = os.path.join(directorio, "proyecto")
+        tarea = TareaTransferencia(AlmacenPDF(raiz), self._pdf(directorio, "acta.pdf", b"12345"),
+                                   os.path.join(raiz, "08-actuaciones"))
+        avisos = []
+
+        assert tarea.tamano == 5
+        assert tarea.ejecutar(avisos.append) is True
+        assert tarea.destino == os.path.join(raiz, "08-actuaciones", "acta.pdf")
+        assert avisos == [5]
+        assert (tarea.error, tarea.cancelada) == ("", False)
+
+    @pytest.mark.unit
+    def test_cancelada_y_error(self, directorio):
+        raiz = os.path.join(directorio, "pdfs")
+        almacen = AlmacenPDF(raiz)
+        cancelada = TareaTransferencia(almacen, self._pdf(directorio, "a.pdf", b"a"), raiz, "1.pdf")
+        inexistente = TareaTransferencia(almacen, os.path.join(directorio, "no.pdf"), raiz)
+
+        assert cancelada.ejecutar(cancelado=lambda: True) is False
+        assert cancelada.cancelada and not cancelada.destino and not cancelada.error
+        assert not os.path.exists(os.path.join(raiz, "1.pdf"))
+        assert inexistente.ejecutar() is False
+        assert "no existe" in inexistente.error and inexistente.tamano == 0
@@ -0,0 +1,111 @@
+"""
+Tests para controlador_vinculos_campos.py
+Registro de campos del contrato vinculados a sus widgets
+"""
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from controladores.controlador_vinculos_campos import AdaptadorCampo, RegistroCampos
+
+
+class WidgetFalso:
+    def __init__(self, nombre, padre=None, valor=''):
+        self.nombre = nombre
+        self.padre = padre
+        self.valor = valor
+        self.escrituras = 0
+
+    def objectName(self):
+        return self.nombre
+
+
+def _escribir(widget, valor):
+    widget.valor = valor
+    widget.escrituras += 1
+
+
+TEXTO = AdaptadorCampo(lambda widget, valor: str(valor), lambda widget: widget.valor, _escribir,
+                       lambda widget: widget.valor.strip())
+SOLO_LECTURA = AdaptadorCampo(None, lambda widget: widget.valor, _escribir, lambda widget: widget.valor)
+
+
+class TestRegistroCampos:
+    """Tests para RegistroCampos"""
+
+    @pytest.fixture
+    def ventana(self):
+        inicio, actas = WidgetFalso('pagina_inicio'), WidgetFalso('pagina_actas')
+        widgets = {
+            'nombreObra': WidgetFalso('nombreObra', inicio),
+            'basePresupuesto': WidgetFalso('basePresupuesto', actas, valor='1212.00'),
+            'comboBox': WidgetFalso('comboBox', valor='c1'),
+            'qt_spinbox_lineedit': WidgetFalso('qt_spinbox_lineedit', actas),
+            'sin_nombre': WidgetFalso('', actas),
+        }
+        paginas = {inicio: 'Inicio', actas: 'ActasGenerales', WidgetFalso('pagina_facturas'): 'Facturas'}
+        return widgets, paginas
+
+    @pytest.fixture
+    def registro(self, ventana):
+        widgets, paginas = ventana
+        return RegistroCampos.construir(
+            widgets.values(), paginas, lambda widget: widget.padre,
+            lambda widget: SOLO_LECTURA if widget.nombre == 'comboBox' else TEXTO
+        )
+
+    @pytest.mark.unit
+    def test_construir_agrupa_por_pestana(self, registro):
+        assert len(registro) == 3
+        assert [c.nombre for c in registro.campos(['Inicio'])] == ['nombreObra']
+        assert [c.nombre for c in registro.campos([None])] == ['comboBox']
+        assert registro.campos(['Facturas']) == []
+        assert registro.campo('basePresupuesto').pestana == 'ActasGenerales'
+        assert registro.claves_pestanas == ['Inicio', 'ActasGenerales', 'Facturas']
+
+    @pytest.mark.unit
+    def test_cargar_solo_escribe_los_valores_distintos(self, registro, ventana):
+        widgets, _ = ventana
+
+        cambiados = registro.cargar({'nombreObra': 'c2', 'basePresupuesto': '1212.00'})
+
+        assert [c.nombre for c in cambiados] == ['nombreObra']
+        assert widgets['basePresupuesto'].escrituras == 0
+        assert widgets['nombreObra'].valor == 'c2'
+
+    @pytest.mark.unit
+    def test_campo_ausente_se_vacia(self, registro, ventana):
+        widgets, _ = ventana
+
+        registro.cargar({}, ['ActasGenerales'])
+
+        assert widgets['basePresupuesto'].valor == ''
+        assert widgets['nombreObra'].escrituras == 0
+
+    @pytest.mark.unit
+    def test_tipo_sin_carga_no_se_toca(self, registro, ventana):
+        widgets, _ = ventana
+
+        registro.cargar({'comboBox': 'otro'})
+
+        assert widgets['comboBox'].valor == 'c1'
+        assert registro.campo('comboBox').extraer() == 'c1'
+
+    @pytest.mark.unit
+    def test_error_en_un_campo_no_detiene_la_carga(self, ventana):
+        widgets, paginas = ventana
+
+        def falla(widget, valor):
+            raise ValueError("valor inválido")
+
+        roto = AdaptadorCampo(falla, lambda widget: widget.valor, _escribir, lambda widget: widget.valor)
+        registro = RegistroCampos.construir(
+            widgets.values(), paginas, lambda widget: widget.padre,
+            lambda widget: roto if widget.nombre == 'nombreObra' else TEXTO
+        )
+
+        cambiados = registro.cargar({'basePresupuesto': '10'})
+
+        assert [c.nombre for c in cambiados] == ['basePresupuesto', 'comboBox']
@@ -0,0 +1,134 @@
+"""
+Tests para firmas.py
+Ruta rápida por /ByteRange frente al lector completo de PyPDF2
+"""
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import firmas
+from firmas import obtener_firmas_pdf, _obtener_firmas_byterange, _obtener_firmas_reader
+
+
+def _crear_pdf_firmado(ruta, fechas, relleno=0):
+    """PDF mínimo con un campo /Sig por fecha, /ByteRange coherente y xref válida"""
+    num_firmas = len(fechas)
+    campos = " ".join(f"{4 + 2 * i} 0 R" for i in range(num_firmas))
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R /AcroForm << /Fields [" + campos.encode() + b"] /SigFlags 3 >> >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+    ]
+    for i, fecha in enumerate(fechas):
+        objetos.append(f"<< /FT /Sig /T (Firma{i}) /V {5 + 2 * i} 0 R >>".encode())
+        objetos.append(
+            b"<< /Type /Sig /Filter /Adobe.PPKLite /SubFilter /adbe.pkcs7.detached "
+            b"/ByteRange [0000000000 0000000000 0000000000 0000000000] "
+            b"/Contents <" + b"30" * 16 + b"> /M (D:" + fecha.encode() + b"+01'00') >>"
+        )
+
+    contenido = bytearray(b"%PDF-1.7\n% relleno " + b"x" * relleno + b"\n")
+    offsets = []
+    for numero, objeto in enumerate(objetos, 1):
+        offsets.append(len(contenido))
+        contenido += f"{numero} 0 obj\n".encode() + objeto + b"\nendobj\n"
+    inicio_xref = len(contenido)
+    contenido += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        contenido += f"{offset:010d} 00000 n \n".encode()
+    contenido += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n".encode()
+
+    # Rellenar cada /ByteRange con el hueco real de su /Contents (mismo ancho de campo)
+    posicion = contenido.find(b"/ByteRange")
+    while posicion >= 0:
+        inicio_contents = contenido.find(b"<", contenido.find(b"/Contents", posicion))
+        fin_contents = contenido.find(b">", inicio_contents) + 1
+        valores = (0, inicio_contents, fin_contents, len(contenido) - fin_contents)
+        rango = "[" + " ".join(f"{v:010d}" for v in valores) + "]"
+        inicio_rango = contenido.find(b"[", posicion)
+        contenido[inicio_rango:inicio_rango + len(rango)] = rango.encode()
+        posicion = contenido.find(b"/ByteRange", posicion + 1)
+
+    with open(ruta, 'wb') as f:
+        f.write(bytes(contenido))
+    return ruta
+
+
+class TestFirmasByteRange:
+    """Tests para la ruta rápida de extracción de firmas"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture(autouse=True)
+    def firmante_fijo(self):
+        with patch.object(firmas, 'extract_name_from_cert', return_value="JUAN PEREZ GARCIA"):
+            yield
+
+    @pytest.mark.unit
+    def test_ruta_rapida_coincide_con_pypdf2(self, temp_dir):
+        """Test que ambas rutas devuelven las mismas firmas"""
+        ruta = _crear_pdf_firmado(os.path.join(temp_dir, "acta.pdf"), ["20240115103000", "20240116090000"])
+
+        rapidas = _obtener_firmas_byterange(ruta)
+
+        assert rapidas == _obtener_firmas_reader(ruta)
+        assert [f['fecha'] for f in rapidas] == ["15/01/2024 10:30:00", "16/01/2024 09:00:00"]
+
+    @pytest.mark.unit
+    def test_xref_clasica_localiza_firmas(self, temp_dir):
+        """Test que con xref clásica las firmas se localizan por los offsets de objeto"""
+        import mmap
+        ruta = _crear_pdf_firmado(os.path.join(temp_dir, "acta.pdf"), ["20240115103000"])
+
+        with open(ruta, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                offsets = firmas._offsets_objetos_xref(datos)
+                posiciones = firmas._posiciones_byterange(datos)
+
+        assert len(offsets) == 5
+        assert len(posiciones) == 1
+
+    @pytest.mark.unit
+    def test_pdf_sin_firmas(self, temp_dir):
+        ruta = _crear_pdf_firmado(os.path.join(temp_dir, "acta.pdf"), [])
+
+        assert _obtener_firmas_byterange(ruta) == []
+
+    @pytest.mark.unit
+    def test_byterange_incoherente_usa_lector_completo(self, temp_dir):
+        """Test que un /ByteRange que no apunta al /Contents activa el respaldo"""
+        ruta = os.path.join(temp_dir, "roto.pdf")
+        with open(ruta, 'wb') as f:
+            f.write(b"%PDF-1.4\n1 0 obj\n<< /ByteRange [0 5 10 5] /Contents <00> >>\nendobj\n")
+
+        assert _obtener_firmas_byterange(ruta) is None
+        with patch.object(firmas, '_obtener_firmas_reader', return_value=[]) as mock_reader:
+            assert obtener_firmas_pdf(ruta) == []
+        mock_reader.assert_called_once_with(ruta, False)
+
+    @pytest.mark.unit
+    def test_archivo_no_pdf_usa_lector_completo(self, temp_dir):
+        ruta = os.path.join(temp_dir, "vacio.pdf")
+        open(ruta, 'wb').close()
+
+        assert _obtener_firmas_byterange(ruta) is None
+
+    @pytest.mark.slow
+    def test_benchmark_pdf_grande(self, temp_dir):
+        """Benchmark en un acta firmada de varios MB"""
+        ruta = _crear_pdf_firmado(os.path.join(temp_dir, "grande.pdf"), ["20240115103000"],
+                                  relleno=8 * 1024 * 1024)
+
+        resultado = firmas.benchmark_firmas([ruta], repeticiones=2)[0]
+
+        assert resultado['coinciden']
+        assert resultado['tamano_mb'] > 8
@@ -25,7 +25,8 @@ from helpers_py import (
     validar_datos_empresa, validar_oferta_economica,
     limpiar_nombre_archivo, formatear_numero_espanol,
     resource_path, get_ui_file_path, crear_copia_respaldo_proyecto,
-    setup_ui_with_new_structure, abrir_archivo
+    setup_ui_with_new_structure, abrir_archivo,
+    cargar_ui, ui_compilada_vigente, get_ruta_ui_compilada, calcular_hash_ui, CABECERA_HASH_UI
 )
 
 
@@ -424,6 +425,96 @@ class TestSetupUI:
         sys.modules['PyQt5'].uic.loadUi.side_effect = None
 
 
+class TestUICompilada:
+    """Tests para la carga de la interfaz compilada con pyuic5"""
+
+    @pytest.fixture
+    def ui_path(self):
+        temp_dir = tempfile.mkdtemp()
+        ui_path = os.path.join(temp_dir, "ventana.ui")
+        with open(ui_path, 'w', encoding='utf-8') as f:
+            f.write("<ui version=\"4.0\"></ui>")
+        yield ui_path
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _escribir_compilada(self, ui_path, hash_ui):
+        with open(get_ruta_ui_compilada(ui_path), 'w', encoding='utf-8') as f:
+            f.write(f"{CABECERA_HASH_UI}{hash_ui}\n")
+            f.write("class Ui_MainWindow(object):\n"
+                    "    def setupUi(self, MainWindow):\n"
+                    "        MainWindow.construida = True\n"
+                    "        self.botonGuardar = 'boton'\n")
+
+    @pytest.mark.unit
+    def test_ruta_compilada(self):
+        assert get_ruta_ui_compilada(os.path.join("ui", "actas.ui")) == os.path.join("ui", "actas_ui.py")
+
+    @pytest.mark.unit
+    def test_vigente_solo_con_el_hash_del_ui_actual(self, ui_path):
+        assert not ui_compilada_vigente(ui_path)
+
+        self._escribir_compilada(ui_path, calcular_hash_ui(ui_path))
+        assert ui_compilada_vigente(ui_path)
+
+        with open(ui_path, 'a', encoding='utf-8') as f:
+            f.write("<!-- cambio -->")
+        assert not ui_compilada_vigente(ui_path)
+
+    @pytest.mark.unit
+    def test_cargar_compilada_expone_widgets_en_la_ventana(self, ui_path):
+        self._escribir_compilada(ui_path, calcular_hash_ui(ui_path))
+        ventana = Mock()
+
+        with patch.object(sys.modules['PyQt5'].uic, 'loadUi') as mock_load_ui:
+            assert cargar_ui(ventana, ui_path) == "compilada"
+
+        mock_load_ui.assert_not_called()
+        assert ventana.construida is True
+        assert ventana.botonGuardar == 'boton'
+
+    @pytest.mark.unit
+    def test_modulo_compilado_roto_usa_load_ui(self, ui_path):
+        with open(get_ruta_ui_compilada(ui_path), 'w', encoding='utf-8') as f:
+            f.write(f"{CABECERA_HASH_UI}{calcular_hash_ui(ui_path)}\n")
+            f.write("class Ui_MainWindow(object):\n    def setupUi(self, MainWindow)\n")
+        ventana = Mock()
+
+        with patch.object(sys.modules['PyQt5'].uic, 'loadUi') as mock_load_ui, \
+                patch('helpers_py._recompilar_ui_en_segundo_plano'):
+            assert cargar_ui(ventana, ui_path) == "loadUi"
+
+        mock_load_ui.assert_called_once_with(ui_path, ventana)
+
+    @pytest.mark.unit
+    def test_error_en_setup_ui_no_repite_con_load_ui(self, ui_path):
+        """Test que una ventana a medio construir no se vuelve a rellenar con loadUi"""
+        with open(get_ruta_ui_compilada(ui_path), 'w', encoding='utf-8') as f:
+            f.write(f"{CABECERA_HASH_UI}{calcular_hash_ui(ui_path)}\n")
+            f.write("class Ui_MainWindow(object):\n"
+                    "    def setupUi(self, MainWindow):\n"
+                    "        MainWindow.construida = True\n"
+                    "        raise RuntimeError('widget desconocido')\n")
+        ventana = Mock()
+
+        with patch.object(sys.modules['PyQt5'].uic, 'loadUi') as mock_load_ui:
+            with pytest.raises(RuntimeError):
+                cargar_ui(ventana, ui_path)
+
+        mock_load_ui.assert_not_called()
+
+    @pytest.mark.unit
+    def test_compilada_desactualizada_usa_load_ui(self, ui_path):
+        self._escribir_compilada(ui_path, "hash_anterior")
+        ventana = Mock()
+
+        with patch.object(sys.modules['PyQt5'].uic, 'loadUi') as mock_load_ui, \
+                patch('helpers_py._recompilar_ui_en_segundo_plano') as mock_recompilar:
+            assert cargar_ui(ventana, ui_path) == "loadUi"
+
+        mock_load_ui.assert_called_once_with(ui_path, ventana)
+        mock_recompilar.assert_called_once_with(ui_path)
+
+
 class TestIntegracionHelpers:
     """Tests de integración para múltiples funciones"""
 
@@ -0,0 +1,147 @@
+"""
+Tests para perfil_arranque.py
+Tiempos de imports, etapas e hitos del arranque
+"""
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perfil_arranque
+from perfil_arranque import PerfilArranque, formatear_informe, PREFIJO_INFORME
+
+
+class TestPerfilArranque:
+    """Tests para PerfilArranque"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def perfil(self):
+        perfil = PerfilArranque()
+        yield perfil
+        perfil.desinstalar_importaciones()
+
+    @pytest.mark.unit
+    def test_etapa_registra_duracion(self, perfil):
+        with perfil.etapa('cargar_ui'):
+            pass
+
+        assert [e['nombre'] for e in perfil.etapas] == ['cargar_ui']
+        assert perfil.etapas[0]['duracion_ms'] >= 0
+
+    @pytest.mark.unit
+    def test_etapa_con_error_se_registra(self, perfil):
+        with pytest.raises(ValueError):
+            with perfil.etapa('falla'):
+                raise ValueError("error")
+
+        assert perfil.etapas[0]['nombre'] == 'falla'
+
+    @pytest.mark.unit
+    def test_hito_solo_cuenta_la_primera_vez(self, perfil):
+        perfil.hito('primer_frame')
+        primero = perfil.hitos['primer_frame']
+        perfil.hito('primer_frame')
+
+        assert perfil.hitos['primer_frame'] == primero
+
+    @pytest.mark.unit
+    def test_importaciones_anidadas(self, perfil, temp_dir):
+        """Test que se mide el import propio y acumulado, con su nivel de anidamiento"""
+        with open(os.path.join(temp_dir, 'mod_externo_perfil.py'), 'w') as f:
+            f.write("import mod_interno_perfil\n")
+        with open(os.path.join(temp_dir, 'mod_interno_perfil.py'), 'w') as f:
+            f.write("VALOR = 1\n")
+        sys.path.insert(0, temp_dir)
+        try:
+            assert perfil.instalar_importaciones()
+            import mod_externo_perfil  # noqa: F401
+            perfil.desinstalar_importaciones()
+            import json as _json  # noqa: F401  (ya importado, no se registra)
+        finally:
+            sys.path.remove(temp_dir)
+            sys.modules.pop('mod_externo_perfil', None)
+            sys.modules.pop('mod_interno_perfil', None)
+
+        registros = {i['modulo']: i for i in perfil.importaciones}
+        assert set(registros) == {'mod_externo_perfil', 'mod_interno_perfil'}
+        assert registros['mod_externo_perfil']['nivel'] == 0
+        assert registros['mod_interno_perfil']['nivel'] == 1
+        externo = registros['mod_externo_perfil']
+        assert externo['acumulado_ms'] >= registros['mod_interno_perfil']['acumulado_ms']
+        assert externo['propio_ms'] <= externo['acumulado_ms']
+
+    @pytest.mark.unit
+    def test_gancho_de_importacion_se_restaura(self, perfil, temp_dir):
+        """Test que el _find_and_load original vuelve a su sitio y los módulos ya importados no se miden"""
+        import importlib._bootstrap as bootstrap
+        original = bootstrap._find_and_load
+        with open(os.path.join(temp_dir, 'mod_unico_perfil.py'), 'w') as f:
+            f.write("VALOR = 1\n")
+        sys.path.insert(0, temp_dir)
+        try:
+            assert perfil.instalar_importaciones()
+            assert not perfil.instalar_importaciones()  # no se instala dos veces
+            assert bootstrap._find_and_load is not original
+            import mod_unico_perfil  # noqa: F401
+            sys.modules.pop('mod_unico_perfil')
+            __import__('json')  # ya estaba importado
+            with pytest.raises(ImportError):
+                __import__('mod_inexistente_perfil')
+            perfil.desinstalar_importaciones()
+            import mod_unico_perfil  # noqa: F401,F811  (sin gancho: no se registra)
+        finally:
+            sys.path.remove(temp_dir)
+            sys.modules.pop('mod_unico_perfil', None)
+
+        assert bootstrap._find_and_load is original
+        assert [i['modulo'] for i in perfil.importaciones] == ['mod_unico_perfil']
+        assert perfil._pila_importaciones() == []
+
+    @pytest.mark.unit
+    def test_guardar_informe_y_dejar_de_medir(self, perfil, temp_dir):
+        with perfil.etapa('cargar_datos'):
+            pass
+        perfil.hito('primer_frame')
+
+        ruta = perfil.guardar(temp_dir, extra={'precarga': {}})
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        assert datos['resumen']['primer_frame_ms'] == perfil.hitos['primer_frame']
+        assert datos['etapas'][0]['nombre'] == 'cargar_datos'
+        assert 'informe' in datos['hitos']
+        assert perfil.guardar(temp_dir) is None
+
+        with perfil.etapa('despues'):
+            pass
+        assert len(perfil.etapas) == 1
+
+    @pytest.mark.unit
+    def test_se_conservan_los_informes_recientes(self, perfil, temp_dir, monkeypatch):
+        monkeypatch.setattr(perfil_arranque, 'MAX_INFORMES', 2)
+        for nombre in ("20240101_000000", "20240102_000000"):
+            with open(os.path.join(temp_dir, f"{PREFIJO_INFORME}{nombre}.json"), 'w') as f:
+                f.write("{}")
+
+        ruta = perfil.guardar(temp_dir)
+
+        assert sorted(os.listdir(temp_dir)) == [f"{PREFIJO_INFORME}20240102_000000.json", os.path.basename(ruta)]
+
+    @pytest.mark.unit
+    def test_formato_importtime(self, perfil):
+        perfil._registrar_importacion('docx', 0.002, 0.005, 1, perfil.inicio)
+
+        texto = formatear_informe(perfil.informe())
+
+        assert texto.splitlines()[0] == "import time: self [us] | cumulative | imported package"
+        assert "import time:      2000 |       5000 |   docx" in texto